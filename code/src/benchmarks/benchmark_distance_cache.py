@@ -0,0 +1,65 @@
+import time
+
+from loguru import logger
+
+from examples.xor.xor_challenge import ChallengeXOR
+from neat_core.activation_function import modified_sigmoid_activation
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.optimizer.neat_optimizer_callback import NeatOptimizerCallback
+from neat_core.service import species_service as ss
+from neat_single_core.neat_optimizer_single_core import NeatOptimizerSingleCore
+
+
+class GenerationLimitCallback(NeatOptimizerCallback):
+
+    def __init__(self, amount_generations: int):
+        self.amount_generations = amount_generations
+        self.fitness_values = []
+
+    def finish_evaluation(self, generation) -> bool:
+        return generation.number >= self.amount_generations
+
+    def on_finish(self, generation, reporters) -> None:
+        self.fitness_values = [agent.fitness for agent in generation.agents]
+
+
+def run_xor(cache_size: int, amount_generations: int, seed: int):
+    config = NeatConfig(population_size=150, compatibility_threshold=3.0, compatibility_factor_matching_genes=0.5,
+                        probability_mutate_add_connection=0.5, probability_mutate_add_node=0.2,
+                        compatibility_distance_cache_size=cache_size)
+
+    # Measure only the time of the speciation
+    sort_agents_into_species = ss.sort_agents_into_species
+    speciation_time = [0.0]
+
+    def timed_sort_agents_into_species(*args, **kwargs):
+        start_time = time.time()
+        result = sort_agents_into_species(*args, **kwargs)
+        speciation_time[0] += time.time() - start_time
+        return result
+
+    callback = GenerationLimitCallback(amount_generations)
+    optimizer = NeatOptimizerSingleCore()
+    optimizer.register_callback(callback)
+
+    ss.sort_agents_into_species = timed_sort_agents_into_species
+    try:
+        optimizer.evaluate(2, 1, modified_sigmoid_activation, ChallengeXOR(), config, seed)
+    finally:
+        ss.sort_agents_into_species = sort_agents_into_species
+
+    distances = optimizer.distance_cache.distances
+    return speciation_time[0], distances.hits, distances.misses, callback.fitness_values
+
+
+if __name__ == '__main__':
+    logger.remove()
+
+    for amount_generations, seed in [(30, 1), (60, 1), (60, 2)]:
+        time_without_cache, _, _, fitness_without_cache = run_xor(0, amount_generations, seed)
+        time_with_cache, hits, misses, fitness_with_cache = run_xor(100000, amount_generations, seed)
+
+        print("Generations: {}, Seed: {} | Same result: {} | Speciation - Without cache: {:.4f}s, With cache: {:.4f}s, "
+              "SpeedUp: {:.2f} | Cache hits: {}, misses: {}, hit rate: {:.2f}"
+              .format(amount_generations, seed, fitness_without_cache == fitness_with_cache, time_without_cache,
+                      time_with_cache, time_without_cache / time_with_cache, hits, misses, hits / (hits + misses)))
@@ -0,0 +1,79 @@
+import timeit
+import warnings
+
+import numpy as np
+
+from benchmarks.benchmark_population_network import create_population
+from neat_core.models.agent import Agent
+from neat_core.models.species import Species
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.service import species_service as ss
+from neat_single_core.species_id_generator_single_core import SpeciesIDGeneratorSingleCore
+
+
+def distances_pairwise(genomes, representatives, config):
+    return [[ss.calculate_genetic_distance(genome, representative, config) for representative in representatives]
+            for genome in genomes]
+
+
+def distances_vectorized(genomes, representatives, config):
+    return [ss.calculate_genetic_distances(genome, representatives, config) for genome in genomes]
+
+
+def sort_pairwise(agents, representatives, config):
+    # The previous implementation of sort_agents_into_species
+    species_id_generator = SpeciesIDGeneratorSingleCore()
+    existing_species = [Species(species_id_generator.get_species_id(), r, []) for r in representatives]
+    for agent in agents:
+        for species in existing_species:
+            if ss.calculate_genetic_distance(agent.genome, species.representative, config) <= \
+                    config.compatibility_threshold:
+                species.members.append(agent)
+                break
+        else:
+            existing_species.append(Species(species_id_generator.get_species_id(), agent.genome, [agent]))
+    return existing_species
+
+
+def sort_vectorized(agents, representatives, config):
+    species_id_generator = SpeciesIDGeneratorSingleCore()
+    existing_species = [Species(species_id_generator.get_species_id(), r, []) for r in representatives]
+    return ss.sort_agents_into_species(existing_species, agents, species_id_generator, config)
+
+
+if __name__ == '__main__':
+    # Distances of genomes without matching genes are nan
+    warnings.simplefilter("ignore", RuntimeWarning)
+    repetitions = 3
+
+    # With the lower threshold, more species are compared for every agent
+    for population_size, mutations, amount_species, threshold in [(150, 5, 5, 3.0), (150, 20, 20, 3.0),
+                                                                   (150, 50, 50, 3.0), (150, 20, 20, 0.5),
+                                                                   (150, 50, 50, 0.5)]:
+        config = NeatConfig(compatibility_threshold=threshold)
+        genomes = create_population(population_size, mutations, 1)
+        agents = [Agent(i, genome) for i, genome in enumerate(genomes)]
+        representatives = genomes[:amount_species]
+
+        expected = np.array(distances_pairwise(genomes, representatives, config))
+        result = np.array(distances_vectorized(genomes, representatives, config))
+        identical = np.array_equal(expected, result, equal_nan=True)
+        same_species = [[a.id for a in s.members] for s in sort_pairwise(agents, representatives, config)] == \
+                       [[a.id for a in s.members] for s in sort_vectorized(agents, representatives, config)]
+
+        time_pairwise = timeit.timeit(lambda: distances_pairwise(genomes, representatives, config),
+                                      number=repetitions) / repetitions
+        time_vectorized = timeit.timeit(lambda: distances_vectorized(genomes, representatives, config),
+                                        number=repetitions) / repetitions
+        time_sort_pairwise = timeit.timeit(lambda: sort_pairwise(agents, representatives, config),
+                                           number=repetitions) / repetitions
+        time_sort_vectorized = timeit.timeit(lambda: sort_vectorized(agents, representatives, config),
+                                             number=repetitions) / repetitions
+
+        print("Population: {}, Mutations: {:2d}, Species: {:2d}, Threshold: {} | "
+              "Identical distances: {}, Same species: {} | "
+              "All distances - Pairwise: {:.4f}s, Vectorized: {:.4f}s, SpeedUp: {:.2f} | "
+              "Sort into species - Pairwise: {:.4f}s, Vectorized: {:.4f}s, SpeedUp: {:.2f}"
+              .format(population_size, mutations, amount_species, threshold, identical, same_species, time_pairwise,
+                      time_vectorized, time_pairwise / time_vectorized, time_sort_pairwise, time_sort_vectorized,
+                      time_sort_pairwise / time_sort_vectorized))
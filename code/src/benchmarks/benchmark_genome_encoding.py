@@ -0,0 +1,55 @@
+import pickle
+import timeit
+
+from benchmarks.benchmark_population_network import create_population
+from neat_core.models.agent import Agent
+from neat_core.service import encoding_service as es
+from neural_network.basic_neural_network import BasicNeuralNetwork
+from neural_network.compiled_neural_network import CompiledNeuralNetwork
+
+
+def pickled_agent_tasks(agents):
+    # The MPI executor pickles the argument of every task separately
+    return [pickle.dumps(agent, protocol=pickle.HIGHEST_PROTOCOL) for agent in agents]
+
+
+def encoded_genome_tasks(agents):
+    return [pickle.dumps(es.encode_genome(agent.genome), protocol=pickle.HIGHEST_PROTOCOL) for agent in agents]
+
+
+def build_from_pickled_agents(tasks):
+    for task in tasks:
+        agent = pickle.loads(task)
+        neural_network = BasicNeuralNetwork()
+        neural_network.build(agent.genome)
+
+
+def build_from_encoded_genomes(tasks):
+    for task in tasks:
+        data = pickle.loads(task)
+        _, nodes, connections = es.decode_genome_arrays(data)
+        neural_network = CompiledNeuralNetwork()
+        neural_network.build_from_arrays(nodes, connections)
+
+
+if __name__ == '__main__':
+    repetitions = 5
+
+    for population_size, mutations in [(150, 5), (150, 20), (150, 50)]:
+        agents = [Agent(i, genome) for i, genome in enumerate(create_population(population_size, mutations, 1))]
+
+        agent_tasks = pickled_agent_tasks(agents)
+        genome_tasks = encoded_genome_tasks(agents)
+        bytes_agents = sum(len(t) for t in agent_tasks)
+        bytes_genomes = sum(len(t) for t in genome_tasks)
+
+        time_pickle = timeit.timeit(lambda: pickled_agent_tasks(agents), number=repetitions) / repetitions
+        time_encode = timeit.timeit(lambda: encoded_genome_tasks(agents), number=repetitions) / repetitions
+        time_unpickle = timeit.timeit(lambda: build_from_pickled_agents(agent_tasks), number=repetitions) / repetitions
+        time_decode = timeit.timeit(lambda: build_from_encoded_genomes(genome_tasks), number=repetitions) / repetitions
+
+        print("Population: {}, Mutations: {:3d} | Bytes per generation - Pickled agents: {}, Encoded genomes: {}, "
+              "Reduction: {:.2f}x | Master - Pickle: {:.4f}s, Encode: {:.4f}s | Worker - Unpickle and build: {:.4f}s, "
+              "Decode and build: {:.4f}s".format(population_size, mutations, bytes_agents, bytes_genomes,
+                                                 bytes_agents / bytes_genomes, time_pickle, time_encode,
+                                                 time_unpickle, time_decode))
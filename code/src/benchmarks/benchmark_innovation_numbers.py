@@ -0,0 +1,40 @@
+import time
+
+import numpy as np
+
+from neat_core.activation_function import modified_sigmoid_activation
+from neat_core.models.node import Node, NodeType
+from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
+
+
+def run_generations(generator: InnovationNumberGeneratorSingleCore, amount_generations: int,
+                    mutations_per_generation: int, report_every: int):
+    rnd = np.random.RandomState(1)
+    nodes = [Node(i, NodeType.HIDDEN, 0.0, modified_sigmoid_activation, 0.5) for i in range(20)]
+
+    window_time = 0.0
+    for generation in range(1, amount_generations + 1):
+        generator.next_generation(generation)
+
+        # The amount of nodes grows over the run, so new connections are found in every generation
+        pairs = [(nodes[in_node], nodes[out_node])
+                 for in_node, out_node in rnd.randint(len(nodes), size=(mutations_per_generation + 1, 2))]
+
+        start_time = time.perf_counter()
+        for in_node, out_node in pairs[:-1]:
+            generator.get_connection_innovation_number(in_node, out_node)
+        new_number = generator.get_node_innovation_number(*pairs[-1])
+        window_time += time.perf_counter() - start_time
+        nodes.append(Node(new_number, NodeType.HIDDEN, 0.0, modified_sigmoid_activation, 0.5))
+
+        if generation % report_every == 0:
+            print("Generation: {:5d} | Time per mutation: {:6.2f}us | Connection innovations: {:7d}"
+                  .format(generation, window_time / (report_every * (mutations_per_generation + 1)) * 1e6,
+                          len(generator.connection_innovations)))
+            window_time = 0.0
+
+
+if __name__ == '__main__':
+    for expiry in [None, 50]:
+        print("Connection innovation expiry: {}".format(expiry))
+        run_generations(InnovationNumberGeneratorSingleCore(connection_innovation_expiry=expiry), 2000, 50, 250)
@@ -0,0 +1,56 @@
+import timeit
+
+import numpy as np
+
+from neat_core.activation_function import modified_sigmoid_activation
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.service import reproduction_service as rp
+from neat_core.service.generation_service import create_genome_structure
+from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
+from neural_network import neural_network_factory
+
+
+def create_genome(amount_inputs: int, amount_outputs: int, mutations: int, seed: int):
+    config = NeatConfig(allow_recurrent_connections=False, probability_mutate_add_node=0.5,
+                        probability_mutate_add_connection=1.0, mutate_connection_tries=20)
+    rnd = np.random.RandomState(seed)
+    generator = InnovationNumberGeneratorSingleCore()
+    genome = create_genome_structure(amount_inputs, amount_outputs, modified_sigmoid_activation, config, generator)
+    genome = rp.set_new_genome_weights(genome, rnd, config)
+    genome = rp.set_new_genome_bias(genome, rnd, config)
+    for generation in range(mutations):
+        generator.next_generation(generation)
+        genome, _, _, _ = rp.mutate_add_node(genome, rnd, generator, config)
+        genome, _ = rp.mutate_add_connection(genome, rnd, generator, config)
+    return genome
+
+
+def build(genome, neural_network_type: str):
+    neural_network = neural_network_factory.create_neural_network(neural_network_type)
+    neural_network.build(genome)
+    return neural_network
+
+
+if __name__ == '__main__':
+    rnd = np.random.RandomState(1)
+
+    # Small networks like xor and networks with the RAM observations of breakout as input
+    for amount_inputs, amount_outputs, mutations in [(2, 1, 10), (128, 4, 0), (128, 4, 20), (128, 4, 100)]:
+        genome = create_genome(amount_inputs, amount_outputs, mutations, 1)
+        inputs = [rnd.uniform(0, 1, amount_inputs).tolist() for _ in range(100)]
+        amount_enabled = sum(connection.enabled for connection in genome.connections)
+
+        results = {}
+        for neural_network_type in ["basic", "compiled", "layered"]:
+            neural_network = build(genome, neural_network_type)
+            results[neural_network_type] = [neural_network.activate(i) for i in inputs]
+
+            time_build = timeit.timeit(lambda: build(genome, neural_network_type), number=20) / 20
+            time_activate = timeit.timeit(lambda: [neural_network.activate(i) for i in inputs], number=5) / 500
+            print("Inputs: {:3}, Nodes: {:3}, Connections: {:4}, Levels: {:2}, Network: {:8} - Build: {:8.1f}us, "
+                  "Activate: {:7.1f}us".format(amount_inputs, len(genome.nodes), amount_enabled,
+                                               int(np.max(build(genome, "layered").node_levels)),
+                                               neural_network_type, time_build * 1e6, time_activate * 1e6))
+
+        max_difference = np.max(np.abs(np.array(results["compiled"]) - np.array(results["layered"])))
+        print("Max difference compiled - layered: {:.2e}".format(max_difference))
@@ -0,0 +1,39 @@
+import pickle
+import timeit
+import tracemalloc
+
+from benchmarks.benchmark_population_network import create_population
+from neat_core.models.agent import Agent
+from neat_core.service import reproduction_service as rp
+
+
+def copy_agents(genomes):
+    return [Agent(i, rp.deep_copy_genome(genome)) for i, genome in enumerate(genomes)]
+
+
+if __name__ == '__main__':
+    repetitions = 5
+
+    for population_size, mutations in [(1000, 5), (1000, 20), (1000, 50)]:
+        genomes = create_population(population_size, mutations, 1)
+        amount_genes = sum(len(genome.nodes) + len(genome.connections) for genome in genomes)
+
+        # Memory of the agents, the genomes are copied, so every gene is a new object
+        tracemalloc.start()
+        agents = copy_agents(genomes)
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        pickled_agents = [pickle.dumps(agent, protocol=pickle.HIGHEST_PROTOCOL) for agent in agents]
+        pickled_bytes = sum(len(data) for data in pickled_agents)
+
+        time_pickle = timeit.timeit(lambda: [pickle.dumps(agent, protocol=pickle.HIGHEST_PROTOCOL)
+                                             for agent in agents], number=repetitions) / repetitions
+        time_unpickle = timeit.timeit(lambda: [pickle.loads(data) for data in pickled_agents],
+                                      number=repetitions) / repetitions
+
+        print("Population: {}, Mutations: {:2d}, Genes: {} | Memory per gene: {:.1f} bytes | Pickled per gene: "
+              "{:.1f} bytes | Pickle: {:.4f}s, Unpickle: {:.4f}s".format(population_size, mutations, amount_genes,
+                                                                        memory / amount_genes,
+                                                                        pickled_bytes / amount_genes, time_pickle,
+                                                                        time_unpickle))
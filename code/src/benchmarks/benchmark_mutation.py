@@ -0,0 +1,36 @@
+import time
+
+import numpy as np
+
+from neat_core.activation_function import modified_sigmoid_activation
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.service import generation_service as gs
+from neat_core.service import reproduction_service as rp
+from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
+
+
+def create_genome(amount_input_nodes: int, amount_output_nodes: int, config: NeatConfig):
+    genome = gs.create_genome_structure(amount_input_nodes, amount_output_nodes, modified_sigmoid_activation, config,
+                                        InnovationNumberGeneratorSingleCore())
+    return rp.set_new_genome_weights(genome, np.random.RandomState(1), config)
+
+
+def measure_mutation(genome, mutate_function, config: NeatConfig, repetitions: int):
+    start_time = time.time()
+    for seed in range(repetitions):
+        mutate_function(rp.copy_genome(genome), np.random.RandomState(seed), config)
+    return (time.time() - start_time) / repetitions
+
+
+if __name__ == '__main__':
+    config = NeatConfig()
+
+    for amount_input_nodes, amount_output_nodes, repetitions in [(2, 1, 5000), (10, 4, 5000), (24, 4, 2000),
+                                                                 (100, 10, 200), (300, 30, 20)]:
+        genome = create_genome(amount_input_nodes, amount_output_nodes, config)
+        time_scalar = measure_mutation(genome, rp.mutate_weights, config, repetitions)
+        time_vectorized = measure_mutation(genome, rp.mutate_weights_vectorized, config, repetitions)
+
+        print("Connections: {:5d} | Scalar: {:9.2f}us | Vectorized: {:9.2f}us | Speedup: {:.2f}"
+              .format(len(genome.connections), time_scalar * 1e6, time_vectorized * 1e6,
+                      time_scalar / time_vectorized))
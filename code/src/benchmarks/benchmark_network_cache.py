@@ -0,0 +1,113 @@
+import time
+
+import numpy as np
+
+from examples.xor.xor_challenge import ChallengeXOR
+from neat_core.activation_function import modified_sigmoid_activation
+from neat_core.models.agent import Agent
+from neat_core.models.generation import Generation
+from neat_core.optimizer.challenge import Challenge
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.optimizer.neat_optimizer_callback import NeatOptimizerCallback
+from neat_core.service import reproduction_service as rp
+from neat_core.service.generation_service import create_genome_structure
+from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
+from neat_single_core.neat_optimizer_single_core import NeatOptimizerSingleCore
+from neural_network.network_cache import NetworkCache
+
+
+class ChallengeXORSingle(Challenge):
+    """
+    The xor challenge without the population evaluation, so every genome is built and evaluated on its own
+    """
+
+    def __init__(self):
+        self.challenge = ChallengeXOR()
+
+    def initialization(self, **kwargs) -> None:
+        pass
+
+    def before_evaluation(self, **kwargs) -> None:
+        pass
+
+    def evaluate(self, neural_network, **kwargs):
+        return self.challenge.evaluate(neural_network)
+
+    def after_evaluation(self, **kwargs) -> None:
+        pass
+
+    def clean_up(self, **kwargs) -> None:
+        pass
+
+
+class Callback(NeatOptimizerCallback):
+
+    def on_finish(self, generation: Generation, reporters) -> None:
+        pass
+
+    def finish_evaluation(self, generation: Generation) -> bool:
+        return False
+
+
+def create_generations(population_size: int, generations: int, mutations: int, unchanged: float, seed: int):
+    """
+    Create generations, in which a part of the genomes is copied unchanged from the previous generation (like the best
+    genomes of the species or children without mutation) and the other genomes are mutated
+    """
+    config = NeatConfig(allow_recurrent_connections=False, probability_mutate_add_node=0.5,
+                        probability_mutate_add_connection=1.0, mutate_connection_tries=20)
+    rnd = np.random.RandomState(seed)
+    generator = InnovationNumberGeneratorSingleCore()
+    structure = create_genome_structure(2, 1, modified_sigmoid_activation, config, generator)
+
+    genomes = []
+    for _ in range(population_size):
+        genome = rp.set_new_genome_weights(rp.copy_genome(structure), rnd, config)
+        genome = rp.set_new_genome_bias(genome, rnd, config)
+        for generation in range(mutations):
+            generator.next_generation(generation)
+            genome, _, _, _ = rp.mutate_add_node(genome, rnd, generator, config)
+            genome, _ = rp.mutate_add_connection(genome, rnd, generator, config)
+        genomes.append(genome)
+
+    all_genomes = [genomes]
+    for _ in range(generations - 1):
+        genomes = [genome if rnd.uniform() < unchanged else rp.mutate_weights(rp.copy_genome(genome), rnd, config)
+                   for genome in genomes]
+        all_genomes.append(genomes)
+    return all_genomes
+
+
+def evaluate_generations(all_genomes, neural_network_type: str, cache_size: int, cache_results: bool):
+    config = NeatConfig(neural_network_type=neural_network_type, network_cache_size=cache_size,
+                        network_cache_results=cache_results)
+    optimizer = NeatOptimizerSingleCore()
+    optimizer.register_callback(Callback())
+    optimizer.network_cache = NetworkCache(cache_size, cache_results)
+    challenge = ChallengeXORSingle()
+
+    start_time = time.time()
+    fitness = 0.0
+    for number, genomes in enumerate(all_genomes):
+        agents = [Agent(i, genome) for i, genome in enumerate(genomes)]
+        generation = optimizer._evaluate_generation(Generation(number, 0, agents, []), challenge, config)
+        fitness += sum(agent.fitness for agent in generation.agents)
+    hits = optimizer.network_cache.networks.hits + optimizer.network_cache.results.hits
+    return fitness, time.time() - start_time, hits
+
+
+if __name__ == '__main__':
+    population_size, generations, repetitions = 1000, 10, 3
+
+    for mutations, unchanged in [(10, 0.1), (10, 0.5), (50, 0.1), (50, 0.5)]:
+        all_genomes = create_generations(population_size, generations, mutations, unchanged, 1)
+        for neural_network_type in ["basic", "compiled"]:
+            for cache_size, cache_results in [(0, False), (2 * population_size, False), (2 * population_size, True)]:
+                results = [evaluate_generations(all_genomes, neural_network_type, cache_size, cache_results)
+                           for _ in range(repetitions)]
+                fitness, _, hits = results[0]
+                duration = min(duration for _, duration, _ in results)
+                print("Mutations: {:2}, Unchanged: {:.0%}, Network: {:8}, Cache: {:4}, Results: {:5} - Time per "
+                      "generation: {:7.2f}ms, Cache hits: {:4}, Fitness sum: {:.6f}"
+                      .format(mutations, unchanged, neural_network_type, cache_size, str(cache_results),
+                              duration / generations * 1000, hits, fitness))
@@ -0,0 +1,104 @@
+import timeit
+
+import numpy as np
+
+from examples.xor.xor_challenge import ChallengeXOR
+from neat_core.activation_function import modified_sigmoid_activation
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.service import reproduction_service as rp
+from neat_core.service.generation_service import create_genome_structure
+from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
+from neural_network import neural_network_factory
+from neural_network.compiled_neural_network import CompiledNeuralNetwork
+from neural_network.population_network import PopulationNetwork
+
+
+def create_population(population_size: int, mutations: int, seed: int):
+    config = NeatConfig(allow_recurrent_connections=False, probability_mutate_add_node=0.5,
+                        probability_mutate_add_connection=1.0, mutate_connection_tries=20)
+    rnd = np.random.RandomState(seed)
+
+    genomes = []
+    for _ in range(population_size):
+        generator = InnovationNumberGeneratorSingleCore()
+        genome = create_genome_structure(2, 1, modified_sigmoid_activation, config, generator)
+        genome = rp.set_new_genome_weights(genome, rnd, config)
+        genome = rp.set_new_genome_bias(genome, rnd, config)
+        for generation in range(rnd.randint(mutations + 1)):
+            generator.next_generation(generation)
+            genome, _, _, _ = rp.mutate_add_node(genome, rnd, generator, config)
+            genome, _ = rp.mutate_add_connection(genome, rnd, generator, config)
+        genomes.append(genome)
+    return genomes
+
+
+def evaluate_single(genomes, challenge: ChallengeXOR, neural_network_type: str):
+    results = []
+    for genome in genomes:
+        neural_network = neural_network_factory.create_neural_network(neural_network_type)
+        neural_network.build(genome)
+        results.append(challenge.evaluate(neural_network))
+    return results
+
+
+def evaluate_population(genomes, challenge: ChallengeXOR):
+    population_network = PopulationNetwork()
+    population_network.build(genomes)
+    return challenge.evaluate_population(population_network)
+
+
+def activate_single(genomes, inputs: np.ndarray):
+    neural_networks = []
+    for genome in genomes:
+        neural_network = CompiledNeuralNetwork()
+        neural_network.build(genome)
+        neural_networks.append(neural_network)
+
+    for step_inputs in inputs:
+        for neural_network, genome_inputs in zip(neural_networks, step_inputs.tolist()):
+            neural_network.activate(genome_inputs)
+
+
+def activate_population(genomes, inputs: np.ndarray):
+    population_network = PopulationNetwork()
+    population_network.build(genomes)
+
+    for step_inputs in inputs:
+        population_network.activate(step_inputs[:, np.newaxis, :])
+
+
+if __name__ == '__main__':
+    challenge = ChallengeXOR()
+    repetitions = 5
+
+    for population_size, mutations in [(150, 5), (150, 20), (1000, 5), (1000, 20)]:
+        genomes = create_population(population_size, mutations, 1)
+
+        basic_results = evaluate_single(genomes, challenge, "basic")
+        population_results = evaluate_population(genomes, challenge)
+        max_difference = max(abs(s[0] - p[0]) for s, p in zip(basic_results, population_results))
+
+        time_basic = timeit.timeit(lambda: evaluate_single(genomes, challenge, "basic"),
+                                   number=repetitions) / repetitions
+        time_compiled = timeit.timeit(lambda: evaluate_single(genomes, challenge, "compiled"),
+                                      number=repetitions) / repetitions
+        time_population = timeit.timeit(lambda: evaluate_population(genomes, challenge),
+                                        number=repetitions) / repetitions
+
+        print("XOR - Population: {:5d}, Mutations: {:3d} | Basic: {:.4f}s | Compiled: {:.4f}s | "
+              "Population network: {:.4f}s | Speedup basic: {:.2f}x | Speedup compiled: {:.2f}x | "
+              "Max fitness difference: {:.2e}".format(population_size, mutations, time_basic, time_compiled,
+                                                      time_population, time_basic / time_population,
+                                                      time_compiled / time_population, max_difference))
+
+    # Episodic challenges activate every network many times, the build costs are shared by all activations
+    for population_size, steps in [(150, 200), (1000, 200)]:
+        genomes = create_population(population_size, 20, 1)
+        inputs = np.random.RandomState(1).uniform(-1, 1, size=(steps, population_size, 2))
+
+        time_single = timeit.timeit(lambda: activate_single(genomes, inputs), number=1)
+        time_population = timeit.timeit(lambda: activate_population(genomes, inputs), number=1)
+
+        print("Rollout - Population: {:5d}, Activations: {:4d} | Compiled: {:.4f}s | Population network: {:.4f}s | "
+              "Speedup: {:.2f}x".format(population_size, steps, time_single, time_population,
+                                        time_single / time_population))
@@ -0,0 +1,64 @@
+import timeit
+
+import numpy as np
+
+from neat_core.activation_function import modified_sigmoid_activation
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.service import reproduction_service as rp
+from neat_core.service.generation_service import create_genome_structure
+from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
+from neural_network import neural_network_factory
+
+
+def create_genome(amount_inputs: int, amount_outputs: int, mutations: int, seed: int):
+    config = NeatConfig(allow_recurrent_connections=True, probability_mutate_add_node=0.5,
+                        probability_mutate_add_connection=1.0, mutate_connection_tries=20)
+    rnd = np.random.RandomState(seed)
+    generator = InnovationNumberGeneratorSingleCore()
+    genome = create_genome_structure(amount_inputs, amount_outputs, modified_sigmoid_activation, config, generator)
+    genome = rp.set_new_genome_weights(genome, rnd, config)
+    genome = rp.set_new_genome_bias(genome, rnd, config)
+    for generation in range(mutations):
+        generator.next_generation(generation)
+        genome, _, _, _ = rp.mutate_add_node(genome, rnd, generator, config)
+        genome, _ = rp.mutate_add_connection(genome, rnd, generator, config)
+    return genome
+
+
+def run_episodes(neural_network, inputs, episodes: int):
+    for _ in range(episodes):
+        neural_network.reset()
+        for i in inputs:
+            neural_network.activate(i)
+
+
+if __name__ == '__main__':
+    rnd = np.random.RandomState(1)
+
+    # Recurrent networks for pole balancing and networks with the RAM observations of breakout as input
+    for amount_inputs, amount_outputs, mutations in [(4, 1, 20), (8, 4, 60), (128, 4, 100)]:
+        genome = create_genome(amount_inputs, amount_outputs, mutations, 1)
+        inputs = [rnd.uniform(0, 1, amount_inputs).tolist() for _ in range(20)]
+        amount_enabled = sum(connection.enabled for connection in genome.connections)
+
+        results = {}
+        for neural_network_type in ["basic", "compiled", "layered", "recurrent"]:
+            neural_network = neural_network_factory.create_neural_network(neural_network_type)
+            neural_network.build(genome)
+            results[neural_network_type] = [neural_network.activate(i) for i in inputs]
+
+            # Episodes of 20 steps, the network is reset at the beginning of every episode
+            time_episode = min(timeit.repeat(lambda: run_episodes(neural_network, inputs, 10), number=5,
+                                             repeat=3)) / 50
+            time_reset = min(timeit.repeat(neural_network.reset, number=1000, repeat=3)) / 1000
+            print("Inputs: {:3}, Nodes: {:3}, Connections: {:4}, Network: {:9} - Episode: {:8.1f}us, "
+                  "Reset: {:5.2f}us".format(amount_inputs, len(genome.nodes), amount_enabled, neural_network_type,
+                                            time_episode * 1e6, time_reset * 1e6))
+
+        neural_network = neural_network_factory.create_neural_network("recurrent")
+        neural_network.build(genome)
+        state = neural_network.export_state()
+        time_restore = min(timeit.repeat(lambda: neural_network.restore_state(state), number=1000, repeat=3)) / 1000
+        max_difference = np.max(np.abs(np.array(results["compiled"]) - np.array(results["recurrent"])))
+        print("Restore state: {:.2f}us, Max difference compiled - recurrent: {:.2e}".format(time_restore * 1e6,
+                                                                                          max_difference))
@@ -0,0 +1,65 @@
+import time
+import tracemalloc
+
+from loguru import logger
+
+from neat_core.activation_function import modified_sigmoid_activation
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.service import generation_service as gs
+from neat_core.service import reproduction_service as rp
+from neat_single_core.agent_id_generator_single_core import AgentIDGeneratorSingleCore
+from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
+from neat_single_core.species_id_generator_single_core import SpeciesIDGeneratorSingleCore
+
+
+def create_generation(population_size: int, config: NeatConfig):
+    return gs.create_initial_generation(10, 4, modified_sigmoid_activation, InnovationNumberGeneratorSingleCore(),
+                                        SpeciesIDGeneratorSingleCore(), AgentIDGeneratorSingleCore(), config, 1)
+
+
+def compose_offspring(agents, config: NeatConfig):
+    generator = InnovationNumberGeneratorSingleCore()
+    generator.next_generation(0)
+    # Every agent is crossed with its neighbour, like the reproduction within a species
+    return [rp.compose_offspring_genome(agent, agents[(i + 1) % len(agents)], generator, config)
+            for i, agent in enumerate(agents)]
+
+
+def measure_time(function):
+    start_time = time.time()
+    result = function()
+    return result, time.time() - start_time
+
+
+def measure_memory(function):
+    # Tracing the allocations slows down the execution, so the time is measured separately
+    tracemalloc.start()
+    result = function()
+    current_memory, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current_memory, peak_memory
+
+
+if __name__ == '__main__':
+    logger.remove()
+
+    for population_size in [1000, 10000]:
+        config = NeatConfig(population_size=population_size, probability_mutate_add_node=0.03,
+                            probability_mutate_add_connection=0.05)
+
+        _, time_initial = measure_time(lambda: create_generation(population_size, config))
+        generation, memory_initial, peak_initial = measure_memory(lambda: create_generation(population_size, config))
+        for i, agent in enumerate(generation.agents):
+            agent.fitness = float(i % 13)
+
+        _, time_offspring = measure_time(lambda: compose_offspring(generation.agents, config))
+        children, memory_offspring, peak_offspring = measure_memory(lambda: compose_offspring(generation.agents,
+                                                                                              config))
+
+        # Shows, that the results are the same
+        checksum = sum(connection.weight for genome in children for connection in genome.connections)
+
+        print("Population: {:5d} | Initial generation - Time: {:.3f}s, Memory: {:.1f}MB, Peak: {:.1f}MB | "
+              "Offspring - Time: {:.3f}s, Memory: {:.1f}MB, Peak: {:.1f}MB | Checksum: {:.6f}"
+              .format(population_size, time_initial, memory_initial / 2 ** 20, peak_initial / 2 ** 20, time_offspring,
+                      memory_offspring / 2 ** 20, peak_offspring / 2 ** 20, checksum))
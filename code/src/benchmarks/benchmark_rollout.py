@@ -0,0 +1,64 @@
+import timeit
+
+import numpy as np
+
+from benchmarks.benchmark_recurrent_network import create_genome
+from neural_network import neural_network_factory
+
+
+class ConstantEnvironment(object):
+
+    def __init__(self, amount_inputs: int, max_steps: int):
+        # Environment without calculations, so only the handoff between network and environment is measured
+        self.observation = np.random.RandomState(1).uniform(-1, 1, amount_inputs)
+        self.info = {}
+        self.max_steps = max_steps
+        self.steps = 0
+
+    def reset(self):
+        self.steps = 0
+        return self.observation
+
+    def step(self, action):
+        self.steps += 1
+        return self.observation, 1.0, self.steps >= self.max_steps, self.info
+
+
+def run_loop(neural_network, environment: ConstantEnvironment):
+    # The loop of the challenges before the rollout
+    observation = environment.reset()
+    done = False
+    fitness = 0
+    while not done:
+        action = neural_network.activate(observation)
+        index = np.argmax(action)
+        observation, reward, done, info = environment.step(index)
+        fitness += reward
+    return fitness
+
+
+def run_rollout(neural_network, environment: ConstantEnvironment):
+    return neural_network.rollout(environment.step, environment.reset(), environment.max_steps).total_reward
+
+
+if __name__ == '__main__':
+    max_steps = 500
+
+    # Networks of the size of pole balancing, lunar lander and breakout
+    for amount_inputs, amount_outputs, mutations in [(4, 2, 5), (8, 4, 20), (128, 4, 50)]:
+        genome = create_genome(amount_inputs, amount_outputs, mutations, 1)
+        environment = ConstantEnvironment(amount_inputs, max_steps)
+
+        for neural_network_type in ["basic", "compiled", "layered", "recurrent"]:
+            neural_network = neural_network_factory.create_neural_network(neural_network_type)
+            neural_network.build(genome)
+
+            neural_network.reset()
+            assert run_loop(neural_network, environment) == run_rollout(neural_network, environment)
+
+            time_loop = min(timeit.repeat(lambda: run_loop(neural_network, environment), number=3, repeat=3))
+            time_rollout = min(timeit.repeat(lambda: run_rollout(neural_network, environment), number=3, repeat=3))
+            print("Inputs: {:3}, Nodes: {:3}, Network: {:9} - Loop: {:6.2f}us/step, Rollout: {:6.2f}us/step, "
+                  "Speedup: {:4.1f}".format(amount_inputs, len(genome.nodes), neural_network_type,
+                                            time_loop / (3 * max_steps) * 1e6, time_rollout / (3 * max_steps) * 1e6,
+                                            time_loop / time_rollout))
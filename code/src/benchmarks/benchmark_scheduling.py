@@ -0,0 +1,49 @@
+import heapq
+
+import numpy as np
+
+from neat_mpi import partitioning
+
+
+def simulate(chunks, costs: np.ndarray, amount_workers: int, latency: float):
+    """
+    Simulate a queue of chunks, every free worker takes the next chunk. Every chunk requires one round trip.
+    :return: the required time and the mean idle time of the workers
+    """
+    workers = [(0.0, worker) for worker in range(amount_workers)]
+    busy_times = np.zeros(amount_workers)
+    for chunk in chunks:
+        free_time, worker = heapq.heappop(workers)
+        chunk_time = latency + float(np.sum(costs[chunk]))
+        busy_times[worker] += chunk_time
+        heapq.heappush(workers, (free_time + chunk_time, worker))
+
+    required_time = max(free_time for free_time, _ in workers)
+    return required_time, float(np.mean(required_time - busy_times))
+
+
+if __name__ == '__main__':
+    rnd = np.random.RandomState(1)
+    amount_agents = 150
+    amount_workers = 39
+    latency = 0.002
+
+    # Episode lengths vary by orders of magnitude, the estimates from the parents are noisy
+    for sigma in [0.5, 1.5, 2.5]:
+        costs = 0.001 * rnd.lognormal(mean=0.0, sigma=sigma, size=amount_agents)
+        estimates = costs * rnd.lognormal(mean=0.0, sigma=0.5, size=amount_agents)
+
+        schedules = {
+            "map(chunksize=1)": [np.array([i]) for i in range(amount_agents)],
+            "static partition": np.split(np.arange(amount_agents), np.cumsum(
+                partitioning.static_partition(amount_agents, amount_workers))[:-1]),
+            "guided, no estimates": partitioning.guided_chunks(np.ones(amount_agents), amount_workers),
+            "guided, estimates": partitioning.guided_chunks(estimates, amount_workers),
+        }
+
+        print("Cost spread sigma={}, total cost {:.4f}s, most expensive agent {:.4f}s".format(
+            sigma, np.sum(costs), np.max(costs)))
+        for name, chunks in schedules.items():
+            required_time, idle_time = simulate(chunks, costs, amount_workers, latency)
+            print("    {:22s} chunks: {:3d} | time: {:.4f}s | mean idle time per rank: {:.4f}s".format(
+                name, len(chunks), required_time, idle_time))
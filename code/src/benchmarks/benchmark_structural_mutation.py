@@ -0,0 +1,107 @@
+import time
+
+import numpy as np
+
+from neat_core.activation_function import modified_sigmoid_activation
+from neat_core.models.agent import Agent
+from neat_core.models.genome import Genome
+from neat_core.models.genome_index import GenomeIndex
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.service import generation_service as gs
+from neat_core.service import reproduction_service as rp
+from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
+
+
+def grow_genome(config: NeatConfig, amount_rounds: int, report_every: int):
+    generator = InnovationNumberGeneratorSingleCore()
+    genome = gs.create_genome_structure(10, 4, modified_sigmoid_activation, config, generator)
+    genome = rp.set_new_genome_weights(genome, np.random.RandomState(1), config)
+    rnd = np.random.RandomState(2)
+
+    # The index is kept for the whole growth of the genome
+    index = GenomeIndex(genome)
+    window_time = 0.0
+    for i in range(1, amount_rounds + 1):
+        start_time = time.perf_counter()
+        rp.mutate_add_node(genome, rnd, generator, config, index)
+        rp.mutate_add_connection(genome, rnd, generator, config, index)
+        window_time += time.perf_counter() - start_time
+
+        if i % report_every == 0:
+            print("Nodes: {:5d}, Connections: {:5d} | Time per mutation: {:7.2f}us"
+                  .format(len(genome.nodes), len(genome.connections), window_time / (2 * report_every) * 1e6))
+            window_time = 0.0
+
+    # Shows, that the same structure is created
+    return sum(hash((c.innovation_number, c.input_node, c.output_node, c.enabled)) % 1000003
+               for c in genome.connections)
+
+
+def grow_large_genome(amount_rounds: int):
+    config = NeatConfig(probability_mutate_add_node=1.0, probability_mutate_add_connection=1.0,
+                        mutate_connection_tries=5)
+    generator = InnovationNumberGeneratorSingleCore()
+    genome = gs.create_genome_structure(10, 4, modified_sigmoid_activation, config, generator)
+    genome = rp.set_new_genome_weights(genome, np.random.RandomState(1), config)
+    rnd = np.random.RandomState(2)
+    # Every round is a new generation, so the node innovation numbers are unique, like in an evolved genome
+    for generation in range(1, amount_rounds + 1):
+        generator.next_generation(generation)
+        rp.mutate_add_node(genome, rnd, generator, config)
+        rp.mutate_add_connection(genome, rnd, generator, config)
+    return genome, generator
+
+
+def compose_offspring(config: NeatConfig, amount_rounds: int, amount_children: int, keep_index: bool):
+    genome, generator = grow_large_genome(amount_rounds)
+    parent1 = Agent(1, rp.deep_copy_genome(genome))
+    parent2 = Agent(2, Genome(3, [rp.deep_copy_node(node) for node in genome.nodes],
+                              [rp.deep_copy_connection(connection) for connection in genome.connections]))
+    parent1.fitness, parent2.fitness = 2, 1
+    parent1.genome.index = GenomeIndex(parent1.genome)
+    parent1.genome.index.get_sorted_nodes()
+
+    checksum = 0
+    start_time = time.perf_counter()
+    for i in range(amount_children):
+        # Without the kept index, every child builds its own index from scratch
+        if not keep_index:
+            parent1.genome.index = None
+        parent1.genome.seed = i
+        child = rp.compose_offspring_genome(parent1, parent2, generator, config)
+        checksum = (checksum + len(child.nodes) * 31 + len(child.connections)) % 1000003
+    total_time = time.perf_counter() - start_time
+
+    print("Keep index: {:5} | Nodes: {:5d}, Connections: {:5d} | Time per child: {:7.2f}ms | Checksum: {}"
+          .format(str(keep_index), len(genome.nodes), len(genome.connections), total_time / amount_children * 1e3,
+                  checksum))
+
+
+def build_child_index(amount_rounds: int, amount_children: int):
+    genome, _ = grow_large_genome(amount_rounds)
+    parent_index = GenomeIndex(genome)
+    parent_index.get_sorted_nodes()
+
+    for use_template in [True, False]:
+        start_time = time.perf_counter()
+        for _ in range(amount_children):
+            child_genome = Genome(genome.seed, list(genome.nodes), list(genome.connections))
+            GenomeIndex(child_genome, parent_index if use_template else None).get_sorted_nodes()
+        total_time = time.perf_counter() - start_time
+        print("Derived index: {:5} | Time per child index: {:7.2f}us"
+              .format(str(use_template), total_time / amount_children * 1e6))
+
+
+if __name__ == '__main__':
+    for allow_recurrent in [True, False]:
+        config = NeatConfig(allow_recurrent_connections=allow_recurrent, probability_mutate_add_node=1.0,
+                            probability_mutate_add_connection=1.0, mutate_connection_tries=5)
+        print("Recurrent: {}".format(allow_recurrent))
+        print("Checksum: {}".format(grow_genome(config, 4000, 1000)))
+
+    # The vectorized weight mutation keeps the share of the cross over and the structural mutations visible
+    config = NeatConfig(probability_mutate_add_node=0.03, probability_mutate_add_connection=0.3,
+                        mutation_mode="vectorized")
+    for keep_index in [True, False]:
+        compose_offspring(config, 1000, 200, keep_index)
+    build_child_index(1000, 200)
@@ -1,7 +1,6 @@
 from typing import Dict
 
 import gym
-import numpy as np
 
 from neat_core.optimizer.challenge import Challenge
 from neural_network.neural_network_interface import NeuralNetworkInterface
@@ -21,38 +20,30 @@ class BreakoutChallenge(Challenge):
         self.observation = self.env.reset()
 
     def evaluate(self, neural_network: NeuralNetworkInterface, **kwargs) -> (float, Dict[str, object]):
-        fitness = 1
-
+        # Render environment only if it is specifically requested
+        render = kwargs.get("record", False) or kwargs.get("show", False)
         last_lives = 5
-        should_fire = True
-
-        for _ in range(5000):
-            if should_fire:
-                # Fire the ball
-                self.env.step(1)
-                should_fire = False
-
-            normalized = [v / 256.0 for v in self.observation]
-            action = neural_network.activate(normalized)
-            index = np.argmax(action)
 
+        def step(index: int):
+            nonlocal last_lives
             self.observation, reward, done, info = self.env.step(2 + index)
 
-            # self.env.render()
+            if render:
+                self.env.render()
 
-            if info["ale.lives"] != last_lives:
-                should_fire = True
+            if not done and info["ale.lives"] != last_lives:
+                # Fire the ball again before the next action
+                self.env.step(1)
                 last_lives = info["ale.lives"]
 
-            # Render environment only if it is specifically requested
-            if kwargs.get("record", False) or kwargs.get("show", False):
-                self.env.render()
+            return self.observation / 256.0, reward, done, info
 
-            # Used for fitness
-            fitness += reward
+        # Fire the ball
+        self.env.step(1)
+        rollout = neural_network.rollout(step, self.observation / 256.0, 5000)
 
-            if done:
-                break
+        # Used for fitness
+        fitness = 1 + rollout.total_reward
 
         return fitness, {"solved": fitness >= 30}
 
@@ -1,7 +1,6 @@
 from typing import Dict
 
 import gym
-import numpy as np
 
 from neat_core.optimizer.challenge import Challenge
 from neural_network.neural_network_interface import NeuralNetworkInterface
@@ -25,22 +24,22 @@ class LunarLanderChallenge(Challenge):
         fitness_values = []
         amount_runs = 10
 
-        for _ in range(amount_runs):
-            self.before_evaluation()
-            done = False
-            fitness = 0
-            while not done:
-                action = neural_network.activate(self.observation)
-                index = np.argmax(action)
+        def step_and_render(index: int):
+            step_result = self.env.step(index)
+            self.env.render()
+            return step_result
 
-                self.observation, reward, done, info = self.env.step(index)
+        # Render environment only if it is specifically requested
+        step = step_and_render if kwargs.get("show", False) else self.env.step
 
-                # Render environment only if it is specifically requested
-                if kwargs.get("show", False):
-                    self.env.render()
+        for _ in range(amount_runs):
+            self.before_evaluation()
+            # The environment is done at the latest after the max episode steps
+            rollout = neural_network.rollout(step, self.observation, self.env.spec.max_episode_steps)
+            self.observation = rollout.final_observation
 
-                # Used for fitness
-                fitness += reward
+            # Used for fitness
+            fitness = rollout.total_reward
 
             fitness_values.append(fitness)
             solved_rounds.append(fitness >= 200)
@@ -1,14 +1,16 @@
-from typing import Dict
+from typing import Dict, List, Tuple
 
 import gym
 import numpy as np
 from loguru import logger
 
-from neat_core.optimizer.challenge import Challenge
+from neat_core.optimizer.batch_challenge import BatchChallenge
 from neural_network.neural_network_interface import NeuralNetworkInterface
+from neural_network.population_network import PopulationNetwork
+from utils.environment.vectorized_mountain_car import VectorizedMountainCar
 
 
-class ChallengeMountainCar(Challenge):
+class ChallengeMountainCar(BatchChallenge):
 
     def __init__(self) -> None:
         self.env = None
@@ -76,5 +78,32 @@ class ChallengeMountainCar(Challenge):
                                         "fitness_values": fitness_values,
                                         "solved_rounds": solved_rounds}
 
+    def evaluate_population(self, population_network: PopulationNetwork, **kwargs) \
+            -> List[Tuple[float, Dict[str, object]]]:
+        max_episodes = 200
+
+        # Every agent starts in the same state like in the single evaluation, which seeds the environment before
+        environment = VectorizedMountainCar(population_network.amount_genomes, max_episode_steps=max_episodes)
+        environment.seed(1111)
+        observations = environment.reset()
+        population_network.reset()
+
+        fitness_values = np.full(population_network.amount_genomes, 1.3 + max_episodes)
+        max_x_progress = observations[:, 0].copy()
+        while not np.all(environment.dones):
+            actions = population_network.activate(observations[:, np.newaxis, :])[:, 0]
+            observations, rewards, _ = environment.step(np.argmax(actions, axis=1))
+
+            # Positions of done environments don't change anymore
+            fitness_values += rewards
+            max_x_progress = np.maximum(max_x_progress, observations[:, 0])
+
+        fitness_values += max_x_progress
+        return [(float(fitness) ** 2, {"solved": bool(fitness >= 90),
+                                       "max_x": [float(max_x)],
+                                       "fitness_values": [float(fitness)],
+                                       "solved_rounds": [bool(fitness >= 90)]})
+                for fitness, max_x in zip(fitness_values, max_x_progress)]
+
     def clean_up(self, **kwargs):
         self.env.close()
@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, List, Tuple
 
 import gym
 import numpy as np
@@ -6,11 +6,13 @@ from gym import wrappers
 from loguru import logger
 from pyvirtualdisplay import Display
 
-from neat_core.optimizer.challenge import Challenge
+from neat_core.optimizer.batch_challenge import BatchChallenge
 from neural_network.neural_network_interface import NeuralNetworkInterface
+from neural_network.population_network import PopulationNetwork
+from utils.environment.vectorized_cart_pole import VectorizedCartPole
 
 
-class PoleBalancingChallenge(Challenge):
+class PoleBalancingChallenge(BatchChallenge):
 
     def __init__(self) -> None:
         # https://github.com/openai/gym/wiki/CartPole-v0
@@ -37,22 +39,20 @@ class PoleBalancingChallenge(Challenge):
         max_episodes = 500
         amount_runs = 1
 
-        for _ in range(amount_runs):
-            self.before_evaluation()
-            done = False
-            fitness = 0
-            while not done:
-                action = neural_network.activate(self.observation)
-                index = np.argmax(action)
-
-                # Take action
-                self.observation, reward, done, info = self.env.step(index)
+        def step_and_render(index: int):
+            step_result = self.env.step(index)
+            self.env.render()
+            return step_result
 
-                # Render environment only if it is specifically requested
-                if kwargs.get("record", False) or kwargs.get("show", False):
-                    self.env.render()
+        # Render environment only if it is specifically requested
+        render = kwargs.get("record", False) or kwargs.get("show", False)
+        step = step_and_render if render else self.env.step
 
-                fitness += reward
+        for _ in range(amount_runs):
+            self.before_evaluation()
+            rollout = neural_network.rollout(step, self.observation, max_episodes)
+            self.observation = rollout.final_observation
+            fitness = rollout.total_reward
 
             solved = fitness >= max_episodes
             fitness_values.append(fitness)
@@ -61,6 +61,25 @@ class PoleBalancingChallenge(Challenge):
         return sum(fitness_values) ** 2, {"solved": all(solved_rounds), "steps": fitness_values,
                                           "solved_rounds": solved_rounds}
 
+    def evaluate_population(self, population_network: PopulationNetwork, **kwargs) \
+            -> List[Tuple[float, Dict[str, object]]]:
+        max_episodes = 500
+
+        # Step the environments of all agents together, done environments are not stepped anymore
+        environment = VectorizedCartPole(population_network.amount_genomes, max_episode_steps=max_episodes)
+        observations = environment.reset()
+        population_network.reset()
+
+        fitness_values = np.zeros(population_network.amount_genomes)
+        while not np.all(environment.dones):
+            actions = population_network.activate(observations[:, np.newaxis, :])[:, 0]
+            observations, rewards, _ = environment.step(np.argmax(actions, axis=1))
+            fitness_values += rewards
+
+        return [(float(fitness) ** 2, {"solved": bool(fitness >= max_episodes), "steps": [float(fitness)],
+                                       "solved_rounds": [bool(fitness >= max_episodes)]})
+                for fitness in fitness_values]
+
     def clean_up(self, **kwargs):
         self.env.close()
 
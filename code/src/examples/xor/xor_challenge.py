@@ -1,12 +1,14 @@
-from typing import Dict
+from typing import Dict, List, Tuple
 
+import numpy as np
 from loguru import logger
 
-from neat_core.optimizer.challenge import Challenge
+from neat_core.optimizer.batch_challenge import BatchChallenge
 from neural_network.neural_network_interface import NeuralNetworkInterface
+from neural_network.population_network import PopulationNetwork
 
 
-class ChallengeXOR(Challenge):
+class ChallengeXOR(BatchChallenge):
     xor_tuples = [
         [0, 0, 0],
         [1, 0, 1],
@@ -43,3 +45,25 @@ class ChallengeXOR(Challenge):
         fitness_val = fitness_val ** 2
 
         return fitness_val, {"solved": solved}
+
+    def evaluate_population(self, population_network: PopulationNetwork, **kwargs) \
+            -> List[Tuple[float, Dict[str, object]]]:
+        xor_array = np.array(ChallengeXOR.xor_tuples, dtype=np.float64)
+
+        # The xor inputs are activated one after another like in the single evaluation, so recurrent connections see
+        # the same values. Every activation calculates all networks at once, result shape (genomes, xor inputs)
+        result = np.concatenate([population_network.activate(xor_input[np.newaxis, :2])[:, :, 0]
+                                 for xor_input in xor_array], axis=1)
+        result = (1 + result) / 2
+        difference = np.abs(xor_array[:, 2] - result)
+
+        # Remove the differences in the same order as the single evaluation
+        fitness_values = np.full(population_network.amount_genomes, 4.0)
+        for i in range(len(ChallengeXOR.xor_tuples)):
+            fitness_values -= difference[:, i]
+
+        # Remaining fitness value is squared, solved if every difference is smaller than 0.5
+        fitness_values = fitness_values ** 2
+        solved = np.all(difference < 0.5, axis=1)
+
+        return [(float(fitness), {"solved": bool(s)}) for fitness, s in zip(fitness_values, solved)]
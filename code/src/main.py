@@ -4,7 +4,6 @@ import time
 
 import numpy as np
 from loguru import logger
-from mpi4py import MPI
 
 from examples.breakout.breakout import BreakoutOptimizer
 from examples.lunar_lander.lunar_lander import LunarLanderOptimizer
@@ -12,7 +11,7 @@ from examples.mountain_car.mountain_car import MountainCarOptimizer
 from examples.pendulum.pendulum import PendulumOptimizer
 from examples.pole_balancing.pole_balancing import PoleBalancingOptimizer
 from examples.xor.xor_evaluation import XOROptimizer
-from neat_mpi.neat_optimizer_mpi import NeatOptimizerMPI
+from neat_multiprocess.neat_optimizer_multiprocess import NeatOptimizerMultiprocess
 from neat_single_core.neat_optimizer_single_core import NeatOptimizerSingleCore
 
 logger.remove()
@@ -84,7 +83,9 @@ parser.add_argument('challenge', type=str, help="Select one example challenge, t
                     choices=challenge_dict.keys())
 parser.add_argument("-s", metavar="--seed", type=int, help="Seed for the evaluation")
 parser.add_argument("-r", metavar="--repeat", type=int, default=1, help="Run the same challenge multiple times")
-parser.add_argument("-o", metavar="--optimizer", type=str, default="single", choices=["single", "mpi"])
+parser.add_argument("-o", metavar="--optimizer", type=str, default="single",
+                    choices=["single", "process", "process_steady_state", "mpi", "mpi_guided", "mpi_steady_state",
+                             "mpi_speciation", "mpi_collective", "mpi_collective_reproduction"])
 
 args = parser.parse_args()
 
@@ -93,12 +94,20 @@ seed = args.s
 amount_runs = args.r
 optimizer_type = args.o
 
-comm = MPI.COMM_WORLD
-rank = comm.Get_rank()
+# MPI is only required, if the MPI optimizer is selected
+if optimizer_type in ["mpi", "mpi_guided", "mpi_steady_state", "mpi_speciation"]:
+    from mpi4py import MPI
+    from neat_mpi.neat_optimizer_mpi import NeatOptimizerMPI
 
-if rank != 0:
-    main_worker()
-    logger.info("Worker with rank {} completed main", rank)
+    comm = MPI.COMM_WORLD
+    rank = comm.Get_rank()
+
+    if rank != 0:
+        main_worker()
+        logger.info("Worker with rank {} completed main", rank)
+elif optimizer_type in ["mpi_collective", "mpi_collective_reproduction"]:
+    # All ranks run the main part, the workers wait in the optimizer for the generations of the master
+    from neat_mpi.neat_optimizer_mpi_collective import NeatOptimizerMPICollective
 
 if __name__ == '__main__':
     # Run specified challenge
@@ -116,8 +125,22 @@ if __name__ == '__main__':
         # Get the selected optimizer
         if optimizer_type == "single":
             optimizer = NeatOptimizerSingleCore()
+        elif optimizer_type == "process":
+            optimizer = NeatOptimizerMultiprocess()
+        elif optimizer_type == "process_steady_state":
+            optimizer = NeatOptimizerMultiprocess(mode="steady_state")
         elif optimizer_type == "mpi":
             optimizer = NeatOptimizerMPI()
+        elif optimizer_type == "mpi_guided":
+            optimizer = NeatOptimizerMPI(scheduling="guided")
+        elif optimizer_type == "mpi_steady_state":
+            optimizer = NeatOptimizerMPI(mode="steady_state")
+        elif optimizer_type == "mpi_speciation":
+            optimizer = NeatOptimizerMPI(speciation="distributed")
+        elif optimizer_type == "mpi_collective":
+            optimizer = NeatOptimizerMPICollective()
+        elif optimizer_type == "mpi_collective_reproduction":
+            optimizer = NeatOptimizerMPICollective(reproduction="distributed")
         else:
             logger.info("Invalid Optimizer, Canceling")
             exit(-1)
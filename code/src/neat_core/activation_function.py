@@ -1,4 +1,11 @@
 import math
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# The vectorized functions use np.exp and np.tanh, which are rounded differently than math.exp and math.tanh. So their
+# results can differ from the scalar functions by a few units in the last place, at most by this absolute tolerance
+VECTORIZED_TOLERANCE: float = 1e-15
 
 
 def modified_sigmoid_activation(x: float) -> float:
@@ -54,3 +61,135 @@ def relu_activation(x: float) -> float:
     :return: the result of the activation function. Is either 0 or x
     """
     return x if x > 0.0 else 0.0
+
+
+def modified_sigmoid_activation_vectorized(x: np.ndarray) -> np.ndarray:
+    """
+    The modified sigmoid function for whole arrays, see modified_sigmoid_activation. The results are equal up to
+    VECTORIZED_TOLERANCE
+    :param x: the input values
+    :return: the results of the activation function, same shape as x
+    """
+    # Large inputs result in exactly 1 without clipping, the lower bound prevents an overflow of exp
+    return np.where(x <= -100, 0.0, 1 / (1 + np.exp(-4.9 * np.maximum(x, -100))))
+
+
+def step_activation_vectorized(x: np.ndarray) -> np.ndarray:
+    """
+    The step function for whole arrays, see step_activation
+    :param x: the input values
+    :return: the results of the activation function, same shape as x
+    """
+    return np.where(x > 0.0, 1.0, 0.0)
+
+
+def sigmoid_activation_vectorized(x: np.ndarray) -> np.ndarray:
+    """
+    The sigmoid function for whole arrays, see sigmoid_activation. The results are equal up to VECTORIZED_TOLERANCE
+    :param x: the input values
+    :return: the results of the activation function, same shape as x
+    """
+    return np.where(x <= -100, 0.0, 1.0 / (1.0 + np.exp(-np.maximum(x, -100))))
+
+
+def relu_activation_vectorized(x: np.ndarray) -> np.ndarray:
+    """
+    The rectified linear function for whole arrays, see relu_activation
+    :param x: the input values
+    :return: the results of the activation function, same shape as x
+    """
+    return np.where(x > 0.0, x, 0.0)
+
+
+# Registry of the activation functions. The id of a function is its index in the lists. The ids are used to encode
+# genomes and to pickle nodes, so the ids of the registered functions must never change
+_activation_functions: List[Callable[[float], float]] = []
+_vectorized_activation_functions: List[Callable[[np.ndarray], np.ndarray]] = []
+_activation_function_ids: Dict[Callable[[float], float], int] = {}
+
+
+def register_activation_function(activation_function: Callable[[float], float],
+                                 vectorized_activation_function: Callable[[np.ndarray], np.ndarray] = None) -> int:
+    """
+    Register an activation function, so it can be encoded, pickled by its id and applied to whole arrays. All processes
+    must register the same functions in the same order, e.g. when the module of the function is imported.
+    :param activation_function: the scalar activation function
+    :param vectorized_activation_function: the same function for numpy arrays. If None, the scalar function is
+    vectorized element wise
+    :return: the id of the function. A function, that is already registered, keeps its id
+    """
+    if activation_function in _activation_function_ids:
+        return _activation_function_ids[activation_function]
+
+    assert len(_activation_functions) < 256, "Too many activation functions, the ids are encoded with 8 bits"
+    if vectorized_activation_function is None:
+        vectorized_activation_function = np.vectorize(activation_function, otypes=[np.float64])
+
+    function_id = len(_activation_functions)
+    _activation_functions.append(activation_function)
+    _vectorized_activation_functions.append(vectorized_activation_function)
+    _activation_function_ids[activation_function] = function_id
+    return function_id
+
+
+def is_registered(activation_function: Callable[[float], float]) -> bool:
+    """
+    :param activation_function: the scalar activation function
+    :return: true, if the activation function is registered
+    """
+    return activation_function in _activation_function_ids
+
+
+def find_activation_function_id(activation_function: Callable[[float], float]) -> Optional[int]:
+    """
+    :param activation_function: the scalar activation function
+    :return: the id of the function, or None if the function is not registered
+    """
+    return _activation_function_ids.get(activation_function)
+
+
+def get_activation_function_id(activation_function: Callable[[float], float]) -> int:
+    """
+    Get the id of a registered activation function
+    :param activation_function: the scalar activation function
+    :return: the id of the function
+    """
+    assert activation_function in _activation_function_ids, \
+        "Unknown activation function {}, it must be registered".format(activation_function)
+    return _activation_function_ids[activation_function]
+
+
+def get_activation_function(function_id: int) -> Callable[[float], float]:
+    """
+    :param function_id: the id of a registered activation function
+    :return: the scalar activation function
+    """
+    return _activation_functions[function_id]
+
+
+def get_amount_activation_functions() -> int:
+    """
+    :return: the amount of registered activation functions, the ids are smaller than this amount
+    """
+    return len(_activation_functions)
+
+
+def get_vectorized_activation_function(activation_function: Callable[[float], float]) \
+        -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Get a version of the activation function, that can be applied to a whole array
+    :param activation_function: the scalar activation function
+    :return: the registered function for numpy arrays, unknown functions are vectorized element wise
+    """
+    if activation_function in _activation_function_ids:
+        return _vectorized_activation_functions[_activation_function_ids[activation_function]]
+    return np.vectorize(activation_function, otypes=[np.float64])
+
+
+# The built-in functions, in the order of their ids
+register_activation_function(modified_sigmoid_activation, modified_sigmoid_activation_vectorized)
+register_activation_function(step_activation, step_activation_vectorized)
+register_activation_function(sigmoid_activation, sigmoid_activation_vectorized)
+# np.tanh is equal to tanh_activation up to VECTORIZED_TOLERANCE
+register_activation_function(tanh_activation, np.tanh)
+register_activation_function(relu_activation, relu_activation_vectorized)
@@ -1,10 +1,12 @@
 from typing import Dict
 
 from neat_core.models.genome import Genome
+from neat_core.models.slotted_model import SlottedModel
 from neural_network.neural_network_interface import NeuralNetworkInterface
 
 
-class Agent(object):
+class Agent(SlottedModel):
+    __slots__ = ("id", "genome", "neural_network", "fitness", "adjusted_fitness", "additional_info")
 
     def __init__(self, id_: int, genome: Genome) -> None:
         self.id = id_
@@ -1,7 +1,10 @@
 from typing import Union
 
+from neat_core.models.slotted_model import SlottedModel
 
-class Connection(object):
+
+class Connection(SlottedModel):
+    __slots__ = ("innovation_number", "input_node", "output_node", "weight", "enabled")
 
     def __init__(self, innovation_number: Union[int, str], input_node: Union[int, str], output_node: Union[int, str],
                  weight: float, enabled: bool) -> None:
@@ -0,0 +1,85 @@
+from typing import List, Optional
+
+from neat_core.models.genome import Genome
+from neat_core.optimizer.neat_config import NeatConfig
+from utils.cache.fingerprint import Fingerprint
+from utils.cache.lru_cache import LRUCache
+
+
+class DistanceCache(object):
+
+    def __init__(self, max_size: int) -> None:
+        """
+        Cache for the genetic distances between genomes with the same genes. Children of the same parents get the same
+        seed, so many children and their comparisons with the representatives are repeated in a generation. The gene
+        objects of these children are different, so the genomes are identified by the values of their genes. The cache
+        is owned by the optimizer.
+        :param max_size: the maximum amount of cached distances, 0 disables the cache
+        """
+        self.distances: LRUCache = LRUCache(max_size)
+
+    def is_enabled(self) -> bool:
+        """
+        :return: true, if distances are cached
+        """
+        return self.distances.max_size > 0
+
+    @staticmethod
+    def create_fingerprint(genome: Genome) -> Fingerprint:
+        """
+        Create a fingerprint of the genes, that are used for the genetic distance: the innovation numbers and biases of
+        the nodes and the innovation numbers and weights of the connections in the order of the genome. The fingerprint
+        should be created once per genome and speciation, because it is compared with many other genomes.
+        :param genome: the genome
+        :return: the fingerprint
+        """
+        return Fingerprint((tuple([node.innovation_number for node in genome.nodes]),
+                                   tuple([node.bias for node in genome.nodes]),
+                                   tuple([connection.innovation_number for connection in genome.connections]),
+                                   tuple([connection.weight for connection in genome.connections])))
+
+    @staticmethod
+    def _create_keys(fingerprint: Fingerprint, other_fingerprints: List[Fingerprint],
+                     config: NeatConfig) -> List:
+        """
+        Create the keys of the distances. The compatibility factors are part of the key, so a changed config doesn't use
+        the old distances.
+        :param fingerprint: the fingerprint of the first genome
+        :param other_fingerprints: the fingerprints of the second genomes
+        :param config: the config that specifies the compatibility functions
+        :return: the keys in the order of the other fingerprints
+        """
+        factors = (config.compatibility_factor_disjoint_genes, config.compatibility_factor_matching_genes,
+                   config.compatibility_genome_size_threshold)
+        return [(fingerprint, other_fingerprint, factors) for other_fingerprint in other_fingerprints]
+
+    def get_distances(self, fingerprint: Fingerprint, other_fingerprints: List[Fingerprint],
+                      config: NeatConfig) -> Optional[List[float]]:
+        """
+        Get the cached distances between one genome and the other genomes. The lookup stops at the first missing
+        distance, because the distances are calculated together.
+        :param fingerprint: the fingerprint of the first genome
+        :param other_fingerprints: the fingerprints of the second genomes
+        :param config: the config that specifies the compatibility functions
+        :return: the distances, or None if one of them is not cached
+        """
+        distances = []
+        for key in self._create_keys(fingerprint, other_fingerprints, config):
+            distance = self.distances.get(key)
+            if distance is None:
+                return None
+            distances.append(distance)
+        return distances
+
+    def put_distances(self, fingerprint: Fingerprint, other_fingerprints: List[Fingerprint],
+                      config: NeatConfig, distances: List[float]) -> None:
+        """
+        Store the calculated distances between one genome and the other genomes
+        :param fingerprint: the fingerprint of the first genome
+        :param other_fingerprints: the fingerprints of the second genomes
+        :param config: the config that specifies the compatibility functions
+        :param distances: the distances in the order of the other fingerprints
+        :return: None
+        """
+        for key, distance in zip(self._create_keys(fingerprint, other_fingerprints, config), distances):
+            self.distances.put(key, distance)
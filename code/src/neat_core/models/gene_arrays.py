@@ -0,0 +1,23 @@
+import numpy as np
+
+
+class GeneArrays(object):
+
+    def __init__(self, keys: np.ndarray, values: np.ndarray, amount_nodes: int, amount_connections: int) -> None:
+        """
+        The nodes and connections of a genome as arrays, that are used to calculate the genetic distance. Every gene has
+        a unique key (2 * innovation number for nodes and 2 * innovation number + 1 for connections) and a value (the
+        bias of nodes and the weight of connections). The genes are stored in the order of the genome (nodes first) and
+        additionally sorted by their key, so the genes of two genomes can be matched with a binary search.
+        :param keys: the keys of the genes in the order of the genome
+        :param values: the values of the genes in the order of the genome
+        :param amount_nodes: the amount of nodes in the genome
+        :param amount_connections: the amount of connections in the genome
+        """
+        self.keys: np.ndarray = keys
+        self.values: np.ndarray = values
+        self.amount_genes: np.ndarray = np.array([amount_nodes, amount_connections], dtype=np.int64)
+
+        sorted_indices = np.argsort(keys, kind="stable")
+        self.sorted_keys: np.ndarray = keys[sorted_indices]
+        self.sorted_values: np.ndarray = values[sorted_indices]
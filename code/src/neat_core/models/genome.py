@@ -1,21 +1,42 @@
-from typing import List
+from typing import Dict, List, Tuple, Union
 
 from .connection import Connection
 from .node import Node
+from .slotted_model import SlottedModel
 
 
-class Genome(object):
+class Genome(SlottedModel):
+    __slots__ = ("seed", "nodes", "connections", "index")
 
-    def __init__(self, seed: int, nodes: List[Node] = [], connections: List[Connection] = []) -> None:
+    def __init__(self, seed: int, nodes: List[Node] = None, connections: List[Connection] = None) -> None:
         """
         Create a genome, that encodes all information for a neural network
         :param seed:
-        :param nodes:
-        :param connections:
+        :param nodes: the nodes of the genome, an empty list if not set
+        :param connections: the connections of the genome, an empty list if not set
         """
         self.seed: int = seed
-        self.nodes: List[Node] = nodes
-        self.connections: List[Connection] = connections
+        self.nodes: List[Node] = [] if nodes is None else nodes
+        self.connections: List[Connection] = [] if connections is None else connections
 
         # Maybe use numpy random state to pass state between objects
         # https://stackoverflow.com/questions/32172054/how-can-i-retrieve-the-current-seed-of-numpys-random-number-generator
+
+        # The GenomeIndex of the structural mutations, created by genome_index.get_genome_index. It is not pickled
+        self.index = None
+
+    def __getstate__(self) -> Tuple:
+        """
+        Get the values of the slots for pickling, without the index
+        :return: the seed, the nodes and the connections
+        """
+        return self.seed, self.nodes, self.connections
+
+    def __setstate__(self, state: Union[Tuple, Dict[str, object]]) -> None:
+        """
+        Restore the values of the slots after unpickling, the index is created again when it is required
+        :param state: the values in the order of the slots or a dict with the attributes
+        :return: None
+        """
+        super().__setstate__(state)
+        self.index = None
@@ -0,0 +1,171 @@
+from bisect import bisect_right
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from .connection import Connection
+from .genome import Genome
+from .node import Node, NodeType
+
+
+class GenomeIndex(object):
+
+    def __init__(self, genome: Genome, template: "GenomeIndex" = None) -> None:
+        """
+        Indexes of a genome for the structural mutations: the nodes by innovation number, the existing connections as
+        set of (input node, output node) and the nodes sorted by their x position. The indexes are built on the first
+        access, so a genome without structural mutation does not pay for them. Nodes and connections, that are added
+        later, must be registered with add_node and add_connection. The index only uses the innovation numbers, types,
+        x positions and activation functions of the nodes, which are not changed by the mutations of the values.
+        :param genome: the indexed genome
+        :param template: the index of a genome with the same node innovation numbers in the same order and the same
+        connections, e.g. the more fit parent of a cross over. The index is derived from the template without sorting
+        the nodes again
+        """
+        self.genome: Genome = genome
+        self._built: bool = False
+
+        # An index without a structural mutation has the structure of its own template, so the templates don't form
+        # chains and only the built index of the last structural mutation is kept
+        if template is not None and not template._built:
+            template = template._template
+        self._template: Optional[GenomeIndex] = template
+
+        self._nodes: Dict[Union[int, str], Node] = {}
+        self._edges: Set[Tuple[Union[int, str], Union[int, str]]] = set()
+        self._sorted_nodes: List[Node] = []
+        self._sorted_x_positions: List[float] = []
+        self._sorted_hidden_output_nodes: List[Node] = []
+        self._sorted_hidden_output_x_positions: List[float] = []
+
+    def get_node(self, innovation_number: Union[int, str]) -> Node:
+        """
+        Get the first node of the genome with the given innovation number
+        :param innovation_number: the innovation number of the node
+        :return: the node
+        """
+        self._build()
+        return self._nodes[innovation_number]
+
+    def has_connection(self, input_node: Union[int, str], output_node: Union[int, str]) -> bool:
+        """
+        Check if the genome contains a connection (enabled or disabled) between the given nodes
+        :param input_node: the innovation number of the input node
+        :param output_node: the innovation number of the output node
+        :return: true, if the connection exists
+        """
+        self._build()
+        return (input_node, output_node) in self._edges
+
+    def get_sorted_nodes(self) -> List[Node]:
+        """
+        :return: all nodes sorted by their x position, nodes with the same position stay in the order of the genome
+        """
+        self._build()
+        return self._sorted_nodes
+
+    def get_sorted_hidden_output_nodes(self) -> List[Node]:
+        """
+        :return: the hidden and output nodes sorted by their x position, like get_sorted_nodes
+        """
+        self._build()
+        return self._sorted_hidden_output_nodes
+
+    def get_first_hidden_output_node_after(self, x_position: float) -> int:
+        """
+        Get the position of the first hidden or output node with a larger x position in the sorted hidden and output
+        nodes. All following nodes have also a larger x position
+        :param x_position: the x position
+        :return: the index in get_sorted_hidden_output_nodes
+        """
+        self._build()
+        return bisect_right(self._sorted_hidden_output_x_positions, x_position)
+
+    def add_node(self, node: Node) -> None:
+        """
+        Register a node, that was appended to the nodes of the genome
+        :param node: the new node
+        :return: None
+        """
+        if not self._built:
+            return
+
+        self._nodes.setdefault(node.innovation_number, node)
+        # The node is the last one in the genome, so it is placed after the nodes with the same x position
+        position = bisect_right(self._sorted_x_positions, node.x_position)
+        self._sorted_nodes.insert(position, node)
+        self._sorted_x_positions.insert(position, node.x_position)
+
+        if node.node_type != NodeType.INPUT:
+            position = bisect_right(self._sorted_hidden_output_x_positions, node.x_position)
+            self._sorted_hidden_output_nodes.insert(position, node)
+            self._sorted_hidden_output_x_positions.insert(position, node.x_position)
+
+    def add_connection(self, connection: Connection) -> None:
+        """
+        Register a connection, that was added to the genome
+        :param connection: the new connection
+        :return: None
+        """
+        if self._built:
+            self._edges.add((connection.input_node, connection.output_node))
+
+    def _build(self) -> None:
+        if self._built:
+            return
+
+        # The first node with an innovation number is used, like in a linear search
+        for node in reversed(self.genome.nodes):
+            self._nodes[node.innovation_number] = node
+
+        if not self._build_from_template():
+            self._edges = {(connection.input_node, connection.output_node) for connection in self.genome.connections}
+
+            # The sort is stable, so nodes with the same position keep the order of the genome
+            self._sorted_nodes = sorted(self.genome.nodes, key=lambda node: node.x_position)
+            self._sorted_x_positions = [node.x_position for node in self._sorted_nodes]
+            self._sorted_hidden_output_nodes = [node for node in self._sorted_nodes if node.node_type != NodeType.INPUT]
+            self._sorted_hidden_output_x_positions = [node.x_position for node in self._sorted_hidden_output_nodes]
+
+        self._template = None
+        self._built = True
+
+    def _build_from_template(self) -> bool:
+        """
+        Replace the nodes in the sorted lists of the template with the nodes of the genome, that have the same
+        innovation numbers. Genes with the same innovation number connect the same nodes, like in the cross over, so
+        the connections are taken from the template. The x positions are checked, because they determine the order.
+        :return: true, if the index could be derived from the template
+        """
+        template = self._template
+        if template is None or len(self._nodes) != len(self.genome.nodes) or \
+                len(template._sorted_nodes) != len(self.genome.nodes):
+            return False
+
+        try:
+            sorted_nodes = [self._nodes[node.innovation_number] for node in template._sorted_nodes]
+            sorted_hidden_output_nodes = [self._nodes[node.innovation_number]
+                                          for node in template._sorted_hidden_output_nodes]
+        except KeyError:
+            return False
+
+        sorted_x_positions = [node.x_position for node in sorted_nodes]
+        if sorted_x_positions != template._sorted_x_positions or \
+                len(self.genome.connections) != len(template.genome.connections):
+            return False
+
+        self._edges = set(template._edges)
+        self._sorted_nodes = sorted_nodes
+        self._sorted_x_positions = sorted_x_positions
+        self._sorted_hidden_output_nodes = sorted_hidden_output_nodes
+        self._sorted_hidden_output_x_positions = list(template._sorted_hidden_output_x_positions)
+        return True
+
+
+def get_genome_index(genome: Genome) -> GenomeIndex:
+    """
+    Get the index, that is stored in the genome, or create it
+    :param genome: the genome
+    :return: the index of the genome
+    """
+    if genome.index is None:
+        genome.index = GenomeIndex(genome)
+    return genome.index
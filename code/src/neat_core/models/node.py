@@ -1,7 +1,10 @@
 from enum import Enum
-from typing import Callable
+from typing import Callable, Dict, Tuple
 from typing import Union
 
+from neat_core import activation_function as af
+from neat_core.models.slotted_model import SlottedModel
+
 
 class NodeType(Enum):
     INPUT = 1
@@ -9,7 +12,8 @@ class NodeType(Enum):
     OUTPUT = 3
 
 
-class Node(object):
+class Node(SlottedModel):
+    __slots__ = ("innovation_number", "node_type", "bias", "activation_function", "x_position")
 
     def __init__(self, innovation_number: Union[int, str], type_: NodeType, bias: float,
                  activation_function: Callable[[float], float],
@@ -25,3 +29,25 @@ class Node(object):
         self.bias: float = bias
         self.activation_function: Callable[[float], float] = activation_function
         self.x_position: float = x_position
+
+    def __getstate__(self) -> Tuple:
+        """
+        Get the values of the slots for pickling. Registered activation functions are stored by their id, which is
+        smaller than the reference to the function.
+        :return: the values in the order of the slots
+        """
+        function_id = af.find_activation_function_id(self.activation_function)
+        if function_id is None:
+            return super().__getstate__()
+        return self.innovation_number, self.node_type, self.bias, function_id, self.x_position
+
+    def __setstate__(self, state: Union[Tuple, Dict[str, object]]) -> None:
+        """
+        Restore the values of the slots after unpickling. Nodes, that were pickled before the registry of the
+        activation functions existed, store the function itself.
+        :param state: the values in the order of the slots or a dict with the attributes
+        :return: None
+        """
+        super().__setstate__(state)
+        if isinstance(self.activation_function, int):
+            self.activation_function = af.get_activation_function(self.activation_function)
@@ -0,0 +1,28 @@
+from typing import Dict, Tuple, Union
+
+
+class SlottedModel(object):
+    __slots__ = ()
+
+    def __getstate__(self) -> Tuple:
+        """
+        Get the values of the slots for pickling. The values are stored without the attribute names to keep the pickled
+        objects small.
+        :return: the values in the order of the slots
+        """
+        return tuple([getattr(self, name) for name in self.__slots__])
+
+    def __setstate__(self, state: Union[Tuple, Dict[str, object]]) -> None:
+        """
+        Restore the values of the slots after unpickling
+        :param state: the values in the order of the slots, or a dict with the attributes for objects, that were pickled
+        before the models used slots (e.g. the trained models)
+        :return: None
+        """
+        if isinstance(state, dict):
+            items = [(name, value) for name, value in state.items() if name in self.__slots__]
+        else:
+            items = zip(self.__slots__, state)
+
+        for name, value in items:
+            setattr(self, name, value)
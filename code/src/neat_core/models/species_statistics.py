@@ -0,0 +1,18 @@
+from typing import List
+
+from neat_core.models.agent import Agent
+
+
+class SpeciesStatistics(object):
+
+    def __init__(self, best_agent: Agent, mean_fitness: float, sorted_members: List[Agent]) -> None:
+        """
+        The fitness values of a species, that are required for the reproduction. They can be calculated as soon as all
+        members of the species are evaluated.
+        :param best_agent: the first member with the highest fitness
+        :param mean_fitness: the mean fitness of the members
+        :param sorted_members: the members sorted by their fitness in ascending order
+        """
+        self.best_agent: Agent = best_agent
+        self.mean_fitness: float = mean_fitness
+        self.sorted_members: List[Agent] = sorted_members
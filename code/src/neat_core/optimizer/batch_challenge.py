@@ -0,0 +1,69 @@
+from abc import abstractmethod
+from typing import Dict, List, Tuple
+
+from loguru import logger
+
+from neat_core.optimizer.challenge import Challenge
+from neat_core.optimizer.neat_config import NeatConfig
+from neural_network.population_network import PopulationNetwork
+
+
+class BatchChallenge(Challenge):
+
+    def before_evaluation(self, **kwargs) -> None:
+        """
+        Prepare the evaluation. If the population is evaluated at once, this is only called once before the population
+        network is evaluated.
+        :return: None
+        """
+        pass
+
+    @abstractmethod
+    def evaluate_population(self, population_network: PopulationNetwork, **kwargs) \
+            -> List[Tuple[float, Dict[str, object]]]:
+        """
+        Evaluate the neural networks of a whole population at once.
+        :param population_network: the built population network, with one network for each agent
+        :return: a list with the fitness value and a dictionary with additional info for every agent. The order matches
+        the order of the genomes in the population network
+        """
+        pass
+
+    def after_evaluation(self, **kwargs) -> None:
+        """
+        Finish the evaluation. If the population is evaluated at once, this is only called once after the population
+        network is evaluated.
+        :return: None
+        """
+        pass
+
+
+def use_batch_evaluation(challenge: Challenge, config: NeatConfig) -> bool:
+    """
+    Check if the whole population is evaluated at once with a population network
+    :param challenge: the challenge of the evaluation
+    :param config: the neat config
+    :return: true, if the challenge is a batch challenge and the batch evaluation is enabled in the config
+    """
+    return config.batch_evaluation and isinstance(challenge, BatchChallenge)
+
+
+def warn_ignored_settings(challenge: Challenge, config: NeatConfig) -> None:
+    """
+    Log a warning, if the batch evaluation ignores settings of the config. The population network is always built from
+    the genomes, so the neural network type and the network cache are not used.
+    :param challenge: the challenge of the evaluation
+    :param config: the neat config
+    :return: None
+    """
+    if not use_batch_evaluation(challenge, config):
+        return
+
+    ignored_settings = []
+    if config.neural_network_type != "basic":
+        ignored_settings.append("neural_network_type")
+    if config.network_cache_size > 0:
+        ignored_settings.append("network_cache_size")
+    if len(ignored_settings) > 0:
+        logger.warning("The batch evaluation of {} ignores the config settings {}. Set batch_evaluation to False to "
+                       "evaluate the agents one by one", type(challenge).__name__, ", ".join(ignored_settings))
@@ -21,6 +21,7 @@ class NeatConfig(object):
                  bias_mutation_type: str = "normal",
                  bias_mutation_uniform_max_change: float = 1,
                  bias_mutation_normal_sigma: float = 1.3,
+                 mutation_mode: str = "scalar",
                  probability_mutate_add_connection: float = 0.05,
                  mutate_connection_tries=5,
                  probability_mutate_add_node: float = 0.03,
@@ -31,7 +32,12 @@ class NeatConfig(object):
                  compatibility_factor_disjoint_genes: float = 1.0,
                  compatibility_factor_matching_genes: float = 0.4,
                  compatibility_genome_size_threshold: int = 0,
-                 compatibility_threshold: float = 3.0
+                 compatibility_threshold: float = 3.0,
+                 compatibility_distance_cache_size: int = 0,
+                 neural_network_type: str = "basic",
+                 network_cache_size: int = 0,
+                 network_cache_results: bool = False,
+                 batch_evaluation: bool = False
                  ) -> None:
         """
         Create a config for the neat reproduction
@@ -55,6 +61,9 @@ class NeatConfig(object):
         :param bias_mutation_type: the type of distribution that is used for bias mutation ("normal" or "uniform")
         :param bias_mutation_uniform_max_change: if type=uniform the max change of the bias (+- the value)
         :param bias_mutation_normal_sigma: if type=normal the sigma value of the normal distribution
+        :param mutation_mode: how the random values for the weight and bias mutation are drawn ("scalar" or
+        "vectorized"). Vectorized draws the values for all genes of a genome at once, which is faster for large genomes,
+        but results in other genomes for the same seed
         :param probability_mutate_add_connection: probability to add a new connection to a genome
         :param mutate_connection_tries: amount of tries to find a connection a new allowed connection
         :param probability_mutate_add_node: probability to add a node to a genome
@@ -66,6 +75,18 @@ class NeatConfig(object):
         :param compatibility_factor_matching_genes: the factor for matching genes in the compatibility function
         :param compatibility_genome_size_threshold: if genome size exceeds this value, the disjoint genes are normalized
         :param compatibility_threshold: the compatibility threshold, for two genomes to be in the same species
+        :param compatibility_distance_cache_size: the amount of genetic distances, that the optimizer caches for
+        genomes with the same genes. 0 disables the cache
+        :param neural_network_type: the neural network that is used to evaluate the genomes ("basic", "compiled",
+        "layered" or "recurrent")
+        :param network_cache_size: the amount of built neural networks, that are cached for unchanged genomes. 0
+        disables the cache
+        :param network_cache_results: true, if the fitness of a cached network should be reused instead of evaluating it
+        again. Only valid for deterministic challenges
+        :param batch_evaluation: true, if batch challenges evaluate the whole population at once with a population
+        network. The population network doesn't use the neural network type and the network cache, and its results can
+        differ slightly from the evaluation one by one (see PopulationNetwork). By default, the agents of batch
+        challenges are evaluated one by one like other challenges
         """
 
         # General params
@@ -97,6 +118,7 @@ class NeatConfig(object):
         self.bias_mutation_type: str = bias_mutation_type
         self.bias_mutation_uniform_max_change: float = bias_mutation_uniform_max_change
         self.bias_mutation_normal_sigma: float = bias_mutation_normal_sigma
+        self.mutation_mode: str = mutation_mode
 
         # Mutate connection
         self.probability_mutate_add_connection: float = probability_mutate_add_connection
@@ -119,3 +141,10 @@ class NeatConfig(object):
         self.compatibility_factor_matching_genes: float = compatibility_factor_matching_genes
         self.compatibility_genome_size_threshold: int = compatibility_genome_size_threshold
         self.compatibility_threshold: float = compatibility_threshold
+        self.compatibility_distance_cache_size: int = compatibility_distance_cache_size
+
+        # Evaluation
+        self.neural_network_type: str = neural_network_type
+        self.network_cache_size: int = network_cache_size
+        self.network_cache_results: bool = network_cache_results
+        self.batch_evaluation: bool = batch_evaluation
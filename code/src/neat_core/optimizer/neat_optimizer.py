@@ -1,11 +1,25 @@
 from abc import ABC
-from typing import List, Callable
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from typing import List, Callable, Dict, Tuple
 
+import numpy as np
+
+from neat_core.models.agent import Agent
+from neat_core.models.distance_cache import DistanceCache
+from neat_core.models.generation import Generation
 from neat_core.models.genome import Genome
+from neat_core.models.species import Species
+from neat_core.models.species_statistics import SpeciesStatistics
 from neat_core.optimizer.challenge import Challenge
+from neat_core.optimizer.generator.agent_id_generator_interface import AgentIDGeneratorInterface
+from neat_core.optimizer.generator.inno_num_generator_interface import InnovationNumberGeneratorInterface
+from neat_core.optimizer.generator.species_id_generator_interface import SpeciesIDGeneratorInterface
 from neat_core.optimizer.neat_config import NeatConfig
 from neat_core.optimizer.neat_optimizer_callback import NeatOptimizerCallback
 from neat_core.optimizer.neat_reporter import NeatReporter
+from neat_core.service import reproduction_service as rp
+from neat_core.service import species_service as ss
+from neat_core.service import steady_state_service as sss
 
 
 class NeatOptimizer(ABC):
@@ -14,6 +28,14 @@ class NeatOptimizer(ABC):
         self.callback: NeatOptimizerCallback = None
         self.reporters: List[NeatReporter] = []
 
+        # Statistics of the species, which members are all evaluated (by species id)
+        self.species_statistics: Dict[int, SpeciesStatistics] = {}
+        self._agent_species: Dict[int, Species] = {}
+        self._remaining_species_members: Dict[int, int] = {}
+
+        # Genetic distances of unchanged genomes, the size is set with the config at the start of an evaluation
+        self.distance_cache: DistanceCache = DistanceCache(0)
+
     def register_callback(self, callback: NeatOptimizerCallback) -> None:
         """
         Register the given callback to receive notifications
@@ -90,3 +112,132 @@ class NeatOptimizer(ABC):
 
         # Notify callback
         func(self.callback)
+
+    def _prepare_species_statistics(self, generation: Generation) -> None:
+        """
+        Prepare the calculation of the species statistics during the evaluation of the generation
+        :param generation: the generation, that will be evaluated
+        :return: None
+        """
+        self.species_statistics = {}
+        self._agent_species = {agent.id: species for species in generation.species_list for agent in species.members}
+        self._remaining_species_members = {species.id_: len(species.members) for species in generation.species_list}
+
+    def _update_species_statistics(self, agent: Agent) -> None:
+        """
+        Register the evaluated agent. The statistics of its species are calculated, when all members are evaluated,
+        so the results can be processed, while the other agents are still evaluated.
+        :param agent: the evaluated agent
+        :return: None
+        """
+        species = self._agent_species.get(agent.id)
+        if species is None:
+            return
+
+        self._remaining_species_members[species.id_] -= 1
+        if self._remaining_species_members[species.id_] == 0:
+            self.species_statistics[species.id_] = ss.calculate_species_statistics(species)
+
+    def _compose_offspring(self, off_spring_pairs: List[Tuple[int, int, int]], agent_dict: Dict[int, Agent],
+                           innovation_number_generator: InnovationNumberGeneratorInterface,
+                           config: NeatConfig) -> List[Agent]:
+        """
+        Create the children with a cross over and mutation of their parents
+        :param off_spring_pairs: the ids of the parents and the id of the child for every child
+        :param agent_dict: the evaluated agents of the current generation by id
+        :param innovation_number_generator: the generator for the innovation numbers of the mutations
+        :param config: the neat config
+        :return: the new agents in the order of the off spring pairs
+        """
+        return [Agent(child_id, rp.compose_offspring_genome(agent_dict[parent1_id], agent_dict[parent2_id],
+                                                            innovation_number_generator, config))
+                for parent1_id, parent2_id, child_id in off_spring_pairs]
+
+    def _evaluation_loop_steady_state(self, generation: Generation,
+                                      innovation_number_generator: InnovationNumberGeneratorInterface,
+                                      species_id_generator: SpeciesIDGeneratorInterface,
+                                      agent_id_generator: AgentIDGeneratorInterface,
+                                      config: NeatConfig, amount_pending_tasks: int,
+                                      submit_genome: Callable[[Genome], Future],
+                                      parse_result: Callable[[Future, Agent], Tuple[float, Dict[str, object]]]) \
+            -> Generation:
+        """
+        Evolve the population in the steady state mode. A new offspring is created for every returned result, so the
+        workers don't wait for the reproduction. A generation is finished, after as many agents as the population size
+        were evaluated.
+        :param generation: the evaluated initial generation
+        :param innovation_number_generator: the generator for the innovation numbers of the mutations
+        :param species_id_generator: the generator for the ids of new species
+        :param agent_id_generator: the generator for the ids of the new agents
+        :param config: the neat config
+        :param amount_pending_tasks: the amount of agents, that are evaluated at the same time
+        :param submit_genome: starts the evaluation of a genome and returns its future
+        :param parse_result: returns the fitness and the additional info from the finished future of the given agent
+        :return: the last generation
+        """
+        current_generation, selection, rnd = self._start_steady_state_generation(generation,
+                                                                                 innovation_number_generator, config)
+        pending_futures = {}
+        submitted_agents = 0
+        evaluated_agents = 0
+        while True:
+            # Keep enough tasks queued, so no worker waits for the next offspring
+            while len(pending_futures) < amount_pending_tasks:
+                agent = sss.create_offspring_agent(current_generation, selection, rnd, innovation_number_generator,
+                                                   agent_id_generator, config)
+                self._notify_reporters_callback(lambda r: r.on_agent_evaluation_start(submitted_agents, agent))
+                pending_futures[submit_genome(agent.genome)] = (submitted_agents, agent)
+                submitted_agents += 1
+
+            done_futures, _ = wait(pending_futures, return_when=FIRST_COMPLETED)
+            # Process the results in the order of the submission
+            for future in sorted(done_futures, key=lambda f: pending_futures[f][0]):
+                # The end of the evaluation is reported with the same index as the start
+                agent_index, agent = pending_futures.pop(future)
+                agent.fitness, agent.additional_info = parse_result(future, agent)
+                self._notify_reporters_callback(lambda r: r.on_agent_evaluation_end(agent_index, agent))
+                sss.replace_worst_agent(current_generation, agent, selection, species_id_generator, config,
+                                        self.distance_cache)
+                evaluated_agents += 1
+                # The remaining results are processed with the next generation
+                if evaluated_agents >= config.population_size:
+                    break
+
+            # A generation is finished, after as many agents as the population size were evaluated
+            if evaluated_agents >= config.population_size:
+                self._notify_reporters_callback(
+                    lambda r: r.on_generation_evaluation_end(current_generation, self.reporters))
+                if self.callback.finish_evaluation(current_generation):
+                    break
+
+                current_generation, selection, rnd = self._start_steady_state_generation(
+                    current_generation, innovation_number_generator, config)
+                submitted_agents, evaluated_agents = 0, 0
+
+        # The agents, that are still evaluated, are not part of the result
+        for future in pending_futures:
+            future.cancel()
+        return current_generation
+
+    def _start_steady_state_generation(self, generation: Generation,
+                                       innovation_number_generator: InnovationNumberGeneratorInterface,
+                                       config: NeatConfig) -> (Generation, List[Species], np.random.RandomState):
+        """
+        Start the next generation of the steady state mode. The offspring are composed during the evaluation, so the
+        reproduction events are only reported to keep the same order of events as in the generational mode. The
+        species for the parent selection are calculated once for the whole generation.
+        :param generation: the evaluated generation
+        :param innovation_number_generator: the innovation number generator, that is notified about the new generation
+        :param config: the neat config
+        :return: the new generation, the species for the parent selection and the random generator for the selection
+        """
+        self._notify_reporters_callback(lambda r: r.on_reproduction_start(generation))
+        innovation_number_generator.next_generation(generation.number)
+        self._notify_reporters_callback(lambda r: r.on_compose_offsprings_start())
+        self._notify_reporters_callback(lambda r: r.on_compose_offsprings_end())
+
+        new_generation, rnd = sss.create_next_generation(generation)
+        selection = sss.create_selection(new_generation, config)
+        self._notify_reporters_callback(lambda r: r.on_reproduction_end(new_generation))
+        self._notify_reporters_callback(lambda r: r.on_generation_evaluation_start(new_generation))
+        return new_generation, selection, rnd
@@ -0,0 +1,101 @@
+from typing import Tuple
+
+import numpy as np
+
+from neat_core import activation_function as af
+from neat_core.models.connection import Connection
+from neat_core.models.genome import Genome
+from neat_core.models.node import Node, NodeType
+
+# Binary layout of a genome: header | nodes | connections. All values are little endian.
+# Innovation numbers are stored as 32 bit integers, weights and positions keep the full precision
+HEADER_DTYPE = np.dtype([("seed", "<i4"), ("amount_nodes", "<u4"), ("amount_connections", "<u4")])
+NODE_DTYPE = np.dtype([("innovation_number", "<u4"), ("node_type", "u1"), ("activation_function", "u1"),
+                       ("bias", "<f8"), ("x_position", "<f8")])
+CONNECTION_DTYPE = np.dtype([("innovation_number", "<u4"), ("input_node", "<u4"), ("output_node", "<u4"),
+                             ("weight", "<f8"), ("enabled", "u1")])
+
+# Genomes without seed are encoded with this value
+_NO_SEED = -1
+
+
+def encode_genome(genome: Genome) -> bytes:
+    """
+    Encode the genome into a compact binary format, that can be sent to other processes
+    :param genome: the genome that should be encoded. Innovation numbers must be integers between 0 and 2^32 - 1,
+    the seed must fit into 32 bits and the activation functions must be registered (see activation_function)
+    :return: the encoded genome
+    """
+    seed = _NO_SEED if genome.seed is None else genome.seed
+    header = np.array([(seed, len(genome.nodes), len(genome.connections))], dtype=HEADER_DTYPE)
+    nodes, connections = genome_to_arrays(genome)
+    return header.tobytes() + nodes.tobytes() + connections.tobytes()
+
+
+def decode_genome_arrays(data: bytes) -> Tuple[int, np.ndarray, np.ndarray]:
+    """
+    Decode the encoded genome into its structured arrays. The arrays are read only views of the given data.
+    :param data: the encoded genome
+    :return: the seed (None if the genome has no seed), the node array (NODE_DTYPE) and the connection array
+    (CONNECTION_DTYPE)
+    """
+    assert len(data) >= HEADER_DTYPE.itemsize, "Invalid size of the encoded genome"
+    header = np.frombuffer(data, dtype=HEADER_DTYPE, count=1)[0]
+    amount_nodes = int(header["amount_nodes"])
+    amount_connections = int(header["amount_connections"])
+
+    nodes_offset = HEADER_DTYPE.itemsize
+    connections_offset = nodes_offset + amount_nodes * NODE_DTYPE.itemsize
+    assert connections_offset + amount_connections * CONNECTION_DTYPE.itemsize == len(data), \
+        "Invalid size of the encoded genome"
+
+    nodes = np.frombuffer(data, dtype=NODE_DTYPE, count=amount_nodes, offset=nodes_offset)
+    connections = np.frombuffer(data, dtype=CONNECTION_DTYPE, count=amount_connections, offset=connections_offset)
+
+    seed = int(header["seed"])
+    return None if seed == _NO_SEED else seed, nodes, connections
+
+
+def decode_genome(data: bytes) -> Genome:
+    """
+    Decode the encoded genome
+    :param data: the encoded genome
+    :return: the decoded genome
+    """
+    seed, nodes, connections = decode_genome_arrays(data)
+    return arrays_to_genome(seed, nodes, connections)
+
+
+def genome_to_arrays(genome: Genome) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert the nodes and connections of the genome into structured arrays
+    :param genome: the genome that should be converted
+    :return: the node array (NODE_DTYPE) and the connection array (CONNECTION_DTYPE)
+    """
+    nodes = np.array([(n.innovation_number, n.node_type.value, _get_activation_function_id(n.activation_function),
+                       n.bias, n.x_position) for n in genome.nodes], dtype=NODE_DTYPE)
+    connections = np.array([(c.innovation_number, c.input_node, c.output_node, c.weight, c.enabled)
+                            for c in genome.connections], dtype=CONNECTION_DTYPE)
+    return nodes, connections
+
+
+def arrays_to_genome(seed: int, nodes: np.ndarray, connections: np.ndarray) -> Genome:
+    """
+    Create a genome from the structured arrays
+    :param seed: the seed of the genome
+    :param nodes: the node array (NODE_DTYPE)
+    :param connections: the connection array (CONNECTION_DTYPE)
+    :return: the created genome
+    """
+    genome_nodes = [Node(innovation_number, NodeType(node_type), bias, af.get_activation_function(activation_id),
+                         x_position)
+                    for innovation_number, node_type, activation_id, bias, x_position in nodes.tolist()]
+    genome_connections = [Connection(innovation_number, input_node, output_node, weight, bool(enabled))
+                          for innovation_number, input_node, output_node, weight, enabled in connections.tolist()]
+    return Genome(seed, genome_nodes, genome_connections)
+
+
+def _get_activation_function_id(activation_function) -> int:
+    assert af.is_registered(activation_function), \
+        "Unknown activation function {}, can't be encoded".format(activation_function)
+    return af.get_activation_function_id(activation_function)
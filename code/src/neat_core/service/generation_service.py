@@ -1,4 +1,4 @@
-from typing import Callable, List
+from typing import Callable, Dict, List
 
 import numpy as np
 
@@ -9,6 +9,7 @@ from neat_core.models.generation import Generation
 from neat_core.models.genome import Genome
 from neat_core.models.node import Node, NodeType
 from neat_core.models.species import Species
+from neat_core.models.species_statistics import SpeciesStatistics
 from neat_core.optimizer.generator.agent_id_generator_interface import AgentIDGeneratorInterface
 from neat_core.optimizer.generator.inno_num_generator_interface import InnovationNumberGeneratorInterface
 from neat_core.optimizer.generator.species_id_generator_interface import SpeciesIDGeneratorInterface
@@ -111,14 +112,14 @@ def _build_generation_from_genome(initial_genome: Genome, species_id_generator:
     :param config: the neat config to specify the weights bounds
     :return: a new initialized generation with number 0, the created agents, and one species
     """
-    # Deep copy genome and set new weights
+    # Copy genome and set new weights, the input nodes are shared by all genomes
     genomes = []
     for _ in range(config.population_size):
         seed = rnd.randint(2 ** 24)
         rnd_generator_genome = np.random.RandomState(seed)
 
         # Copy genome, set new values and save seed
-        copied_genome = rp.deep_copy_genome(initial_genome)
+        copied_genome = rp.copy_genome(initial_genome)
         copied_genome = _randomize_weight_bias(copied_genome, rnd_generator_genome, config)
         copied_genome.seed = seed
         genomes.append(copied_genome)
@@ -164,19 +165,24 @@ def create_genome_structure(amount_input_nodes: int, amount_output_nodes: int, a
     return Genome(seed=None, nodes=input_nodes + output_nodes, connections=connections)
 
 
-def get_best_genomes_from_species(species_list: List[Species], min_species_size) -> List[Genome]:
+def get_best_genomes_from_species(species_list: List[Species], min_species_size,
+                                  species_statistics: Dict[int, SpeciesStatistics] = None) -> List[Genome]:
     """
     Get the best genomes from each species with more members then the given min_species_size. The agent, with the best
     fitness value will be included, even if the species has less members then the given min_species_size
     :param species_list: a list of species, from which the best members should be extraced
     :param min_species_size: the min size if each species, that the best agent will be copied
+    :param species_statistics: precalculated statistics by species id with the best agents, can be None
     :return: a list with the best genomes
     """
     best_generation_agent = None
     best_genomes_list = []
 
     for species in species_list:
-        best_species_agent = fitness_evaluation_utils.get_best_agent(species.members)
+        if species_statistics is not None and species.id_ in species_statistics:
+            best_species_agent = species_statistics[species.id_].best_agent
+        else:
+            best_species_agent = fitness_evaluation_utils.get_best_agent(species.members)
 
         # Check if the species champions is the generation champion
         if best_generation_agent is None or best_generation_agent.fitness < best_species_agent.fitness:
@@ -1,9 +1,11 @@
-from typing import List
+from typing import List, Tuple
 
 import numpy as np
 
+from neat_core.models.agent import Agent
 from neat_core.models.connection import Connection
 from neat_core.models.genome import Genome
+from neat_core.models.genome_index import GenomeIndex, get_genome_index
 from neat_core.models.node import Node, NodeType
 from neat_core.optimizer.generator.inno_num_generator_interface import InnovationNumberGeneratorInterface
 from neat_core.optimizer.neat_config import NeatConfig
@@ -21,6 +23,17 @@ def deep_copy_genome(genome: Genome) -> Genome:
     return Genome(genome.seed, nodes, connections)
 
 
+def copy_genome(genome: Genome) -> Genome:
+    """
+    Copy the given genome, but share the nodes and connections with the original genome. The functions of this module
+    never change a gene in place. A gene is replaced by a modified copy (copy on write), so the genomes stay
+    independent, while unchanged genes are stored only once.
+    :param genome: the genome to be copied
+    :return: the newly created instance
+    """
+    return Genome(genome.seed, list(genome.nodes), list(genome.connections))
+
+
 def deep_copy_node(node: Node) -> Node:
     """
     Make a deep copy of the given node and return the new instance
@@ -40,6 +53,27 @@ def deep_copy_connection(connection: Connection) -> Connection:
                       connection.enabled)
 
 
+def _copy_node_with_bias(node: Node, bias: float) -> Node:
+    """
+    Copy the node with a new bias, the given node is not changed
+    :param node: the node to be copied
+    :param bias: the bias of the copy
+    :return: the newly created node
+    """
+    return Node(node.innovation_number, node.node_type, bias, node.activation_function, node.x_position)
+
+
+def _copy_connection_with(connection: Connection, weight: float, enabled: bool) -> Connection:
+    """
+    Copy the connection with a new weight and enabled flag, the given connection is not changed
+    :param connection: the connection to be copied
+    :param weight: the weight of the copy
+    :param enabled: the enabled flag of the copy
+    :return: the newly created connection
+    """
+    return Connection(connection.innovation_number, connection.input_node, connection.output_node, weight, enabled)
+
+
 def set_new_genome_weights(genome: Genome, rnd: np.random.RandomState, config: NeatConfig) -> Genome:
     """
     Set new weights for the connections and the genome with the given random generator.
@@ -48,9 +82,9 @@ def set_new_genome_weights(genome: Genome, rnd: np.random.RandomState, config: N
     :param config: the neat config that specifies max and min weight
     :return: the modified genome
     """
-    for connection in genome.connections:
-        connection.weight = rnd.uniform(low=config.connection_initial_min_weight,
-                                        high=config.connection_initial_max_weight)
+    for i, connection in enumerate(genome.connections):
+        weight = rnd.uniform(low=config.connection_initial_min_weight, high=config.connection_initial_max_weight)
+        genome.connections[i] = _copy_connection_with(connection, weight, connection.enabled)
 
     return genome
 
@@ -63,10 +97,11 @@ def set_new_genome_bias(genome: Genome, rnd: np.random.RandomState, config: Neat
     :param config: a neat config that specifies min and max values
     :return: the modified genome
     """
-    for node in genome.nodes:
+    for i, node in enumerate(genome.nodes):
         if node.node_type == NodeType.INPUT:
             continue
-        node.bias = rnd.uniform(low=config.bias_initial_min, high=config.bias_initial_max)
+        genome.nodes[i] = _copy_node_with_bias(node, rnd.uniform(low=config.bias_initial_min,
+                                                                 high=config.bias_initial_max))
     return genome
 
 
@@ -78,7 +113,7 @@ def mutate_bias(genome: Genome, rnd: np.random.RandomState, config: NeatConfig)
     :param config: neat config that specifies the probabilities
     :return: the modified genome
     """
-    for node in genome.nodes:
+    for i, node in enumerate(genome.nodes):
         # Input nodes do not have a bias
         if node.node_type == NodeType.INPUT:
             continue
@@ -86,19 +121,22 @@ def mutate_bias(genome: Genome, rnd: np.random.RandomState, config: NeatConfig)
         if rnd.uniform(0, 1) <= config.probability_bias_mutation:
             # Assign random bias or perturb value
             if rnd.uniform(0, 1) <= config.probability_random_bias_mutation:
-                node.bias = rnd.uniform(low=config.bias_initial_min, high=config.bias_initial_max)
+                bias = rnd.uniform(low=config.bias_initial_min, high=config.bias_initial_max)
             else:
                 # Check how the connection weight should be mutated
                 mutation_type = config.bias_mutation_type
                 if mutation_type == "uniform":
-                    node.bias += rnd.uniform(low=-config.bias_mutation_uniform_max_change,
-                                             high=config.bias_mutation_uniform_max_change)
+                    bias = node.bias + rnd.uniform(low=-config.bias_mutation_uniform_max_change,
+                                                   high=config.bias_mutation_uniform_max_change)
                 elif mutation_type == "normal":
-                    node.bias += rnd.normal(loc=0, scale=config.bias_mutation_normal_sigma)
+                    bias = node.bias + rnd.normal(loc=0, scale=config.bias_mutation_normal_sigma)
                 else:
                     raise AssertionError("Unknown type of mutation type. Must be 'uniform' or 'normal'")
 
-                node.bias = np.clip(node.bias, a_min=config.bias_min, a_max=config.bias_max)
+                bias = np.clip(bias, a_min=config.bias_min, a_max=config.bias_max)
+
+            # The node can be shared with other genomes, so it is replaced by a copy
+            genome.nodes[i] = _copy_node_with_bias(node, bias)
     return genome
 
 
@@ -110,31 +148,129 @@ def mutate_weights(genome: Genome, rnd: np.random.RandomState, config: NeatConfi
     :param config: a config that specifies the probability and magnitude of the changes
     :return: the mutated genome
     """
-    for connection in genome.connections:
+    for i, connection in enumerate(genome.connections):
         # Should mutate weights?
         if rnd.uniform(0, 1) <= config.probability_weight_mutation:
             # Assign random weight or perturb existing weight?
             if rnd.uniform(0, 1) <= config.probability_random_weight_mutation:
-                connection.weight = rnd.uniform(low=config.connection_initial_min_weight,
-                                                high=config.connection_initial_max_weight)
+                weight = rnd.uniform(low=config.connection_initial_min_weight,
+                                     high=config.connection_initial_max_weight)
             else:
                 # Check how the connection weight should be mutated
                 mutation_type = config.weight_mutation_type
                 if mutation_type == "uniform":
-                    connection.weight += rnd.uniform(-config.weight_mutation_uniform_max_change,
-                                                     config.weight_mutation_uniform_max_change)
+                    weight = connection.weight + rnd.uniform(-config.weight_mutation_uniform_max_change,
+                                                             config.weight_mutation_uniform_max_change)
                 elif mutation_type == "normal":
-                    connection.weight += rnd.normal(loc=0, scale=config.weight_mutation_normal_sigma)
+                    weight = connection.weight + rnd.normal(loc=0, scale=config.weight_mutation_normal_sigma)
                 else:
                     raise AssertionError("Unknown type of mutation type. Must be 'uniform' or 'normal'")
 
-                connection.weight = np.clip(connection.weight, a_min=config.connection_min_weight,
-                                            a_max=config.connection_max_weight)
+                weight = np.clip(weight, a_min=config.connection_min_weight, a_max=config.connection_max_weight)
+
+            # The connection can be shared with other genomes, so it is replaced by a copy
+            genome.connections[i] = _copy_connection_with(connection, weight, connection.enabled)
+    return genome
+
+
+def mutate_bias_vectorized(genome: Genome, rnd: np.random.RandomState, config: NeatConfig) -> Genome:
+    """
+    Mutate the bias of the nodes like mutate_bias, but draw the random values for all nodes at once. The random values
+    are taken in a different order from the random generator, see _mutate_values_vectorized
+    :param genome: the genome, with nodes
+    :param rnd: a random generator to determine, which nodes should be mutated and how
+    :param config: neat config that specifies the probabilities
+    :return: the modified genome
+    """
+    # Input nodes do not have a bias
+    indices = [i for i, node in enumerate(genome.nodes) if node.node_type != NodeType.INPUT]
+    biases = np.array([genome.nodes[i].bias for i in indices], dtype=float)
+
+    mutated, new_biases = _mutate_values_vectorized(biases, rnd, config.probability_bias_mutation,
+                                                    config.probability_random_bias_mutation,
+                                                    config.bias_initial_min, config.bias_initial_max,
+                                                    config.bias_mutation_type, config.bias_mutation_uniform_max_change,
+                                                    config.bias_mutation_normal_sigma, config.bias_min,
+                                                    config.bias_max)
+
+    # The nodes can be shared with other genomes, so they are replaced by copies
+    for position in np.flatnonzero(mutated).tolist():
+        i = indices[position]
+        genome.nodes[i] = _copy_node_with_bias(genome.nodes[i], new_biases[position])
+    return genome
+
+
+def mutate_weights_vectorized(genome: Genome, rnd: np.random.RandomState, config: NeatConfig) -> Genome:
+    """
+    Mutate the connection weights like mutate_weights, but draw the random values for all connections at once. The
+    random values are taken in a different order from the random generator, see _mutate_values_vectorized
+    :param genome: the genome which weights should be mutated
+    :param rnd: a random generator to determine, which weights and how much they will be changed
+    :param config: a config that specifies the probability and magnitude of the changes
+    :return: the mutated genome
+    """
+    weights = np.array([connection.weight for connection in genome.connections], dtype=float)
+
+    mutated, new_weights = _mutate_values_vectorized(weights, rnd, config.probability_weight_mutation,
+                                                     config.probability_random_weight_mutation,
+                                                     config.connection_initial_min_weight,
+                                                     config.connection_initial_max_weight,
+                                                     config.weight_mutation_type,
+                                                     config.weight_mutation_uniform_max_change,
+                                                     config.weight_mutation_normal_sigma, config.connection_min_weight,
+                                                     config.connection_max_weight)
+
+    # The connections can be shared with other genomes, so they are replaced by copies
+    for i in np.flatnonzero(mutated).tolist():
+        connection = genome.connections[i]
+        genome.connections[i] = _copy_connection_with(connection, new_weights[i], connection.enabled)
     return genome
 
 
+def _mutate_values_vectorized(values: np.ndarray, rnd: np.random.RandomState, probability_mutation: float,
+                              probability_random_value: float, initial_min: float, initial_max: float,
+                              mutation_type: str, uniform_max_change: float, normal_sigma: float, min_value: float,
+                              max_value: float) -> Tuple[np.ndarray, List[float]]:
+    """
+    Mutate the given weights or biases with four calls to the random generator. For n values, the following arrays
+    are drawn in this order, independent of the outcome of the previous draws:
+    1. n values of uniform(0, 1) - the value is mutated, if the number is <= probability_mutation
+    2. n values of uniform(0, 1) - a mutated value is replaced, if the number is <= probability_random_value
+    3. n values of uniform(initial_min, initial_max) - the replacements
+    4. n values of uniform(-uniform_max_change, uniform_max_change) or normal(0, normal_sigma) - the perturbations
+    So the same seed and the same amount of values result always in the same mutation.
+    :param values: the current weights or biases
+    :param rnd: the random generator
+    :param probability_mutation: the probability, that a value is mutated
+    :param probability_random_value: the probability, that a mutated value is replaced and not perturbed
+    :param initial_min: the min value of a replacement
+    :param initial_max: the max value of a replacement
+    :param mutation_type: the distribution of the perturbation ("uniform" or "normal")
+    :param uniform_max_change: if type=uniform the max change of the value (+- the value)
+    :param normal_sigma: if type=normal the sigma value of the normal distribution
+    :param min_value: the min value, that can be reached with a perturbation
+    :param max_value: the max value, that can be reached with a perturbation
+    :return: a boolean array, which values are mutated and a list with the new values
+    """
+    if mutation_type not in ("uniform", "normal"):
+        raise AssertionError("Unknown type of mutation type. Must be 'uniform' or 'normal'")
+
+    amount = len(values)
+    mutated = rnd.uniform(0, 1, amount) <= probability_mutation
+    replaced = rnd.uniform(0, 1, amount) <= probability_random_value
+    random_values = rnd.uniform(low=initial_min, high=initial_max, size=amount)
+    if mutation_type == "uniform":
+        perturbations = rnd.uniform(low=-uniform_max_change, high=uniform_max_change, size=amount)
+    else:
+        perturbations = rnd.normal(loc=0, scale=normal_sigma, size=amount)
+
+    perturbed_values = np.clip(values + perturbations, a_min=min_value, a_max=max_value)
+    new_values = np.where(replaced, random_values, perturbed_values)
+    return mutated, new_values.tolist()
+
+
 def mutate_add_connection(genome: Genome, rnd: np.random.RandomState, generator: InnovationNumberGeneratorInterface,
-                          config: NeatConfig) -> (Genome, Connection):
+                          config: NeatConfig, index: GenomeIndex = None) -> (Genome, Connection):
     """
     Mutate the genome and add a new connection (if possible). The in and out node of the connection are chosen
     randomly with the given rnd generator, as well as the weight. If the in the config, recurrent networks are set to
@@ -143,18 +279,19 @@ def mutate_add_connection(genome: Genome, rnd: np.random.RandomState, generator:
     :param rnd: the random generator
     :param generator: to generate innovation numbers
     :param config: the config that specifies, where and how the connection is created
+    :param index: the index of the genome, that is updated with the new connection. The index of the genome if None
     :return: the modified genome and the newly created connection. If adding a connection failed, it will be None
     """
     # Check if connection should be mutated at all
     if rnd.uniform(0, 1) > config.probability_mutate_add_connection:
         return genome, None
 
-    # Sort nodes
-    sorted_nodes = genome.nodes.copy()
-    sorted_nodes.sort(key=lambda node: node.x_position)
+    if index is None:
+        index = get_genome_index(genome)
 
-    # List with hidden and output nodes
-    hidden_output_nodes = list(filter(lambda node: node.node_type != NodeType.INPUT, sorted_nodes))
+    # Nodes sorted by the x position, the hidden and output nodes are the possible out nodes
+    sorted_nodes = index.get_sorted_nodes()
+    hidden_output_nodes = index.get_sorted_hidden_output_nodes()
 
     # If a selection is not possible, retry the specified amount of times
     for _ in range(config.mutate_connection_tries):
@@ -162,25 +299,19 @@ def mutate_add_connection(genome: Genome, rnd: np.random.RandomState, generator:
 
         if config.allow_recurrent:
             # In recurrent networks, all nodes except input nodes can be output nodes
-            possible_out_nodes = hidden_output_nodes
+            first_out_node = 0
         else:
             # Feed forward networks, require additional, that the x position of the in_node is smaller
-            possible_out_nodes = filter(lambda node: in_node.x_position < node.x_position, hidden_output_nodes)
+            first_out_node = index.get_first_hidden_output_node_after(in_node.x_position)
 
-        # Convert from iterable to list
-        possible_out_nodes = list(possible_out_nodes)
-        if len(possible_out_nodes) == 0:
+        amount_out_nodes = len(hidden_output_nodes) - first_out_node
+        if amount_out_nodes == 0:
             continue
 
-        out_node = possible_out_nodes[rnd.randint(len(possible_out_nodes))]
+        out_node = hidden_output_nodes[first_out_node + rnd.randint(amount_out_nodes)]
 
-        # Check if connection already exists
-        exists = any(
-            connection.input_node == in_node.innovation_number and
-            connection.output_node == out_node.innovation_number
-            for connection in genome.connections)
         # Double connections are not allowed
-        if exists:
+        if index.has_connection(in_node.innovation_number, out_node.innovation_number):
             continue
 
         innovation_number = generator.get_connection_innovation_number(in_node, out_node)
@@ -190,13 +321,14 @@ def mutate_add_connection(genome: Genome, rnd: np.random.RandomState, generator:
                                     enabled=True)
 
         genome.connections.append(new_connection)
+        index.add_connection(new_connection)
         return genome, new_connection
 
     return genome, None
 
 
 def mutate_add_node(genome: Genome, rnd: np.random.RandomState, generator: InnovationNumberGeneratorInterface,
-                    config: NeatConfig) -> (Genome, Node, Connection, Connection):
+                    config: NeatConfig, index: GenomeIndex = None) -> (Genome, Node, Connection, Connection):
     """
     Add with a given probability from the config a new node to the genome.
     A random connections is selected, which will be disabled. A new node will be placed between the in and out node of
@@ -206,17 +338,21 @@ def mutate_add_node(genome: Genome, rnd: np.random.RandomState, generator: Innov
     :param rnd: a random generator to determine if, the genome is mutated, and how
     :param generator: a generator for innovation number for nodes and connections
     :param config: a config that specifies the mutation params
+    :param index: the index of the genome, that is updated with the new genes. The index of the genome if None
     :return: the modified genome, as well as the generated node and the two connections (if they were mutated)
     """
     # Check if node should mutate
     if rnd.uniform(0, 1) > config.probability_mutate_add_node:
         return genome, None, None, None
 
-    selected_connection = genome.connections[rnd.randint(0, len(genome.connections))]
-    selected_connection.enabled = False
+    selected_index = rnd.randint(0, len(genome.connections))
+    selected_connection = genome.connections[selected_index]
+    genome.connections[selected_index] = _copy_connection_with(selected_connection, selected_connection.weight, False)
 
-    in_node = next(x for x in genome.nodes if x.innovation_number == selected_connection.input_node)
-    out_node = next(x for x in genome.nodes if x.innovation_number == selected_connection.output_node)
+    if index is None:
+        index = get_genome_index(genome)
+    in_node = index.get_node(selected_connection.input_node)
+    out_node = index.get_node(selected_connection.output_node)
 
     # Select activation function either from one of the nodes
     new_node_activation = in_node.activation_function if rnd.uniform(0, 1) <= 0.5 else out_node.activation_function
@@ -238,6 +374,9 @@ def mutate_add_node(genome: Genome, rnd: np.random.RandomState, generator: Innov
     genome.nodes.append(new_node)
     genome.connections.append(new_connection_in)
     genome.connections.append(new_connection_out)
+    index.add_node(new_node)
+    index.add_connection(new_connection_in)
+    index.add_connection(new_connection_out)
 
     return genome, new_node, new_connection_in, new_connection_out
 
@@ -246,7 +385,8 @@ def cross_over(more_fit_genome: Genome, less_fit_genome: Genome, rnd: np.random.
         -> (List[Node], List[Connection]):
     """
     Perform the cross over between two parents. Matching genes (that are in both genomes) will be chosen randomly with
-    the given rnd generator. Disjoint and access genes will be inherited from the more fit parent
+    the given rnd generator. Disjoint and access genes will be inherited from the more fit parent. The selected genes
+    are shared with the parents, only connections with a changed enabled flag are copied
     :param more_fit_genome: the genome with the higher fitness value
     :param less_fit_genome: the genome with the lower fitness value
     :param rnd: a random generator to determine which genes should be selected
@@ -269,9 +409,8 @@ def cross_over(more_fit_genome: Genome, less_fit_genome: Genome, rnd: np.random.
             # Disjoint or excess gene
             selected_node = more_fit_genome_node
 
-        # Copy and add it to child
-        copied_node = deep_copy_node(selected_node)
-        nodes_child.append(copied_node)
+        # Add it to child, the node is shared with the parent
+        nodes_child.append(selected_node)
 
     connections_child = []
     for more_fit_genome_connection in more_fit_genome.connections:
@@ -291,9 +430,47 @@ def cross_over(more_fit_genome: Genome, less_fit_genome: Genome, rnd: np.random.
             selected_connection = more_fit_genome_connection
             enable_connection = selected_connection.enabled
 
-        copied_connection = deep_copy_connection(selected_connection)
-        copied_connection.enabled = enable_connection
+        if selected_connection.enabled != enable_connection:
+            selected_connection = _copy_connection_with(selected_connection, selected_connection.weight,
+                                                        enable_connection)
 
-        connections_child.append(copied_connection)
+        connections_child.append(selected_connection)
 
     return nodes_child, connections_child
+
+
+def compose_offspring_genome(parent1: Agent, parent2: Agent, generator: InnovationNumberGeneratorInterface,
+                             config: NeatConfig) -> Genome:
+    """
+    Create the genome of a child with a cross over of the parents and the mutation of the child. The seed of the child
+    is derived from the seeds of the parents, so the same parents create the same child
+    :param parent1: the first parent, with its fitness value
+    :param parent2: the second parent, with its fitness value
+    :param generator: the generator for the innovation numbers of new nodes and connections
+    :param config: the config that specifies the reproduction behavior
+    :return: the genome of the child
+    """
+    child_seed = (parent1.genome.seed + parent2.genome.seed) % 2 ** 24
+    rnd_child = np.random.RandomState(child_seed)
+
+    # Perform crossover for to get the nodes and connections for the child
+    more_fit_genome, less_fit_genome = (parent1.genome, parent2.genome) if parent1.fitness > parent2.fitness \
+        else (parent2.genome, parent1.genome)
+    child_nodes, child_connections = cross_over(more_fit_genome, less_fit_genome, rnd_child, config)
+
+    # Create child genome, it has the structure of the more fit parent, so its index is derived from the parent's index
+    child_genome = Genome(child_seed, child_nodes, child_connections)
+    if more_fit_genome.index is not None:
+        child_genome.index = GenomeIndex(child_genome, more_fit_genome.index)
+
+    # Mutate genome
+    if config.mutation_mode == "scalar":
+        child_genome = mutate_weights(child_genome, rnd_child, config)
+    elif config.mutation_mode == "vectorized":
+        child_genome = mutate_weights_vectorized(child_genome, rnd_child, config)
+    else:
+        raise AssertionError("Unknown type of mutation mode. Must be 'scalar' or 'vectorized'")
+    # Both structural mutations use the index of the child
+    child_genome, _, _, _ = mutate_add_node(child_genome, rnd_child, generator, config)
+    child_genome, _ = mutate_add_connection(child_genome, rnd_child, generator, config)
+    return child_genome
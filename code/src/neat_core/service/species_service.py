@@ -1,24 +1,71 @@
 import math
-from typing import List, Tuple, Set, Union
+from typing import Callable, Dict, List, Optional, Tuple, Set, Union
 
 import numpy as np
 
 from neat_core.models.agent import Agent
+from neat_core.models.distance_cache import DistanceCache
+from neat_core.models.gene_arrays import GeneArrays
 from neat_core.models.generation import Generation
 from neat_core.models.genome import Genome
 from neat_core.models.species import Species
+from neat_core.models.species_statistics import SpeciesStatistics
 from neat_core.optimizer.generator.agent_id_generator_interface import AgentIDGeneratorInterface
 from neat_core.optimizer.generator.species_id_generator_interface import SpeciesIDGeneratorInterface
 from neat_core.optimizer.neat_config import NeatConfig
+from utils.cache.fingerprint import Fingerprint
 from utils.fitness_evaluation import fitness_evaluation_utils
 
 
-def calculate_genetic_distance(genome1: Genome, genome2: Genome, config: NeatConfig) -> float:
+def calculate_genetic_distance(genome1: Genome, genome2: Genome, config: NeatConfig,
+                               distance_cache: DistanceCache = None) -> float:
     """
     Calculate the compatibility between the two given genomes. This includes the nodes and connections
     :param genome1: the first genome
     :param genome2: the second genome
     :param config: the config that specifies the compatibility functions
+    :param distance_cache: the cache for the distances of unchanged genomes, None to calculate the distance
+    :return: the compatibility value between the two nodes
+    """
+    if distance_cache is None or not distance_cache.is_enabled():
+        return _calculate_genetic_distance(genome1, genome2, config)
+
+    distances = _get_cached_distances(lambda: np.array([_calculate_genetic_distance(genome1, genome2, config)]),
+                                      distance_cache, DistanceCache.create_fingerprint(genome1),
+                                      [DistanceCache.create_fingerprint(genome2)], config)
+    return float(distances[0])
+
+
+def _get_cached_distances(calculate_distances: Callable[[], np.ndarray], distance_cache: Optional[DistanceCache],
+                          fingerprint: Optional[Fingerprint], other_fingerprints: List[Fingerprint],
+                          config: NeatConfig) -> np.ndarray:
+    """
+    Get the distances between one genome and other genomes from the cache, or calculate and store them
+    :param calculate_distances: calculates the distances, if they are not cached
+    :param distance_cache: the cache for the distances, can be None
+    :param fingerprint: the fingerprint of the genome, None if the distances are not cached
+    :param other_fingerprints: the fingerprints of the other genomes
+    :param config: the config that specifies the compatibility functions
+    :return: the distances in the order of the other fingerprints
+    """
+    if distance_cache is None or fingerprint is None:
+        return calculate_distances()
+
+    distances = distance_cache.get_distances(fingerprint, other_fingerprints, config)
+    if distances is not None:
+        return np.array(distances, dtype=np.float64)
+
+    distances = calculate_distances()
+    distance_cache.put_distances(fingerprint, other_fingerprints, config, distances.tolist())
+    return distances
+
+
+def _calculate_genetic_distance(genome1: Genome, genome2: Genome, config: NeatConfig) -> float:
+    """
+    Calculate the compatibility between the two given genomes without the cache
+    :param genome1: the first genome
+    :param genome2: the second genome
+    :param config: the config that specifies the compatibility functions
     :return: the compatibility value between the two nodes
     """
     node_distance = _calculate_genetic_distance_nodes(genome1, genome2, config)
@@ -154,6 +201,232 @@ def _calculate_genetic_distance_connections(genome1: Genome, genome2: Genome, co
     return disjoint_genes_result + matching_genes_result
 
 
+def create_gene_arrays(genome: Genome) -> Optional[GeneArrays]:
+    """
+    Create the arrays of the nodes and connections, that are used to calculate the genetic distance with
+    calculate_genetic_distances. This is only possible for genomes with unique integer innovation numbers.
+    :param genome: the genome
+    :return: the gene arrays, or None if the innovation numbers are not supported
+    """
+    node_innovation_numbers = np.array([node.innovation_number for node in genome.nodes])
+    connection_innovation_numbers = np.array([connection.innovation_number for connection in genome.connections])
+    for innovation_numbers in [node_innovation_numbers, connection_innovation_numbers]:
+        if len(innovation_numbers) > 0 and innovation_numbers.dtype.kind not in "iu":
+            return None
+
+    keys = np.concatenate([2 * node_innovation_numbers.astype(np.int64),
+                           2 * connection_innovation_numbers.astype(np.int64) + 1])
+    values = np.array([node.bias for node in genome.nodes] + [connection.weight for connection in genome.connections],
+                      dtype=np.float64)
+    gene_arrays = GeneArrays(keys, values, len(genome.nodes), len(genome.connections))
+
+    # Duplicated innovation numbers are not supported
+    if np.any(gene_arrays.sorted_keys[1:] == gene_arrays.sorted_keys[:-1]):
+        return None
+    return gene_arrays
+
+
+def calculate_genetic_distances(genome: Genome, representatives: List[Genome], config: NeatConfig,
+                                distance_cache: DistanceCache = None) -> np.ndarray:
+    """
+    Calculate the genetic distance between the genome and every representative in one vectorized call. The result is
+    the same as calculate_genetic_distance(genome, representative, config) for every representative.
+    :param genome: the first genome, e.g. of the agent that is sorted into a species
+    :param representatives: the second genomes, e.g. the representatives of the species
+    :param config: the config that specifies the compatibility functions
+    :param distance_cache: the cache for the distances of unchanged genomes, None to calculate the distances
+    :return: the distances with the same order as the representatives
+    """
+    if distance_cache is None or not distance_cache.is_enabled():
+        return _calculate_genetic_distances(genome, representatives, config)
+
+    return _get_cached_distances(lambda: _calculate_genetic_distances(genome, representatives, config), distance_cache,
+                                 DistanceCache.create_fingerprint(genome),
+                                 [DistanceCache.create_fingerprint(r) for r in representatives], config)
+
+
+def _calculate_genetic_distances(genome: Genome, representatives: List[Genome], config: NeatConfig) -> np.ndarray:
+    """
+    Calculate the genetic distance between the genome and every representative without the cache
+    :param genome: the first genome
+    :param representatives: the second genomes
+    :param config: the config that specifies the compatibility functions
+    :return: the distances with the same order as the representatives
+    """
+    genome_genes = create_gene_arrays(genome)
+    representative_genes = [create_gene_arrays(representative) for representative in representatives]
+    if genome_genes is None or any(genes is None for genes in representative_genes):
+        return np.array([_calculate_genetic_distance(genome, representative, config)
+                         for representative in representatives], dtype=np.float64)
+
+    return _calculate_genetic_distances_arrays(genome_genes, _pack_gene_arrays(representative_genes), config)
+
+
+def _pack_gene_arrays(gene_arrays: List[GeneArrays]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Concatenate the gene arrays of multiple genomes, so they can be compared with one genome at once
+    :param gene_arrays: the gene arrays of every genome
+    :return: the concatenated keys, the concatenated values and the amount of nodes and connections of every genome
+    with the shape (genomes, 2)
+    """
+    keys = np.concatenate([genes.keys for genes in gene_arrays] + [np.zeros(0, dtype=np.int64)])
+    values = np.concatenate([genes.values for genes in gene_arrays] + [np.zeros(0, dtype=np.float64)])
+    amount_genes = np.array([genes.amount_genes for genes in gene_arrays], dtype=np.int64).reshape((-1, 2))
+    return keys, values, amount_genes
+
+
+def _calculate_genetic_distances_arrays(genome_genes: GeneArrays,
+                                        packed_genes: Tuple[np.ndarray, np.ndarray, np.ndarray],
+                                        config: NeatConfig) -> np.ndarray:
+    """
+    Calculate the genetic distances between one genome and multiple packed genomes. The calculation is done in the same
+    order as in _calculate_genetic_distance_nodes and _calculate_genetic_distance_connections, so the results are
+    identical. The nodes and connections are calculated together, the last axis of the intermediate results separates
+    them.
+    :param genome_genes: the gene arrays of the first genome
+    :param packed_genes: the packed gene arrays of the second genomes
+    :param config: the config that specifies the compatibility functions
+    :return: the distance to every packed genome
+    """
+    other_keys, other_values, other_amount_genes = packed_genes
+    amount_genes = genome_genes.amount_genes
+
+    # Find the matching genes with a binary search in the sorted genes of the first genome
+    positions = np.searchsorted(genome_genes.sorted_keys, other_keys)
+    positions = np.minimum(positions, max(len(genome_genes.sorted_keys) - 1, 0))
+    if len(genome_genes.sorted_keys) > 0:
+        matching = genome_genes.sorted_keys[positions] == other_keys
+    else:
+        matching = np.zeros(len(other_keys), dtype=bool)
+
+    # Genes of the other genomes are ordered by genome and gene type, so every (genome, type) pair is a segment
+    segments = np.repeat(np.arange(other_amount_genes.size), other_amount_genes.ravel())
+    amount_matching = np.bincount(segments[matching], minlength=other_amount_genes.size).reshape((-1, 2))
+
+    # Disjoint genes are in one of the genomes only
+    amount_disjoint = amount_genes + other_amount_genes - 2 * amount_matching
+    max_genome_size = np.maximum(amount_genes, other_amount_genes)
+    divisor = np.where(max_genome_size >= config.compatibility_genome_size_threshold, max_genome_size, 1.0)
+    disjoint_genes_result = (config.compatibility_factor_disjoint_genes * amount_disjoint) / divisor
+
+    # Mean of the differences in the order of the other genome
+    differences = np.abs(other_values[matching] - genome_genes.sorted_values[positions[matching]])
+    mean_differences = _segment_means(differences, amount_matching.ravel()).reshape((-1, 2))
+    matching_genes_result = mean_differences * config.compatibility_factor_matching_genes
+
+    distances = disjoint_genes_result + matching_genes_result
+    return distances[:, 0] + distances[:, 1]
+
+
+def _segment_means(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Calculate the mean of consecutive segments of the values. Every mean is identical to np.mean of the segment, so the
+    vectorized distances match the distances of _calculate_genetic_distance. Empty segments have the mean nan.
+    :param values: the concatenated values of all segments
+    :param counts: the amount of values in every segment
+    :return: the mean of every segment
+    """
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+    if _BLOCKED_SUMS_MATCH_NUMPY:
+        sums = _blocked_segment_sums(values, offsets, counts)
+    else:
+        sums = _grouped_segment_sums(values, offsets, counts)
+
+    means = np.full(len(counts), np.nan)
+    means[counts > 0] = sums[counts > 0] / counts[counts > 0]
+    return means
+
+
+def _grouped_segment_sums(values: np.ndarray, offsets: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Calculate the sums of the segments with numpy. Segments with the same length are gathered into the rows of a 2d
+    array, numpy sums every contiguous row like a single segment. Every length needs its own reduction, so this is
+    slower than _blocked_segment_sums, but doesn't depend on the summation order of numpy.
+    :param values: the concatenated values of all segments
+    :param offsets: the start index of every segment
+    :param counts: the amount of values in every segment
+    :return: the sum of every segment, 0 for empty segments
+    """
+    sums = np.zeros(len(counts), dtype=np.float64)
+    for count in np.unique(counts[counts > 0]):
+        segments = np.flatnonzero(counts == count)
+        sums[segments] = np.add.reduce(values[offsets[segments, np.newaxis] + np.arange(count)], axis=1)
+    return sums
+
+
+def _blocked_segment_sums(values: np.ndarray, offsets: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Calculate the sums of the segments in the same order as the pairwise summation of numpy, with a fixed amount of
+    operations for all segments. The order is verified once in _check_blocked_segment_sums.
+    :param values: the concatenated values of all segments
+    :param offsets: the start index of every segment
+    :param counts: the amount of values in every segment
+    :return: the sum of every segment, 0 for empty segments
+    """
+    sums = np.zeros(len(counts), dtype=np.float64)
+
+    # Less than 8 values are summed one after another
+    short = np.flatnonzero((counts > 0) & (counts < 8))
+    if len(short) > 0:
+        padded_values = _pad_segments(values, offsets[short], counts[short], 7)
+        for column in range(7):
+            sums[short] += padded_values[:, column]
+
+    # Up to 128 values are summed in 8 separate sums, the remaining values are added at the end
+    blocked = np.flatnonzero((counts >= 8) & (counts <= 128))
+    if len(blocked) > 0:
+        block_counts = counts[blocked] - counts[blocked] % 8
+        amount_blocks = int(np.max(block_counts)) // 8
+        blocks = _pad_segments(values, offsets[blocked], block_counts, 8 * amount_blocks)
+        blocks = blocks.reshape((len(blocked), amount_blocks, 8))
+
+        partial_sums = blocks[:, 0].copy()
+        for block in range(1, amount_blocks):
+            partial_sums += blocks[:, block]
+        block_sums = ((partial_sums[:, 0] + partial_sums[:, 1]) + (partial_sums[:, 2] + partial_sums[:, 3])) + \
+                     ((partial_sums[:, 4] + partial_sums[:, 5]) + (partial_sums[:, 6] + partial_sums[:, 7]))
+
+        remaining_values = _pad_segments(values, offsets[blocked] + block_counts, counts[blocked] - block_counts, 7)
+        for column in range(7):
+            block_sums += remaining_values[:, column]
+        sums[blocked] = block_sums
+
+    # Larger segments are split recursively by numpy
+    for segment in np.flatnonzero(counts > 128):
+        sums[segment] = np.sum(values[offsets[segment]:offsets[segment] + counts[segment]])
+
+    return sums
+
+
+def _pad_segments(values: np.ndarray, starts: np.ndarray, lengths: np.ndarray, width: int) -> np.ndarray:
+    """
+    Copy segments of the values into the rows of a 2d array. The rows are padded with zeros, which don't change a sum.
+    :param values: the values
+    :param starts: the start index of every segment
+    :param lengths: the length of every segment, at most width
+    :param width: the width of the result
+    :return: the padded segments with the shape (segments, width)
+    """
+    columns = np.arange(width)
+    indices = np.minimum(starts[:, np.newaxis] + columns, len(values) - 1)
+    return np.where(columns < lengths[:, np.newaxis], values[indices], 0.0)
+
+
+def _check_blocked_segment_sums() -> bool:
+    """
+    Check, if the blocked sums are identical to the sums of the installed numpy version
+    :return: true, if _blocked_segment_sums can be used
+    """
+    counts = np.arange(200)
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+    values = np.random.RandomState(0).uniform(0, 3, size=counts.sum())
+    return np.array_equal(_grouped_segment_sums(values, offsets, counts),
+                          _blocked_segment_sums(values, offsets, counts))
+
+
+_BLOCKED_SUMS_MATCH_NUMPY: bool = _check_blocked_segment_sums()
+
+
 def _innovation_numbers_matching_disjoint_genes(g1_innovation_numbers: Set[Union[int, str]],
                                                 g2_innovation_numbers: Set[Union[int, str]]) -> (
         Set[Union[int, str]], Set[Union[int, str]]):
@@ -170,7 +443,8 @@ def _innovation_numbers_matching_disjoint_genes(g1_innovation_numbers: Set[Union
 
 
 def sort_agents_into_species(existing_species: List[Species], agents: List[Agent],
-                             species_id_generator: SpeciesIDGeneratorInterface, config: NeatConfig) -> List[Species]:
+                             species_id_generator: SpeciesIDGeneratorInterface, config: NeatConfig,
+                             distance_cache: DistanceCache = None) -> List[Species]:
     """
     Sort the given agents into the given list of species, according to the compatibility. If no matching species is
     found for an agent, a new species is created and the agent is placed inside it.
@@ -179,31 +453,196 @@ def sort_agents_into_species(existing_species: List[Species], agents: List[Agent
     :param agents: a list of agents that should be placed into species
     :param species_id_generator to generate new ids for species
     :param config: a neat config with the required compatibility parameters
+    :param distance_cache: the cache for the distances of unchanged genomes, None to calculate all distances
     :return: the list of species with the sorted agents
     """
-    for agent in agents:
-        for species in existing_species:
-            compatibility = calculate_genetic_distance(agent.genome, species.representative, config)
-            if compatibility <= config.compatibility_threshold:
-                species.members.append(agent)
-                break
+    candidates = find_compatible_species([agent.genome for agent in agents],
+                                         [species.representative for species in existing_species], config,
+                                         distance_cache)
+    return sort_agents_into_species_with_candidates(existing_species, agents, candidates, species_id_generator, config,
+                                                    distance_cache)
+
+
+def find_compatible_species(genomes: List[Genome], representatives: List[Genome], config: NeatConfig,
+                            distance_cache: DistanceCache = None) -> np.ndarray:
+    """
+    Find the first compatible representative for every genome. The genomes are independent of each other, so they can
+    be split and compared on different processes.
+    :param genomes: the genomes, e.g. of the agents that are sorted into species
+    :param representatives: the representatives of the existing species
+    :param config: a neat config with the required compatibility parameters
+    :param distance_cache: the cache for the distances of unchanged genomes, None to calculate all distances
+    :return: the index of the first compatible representative for every genome, -1 if no representative is compatible
+    """
+    packed_genes = _pack_remaining_representatives([create_gene_arrays(r) for r in representatives])
+    representative_fingerprints = _create_fingerprints(representatives, distance_cache)
+    return np.array([_find_first_compatible_species(genome, representatives, packed_genes, config, distance_cache,
+                                                    representative_fingerprints)
+                     for genome in genomes], dtype=np.int64)
+
+
+def _create_fingerprints(genomes: List[Genome], distance_cache: Optional[DistanceCache]) \
+        -> Optional[List[Fingerprint]]:
+    """
+    Create the fingerprints of the genomes once for all comparisons of a speciation
+    :param genomes: the genomes, e.g. the representatives
+    :param distance_cache: the cache for the distances, can be None
+    :return: the fingerprints, or None if the distances are not cached
+    """
+    if distance_cache is None or not distance_cache.is_enabled():
+        return None
+    return [DistanceCache.create_fingerprint(genome) for genome in genomes]
+
+
+def sort_agents_into_species_with_candidates(existing_species: List[Species], agents: List[Agent],
+                                             candidates: np.ndarray, species_id_generator: SpeciesIDGeneratorInterface,
+                                             config: NeatConfig, distance_cache: DistanceCache = None) -> List[Species]:
+    """
+    Sort the given agents into the given list of species with the precalculated compatible species of
+    find_compatible_species. Agents without a compatible existing species are compared with the species, that were
+    created for the previous agents. The agents are processed in the given order, so the result is identical to
+    sort_agents_into_species.
+    Note: The existing members of a species are not deleted!
+    :param existing_species: a list of existing species.
+    :param agents: a list of agents that should be placed into species
+    :param candidates: the index of the first compatible existing species for every agent, -1 if there is none
+    :param species_id_generator to generate new ids for species
+    :param config: a neat config with the required compatibility parameters
+    :param distance_cache: the cache for the distances of unchanged genomes, None to calculate all distances
+    :return: the list of species with the sorted agents
+    """
+    assert len(agents) == len(candidates)
+
+    # Most agents are compatible with one of the first species, so the first species is compared directly and the
+    # remaining species in one vectorized call. The new representatives are only packed, if a new species is created.
+    amount_existing_species = len(existing_species)
+    new_representatives = []
+    new_representative_genes = []
+    new_representative_fingerprints = _create_fingerprints([], distance_cache)
+    packed_genes = None
+
+    for agent, candidate in zip(agents, candidates):
+        species_index = int(candidate)
+        if species_index < 0 and len(new_representatives) > 0:
+            new_species_index = _find_first_compatible_species(agent.genome, new_representatives, packed_genes, config,
+                                                               distance_cache, new_representative_fingerprints)
+            if new_species_index >= 0:
+                species_index = amount_existing_species + new_species_index
+
+        if species_index >= 0:
+            # The agent is placed in the first compatible species
+            existing_species[species_index].members.append(agent)
         else:
             # Not found a matching element,
             new_species_id = species_id_generator.get_species_id()
             new_species = Species(new_species_id, agent.genome, [agent])
             existing_species.append(new_species)
+            new_representatives.append(agent.genome)
+            new_representative_genes.append(create_gene_arrays(agent.genome))
+            if new_representative_fingerprints is not None:
+                new_representative_fingerprints.append(DistanceCache.create_fingerprint(agent.genome))
+            packed_genes = _pack_remaining_representatives(new_representative_genes)
 
     return existing_species
 
 
-def update_fitness_species(generation: Generation) -> Generation:
+def _find_first_compatible_species(genome: Genome, representatives: List[Genome],
+                                   packed_genes: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+                                   config: NeatConfig, distance_cache: DistanceCache = None,
+                                   representative_fingerprints: List[Fingerprint] = None) -> int:
+    """
+    Find the first compatible representative for the genome. The first representative is compared directly, the
+    remaining representatives with the vectorized genetic distance, if they are packed. Both comparisons use the
+    cached distances, if the fingerprints of the representatives are given.
+    :param genome: the genome
+    :param representatives: the representatives
+    :param packed_genes: the packed gene arrays of all representatives except the first one, None if the genes can't be
+    packed
+    :param config: a neat config with the required compatibility parameters
+    :param distance_cache: the cache for the distances of unchanged genomes, None to calculate all distances
+    :param representative_fingerprints: the fingerprints of the representatives for the cache, None if the distances
+    are not cached
+    :return: the index of the first compatible representative, -1 if no representative is compatible
+    """
+    if len(representatives) == 0:
+        return -1
+
+    fingerprint = None
+    if distance_cache is not None and representative_fingerprints is not None:
+        fingerprint = DistanceCache.create_fingerprint(genome)
+
+    def get_distances(start: int, end: int, calculate_distances: Callable[[], np.ndarray]) -> np.ndarray:
+        other_fingerprints = representative_fingerprints[start:end] if fingerprint is not None else None
+        return _get_cached_distances(calculate_distances, distance_cache, fingerprint, other_fingerprints, config)
+
+    first_distance = get_distances(0, 1, lambda: np.array([_calculate_genetic_distance(genome, representatives[0],
+                                                                                       config)]))[0]
+    if first_distance <= config.compatibility_threshold:
+        return 0
+
+    genome_genes = create_gene_arrays(genome) if packed_genes is not None else None
+    if genome_genes is None:
+        # Genomes with other innovation numbers are compared one by one
+        for i, representative in enumerate(representatives[1:], start=1):
+            distance = get_distances(i, i + 1, lambda: np.array([_calculate_genetic_distance(genome, representative,
+                                                                                             config)]))[0]
+            if distance <= config.compatibility_threshold:
+                return i
+        return -1
+
+    distances = get_distances(1, len(representatives),
+                              lambda: _calculate_genetic_distances_arrays(genome_genes, packed_genes, config))
+    compatible_species = np.flatnonzero(distances <= config.compatibility_threshold)
+    return int(compatible_species[0]) + 1 if len(compatible_species) > 0 else -1
+
+
+def _pack_remaining_representatives(representative_genes: List[Optional[GeneArrays]]) \
+        -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Pack the gene arrays of all representatives except the first one, which is compared directly
+    :param representative_genes: the gene arrays of the representatives
+    :return: the packed gene arrays or None, if there are no remaining representatives or the genes are not supported
+    """
+    remaining_genes = representative_genes[1:]
+    if len(remaining_genes) == 0 or any(genes is None for genes in remaining_genes):
+        return None
+    return _pack_gene_arrays(remaining_genes)
+
+
+def calculate_species_statistics(species: Species) -> SpeciesStatistics:
+    """
+    Calculate the fitness values of the species, that are required for the reproduction. All members must be evaluated.
+    :param species: the species with its evaluated members
+    :return: the statistics of the species
+    """
+    best_agent = fitness_evaluation_utils.get_best_agent(species.members)
+    mean_fitness = np.mean([member.fitness for member in species.members])
+    sorted_members = sorted(species.members, key=lambda member: member.fitness)
+    return SpeciesStatistics(best_agent, mean_fitness, sorted_members)
+
+
+def _get_species_statistics(species: Species, species_statistics: Dict[int, SpeciesStatistics]) -> SpeciesStatistics:
+    """
+    Get the precalculated statistics of the species or calculate them, if they are not available
+    :param species: the species
+    :param species_statistics: the precalculated statistics by species id, can be None
+    :return: the statistics of the species
+    """
+    if species_statistics is not None and species.id_ in species_statistics:
+        return species_statistics[species.id_]
+    return calculate_species_statistics(species)
+
+
+def update_fitness_species(generation: Generation,
+                           species_statistics: Dict[int, SpeciesStatistics] = None) -> Generation:
     """
     Update the max fitness and the corresponding generation of each species with the values from its members.
     :param generation: which contains the species
+    :param species_statistics: precalculated statistics by species id, missing statistics are calculated
     :return: the updated generation
     """
     for species in generation.species_list:
-        best_fitness_current_generation = fitness_evaluation_utils.get_best_agent(species.members).fitness
+        best_fitness_current_generation = _get_species_statistics(species, species_statistics).best_agent.fitness
 
         # If fitness is none or lower, update the value
         if species.max_species_fitness is None or species.max_species_fitness < best_fitness_current_generation:
@@ -228,17 +667,19 @@ def get_allowed_species_for_reproduction(generation: Generation, max_stagnant_ge
     return allowed_species
 
 
-def calculate_adjusted_fitness(species_list: List[Species], min_fitness: float, max_fitness: float) -> List[Species]:
+def calculate_adjusted_fitness(species_list: List[Species], min_fitness: float, max_fitness: float,
+                               species_statistics: Dict[int, SpeciesStatistics] = None) -> List[Species]:
     """
     Calculate the adjusted fitness for each species
     :param species_list: a list of species, for which the adjusted fitness should be calculated
     :param min_fitness: the minimum fitness of the generation
     :param max_fitness: the maximum fitness of the generation
+    :param species_statistics: precalculated statistics by species id, missing statistics are calculated
     :return: the updated species
     """
     fitness_range = max(1.0, max_fitness - min_fitness)
     for species in species_list:
-        mean_species_fitness = np.mean([member.fitness for member in species.members])
+        mean_species_fitness = _get_species_statistics(species, species_statistics).mean_fitness
         species.adjusted_fitness = (mean_species_fitness - min_fitness) / fitness_range
 
     return species_list
@@ -281,16 +722,18 @@ def calculate_amount_offspring(species_list: List[Species], amount_offspring) ->
     return off_spring_list
 
 
-def remove_low_genomes(species_list: List[Species], remove_percentage: float) -> List[Species]:
+def remove_low_genomes(species_list: List[Species], remove_percentage: float,
+                       species_statistics: Dict[int, SpeciesStatistics] = None) -> List[Species]:
     """
     Remove the given percentage of low genomes from every species
     :param species_list: the list of species, which members should be modified
     :param remove_percentage: the percentage of low genomes that should be removed e.g 0.2 means the lower 20% percent
+    :param species_statistics: precalculated statistics by species id, missing statistics are calculated
     :return: the updated species list
     """
     for species in species_list:
         remove_agents = math.floor(remove_percentage * len(species.members))
-        sorted_members = sorted(species.members, key=lambda member: member.fitness)
+        sorted_members = _get_species_statistics(species, species_statistics).sorted_members
         species.members = sorted_members[remove_agents:]
 
     return species_list
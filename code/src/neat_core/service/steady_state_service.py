@@ -0,0 +1,137 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from neat_core.models.agent import Agent
+from neat_core.models.distance_cache import DistanceCache
+from neat_core.models.generation import Generation
+from neat_core.models.species import Species
+from neat_core.optimizer.generator.agent_id_generator_interface import AgentIDGeneratorInterface
+from neat_core.optimizer.generator.inno_num_generator_interface import InnovationNumberGeneratorInterface
+from neat_core.optimizer.generator.species_id_generator_interface import SpeciesIDGeneratorInterface
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.service import reproduction_service as rp
+from neat_core.service import species_service as ss
+
+
+def create_next_generation(generation: Generation) -> Tuple[Generation, np.random.RandomState]:
+    """
+    Start the next generation of the steady state evolution. The agents and species are copied, so the given generation
+    is not changed by the following replacements. Every species gets a new representative.
+    :param generation: the current population
+    :return: the next generation and the random generator for the selection of parents in this generation
+    """
+    new_generation_seed = np.random.RandomState(generation.seed).randint(2 ** 24)
+    rnd = np.random.RandomState(new_generation_seed)
+
+    species_list = [Species(species.id_, species.representative, list(species.members),
+                            species.max_species_fitness, species.generation_max_species_fitness)
+                    for species in generation.species_list]
+    species_list = [ss.select_new_representative(species, rnd) for species in species_list]
+
+    return Generation(generation.number + 1, new_generation_seed, list(generation.agents), species_list), rnd
+
+
+def select_species(species_list: List[Species], rnd: np.random.RandomState) -> Species:
+    """
+    Select a species for the next offspring. The probability of a species is proportional to its adjusted fitness.
+    :param species_list: the species with the calculated adjusted fitness
+    :param rnd: the random generator to select the species
+    :return: the selected species
+    """
+    assert len(species_list) != 0
+
+    adjusted_fitness = np.array([max(species.adjusted_fitness, 0.0) for species in species_list])
+    if adjusted_fitness.sum() <= 0:
+        return species_list[rnd.randint(len(species_list))]
+    return species_list[rnd.choice(len(species_list), p=adjusted_fitness / adjusted_fitness.sum())]
+
+
+def create_selection(generation: Generation, config: NeatConfig) -> List[Species]:
+    """
+    Calculate the species, from which the parents of the offspring are selected during one generation. The species are
+    selected like in the generational reproduction and the low genomes are removed from copies of the species, so the
+    members of the species in the generation are not changed. The selection is calculated once per generation and only
+    updated with replace_worst_agent.
+    :param generation: the current population, all agents must be evaluated
+    :param config: the neat config
+    :return: the copied species with the adjusted fitness and the better members
+    """
+    generation = ss.update_fitness_species(generation)
+    species_list = ss.get_allowed_species_for_reproduction(generation, config.species_stagnant_after_generations)
+
+    # Same fallback as in the generational reproduction
+    if len(species_list) <= 5:
+        species_list = generation.species_list
+
+    # Work on copies, so the low genomes are only removed for the selection
+    species_list = [Species(species.id_, species.representative, list(species.members)) for species in species_list]
+
+    min_fitness = min([a.fitness for a in generation.agents])
+    max_fitness = max([a.fitness for a in generation.agents])
+    species_list = ss.calculate_adjusted_fitness(species_list, min_fitness, max_fitness)
+    return ss.remove_low_genomes(species_list, config.percentage_remove_low_genomes)
+
+
+def create_offspring_agent(generation: Generation, selection: List[Species], rnd: np.random.RandomState,
+                           innovation_number_generator: InnovationNumberGeneratorInterface,
+                           agent_id_generator: AgentIDGeneratorInterface, config: NeatConfig) -> Agent:
+    """
+    Create one new agent from the current population. A species of the selection is chosen by its adjusted fitness and
+    the parents are chosen from its members.
+    :param generation: the current population
+    :param selection: the species for the parent selection, created with create_selection
+    :param rnd: the random generator to select the species and parents
+    :param innovation_number_generator: the generator for the innovation numbers of the mutations
+    :param agent_id_generator: the generator for the id of the new agent
+    :param config: the neat config
+    :return: the new, not evaluated agent
+    """
+    species = select_species(selection, rnd)
+    parent1_id, parent2_id, child_id = ss.create_offspring_pairs(species, 1, agent_id_generator, generation, rnd,
+                                                                 config)[0]
+
+    agent_dict = {agent.id: agent for agent in species.members}
+    child_genome = rp.compose_offspring_genome(agent_dict[parent1_id], agent_dict[parent2_id],
+                                               innovation_number_generator, config)
+    return Agent(child_id, child_genome)
+
+
+def replace_worst_agent(generation: Generation, agent: Agent, selection: List[Species],
+                        species_id_generator: SpeciesIDGeneratorInterface, config: NeatConfig,
+                        distance_cache: DistanceCache = None) -> Agent:
+    """
+    Insert an evaluated agent into the population and remove the agent with the lowest fitness, so the size of the
+    population stays the same. On equal fitness, the older agent is removed. The new agent itself is removed, if its
+    fitness is the lowest. The agents and members of the species must be separate lists, like in the generations
+    created with create_next_generation.
+    The removed agent is also removed from the selection, so it can't become a parent anymore. The new agent is only
+    selected as parent in the next generation. If no species of the selection is left, the selection is calculated
+    again.
+    :param generation: the current population, that is modified
+    :param agent: the new evaluated agent
+    :param selection: the species for the parent selection, that are modified
+    :param species_id_generator: the generator for the id, if the agent requires a new species
+    :param config: the neat config with the compatibility parameters
+    :param distance_cache: the cache for the distances of unchanged genomes, None to calculate all distances
+    :return: the removed agent
+    """
+    generation.agents.append(agent)
+    generation.species_list = ss.sort_agents_into_species(generation.species_list, [agent], species_id_generator,
+                                                          config, distance_cache)
+
+    worst_agent = min(generation.agents, key=lambda a: a.fitness)
+    generation.agents.remove(worst_agent)
+    for species in generation.species_list:
+        if worst_agent in species.members:
+            species.members.remove(worst_agent)
+    generation.species_list = ss.get_species_with_members(generation.species_list)
+
+    for species in selection:
+        if worst_agent in species.members:
+            species.members.remove(worst_agent)
+    selection[:] = ss.get_species_with_members(selection)
+    if len(selection) == 0:
+        selection.extend(create_selection(generation, config))
+
+    return worst_agent
@@ -0,0 +1,8 @@
+from neat_core.optimizer.generator.agent_id_generator_interface import AgentIDGeneratorInterface
+from neat_mpi.id_block_generator import IDBlockGenerator
+
+
+class AgentIDGeneratorMPI(IDBlockGenerator, AgentIDGeneratorInterface):
+
+    def get_agent_id(self) -> int:
+        return self.get_id()
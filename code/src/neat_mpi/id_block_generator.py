@@ -0,0 +1,43 @@
+class IDBlockGenerator(object):
+
+    def __init__(self, rank: int, amount_ranks: int, block_size: int = 1024, first_id: int = 0) -> None:
+        """
+        Generate unique ids on multiple ranks without communication. The ids are split into blocks of the given size,
+        which are assigned to the ranks in turn: the k-th block of a rank is the block k * amount_ranks + rank. A rank
+        continues with its next block, if the current one is exhausted.
+        :param rank: the rank of this process
+        :param amount_ranks: the amount of ranks, that generate ids
+        :param block_size: the amount of ids in every block
+        :param first_id: the first id of the first block
+        """
+        assert 0 <= rank < amount_ranks
+        assert block_size > 0
+
+        self.rank: int = rank
+        self.amount_ranks: int = amount_ranks
+        self.block_size: int = block_size
+        self.first_id: int = first_id
+
+        self.block_number: int = 0
+        self.next_id: int = self._get_block_start(0)
+
+    def get_id(self) -> int:
+        """
+        Get the next id from the block of this rank, reserve the next block if required
+        :return: the generated id
+        """
+        if self.next_id == self._get_block_start(self.block_number) + self.block_size:
+            self.block_number += 1
+            self.next_id = self._get_block_start(self.block_number)
+
+        tmp = self.next_id
+        self.next_id += 1
+        return tmp
+
+    def _get_block_start(self, block_number: int) -> int:
+        """
+        Get the first id of the given block of this rank
+        :param block_number: the number of the block of this rank
+        :return: the first id in the block
+        """
+        return self.first_id + (block_number * self.amount_ranks + self.rank) * self.block_size
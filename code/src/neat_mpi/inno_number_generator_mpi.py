@@ -0,0 +1,199 @@
+from typing import Dict, List, Optional, Tuple, Union
+
+from neat_core.models.connection import Connection
+from neat_core.models.genome import Genome
+from neat_core.models.node import Node
+from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
+
+# The new innovations of one rank: the node records, the connection records, each as (key, provisional number) in the
+# order of their creation, and the keys of the stored connection innovations, that were used again
+RankInnovations = Tuple[List[Tuple[Tuple, int]], List[Tuple[Tuple, int]], List[Tuple]]
+
+
+class InnovationNumberGeneratorMPI(InnovationNumberGeneratorSingleCore):
+
+    def __init__(self, rank: int, block_size: int = 2 ** 32, connection_innovation_expiry: Optional[int] = None) \
+            -> None:
+        """
+        Generator for the innovation numbers, if the offspring is composed on multiple ranks in parallel. Every rank
+        has the same counters and stored connection innovations. During the reproduction, new innovations receive
+        provisional numbers from a block, that is reserved for the rank. Afterwards the new innovations of all ranks
+        are gathered (get_new_innovations) and every rank merges them in the same way (apply_innovations), so the same
+        structures share the same final innovation number. If the ranks compose contiguous parts of the children in the
+        order of the ranks, the final numbers are the same as with the single core generator.
+        The generator does not communicate itself, the gathering is done by the optimizer.
+        :param rank: the rank of this process
+        :param block_size: the size of the reserved block for the provisional numbers of every rank
+        :param connection_innovation_expiry: the amount of generations, after which an unused connection innovation is
+        removed. None keeps all innovations
+        """
+        super().__init__(connection_innovation_expiry)
+        assert rank >= 0
+        assert block_size > 0
+
+        self.rank: int = rank
+        self.block_size: int = block_size
+        self._reset_new_innovations()
+
+    def next_generation(self, generation: int) -> None:
+        """
+        Indicate that a new generation is composed. The provisional numbers start after the current counters
+        :param generation: the number of the new generation
+        :return: None
+        """
+        super().next_generation(generation)
+        self._reset_new_innovations()
+
+    def get_node_innovation_number(self, node1: Node = None, node2: Node = None) -> Union[int, str]:
+        """
+        Get a node innovation number. Nodes without the given nodes are only created for the initial generation and
+        receive a final number. Nodes from mutations receive a provisional number, if they are new in this generation
+        :param node1: the in node of the splitted connection. Can be none for initial nodes
+        :param node2: the out node of the splitted connection. Can be none for initial nodes
+        :return: the final or provisional innovation number
+        """
+        if node1 is None or node2 is None:
+            return self._get_new_node_number()
+
+        key = (node1.innovation_number, node2.innovation_number)
+        innovation = self.node_innovations.get(key)
+        if innovation is None:
+            innovation = self._get_provisional_number(self.node_counter, len(self.node_innovations))
+            self.node_innovations[key] = innovation
+        return innovation
+
+    def get_connection_innovation_number(self, input_node: Node = None, output_node: Node = None) -> Union[int, str]:
+        """
+        Get a connection innovation number. Stored innovations keep their final number, new connections from mutations
+        receive a provisional number
+        :param input_node: the input node of the connection. Can be none for initial connections
+        :param output_node: the output node of the connection. Can be none for initial connections
+        :return: the final or provisional innovation number
+        """
+        if input_node is None or output_node is None:
+            return self._get_new_connection_number()
+
+        key = (input_node.innovation_number, output_node.innovation_number)
+        record = self.connection_innovations.get(key)
+        if record is not None:
+            # The usage is applied on all ranks after the merge
+            self._used_connection_keys[key] = None
+            return record[0]
+
+        innovation = self._new_connection_innovations.get(key)
+        if innovation is None:
+            innovation = self._get_provisional_number(self.connection_counter, len(self._new_connection_innovations))
+            self._new_connection_innovations[key] = innovation
+        return innovation
+
+    def get_new_innovations(self) -> RankInnovations:
+        """
+        Get the innovations of this rank in the current generation, that must be sent to all other ranks
+        :return: the node records, the connection records and the keys of the used connection innovations
+        """
+        return (list(self.node_innovations.items()), list(self._new_connection_innovations.items()),
+                list(self._used_connection_keys))
+
+    def apply_innovations(self, innovations_per_rank: List[RankInnovations]) -> Tuple[Dict, Dict]:
+        """
+        Merge the new innovations of all ranks, update the counters and the stored connection innovations. Every rank
+        must apply the same innovations, so the generators stay the same on all ranks
+        :param innovations_per_rank: the new innovations of every rank, ordered by the rank
+        :return: the mapping from the provisional to the final node and connection numbers of this rank
+        """
+        node_mappings, connection_mappings, new_connections, self.node_counter, self.connection_counter = \
+            merge_innovations(innovations_per_rank, self.node_counter, self.connection_counter)
+
+        # Reinsert the used innovations, so the stored innovations stay ordered by the last usage
+        for _, _, used_keys in innovations_per_rank:
+            for key in used_keys:
+                record = self.connection_innovations.pop(key)
+                self.connection_innovations[key] = (record[0], self.generation)
+
+        for key, innovation in new_connections:
+            self.connection_innovations[key] = (innovation, self.generation)
+
+        self._reset_new_innovations()
+        return node_mappings[self.rank], connection_mappings[self.rank]
+
+    def _get_provisional_number(self, counter: int, amount_used: int) -> int:
+        """
+        Get the next provisional number from the block of this rank. The block starts after the current counter, so
+        the provisional numbers are larger than all final numbers, like the final numbers of the new innovations
+        :param counter: the current final counter
+        :param amount_used: the amount of provisional numbers, that were already used in this generation
+        :return: the provisional number
+        """
+        assert amount_used < self.block_size, "The reserved block of provisional innovation numbers is exhausted"
+        return counter + self.rank * self.block_size + amount_used
+
+    def _reset_new_innovations(self) -> None:
+        self.node_innovations = {}
+        self._new_connection_innovations: Dict[Tuple, int] = {}
+        self._used_connection_keys: Dict[Tuple, None] = {}
+
+
+def merge_innovations(innovations_per_rank: List[RankInnovations], node_counter: int, connection_counter: int) \
+        -> Tuple[List[Dict], List[Dict], List[Tuple[Tuple, int]], int, int]:
+    """
+    Assign the final innovation numbers to the new innovations of all ranks. The records are processed in the order of
+    the ranks and their creation, the first record of a structure receives the next number of the counter and all
+    later records of the same structure are mapped to this number. The connection keys can contain provisional node
+    numbers, so they are mapped to the final node numbers first.
+    :param innovations_per_rank: the new innovations of every rank, ordered by the rank
+    :param node_counter: the current counter for the node innovations
+    :param connection_counter: the current counter for the connection innovations
+    :return: the node and connection mapping from provisional to final numbers for every rank, the new connection
+    innovations with the final keys and numbers, and the new node and connection counters
+    """
+    final_nodes = {}
+    node_mappings = []
+    for node_records, _, _ in innovations_per_rank:
+        node_mapping = {}
+        for key, provisional_number in node_records:
+            if key not in final_nodes:
+                final_nodes[key] = node_counter
+                node_counter += 1
+            node_mapping[provisional_number] = final_nodes[key]
+        node_mappings.append(node_mapping)
+
+    final_connections = {}
+    connection_mappings = []
+    for (_, connection_records, _), node_mapping in zip(innovations_per_rank, node_mappings):
+        connection_mapping = {}
+        for (input_node, output_node), provisional_number in connection_records:
+            key = (node_mapping.get(input_node, input_node), node_mapping.get(output_node, output_node))
+            if key not in final_connections:
+                final_connections[key] = connection_counter
+                connection_counter += 1
+            connection_mapping[provisional_number] = final_connections[key]
+        connection_mappings.append(connection_mapping)
+
+    return node_mappings, connection_mappings, list(final_connections.items()), node_counter, connection_counter
+
+
+def remap_genome(genome: Genome, node_mapping: Dict, connection_mapping: Dict) -> Genome:
+    """
+    Replace the provisional innovation numbers in the genome with the final numbers. The changed genes are replaced by
+    copies, so genes shared with other genomes are not modified
+    :param genome: the genome with provisional numbers
+    :param node_mapping: the mapping from provisional to final node numbers
+    :param connection_mapping: the mapping from provisional to final connection numbers
+    :return: the modified genome
+    """
+    for i, node in enumerate(genome.nodes):
+        final_number = node_mapping.get(node.innovation_number, node.innovation_number)
+        if final_number != node.innovation_number:
+            genome.nodes[i] = Node(final_number, node.node_type, node.bias, node.activation_function,
+                                   node.x_position)
+
+    for i, connection in enumerate(genome.connections):
+        final_numbers = (connection_mapping.get(connection.innovation_number, connection.innovation_number),
+                         node_mapping.get(connection.input_node, connection.input_node),
+                         node_mapping.get(connection.output_node, connection.output_node))
+        if final_numbers != (connection.innovation_number, connection.input_node, connection.output_node):
+            genome.connections[i] = Connection(*final_numbers, connection.weight, connection.enabled)
+
+    # The index refers to the provisional numbers, it is created again when it is required
+    genome.index = None
+    return genome
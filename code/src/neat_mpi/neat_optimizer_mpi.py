@@ -1,19 +1,26 @@
+import time
+from concurrent.futures import Future, as_completed
+from typing import Dict, List, Tuple
+
 import numpy as np
 from loguru import logger
 from mpi4py import MPI
 from mpi4py.futures import MPIPoolExecutor
 
 from neat_core.models.agent import Agent
+from neat_core.models.distance_cache import DistanceCache
 from neat_core.models.generation import Generation
 from neat_core.models.genome import Genome
+from neat_core.models.species import Species
 from neat_core.optimizer.challenge import Challenge
 from neat_core.optimizer.generator.inno_num_generator_interface import InnovationNumberGeneratorInterface
 from neat_core.optimizer.neat_config import NeatConfig
 from neat_core.optimizer.neat_optimizer import NeatOptimizer
+from neat_core.service import encoding_service as es
 from neat_core.service import generation_service as gs
-from neat_core.service import reproduction_service as rp
 from neat_core.service import species_service as ss
 from neat_mpi import neat_worker_mpi
+from neat_mpi import partitioning
 from neat_single_core.agent_id_generator_single_core import AgentIDGeneratorSingleCore
 from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
 from neat_single_core.species_id_generator_single_core import SpeciesIDGeneratorSingleCore
@@ -23,13 +30,38 @@ challenge_tmp = None
 
 class NeatOptimizerMPI(NeatOptimizer):
 
-    def __init__(self):
+    def __init__(self, scheduling: str = "map", mode: str = "generational", speciation: str = "master"):
+        """
+        Optimizer, that evaluates the agents with the MPIPoolExecutor
+        :param scheduling: "map" sends every agent as own task to the workers, "guided" sends chunks of agents that
+        shrink as the queue drains (guided self scheduling). The chunks are built with the measured evaluation times of
+        the parents as cost estimate.
+        :param mode: "generational" evaluates and reproduces whole generations, "steady_state" creates a new offspring
+        for every returned result, so the workers don't wait for the reproduction
+        :param speciation: "master" sorts the new agents into species on the master, "distributed" lets the workers find
+        the compatible existing species of the new agents. The master only creates the new species in the order of the
+        agents, so the result is the same. Only used in the generational mode.
+        """
         super().__init__()
+        assert scheduling in ["map", "guided"], "Unknown type of scheduling. Must be 'map' or 'guided'"
+        assert mode in ["generational", "steady_state"], \
+            "Unknown type of mode. Must be 'generational' or 'steady_state'"
+        assert speciation in ["master", "distributed"], "Unknown type of speciation. Must be 'master' or 'distributed'"
+        self.scheduling: str = scheduling
+        self.mode: str = mode
+        self.speciation: str = speciation
+
         self.comm = MPI.COMM_WORLD
         self.name = MPI.Get_processor_name()
         self.rank = self.comm.Get_rank()
         self.size = self.comm.Get_size()
 
+        # Measured evaluation times of the last generation and estimated times for the next generation (by agent id)
+        self.evaluation_times: Dict[int, float] = {}
+        self.cost_estimates: Dict[int, float] = {}
+        # Idle time of every worker rank for each evaluated generation
+        self.idle_times: List[Dict[int, float]] = []
+
     def evaluate(self, amount_input_nodes: int, amount_output_nodes,
                  activation_function, challenge: Challenge, config: NeatConfig,
                  seed: int) -> None:
@@ -37,10 +69,10 @@ class NeatOptimizerMPI(NeatOptimizer):
 
         # Setup worker, run remaining code on master. If not workers are selected, setup master
         if self.rank != 0:
-            neat_worker_mpi.setup(challenge)
+            neat_worker_mpi.setup(challenge, config)
         elif self.size <= 1:
             # If only one core is selected, master is also worker
-            neat_worker_mpi.setup(challenge)
+            neat_worker_mpi.setup(challenge, config)
             self._run_master(amount_input_nodes, amount_output_nodes, activation_function, challenge, config, seed)
         else:
             self._run_master(amount_input_nodes, amount_output_nodes, activation_function, challenge, config, seed)
@@ -130,6 +162,11 @@ class NeatOptimizerMPI(NeatOptimizer):
                          agent_id_generator: AgentIDGeneratorSingleCore,
                          config: NeatConfig) -> Generation:
 
+        self.distance_cache = DistanceCache(config.compatibility_distance_cache_size)
+        if self.mode == "steady_state":
+            return self._evaluation_loop_mpi_steady_state(generation, challenge, innovation_number_generator,
+                                                          species_id_generator, agent_id_generator, config)
+
         current_generation = generation
         while True:
             current_generation = self._evaluate_generation(current_generation, challenge)
@@ -143,21 +180,116 @@ class NeatOptimizerMPI(NeatOptimizer):
 
         return current_generation
 
+    def _evaluation_loop_mpi_steady_state(self, generation: Generation, challenge: Challenge,
+                                          innovation_number_generator: InnovationNumberGeneratorInterface,
+                                          species_id_generator: SpeciesIDGeneratorSingleCore,
+                                          agent_id_generator: AgentIDGeneratorSingleCore,
+                                          config: NeatConfig) -> Generation:
+        # The initial generation is evaluated at once, afterwards the population is updated with every result
+        current_generation = self._evaluate_generation(generation, challenge)
+        if self.callback.finish_evaluation(current_generation):
+            return current_generation
+
+        def submit_genome(genome: Genome) -> Future:
+            return self.executor.submit(neat_worker_mpi.evaluate_encoded_genomes, [es.encode_genome(genome)])
+
+        def parse_result(future: Future, agent: Agent) -> Tuple[float, Dict[str, object]]:
+            _, _, [(fitness, additional_info, evaluation_time)] = future.result()
+            self.evaluation_times[agent.id] = evaluation_time
+            return fitness, additional_info
+
+        return self._evaluation_loop_steady_state(current_generation, innovation_number_generator, species_id_generator,
+                                                  agent_id_generator, config, 2 * self._get_amount_workers(),
+                                                  submit_genome, parse_result)
+
     def _evaluate_generation(self, generation: Generation, challenge: Challenge):
         # Notify callback
         self._notify_reporters_callback(lambda r: r.on_generation_evaluation_start(generation))
 
-        result_list = self.executor.map(neat_worker_mpi.evaluate_agent, generation.agents, chunksize=1)
+        # Send only the encoded genomes instead of the pickled agents
+        encoded_genomes = [es.encode_genome(agent.genome) for agent in generation.agents]
+        start_time = time.time()
 
-        for i, result in enumerate(result_list):
-            generation.agents[i].fitness = result[0]
-            generation.agents[i].additional_info = result[1]
-            self._notify_reporters_callback(lambda r: r.on_agent_evaluation_end(i, generation.agents[i]))
+        if self.scheduling == "guided":
+            costs = self._get_cost_estimates(generation)
+            chunks = partitioning.guided_chunks(costs, self._get_amount_workers())
+        else:
+            chunks = [np.array([i]) for i in range(len(encoded_genomes))]
+
+        futures = {self.executor.submit(neat_worker_mpi.evaluate_encoded_genomes,
+                                        [encoded_genomes[i] for i in chunk]): chunk for chunk in chunks}
+
+        # Process the results as they arrive, the species statistics are calculated while other chunks are evaluated
+        self._prepare_species_statistics(generation)
+        busy_times = {}
+        self.evaluation_times = {}
+        for future in as_completed(futures):
+            worker_rank, busy_time, results = future.result()
+            busy_times[worker_rank] = busy_times.get(worker_rank, 0.0) + busy_time
+
+            for i, (fitness, additional_info, evaluation_time) in zip(futures[future].tolist(), results):
+                agent = generation.agents[i]
+                agent.fitness = fitness
+                agent.additional_info = additional_info
+                self.evaluation_times[agent.id] = evaluation_time
+                self._notify_reporters_callback(lambda r: r.on_agent_evaluation_end(i, agent))
+                self._update_species_statistics(agent)
+
+        # Workers are idle, while they wait for tasks or the other workers are still busy
+        required_time = time.time() - start_time
+        worker_ranks = set(range(1, self.size) if self.size > 1 else [0]) | set(busy_times.keys())
+        idle_times = {worker_rank: max(0.0, required_time - busy_times.get(worker_rank, 0.0))
+                      for worker_rank in sorted(worker_ranks)}
+        self.idle_times.append(idle_times)
+        logger.info("Generation {} evaluated in {:.4f}s with {} chunks, Idle time per rank: {}".format(
+            generation.number, required_time, len(chunks), {r: round(t, 4) for r, t in idle_times.items()}))
 
         # # Notify callback
         self._notify_reporters_callback(lambda r: r.on_generation_evaluation_end(generation, self.reporters))
         return generation
 
+    def _get_amount_workers(self) -> int:
+        """
+        :return: the amount of ranks, that evaluate agents
+        """
+        return max(1, self.size - 1)
+
+    def _get_cost_estimates(self, generation: Generation) -> np.ndarray:
+        """
+        Get the estimated evaluation cost of every agent. Agents without estimate get the mean of the known estimates.
+        :param generation: the generation, that should be evaluated
+        :return: the estimated costs
+        """
+        known_costs = [self.cost_estimates[agent.id] for agent in generation.agents if agent.id in self.cost_estimates]
+        default_cost = np.mean(known_costs) if len(known_costs) > 0 else 1.0
+
+        costs = np.array([self.cost_estimates.get(agent.id, default_cost) for agent in generation.agents])
+        # Every agent requires at least some time, so that all chunks contain agents
+        return np.maximum(costs, 1e-6)
+
+    def _estimate_costs(self, generation: Generation, new_agents: List[Agent], off_spring_pairs) -> None:
+        """
+        Estimate the evaluation costs of the new agents from the measured times of the last generation. Children get
+        the mean of their parents, copied agents the time of the original agent.
+        :param generation: the evaluated generation
+        :param new_agents: the agents of the new generation
+        :param off_spring_pairs: the parent ids and child id of every child
+        :return: None
+        """
+        genome_costs = {id(agent.genome): self.evaluation_times[agent.id] for agent in generation.agents
+                        if agent.id in self.evaluation_times}
+
+        self.cost_estimates = {}
+        for agent in new_agents:
+            if id(agent.genome) in genome_costs:
+                self.cost_estimates[agent.id] = genome_costs[id(agent.genome)]
+
+        for parent1_id, parent2_id, child_id in off_spring_pairs:
+            parent_costs = [self.evaluation_times[parent_id] for parent_id in [parent1_id, parent2_id]
+                            if parent_id in self.evaluation_times]
+            if len(parent_costs) > 0:
+                self.cost_estimates[child_id] = float(np.mean(parent_costs))
+
     def _build_new_generation(self, generation: Generation,
                               innovation_number_generator: InnovationNumberGeneratorInterface,
                               species_id_generator: SpeciesIDGeneratorSingleCore,
@@ -170,12 +302,16 @@ class NeatOptimizerMPI(NeatOptimizer):
         new_generation_seed = np.random.RandomState(generation.seed).randint(2 ** 24)
         rnd = np.random.RandomState(new_generation_seed)
 
+        # Use the statistics, that were calculated during the evaluation
+        species_statistics, self.species_statistics = self.species_statistics, {}
+
         # Get the best agents, which will be copied later
         best_agents_genomes = gs.get_best_genomes_from_species(generation.species_list,
-                                                               config.species_size_copy_best_genome)
+                                                               config.species_size_copy_best_genome,
+                                                               species_statistics)
 
         # Get allowed species for reproduction
-        generation = ss.update_fitness_species(generation)
+        generation = ss.update_fitness_species(generation, species_statistics)
         species_list = ss.get_allowed_species_for_reproduction(generation,
                                                                config.species_stagnant_after_generations)
 
@@ -187,10 +323,10 @@ class NeatOptimizerMPI(NeatOptimizer):
         # Calculate the adjusted fitness values
         min_fitness = min([a.fitness for a in generation.agents])
         max_fitness = max([a.fitness for a in generation.agents])
-        species_list = ss.calculate_adjusted_fitness(species_list, min_fitness, max_fitness)
+        species_list = ss.calculate_adjusted_fitness(species_list, min_fitness, max_fitness, species_statistics)
 
         # Remove the low performing genomes
-        species_list = ss.remove_low_genomes(species_list, config.percentage_remove_low_genomes)
+        species_list = ss.remove_low_genomes(species_list, config.percentage_remove_low_genomes, species_statistics)
 
         # Calculate offspring for species
         off_spring_list = ss.calculate_amount_offspring(species_list, config.population_size - len(best_agents_genomes))
@@ -212,40 +348,21 @@ class NeatOptimizerMPI(NeatOptimizer):
 
         # Create agents with crossover
         self._notify_reporters_callback(lambda r: r.on_compose_offsprings_start())
-        for parent1_id, parent2_id, child_id in off_spring_pairs:
-            parent1 = agent_dict[parent1_id]
-            parent2 = agent_dict[parent2_id]
-
-            child_seed = (parent1.genome.seed + parent2.genome.seed) % 2 ** 24
-            rnd_child = np.random.RandomState(child_seed)
-
-            # Perform crossover for to get the nodes and connections for the child
-            if parent1.fitness > parent2.fitness:
-                child_nodes, child_connections = rp.cross_over(parent1.genome, parent2.genome, rnd_child, config)
-            else:
-                child_nodes, child_connections = rp.cross_over(parent2.genome, parent1.genome, rnd_child, config)
-
-            # Create child genome
-            child_genome = Genome(child_seed, child_nodes, child_connections)
-
-            # Mutate genome
-            child_genome = rp.mutate_weights(child_genome, rnd_child, config)
-            child_genome, _, _, _ = rp.mutate_add_node(child_genome, rnd_child, innovation_number_generator, config)
-            child_genome, _ = rp.mutate_add_connection(child_genome, rnd_child, innovation_number_generator, config)
-
-            child_agent = Agent(child_id, child_genome)
-            new_agents.append(child_agent)
+        new_agents += self._compose_offspring(off_spring_pairs, agent_dict, innovation_number_generator, config)
 
         # Notify callback end
         self._notify_reporters_callback(lambda r: r.on_compose_offsprings_end())
 
+        # Estimate the evaluation costs for the scheduling
+        self._estimate_costs(generation, new_agents, off_spring_pairs)
+
         # Select new representative
         existing_species = [ss.select_new_representative(species, rnd) for species in generation.species_list]
         # Reset members and fitness
         existing_species = [ss.reset_species(species) for species in existing_species]
 
         # Sort members into species
-        new_species_list = ss.sort_agents_into_species(existing_species, new_agents, species_id_generator, config)
+        new_species_list = self._sort_agents_into_species(existing_species, new_agents, species_id_generator, config)
 
         # Filter out empty species
         new_species_list = ss.get_species_with_members(new_species_list)
@@ -255,6 +372,36 @@ class NeatOptimizerMPI(NeatOptimizer):
         self._notify_reporters_callback(lambda r: r.on_reproduction_end(new_generation))
         return new_generation
 
+    def _sort_agents_into_species(self, existing_species: List[Species], agents: List[Agent],
+                                  species_id_generator: SpeciesIDGeneratorSingleCore,
+                                  config: NeatConfig) -> List[Species]:
+        """
+        Sort the new agents into the species. With the distributed speciation, every worker gets a contiguous part of
+        the agents and all representatives and returns the first compatible existing species of its agents.
+        :param existing_species: the species with the new representatives and without members
+        :param agents: the new agents
+        :param species_id_generator: the generator for the ids of new species
+        :param config: the neat config with the compatibility parameters
+        :return: the list of species with the sorted agents
+        """
+        if self.speciation == "master":
+            return ss.sort_agents_into_species(existing_species, agents, species_id_generator, config,
+                                               self.distance_cache)
+
+        encoded_representatives = [es.encode_genome(species.representative) for species in existing_species]
+        encoded_genomes = [es.encode_genome(agent.genome) for agent in agents]
+
+        agent_counts = partitioning.static_partition(len(agents), self._get_amount_workers())
+        agent_displacements = partitioning.get_displacements(agent_counts)
+        futures = [self.executor.submit(neat_worker_mpi.find_compatible_species,
+                                        encoded_genomes[start:start + count], encoded_representatives)
+                   for start, count in zip(agent_displacements.tolist(), agent_counts.tolist()) if count > 0]
+
+        # The parts are contiguous, so the results are concatenated in the order of the agents
+        candidates = np.concatenate([future.result() for future in futures] + [np.zeros(0, dtype=np.int64)])
+        return ss.sort_agents_into_species_with_candidates(existing_species, agents, candidates,
+                                                           species_id_generator, config, self.distance_cache)
+
     def _cleanup(self, challenge: Challenge) -> None:
         self._notify_reporters_callback(lambda r: r.on_cleanup())
 
@@ -0,0 +1,304 @@
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+from loguru import logger
+from mpi4py import MPI
+
+from neat_core.models.agent import Agent
+from neat_core.models.generation import Generation
+from neat_core.models.genome import Genome
+from neat_core.optimizer.challenge import Challenge
+from neat_core.optimizer.generator.inno_num_generator_interface import InnovationNumberGeneratorInterface
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.service import encoding_service as es
+from neat_core.service import generation_service as gs
+from neat_core.service import reproduction_service as rp
+from neat_mpi import neat_worker_mpi
+from neat_mpi import partitioning
+from neat_mpi.inno_number_generator_mpi import InnovationNumberGeneratorMPI, remap_genome
+from neat_single_core.agent_id_generator_single_core import AgentIDGeneratorSingleCore
+from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
+from neat_single_core.neat_optimizer_single_core import NeatOptimizerSingleCore
+from neat_single_core.species_id_generator_single_core import SpeciesIDGeneratorSingleCore
+
+# Commands, that are broadcast from the master to the workers
+COMMAND_STOP = 0
+COMMAND_EVALUATE = 1
+COMMAND_EVALUATE_LOCAL = 2
+COMMAND_COMPOSE = 3
+
+
+class NeatOptimizerMPICollective(NeatOptimizerSingleCore):
+
+    def __init__(self, partition_type: str = "static", reproduction: str = "master"):
+        """
+        MPI optimizer, that drives long lived workers with collective operations instead of a pool executor. Must be
+        started on all ranks (mpiexec -n X python main.py ...). Every generation is sent as one packed buffer of encoded
+        genomes, every rank (including the master) evaluates a contiguous part of the agents and the fitness values are
+        gathered back in one call. The reproduction is done on the master like in the single core optimizer.
+        :param partition_type: "static" splits the agents into parts of the same size, "cost" balances the parts with
+        the size of the genomes as cost estimate
+        :param reproduction: "master" composes the offspring on the master. "distributed" sends the offspring pairs and
+        the parents to all ranks, every rank composes a contiguous part of the children and keeps them for the next
+        evaluation. The children are the same as with "master"
+        """
+        super().__init__()
+        assert partition_type in ["static", "cost"], "Unknown type of partition. Must be 'static' or 'cost'"
+        assert reproduction in ["master", "distributed"], \
+            "Unknown type of reproduction. Must be 'master' or 'distributed'"
+        self.partition_type: str = partition_type
+        self.reproduction: str = reproduction
+
+        self.comm = MPI.COMM_WORLD
+        self.name = MPI.Get_processor_name()
+        self.rank = self.comm.Get_rank()
+        self.size = self.comm.Get_size()
+
+        # The amount of agents of the next generation on every rank, if they were composed by the ranks
+        self._local_agent_counts: np.ndarray = None
+        # The children, that were composed on this rank and are evaluated in the next generation (workers only)
+        self._local_genomes: List[Genome] = []
+
+    def evaluate(self, amount_input_nodes: int, amount_output_nodes,
+                 activation_function, challenge: Challenge, config: NeatConfig,
+                 seed: int) -> None:
+        self._run(challenge, config, lambda i, s, a: gs.create_initial_generation(
+            amount_input_nodes, amount_output_nodes, activation_function, i, s, a, config, seed))
+
+    def evaluate_genome_structure(self, genome_structure: Genome, challenge: Challenge, config: NeatConfig, seed: int):
+        self._run(challenge, config, lambda i, s, a: gs.create_initial_generation_genome(
+            genome_structure, i, s, a, config, seed))
+
+    def _run(self, challenge: Challenge, config: NeatConfig, create_initial_generation: Callable) -> None:
+        # Every rank evaluates agents, so every rank sets up the challenge
+        neat_worker_mpi.setup(challenge, config)
+
+        if self.rank != 0:
+            self._worker_loop()
+            neat_worker_mpi.clean_up()
+            return
+
+        assert self.callback is not None
+        logger.info("Master - Name: {}, Size: {}, Rank {}/{}", self.name, self.size, self.rank, self.size - 1)
+
+        # Initialize Parameters
+        if self.reproduction == "distributed":
+            innovation_number_generator = InnovationNumberGeneratorMPI(self.rank)
+        else:
+            innovation_number_generator = InnovationNumberGeneratorSingleCore()
+        species_id_generator = SpeciesIDGeneratorSingleCore()
+        agent_id_generator = AgentIDGeneratorSingleCore()
+
+        # Notify callback about starting evaluation
+        self._notify_reporters_callback(lambda r: r.on_initialization())
+
+        initial_generation = create_initial_generation(innovation_number_generator, species_id_generator,
+                                                       agent_id_generator)
+        finished_generation = self._evaluation_loop(initial_generation, challenge, innovation_number_generator,
+                                                    species_id_generator, agent_id_generator, config)
+
+        # Stop the workers, finish the evaluation and notify the callback
+        self._broadcast_control(COMMAND_STOP, np.zeros(self.size, dtype=np.int64), np.zeros(self.size, dtype=np.int64))
+        neat_worker_mpi.clean_up()
+        self._notify_reporters_callback(lambda r: r.on_cleanup())
+        self._notify_reporters_callback(lambda r: r.on_finish(finished_generation, self.reporters))
+
+    def _evaluate_generation(self, generation: Generation, challenge: Challenge, config: NeatConfig):
+        # Notify callback
+        self._notify_reporters_callback(lambda r: r.on_generation_evaluation_start(generation))
+
+        if self._local_agent_counts is not None:
+            # The ranks hold the children, that they composed. The best genomes before the children are on the master
+            agent_counts, self._local_agent_counts = self._local_agent_counts.copy(), None
+            agent_counts[0] += len(generation.agents) - np.sum(agent_counts)
+            self._broadcast_control(COMMAND_EVALUATE_LOCAL, agent_counts, np.zeros(self.size, dtype=np.int64))
+            local_genomes = [agent.genome for agent in generation.agents[:agent_counts[0]]]
+            fitness_values, additional_infos = self._evaluate_local_part(agent_counts, local_genomes)
+        else:
+            # Pack all genomes into one buffer and split the agents into contiguous parts
+            encoded_genomes = [es.encode_genome(agent.genome) for agent in generation.agents]
+            packed_genomes, genome_sizes = partitioning.pack_buffers(encoded_genomes)
+            agent_counts = self._partition(genome_sizes)
+            byte_counts = partitioning.get_part_sums(genome_sizes, agent_counts)
+
+            self._broadcast_control(COMMAND_EVALUATE, agent_counts, byte_counts)
+            fitness_values, additional_infos = self._evaluate_part(agent_counts, byte_counts, packed_genomes,
+                                                                   genome_sizes)
+
+        for i, (agent, fitness, additional_info) in enumerate(zip(generation.agents, fitness_values,
+                                                                  additional_infos)):
+            agent.fitness = float(fitness)
+            agent.additional_info = additional_info
+            self._notify_reporters_callback(lambda r: r.on_agent_evaluation_end(i, agent))
+
+        # Notify callback
+        self._notify_reporters_callback(lambda r: r.on_generation_evaluation_end(generation, self.reporters))
+        return generation
+
+    def _compose_offspring(self, off_spring_pairs: List[Tuple[int, int, int]], agent_dict: Dict[int, Agent],
+                           innovation_number_generator: InnovationNumberGeneratorInterface,
+                           config: NeatConfig) -> List[Agent]:
+        if self.reproduction == "master":
+            return super()._compose_offspring(off_spring_pairs, agent_dict, innovation_number_generator, config)
+
+        # Every rank composes a contiguous part of the children
+        child_counts = partitioning.static_partition(len(off_spring_pairs), self.size)
+        self._local_agent_counts = child_counts
+
+        parent_ids = {parent_id for pair in off_spring_pairs for parent_id in pair[:2]}
+        parents = {parent_id: (es.encode_genome(agent_dict[parent_id].genome), agent_dict[parent_id].fitness)
+                   for parent_id in parent_ids}
+        compose_info = (innovation_number_generator.generation, innovation_number_generator.node_counter,
+                        innovation_number_generator.connection_counter, off_spring_pairs, parents)
+
+        self._broadcast_control(COMMAND_COMPOSE, child_counts, np.zeros(self.size, dtype=np.int64))
+        genomes = self._compose_part(child_counts, innovation_number_generator, compose_info, agent_dict)
+        return [Agent(child_id, genome) for (_, _, child_id), genome in zip(off_spring_pairs, genomes)]
+
+    def _compose_part(self, child_counts: np.ndarray, innovation_number_generator: InnovationNumberGeneratorMPI,
+                      compose_info: Tuple = None, agent_dict: Dict[int, Agent] = None):
+        """
+        Compose the children of this rank, merge the new innovations of all ranks and gather the children on the master
+        :param child_counts: the amount of children for every rank
+        :param innovation_number_generator: the generator of this rank
+        :param compose_info: the generation number, the counters of the generator, the offspring pairs and the encoded
+        parents with their fitness, only required on the master
+        :param agent_dict: the agents of the current generation, only required on the master
+        :return: the genomes of all children on the master, None on the workers
+        """
+        generation_number, node_counter, connection_counter, off_spring_pairs, parents = \
+            self.comm.bcast(compose_info, root=0)
+
+        is_master = self.rank == 0
+        if not is_master:
+            innovation_number_generator.node_counter = node_counter
+            innovation_number_generator.connection_counter = connection_counter
+            innovation_number_generator.next_generation(generation_number)
+            agent_dict = {}
+            for parent_id, (encoded_genome, fitness) in parents.items():
+                agent_dict[parent_id] = Agent(parent_id, es.decode_genome(encoded_genome))
+                agent_dict[parent_id].fitness = fitness
+
+        start = int(partitioning.get_displacements(child_counts)[self.rank])
+        genomes = [rp.compose_offspring_genome(agent_dict[parent1_id], agent_dict[parent2_id],
+                                               innovation_number_generator, neat_worker_mpi.neat_config)
+                   for parent1_id, parent2_id, _ in off_spring_pairs[start:start + child_counts[self.rank]]]
+
+        # Replace the provisional innovation numbers, all ranks merge the innovations in the same way
+        innovations = self.comm.allgather(innovation_number_generator.get_new_innovations())
+        node_mapping, connection_mapping = innovation_number_generator.apply_innovations(innovations)
+        genomes = [remap_genome(genome, node_mapping, connection_mapping) for genome in genomes]
+
+        # The workers keep their children for the next evaluation, the master requires all of them for the speciation
+        gathered_genomes = self.comm.gather([es.encode_genome(genome) for genome in genomes] if not is_master else [],
+                                            root=0)
+        if not is_master:
+            self._local_genomes = genomes
+            return None
+        return genomes + [es.decode_genome(data) for encoded_genomes in gathered_genomes[1:]
+                          for data in encoded_genomes]
+
+    def _partition(self, genome_sizes: np.ndarray) -> np.ndarray:
+        """
+        Split the agents into one contiguous part per rank
+        :param genome_sizes: the size of every encoded genome, used as cost estimate
+        :return: the amount of agents for every rank
+        """
+        if self.partition_type == "cost":
+            return partitioning.cost_partition(genome_sizes, self.size)
+        return partitioning.static_partition(len(genome_sizes), self.size)
+
+    def _broadcast_control(self, command: int, agent_counts: np.ndarray, byte_counts: np.ndarray) -> None:
+        """
+        Broadcast the command and the sizes of the parts from the master to all workers
+        :param command: the command for the workers
+        :param agent_counts: the amount of agents for every rank
+        :param byte_counts: the amount of bytes of the encoded genomes for every rank
+        :return: None
+        """
+        control = np.concatenate([[command], agent_counts, byte_counts]).astype(np.int64)
+        self.comm.Bcast([control, MPI.INT64_T], root=0)
+
+    def _worker_loop(self) -> None:
+        """
+        Wait for the commands of the master and evaluate the received parts, until the master stops the workers
+        :return: None
+        """
+        innovation_number_generator = InnovationNumberGeneratorMPI(self.rank)
+        while True:
+            control = np.zeros(1 + 2 * self.size, dtype=np.int64)
+            self.comm.Bcast([control, MPI.INT64_T], root=0)
+
+            if control[0] == COMMAND_STOP:
+                logger.info("Worker with rank {} stopped", self.rank)
+                break
+
+            agent_counts = control[1:1 + self.size]
+            byte_counts = control[1 + self.size:]
+            if control[0] == COMMAND_COMPOSE:
+                self._compose_part(agent_counts, innovation_number_generator)
+            elif control[0] == COMMAND_EVALUATE_LOCAL:
+                local_genomes, self._local_genomes = self._local_genomes, []
+                self._evaluate_local_part(agent_counts, local_genomes)
+            else:
+                self._evaluate_part(agent_counts, byte_counts)
+
+    def _evaluate_part(self, agent_counts: np.ndarray, byte_counts: np.ndarray, packed_genomes: np.ndarray = None,
+                       genome_sizes: np.ndarray = None):
+        """
+        Scatter the packed genomes, evaluate the part of this rank and gather the results on the master
+        :param agent_counts: the amount of agents for every rank
+        :param byte_counts: the amount of bytes of the encoded genomes for every rank
+        :param packed_genomes: the packed encoded genomes, only required on the master
+        :param genome_sizes: the size of every encoded genome, only required on the master
+        :return: the fitness values and additional infos of all agents on the master, None on the workers
+        """
+        agent_displacements = partitioning.get_displacements(agent_counts)
+        byte_displacements = partitioning.get_displacements(byte_counts)
+
+        # Receive the genomes of this rank
+        local_sizes = np.zeros(agent_counts[self.rank], dtype=np.int64)
+        local_genomes = np.zeros(byte_counts[self.rank], dtype=np.uint8)
+        is_master = self.rank == 0
+        self.comm.Scatterv([genome_sizes, agent_counts, agent_displacements, MPI.INT64_T] if is_master else None,
+                           [local_sizes, MPI.INT64_T], root=0)
+        self.comm.Scatterv([packed_genomes, byte_counts, byte_displacements, MPI.BYTE] if is_master else None,
+                           [local_genomes, MPI.BYTE], root=0)
+
+        # Evaluate the agents of this rank
+        local_results = [neat_worker_mpi.evaluate_encoded_genome(data)
+                         for data in partitioning.unpack_buffers(local_genomes, local_sizes)]
+        return self._gather_results(agent_counts, local_results)
+
+    def _evaluate_local_part(self, agent_counts: np.ndarray, local_genomes: List[Genome]):
+        """
+        Evaluate the genomes, that are stored on this rank, and gather the results on the master
+        :param agent_counts: the amount of agents for every rank
+        :param local_genomes: the genomes of this rank
+        :return: the fitness values and additional infos of all agents on the master, None on the workers
+        """
+        assert len(local_genomes) == agent_counts[self.rank]
+        local_results = [neat_worker_mpi.evaluate_genome(genome) for genome in local_genomes]
+        return self._gather_results(agent_counts, local_results)
+
+    def _gather_results(self, agent_counts: np.ndarray, local_results: List[Tuple[float, object]]):
+        """
+        Send the results of this rank to the master
+        :param agent_counts: the amount of agents for every rank
+        :param local_results: the fitness and additional info of every agent of this rank
+        :return: the fitness values and additional infos of all agents on the master, None on the workers
+        """
+        agent_displacements = partitioning.get_displacements(agent_counts)
+        is_master = self.rank == 0
+        local_fitness = np.array([fitness for fitness, _ in local_results], dtype=np.float64)
+        local_infos = [additional_info for _, additional_info in local_results]
+
+        fitness_values = np.zeros(np.sum(agent_counts), dtype=np.float64) if is_master else None
+        self.comm.Gatherv([local_fitness, MPI.DOUBLE],
+                          [fitness_values, agent_counts, agent_displacements, MPI.DOUBLE] if is_master else None,
+                          root=0)
+        gathered_infos = self.comm.gather(local_infos, root=0)
+
+        if not is_master:
+            return None
+        return fitness_values, [additional_info for infos in gathered_infos for additional_info in infos]
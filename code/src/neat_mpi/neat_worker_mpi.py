@@ -1,9 +1,19 @@
+import time
+from typing import Callable, Hashable, List, Optional
+
+import numpy as np
 from loguru import logger
 from mpi4py import MPI
 
 from neat_core.models.agent import Agent
+from neat_core.models.genome import Genome
 from neat_core.optimizer.challenge import Challenge
-from neural_network.basic_neural_network import BasicNeuralNetwork
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.service import encoding_service
+from neat_core.service import species_service
+from neural_network import neural_network_factory
+from neural_network.network_cache import NetworkCache, create_network_fingerprint
+from neural_network.neural_network_interface import NeuralNetworkInterface
 
 initialized = False
 
@@ -12,19 +22,26 @@ rank = None
 size = None
 name = None
 challenge: Challenge = None
+neural_network_type: str = "basic"
+neat_config: NeatConfig = None
+network_cache: NetworkCache = NetworkCache(0)
 
 
-def setup(c: Challenge) -> None:
+def setup(c: Challenge, config: NeatConfig) -> None:
     """
     Setup a MPI worker with the given parameters
     :param c: the challenge for the worker
+    :param config: the neat config, that specifies the used neural network and the compatibility parameters
     :return: None
     """
-    global initialized, comm, rank, size, name, challenge
+    global initialized, comm, rank, size, name, challenge, neural_network_type, neat_config, network_cache
     comm = MPI.COMM_WORLD
     name = MPI.Get_processor_name()
     rank = comm.Get_rank()
     size = comm.Get_size()
+    neural_network_type = config.neural_network_type
+    neat_config = config
+    network_cache = NetworkCache(config.network_cache_size, config.network_cache_results)
 
     # Set up the challenge
     _setup_challenge(c)
@@ -63,15 +80,113 @@ def _clean_up_challenge():
 
 
 def evaluate_agent(agent: Agent):
-    global challenge
+    return evaluate_genome(agent.genome)
+
+
+def evaluate_genome(genome: Genome):
+    """
+    Evaluate a genome, that is stored on this rank
+    :param genome: the genome, that should be evaluated
+    :return: the fitness and the additional info of the challenge
+    """
+    global network_cache
+
+    fingerprint = create_network_fingerprint(genome) if network_cache.is_enabled() else None
+    return _evaluate_cached(fingerprint, lambda: _build_neural_network(genome))
 
-    challenge.before_evaluation()
 
-    nn = BasicNeuralNetwork()
-    nn.build(agent.genome)
+def evaluate_encoded_genome(data: bytes):
+    """
+    Evaluate a genome, that was encoded with the encoding service. The compiled and layered networks are built
+    directly from the encoded arrays, other networks are built from the decoded genome.
+    :param data: the encoded genome
+    :return: the fitness and the additional info of the challenge
+    """
+    global network_cache
 
+    # The encoded genome itself is the fingerprint, it contains everything that is used to build the network
+    fingerprint = data if network_cache.is_enabled() else None
+    return _evaluate_cached(fingerprint, lambda: _build_neural_network_from_encoding(data))
+
+
+def _evaluate_cached(fingerprint: Optional[Hashable], build_neural_network: Callable[[], NeuralNetworkInterface]):
+    """
+    Evaluate the network with the challenge. Unchanged genomes use the cached network or result
+    :param fingerprint: the fingerprint of the network, None if the cache is not used
+    :param build_neural_network: builds the network, if it is not cached
+    :return: the fitness and the additional info of the challenge
+    """
+    global challenge, network_cache
+
+    result = network_cache.get_result(fingerprint)
+    if result is not None:
+        return result
+
+    challenge.before_evaluation()
+
+    nn = network_cache.get_neural_network(fingerprint, build_neural_network)
     fitness, additional_info = challenge.evaluate(nn)
+    network_cache.put_result(fingerprint, fitness, additional_info)
 
     challenge.after_evaluation()
 
     return fitness, additional_info
+
+
+def _build_neural_network(genome: Genome) -> NeuralNetworkInterface:
+    global neural_network_type
+
+    nn = neural_network_factory.create_neural_network(neural_network_type)
+    nn.build(genome)
+    return nn
+
+
+def _build_neural_network_from_encoding(data: bytes) -> NeuralNetworkInterface:
+    """
+    Build the network from an encoded genome. The compiled, layered and recurrent networks are built directly from the
+    encoded arrays, other networks are built from the decoded genome.
+    :param data: the encoded genome
+    :return: the built network
+    """
+    global neural_network_type
+
+    seed, nodes, connections = encoding_service.decode_genome_arrays(data)
+    if neural_network_type in ("compiled", "layered", "recurrent"):
+        nn = neural_network_factory.create_neural_network(neural_network_type)
+        nn.build_from_arrays(nodes, connections)
+    else:
+        nn = neural_network_factory.create_neural_network(neural_network_type)
+        nn.build(encoding_service.arrays_to_genome(seed, nodes, connections))
+    return nn
+
+
+def evaluate_encoded_genomes(encoded_genomes: List[bytes]):
+    """
+    Evaluate a chunk of encoded genomes and measure the required time
+    :param encoded_genomes: the encoded genomes
+    :return: the rank of the worker, the time the worker was busy with the chunk and a list with the fitness, the
+    additional info and the evaluation time of every genome
+    """
+    start_time = time.time()
+
+    results = []
+    for data in encoded_genomes:
+        start_time_genome = time.time()
+        fitness, additional_info = evaluate_encoded_genome(data)
+        results.append((fitness, additional_info, time.time() - start_time_genome))
+
+    return rank, time.time() - start_time, results
+
+
+def find_compatible_species(encoded_genomes: List[bytes], encoded_representatives: List[bytes]) -> np.ndarray:
+    """
+    Find the first compatible species for a part of the new agents
+    :param encoded_genomes: the encoded genomes of the agents
+    :param encoded_representatives: the encoded representatives of the existing species
+    :return: the index of the first compatible species for every genome, -1 if no species is compatible
+    """
+    global neat_config
+
+    genomes = [encoding_service.decode_genome(data) for data in encoded_genomes]
+    representatives = [encoding_service.decode_genome(data) for data in encoded_representatives]
+    return species_service.find_compatible_species(genomes, representatives, neat_config)
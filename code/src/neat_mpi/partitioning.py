@@ -0,0 +1,121 @@
+from typing import List, Tuple
+
+import numpy as np
+
+
+def static_partition(amount_items: int, amount_parts: int) -> np.ndarray:
+    """
+    Split the items into contiguous parts with nearly the same size. The first parts get one item more, if the items
+    can't be split evenly.
+    :param amount_items: the amount of items, that should be split
+    :param amount_parts: the amount of parts
+    :return: the amount of items in every part
+    """
+    assert amount_parts >= 1
+    counts = np.full(amount_parts, amount_items // amount_parts, dtype=np.int64)
+    counts[:amount_items % amount_parts] += 1
+    return counts
+
+
+def cost_partition(costs: np.ndarray, amount_parts: int) -> np.ndarray:
+    """
+    Split the items into contiguous parts, so that every part has nearly the same sum of costs
+    :param costs: the estimated costs of every item, must be positive
+    :param amount_parts: the amount of parts
+    :return: the amount of items in every part
+    """
+    assert amount_parts >= 1
+    costs = np.asarray(costs, dtype=np.float64)
+    if len(costs) == 0:
+        return np.zeros(amount_parts, dtype=np.int64)
+
+    # The part k ends at the boundary, whose cumulative cost is closest to k / amount_parts of the total cost
+    cumulative_costs = np.concatenate([[0], np.cumsum(costs)])
+    targets = cumulative_costs[-1] * np.arange(1, amount_parts) / amount_parts
+    boundaries = np.clip(np.searchsorted(cumulative_costs, targets, side="left"), 1, len(costs))
+    take_before = targets - cumulative_costs[boundaries - 1] < cumulative_costs[boundaries] - targets
+    boundaries = boundaries - take_before
+
+    boundaries = np.concatenate([[0], boundaries, [len(costs)]])
+    return np.diff(np.maximum.accumulate(boundaries)).astype(np.int64)
+
+
+def guided_chunks(costs: np.ndarray, amount_workers: int, min_chunk_size: int = 1) -> List[np.ndarray]:
+    """
+    Split the items into chunks for guided self scheduling. The expensive items are scheduled first and every chunk
+    contains about 1 / amount_workers of the remaining costs, so the chunks start large and shrink as the queue drains.
+    :param costs: the estimated costs of every item, must be positive
+    :param amount_workers: the amount of workers, that take chunks from the queue
+    :param min_chunk_size: the minimum amount of items in a chunk
+    :return: the indices of the items in every chunk, in the order they should be scheduled
+    """
+    assert amount_workers >= 1
+    assert min_chunk_size >= 1
+    costs = np.asarray(costs, dtype=np.float64)
+
+    order = np.argsort(-costs, kind="stable")
+    cumulative_costs = np.cumsum(costs[order])
+    total_cost = cumulative_costs[-1] if len(costs) > 0 else 0.0
+
+    chunks = []
+    start = 0
+    while start < len(costs):
+        scheduled_cost = cumulative_costs[start - 1] if start > 0 else 0.0
+        target = scheduled_cost + (total_cost - scheduled_cost) / amount_workers
+        # The chunk ends at the boundary, whose cumulative cost is closest to the target
+        end = min(int(np.searchsorted(cumulative_costs, target, side="left")), len(costs) - 1)
+        if target - (cumulative_costs[end - 1] if end > 0 else 0.0) < cumulative_costs[end] - target:
+            end -= 1
+        end += 1
+        end = max(end, start + min_chunk_size)
+        # A remainder smaller than the minimum chunk size is added to the last chunk
+        if len(costs) - end < min_chunk_size:
+            end = len(costs)
+        chunks.append(order[start:end])
+        start = end
+    return chunks
+
+
+def get_displacements(counts: np.ndarray) -> np.ndarray:
+    """
+    Calculate the start index of every part
+    :param counts: the amount of items in every part
+    :return: the displacements of the parts
+    """
+    return np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+
+
+def get_part_sums(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Sum up the values of every contiguous part
+    :param values: the values of all items
+    :param counts: the amount of items in every part
+    :return: the sum of the values for every part
+    """
+    cumulative_values = np.concatenate([[0], np.cumsum(values)])
+    ends = np.cumsum(counts)
+    return (cumulative_values[ends] - cumulative_values[ends - counts]).astype(np.asarray(values).dtype)
+
+
+def pack_buffers(buffers: List[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pack multiple byte buffers into one contiguous buffer
+    :param buffers: the buffers, that should be packed
+    :return: the packed buffer (uint8) and the size of every buffer (int64)
+    """
+    sizes = np.array([len(buffer) for buffer in buffers], dtype=np.int64)
+    packed = np.frombuffer(b"".join(buffers), dtype=np.uint8)
+    return packed, sizes
+
+
+def unpack_buffers(packed: np.ndarray, sizes: np.ndarray) -> List[bytes]:
+    """
+    Split the packed buffer into the original buffers
+    :param packed: the packed buffer
+    :param sizes: the size of every buffer
+    :return: the original buffers
+    """
+    data = packed.tobytes()
+    ends = np.cumsum(sizes).tolist()
+    starts = [0] + ends[:-1]
+    return [data[start:end] for start, end in zip(starts, ends)]
@@ -0,0 +1,8 @@
+from neat_core.optimizer.generator.species_id_generator_interface import SpeciesIDGeneratorInterface
+from neat_mpi.id_block_generator import IDBlockGenerator
+
+
+class SpeciesIDGeneratorMPI(IDBlockGenerator, SpeciesIDGeneratorInterface):
+
+    def get_species_id(self) -> int:
+        return self.get_id()
@@ -0,0 +1,139 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, Future, as_completed
+from typing import Dict, Tuple
+
+from neat_core.models.agent import Agent
+from neat_core.models.distance_cache import DistanceCache
+from neat_core.models.generation import Generation
+from neat_core.models.genome import Genome
+from neat_core.optimizer.batch_challenge import warn_ignored_settings
+from neat_core.optimizer.challenge import Challenge
+from neat_core.optimizer.generator.inno_num_generator_interface import InnovationNumberGeneratorInterface
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_multiprocess import neat_worker_multiprocess
+from neat_single_core.agent_id_generator_single_core import AgentIDGeneratorSingleCore
+from neat_single_core.neat_optimizer_single_core import NeatOptimizerSingleCore
+from neat_single_core.species_id_generator_single_core import SpeciesIDGeneratorSingleCore
+
+
+class NeatOptimizerMultiprocess(NeatOptimizerSingleCore):
+
+    def __init__(self, amount_processes: int = None, target_chunk_time: float = 0.2, min_chunks_per_process: int = 4,
+                 mode: str = "generational"):
+        """
+        Optimizer, that evaluates the agents in a pool of worker processes on the local machine. The workers are started
+        once per evaluation and reused for all generations. The reproduction is done in the main process like in the
+        single core optimizer.
+        :param amount_processes: the amount of worker processes, by default the amount of cpu cores
+        :param target_chunk_time: the desired evaluation time of one chunk of agents in seconds
+        :param min_chunks_per_process: the minimum amount of chunks per process, so that the work is balanced
+        :param mode: "generational" evaluates and reproduces whole generations, "steady_state" creates a new offspring
+        for every returned result, so the workers don't wait for the reproduction
+        """
+        super().__init__()
+        assert mode in ["generational", "steady_state"], \
+            "Unknown type of mode. Must be 'generational' or 'steady_state'"
+        self.mode: str = mode
+        self.amount_processes: int = os.cpu_count() if amount_processes is None else amount_processes
+        self.target_chunk_time: float = target_chunk_time
+        self.min_chunks_per_process: int = min_chunks_per_process
+        self.executor: ProcessPoolExecutor = None
+
+        # Measured evaluation time of one agent in one process, None if nothing is measured
+        self.agent_evaluation_time: float = None
+
+    def evaluate(self, amount_input_nodes: int, amount_output_nodes,
+                 activation_function, challenge: Challenge, config: NeatConfig,
+                 seed: int) -> None:
+        with self._create_executor(challenge, config):
+            super().evaluate(amount_input_nodes, amount_output_nodes, activation_function, challenge, config, seed)
+
+    def evaluate_genome_structure(self, genome_structure: Genome, challenge: Challenge, config: NeatConfig, seed: int):
+        with self._create_executor(challenge, config):
+            super().evaluate_genome_structure(genome_structure, challenge, config, seed)
+
+    def _create_executor(self, challenge: Challenge, config: NeatConfig) -> ProcessPoolExecutor:
+        """
+        Create the process pool. Every worker initializes the challenge once, when it is started.
+        :param challenge: the challenge for the workers
+        :param config: the neat config
+        :return: the process pool executor
+        """
+        self.agent_evaluation_time = None
+        self.executor = ProcessPoolExecutor(max_workers=self.amount_processes,
+                                            initializer=neat_worker_multiprocess.setup,
+                                            initargs=(challenge, config))
+        return self.executor
+
+    def _evaluation_loop(self, generation: Generation, challenge: Challenge,
+                         innovation_number_generator: InnovationNumberGeneratorInterface,
+                         species_id_generator: SpeciesIDGeneratorSingleCore,
+                         agent_id_generator: AgentIDGeneratorSingleCore,
+                         config: NeatConfig) -> Generation:
+        if self.mode == "generational":
+            return super()._evaluation_loop(generation, challenge, innovation_number_generator, species_id_generator,
+                                            agent_id_generator, config)
+
+        # The initial generation is evaluated at once, afterwards the population is updated with every result
+        self.distance_cache = DistanceCache(config.compatibility_distance_cache_size)
+        warn_ignored_settings(challenge, config)
+        current_generation = self._evaluate_generation(generation, challenge, config)
+        if self.callback.finish_evaluation(current_generation):
+            return current_generation
+
+        def submit_genome(genome: Genome) -> Future:
+            return self.executor.submit(neat_worker_multiprocess.evaluate_genomes, [genome])
+
+        def parse_result(future: Future, agent: Agent) -> Tuple[float, Dict[str, object]]:
+            (fitness, additional_info), = future.result()
+            return fitness, additional_info
+
+        return self._evaluation_loop_steady_state(current_generation, innovation_number_generator, species_id_generator,
+                                                  agent_id_generator, config, 2 * self.amount_processes, submit_genome,
+                                                  parse_result)
+
+    def _evaluate_generation(self, generation: Generation, challenge: Challenge, config: NeatConfig):
+        # Notify callback
+        self._notify_reporters_callback(lambda r: r.on_generation_evaluation_start(generation))
+        start_time = time.time()
+
+        # Send the genomes in chunks to the workers
+        chunk_size = self._calculate_chunk_size(len(generation.agents))
+        chunks = [range(i, min(i + chunk_size, len(generation.agents)))
+                  for i in range(0, len(generation.agents), chunk_size)]
+        futures = {self.executor.submit(neat_worker_multiprocess.evaluate_genomes,
+                                        [generation.agents[i].genome for i in chunk]): chunk for chunk in chunks}
+
+        # Process the results as they arrive, the species statistics are calculated while other chunks are evaluated
+        self._prepare_species_statistics(generation)
+        for future in as_completed(futures):
+            for i, (fitness, additional_info) in zip(futures[future], future.result()):
+                agent = generation.agents[i]
+                agent.fitness = fitness
+                agent.additional_info = additional_info
+                self._notify_reporters_callback(lambda r: r.on_agent_evaluation_end(i, agent))
+                self._update_species_statistics(agent)
+
+        # Estimate the evaluation time of one agent for the next chunk size
+        required_time = time.time() - start_time
+        self.agent_evaluation_time = required_time * min(self.amount_processes, len(chunks)) / len(generation.agents)
+
+        # Notify callback
+        self._notify_reporters_callback(lambda r: r.on_generation_evaluation_end(generation, self.reporters))
+        return generation
+
+    def _calculate_chunk_size(self, amount_agents: int) -> int:
+        """
+        Calculate the amount of agents, that are sent together to a worker. Chunks should be large enough to hide the
+        communication overhead, but every process should get multiple chunks to balance the load.
+        :param amount_agents: the amount of agents, that should be evaluated
+        :return: the chunk size, at least 1
+        """
+        balanced_size = math.ceil(amount_agents / (self.amount_processes * self.min_chunks_per_process))
+        if self.agent_evaluation_time is None or self.agent_evaluation_time <= 0:
+            return max(1, balanced_size)
+
+        timed_size = int(self.target_chunk_time / self.agent_evaluation_time)
+        return max(1, min(balanced_size, timed_size))
@@ -0,0 +1,88 @@
+import os
+from multiprocessing.util import Finalize
+from typing import List, Tuple, Dict
+
+from loguru import logger
+
+from neat_core.models.genome import Genome
+from neat_core.optimizer.batch_challenge import use_batch_evaluation
+from neat_core.optimizer.challenge import Challenge
+from neat_core.optimizer.neat_config import NeatConfig
+from neural_network import neural_network_factory
+from neural_network.population_network import PopulationNetwork
+
+initialized = False
+
+challenge: Challenge = None
+neural_network_type: str = "basic"
+batch_evaluation: bool = False
+
+
+def setup(c: Challenge, config: NeatConfig) -> None:
+    """
+    Setup a worker process with the given parameters. Called once when the process is started. The challenge is
+    cleaned up, when the process exits after the shutdown of the executor.
+    :param c: the challenge for the worker
+    :param config: the neat config, that specifies the used neural network and the batch evaluation
+    :return: None
+    """
+    global initialized, challenge, neural_network_type, batch_evaluation
+    neural_network_type = config.neural_network_type
+    batch_evaluation = use_batch_evaluation(c, config)
+
+    # Set up the challenge
+    challenge = c
+    challenge.initialization()
+    Finalize(None, clean_up, exitpriority=10)
+
+    initialized = True
+    logger.info("Worker Setup - Process ID: {}", os.getpid())
+
+
+def clean_up() -> None:
+    """
+    Cleanup the challenge of the worker
+    :return: None
+    """
+    global initialized
+
+    if not initialized:
+        logger.error("Worker is not initialized")
+        return
+
+    challenge.clean_up()
+    initialized = False
+
+
+def evaluate_genomes(genomes: List[Genome]) -> List[Tuple[float, Dict[str, object]]]:
+    """
+    Evaluate a chunk of genomes with the challenge of the worker. Batch challenges evaluate the whole chunk at once.
+    :param genomes: the genomes that should be evaluated
+    :return: the fitness and additional info for every genome
+    """
+    if batch_evaluation:
+        population_network = PopulationNetwork()
+        population_network.build(genomes)
+
+        challenge.before_evaluation()
+        results = challenge.evaluate_population(population_network)
+        challenge.after_evaluation()
+        return results
+
+    return [evaluate_genome(genome) for genome in genomes]
+
+
+def evaluate_genome(genome: Genome) -> Tuple[float, Dict[str, object]]:
+    """
+    Evaluate a single genome with the challenge of the worker
+    :param genome: the genome that should be evaluated
+    :return: the fitness and additional info
+    """
+    challenge.before_evaluation()
+
+    nn = neural_network_factory.create_neural_network(neural_network_type)
+    nn.build(genome)
+    fitness, additional_info = challenge.evaluate(nn)
+
+    challenge.after_evaluation()
+    return fitness, additional_info
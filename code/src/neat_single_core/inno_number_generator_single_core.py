@@ -1,4 +1,5 @@
-from typing import Union
+import sys
+from typing import Dict, Optional, Tuple, Union
 
 from neat_core.models.node import Node
 from neat_core.optimizer.generator.inno_num_generator_interface import InnovationNumberGeneratorInterface
@@ -6,20 +7,37 @@ from neat_core.optimizer.generator.inno_num_generator_interface import Innovatio
 
 class InnovationNumberGeneratorSingleCore(InnovationNumberGeneratorInterface):
 
-    def __init__(self) -> None:
+    def __init__(self, connection_innovation_expiry: Optional[int] = None) -> None:
+        """
+        Create a generator for innovation numbers. The innovations are stored in dicts with the innovation numbers of
+        the two nodes as key, so the lookup does not depend on the amount of stored innovations.
+        :param connection_innovation_expiry: the amount of generations, after which an unused connection innovation is
+        removed. A connection between the same nodes receives then a new innovation number. None keeps all innovations
+        """
+        assert connection_innovation_expiry is None or connection_innovation_expiry > 0
+
         self.node_counter = 0
         self.connection_counter = 0
+        self.connection_innovation_expiry = connection_innovation_expiry
+        self.generation = 0
 
-        self.node_innovations = []
-        self.connection_innovations = []
+        # (input node, output node) -> innovation number
+        self.node_innovations: Dict[Tuple, Union[int, str]] = {}
+        # (input node, output node) -> (innovation number, generation of the last usage), ordered by the last usage
+        self.connection_innovations: Dict[Tuple, Tuple[Union[int, str], int]] = {}
 
     def next_generation(self, generation: int) -> None:
         """
-        Indicate that a new generation is evaluated. This resets the stored node innovations
-        :param generation: not used
+        Indicate that a new generation is evaluated. This resets the stored node innovations and removes the expired
+        connection innovations
+        :param generation: the number of the new generation
         :return: None
         """
-        self.node_innovations = []
+        self.generation = generation
+        self.node_innovations = {}
+
+        if self.connection_innovation_expiry is not None:
+            self._remove_expired_connection_innovations(generation - self.connection_innovation_expiry)
 
     def get_node_innovation_number(self, node1: Node = None, node2: Node = None) -> Union[int, str]:
         """
@@ -33,13 +51,14 @@ class InnovationNumberGeneratorSingleCore(InnovationNumberGeneratorInterface):
         if node1 is None or node2 is None:
             return self._get_new_node_number()
 
-        for n1_innovation, n2_innovation, innovation in self.node_innovations:
-            if n1_innovation == node1.innovation_number and n2_innovation == node2.innovation_number:
-                return innovation
+        key = (node1.innovation_number, node2.innovation_number)
+        innovation = self.node_innovations.get(key)
+        if innovation is not None:
+            return innovation
 
         # No stored record found, create a new one
         new_number = self._get_new_node_number()
-        self.node_innovations.append((node1.innovation_number, node2.innovation_number, new_number))
+        self.node_innovations[key] = new_number
 
         return new_number
 
@@ -54,15 +73,40 @@ class InnovationNumberGeneratorSingleCore(InnovationNumberGeneratorInterface):
         if input_node is None or output_node is None:
             return self._get_new_connection_number()
 
-        for n1_innovation, n2_innovation, innovation in self.connection_innovations:
-            if n1_innovation == input_node.innovation_number and n2_innovation == output_node.innovation_number:
-                return innovation
-
+        key = (input_node.innovation_number, output_node.innovation_number)
+        record = self.connection_innovations.pop(key, None)
         # No stored record found, create a new one
-        new_number = self._get_new_connection_number()
-        self.connection_innovations.append((input_node.innovation_number, output_node.innovation_number, new_number))
+        innovation = self._get_new_connection_number() if record is None else record[0]
 
-        return new_number
+        # Insert the record again, so the dict stays ordered by the last usage
+        self.connection_innovations[key] = (innovation, self.generation)
+        return innovation
+
+    def get_memory_usage(self) -> int:
+        """
+        Estimate the memory, that is used by the stored innovations
+        :return: the size of the dicts, keys and values in bytes
+        """
+        memory = sys.getsizeof(self.node_innovations) + sys.getsizeof(self.connection_innovations)
+        memory += sum(sys.getsizeof(key) for key in self.node_innovations)
+        memory += sum(sys.getsizeof(key) + sys.getsizeof(value) for key, value in self.connection_innovations.items())
+        return memory
+
+    def _remove_expired_connection_innovations(self, min_generation: int) -> None:
+        """
+        Remove the connection innovations, that were last used before the given generation. The dict is ordered by the
+        last usage, so only the expired records are visited
+        :param min_generation: the innovations, which were used in this or a later generation are kept
+        :return: None
+        """
+        expired_keys = []
+        for key, (_, last_generation) in self.connection_innovations.items():
+            if last_generation >= min_generation:
+                break
+            expired_keys.append(key)
+
+        for key in expired_keys:
+            del self.connection_innovations[key]
 
     def _get_new_node_number(self) -> Union[int, str]:
         """
@@ -2,23 +2,31 @@ import numpy as np
 from loguru import logger
 
 from neat_core.models.agent import Agent
+from neat_core.models.distance_cache import DistanceCache
 from neat_core.models.generation import Generation
 from neat_core.models.genome import Genome
+from neat_core.optimizer.batch_challenge import BatchChallenge, use_batch_evaluation, warn_ignored_settings
 from neat_core.optimizer.challenge import Challenge
 from neat_core.optimizer.generator.inno_num_generator_interface import InnovationNumberGeneratorInterface
 from neat_core.optimizer.neat_config import NeatConfig
 from neat_core.optimizer.neat_optimizer import NeatOptimizer
 from neat_core.service import generation_service as gs
-from neat_core.service import reproduction_service as rp
 from neat_core.service import species_service as ss
 from neat_single_core.agent_id_generator_single_core import AgentIDGeneratorSingleCore
 from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
 from neat_single_core.species_id_generator_single_core import SpeciesIDGeneratorSingleCore
-from neural_network.basic_neural_network import BasicNeuralNetwork
+from neural_network import neural_network_factory
+from neural_network.network_cache import NetworkCache, create_network_fingerprint
+from neural_network.neural_network_interface import NeuralNetworkInterface
+from neural_network.population_network import PopulationNetwork
 
 
 class NeatOptimizerSingleCore(NeatOptimizer):
 
+    def __init__(self):
+        super().__init__()
+        self.network_cache: NetworkCache = NetworkCache(0)
+
     def evaluate(self, amount_input_nodes: int, amount_output_nodes,
                  activation_function, challenge: Challenge, config: NeatConfig,
                  seed: int) -> None:
@@ -74,9 +82,13 @@ class NeatOptimizerSingleCore(NeatOptimizer):
                          agent_id_generator: AgentIDGeneratorSingleCore,
                          config: NeatConfig) -> Generation:
 
+        self.network_cache = NetworkCache(config.network_cache_size, config.network_cache_results)
+        self.distance_cache = DistanceCache(config.compatibility_distance_cache_size)
+        warn_ignored_settings(challenge, config)
+
         current_generation = generation
         while True:
-            current_generation = self._evaluate_generation(current_generation, challenge)
+            current_generation = self._evaluate_generation(current_generation, challenge, config)
 
             # Should e new generation be built?
             if self.callback.finish_evaluation(current_generation):
@@ -87,26 +99,64 @@ class NeatOptimizerSingleCore(NeatOptimizer):
 
         return current_generation
 
-    def _evaluate_generation(self, generation: Generation, challenge: Challenge):
+    def _evaluate_generation(self, generation: Generation, challenge: Challenge, config: NeatConfig):
         # Notify callback
         self._notify_reporters_callback(lambda r: r.on_generation_evaluation_start(generation))
 
+        # Challenges that support it, evaluate the whole population at once
+        if use_batch_evaluation(challenge, config):
+            return self._evaluate_generation_batch(generation, challenge)
+
         for i, agent in zip(range(len(generation.agents)), generation.agents):
             # Prepare challenge and notify callback
             self._notify_reporters_callback(lambda r: r.on_agent_evaluation_start(i, agent))
-            challenge.before_evaluation()
 
-            # Create and build neural network
-            neural_network = BasicNeuralNetwork()
-            neural_network.build(agent.genome)
+            # Unchanged genomes use the cached network or result
+            fingerprint = create_network_fingerprint(agent.genome) if self.network_cache.is_enabled() else None
+            result = self.network_cache.get_result(fingerprint)
+            if result is None:
+                challenge.before_evaluation()
+
+                # Create and build neural network
+                neural_network = self.network_cache.get_neural_network(
+                    fingerprint, lambda: self._build_neural_network(agent.genome, config))
+
+                # Evaluate agent
+                result = challenge.evaluate(neural_network)
+                self.network_cache.put_result(fingerprint, *result)
+
+                # Postprocess challenge
+                challenge.after_evaluation()
+
+            # Set values and notify callback
+            agent.fitness, agent.additional_info = result
+            self._notify_reporters_callback(lambda r: r.on_agent_evaluation_end(i, agent))
+
+        # Notify callback
+        self._notify_reporters_callback(lambda r: r.on_generation_evaluation_end(generation, self.reporters))
+        return generation
+
+    @staticmethod
+    def _build_neural_network(genome: Genome, config: NeatConfig) -> NeuralNetworkInterface:
+        neural_network = neural_network_factory.create_neural_network(config.neural_network_type)
+        neural_network.build(genome)
+        return neural_network
+
+    def _evaluate_generation_batch(self, generation: Generation, challenge: BatchChallenge):
+        for i, agent in enumerate(generation.agents):
+            self._notify_reporters_callback(lambda r: r.on_agent_evaluation_start(i, agent))
+
+        # Pack all genomes into one network and evaluate them together
+        population_network = PopulationNetwork()
+        population_network.build([agent.genome for agent in generation.agents])
+
+        challenge.before_evaluation()
+        results = challenge.evaluate_population(population_network)
+        challenge.after_evaluation()
 
-            # Evaluate agent, set values
-            fitness, additional_info = challenge.evaluate(neural_network)
+        for i, (agent, (fitness, additional_info)) in enumerate(zip(generation.agents, results)):
             agent.fitness = fitness
             agent.additional_info = additional_info
-
-            # Postprocess challenge and notify callback
-            challenge.after_evaluation()
             self._notify_reporters_callback(lambda r: r.on_agent_evaluation_end(i, agent))
 
         # Notify callback
@@ -125,12 +175,16 @@ class NeatOptimizerSingleCore(NeatOptimizer):
         new_generation_seed = np.random.RandomState(generation.seed).randint(2 ** 24)
         rnd = np.random.RandomState(new_generation_seed)
 
+        # Use the statistics, that were calculated during the evaluation
+        species_statistics, self.species_statistics = self.species_statistics, {}
+
         # Get the best agents, which will be copied later
         best_agents_genomes = gs.get_best_genomes_from_species(generation.species_list,
-                                                               config.species_size_copy_best_genome)
+                                                               config.species_size_copy_best_genome,
+                                                               species_statistics)
 
         # Get allowed species for reproduction
-        generation = ss.update_fitness_species(generation)
+        generation = ss.update_fitness_species(generation, species_statistics)
         species_list = ss.get_allowed_species_for_reproduction(generation,
                                                                config.species_stagnant_after_generations)
 
@@ -142,10 +196,10 @@ class NeatOptimizerSingleCore(NeatOptimizer):
         # Calculate the adjusted fitness values
         min_fitness = min([a.fitness for a in generation.agents])
         max_fitness = max([a.fitness for a in generation.agents])
-        species_list = ss.calculate_adjusted_fitness(species_list, min_fitness, max_fitness)
+        species_list = ss.calculate_adjusted_fitness(species_list, min_fitness, max_fitness, species_statistics)
 
         # Remove the low performing genomes
-        species_list = ss.remove_low_genomes(species_list, config.percentage_remove_low_genomes)
+        species_list = ss.remove_low_genomes(species_list, config.percentage_remove_low_genomes, species_statistics)
 
         # Calculate offspring for species
         off_spring_list = ss.calculate_amount_offspring(species_list, config.population_size - len(best_agents_genomes))
@@ -167,29 +221,7 @@ class NeatOptimizerSingleCore(NeatOptimizer):
 
         # Create agents with crossover
         self._notify_reporters_callback(lambda r: r.on_compose_offsprings_start())
-        for parent1_id, parent2_id, child_id in off_spring_pairs:
-            parent1 = agent_dict[parent1_id]
-            parent2 = agent_dict[parent2_id]
-
-            child_seed = (parent1.genome.seed + parent2.genome.seed) % 2 ** 24
-            rnd_child = np.random.RandomState(child_seed)
-
-            # Perform crossover for to get the nodes and connections for the child
-            if parent1.fitness > parent2.fitness:
-                child_nodes, child_connections = rp.cross_over(parent1.genome, parent2.genome, rnd_child, config)
-            else:
-                child_nodes, child_connections = rp.cross_over(parent2.genome, parent1.genome, rnd_child, config)
-
-            # Create child genome
-            child_genome = Genome(child_seed, child_nodes, child_connections)
-
-            # Mutate genome
-            child_genome = rp.mutate_weights(child_genome, rnd_child, config)
-            child_genome, _, _, _ = rp.mutate_add_node(child_genome, rnd_child, innovation_number_generator, config)
-            child_genome, _ = rp.mutate_add_connection(child_genome, rnd_child, innovation_number_generator, config)
-
-            child_agent = Agent(child_id, child_genome)
-            new_agents.append(child_agent)
+        new_agents += self._compose_offspring(off_spring_pairs, agent_dict, innovation_number_generator, config)
 
         # Notify callback end
         self._notify_reporters_callback(lambda r: r.on_compose_offsprings_end())
@@ -202,7 +234,8 @@ class NeatOptimizerSingleCore(NeatOptimizer):
         # existing_species = [ss.reset_species(species) for species in generation.species_list]
 
         # Sort members into species
-        new_species_list = ss.sort_agents_into_species(existing_species, new_agents, species_id_generator, config)
+        new_species_list = ss.sort_agents_into_species(existing_species, new_agents, species_id_generator, config,
+                                                       self.distance_cache)
         logger.info("Species IDs: {}".format([s.id_ for s in new_species_list]))
         logger.info("Species Mem: {}".format([len(s.members) for s in new_species_list]))
 
@@ -6,6 +6,7 @@ from loguru import logger
 from neat_core.models.connection import Connection
 from neat_core.models.genome import Genome
 from neat_core.models.node import NodeType
+from neural_network.network_pruning import find_required_nodes
 from neural_network.neural_network_interface import NeuralNetworkInterface
 
 
@@ -40,6 +41,10 @@ class BasicNeuralNetwork(NeuralNetworkInterface):
         # Innovation number of nodes to determine calculation order
         self.order: List[Union[int, str]] = []
 
+        # The amount of nodes and connections of the genome, that don't affect the outputs and are not calculated
+        self.amount_pruned_nodes: int = 0
+        self.amount_pruned_connections: int = 0
+
     def build(self, genome: Genome) -> None:
         """
         Build the neural network with the information encoded in the genome.
@@ -51,8 +56,16 @@ class BasicNeuralNetwork(NeuralNetworkInterface):
         # Sort neurons according to output
         sorted_connection = BasicNeuralNetwork._sort_connections(genome.connections)
 
+        # Nodes, that don't affect the outputs, are pruned
+        required_nodes = find_required_nodes(
+            [node.innovation_number for node in genome.nodes if node.node_type == NodeType.INPUT],
+            [node.innovation_number for node in genome.nodes if node.node_type == NodeType.OUTPUT],
+            {node: [connection.input_node for connection in connections]
+             for node, connections in sorted_connection.items()})
+        nodes = [node for node in genome.nodes if node.innovation_number in required_nodes]
+
         # Iterate over sorted nodes.
-        for node in sorted(genome.nodes, key=lambda n: n.x_position):
+        for node in sorted(nodes, key=lambda n: n.x_position):
             # Get keys and weights of active connections for each node
             connections_for_node = sorted_connection.get(node.innovation_number, [])
             input_keys = np.array([connection.input_node for connection in connections_for_node])
@@ -73,6 +86,11 @@ class BasicNeuralNetwork(NeuralNetworkInterface):
                 if node.node_type == NodeType.OUTPUT:
                     self.output_neurons.append(basic_neuron)
 
+        amount_calculated_connections = sum(len(self.all_neurons[innovation_number].input_keys)
+                                            for innovation_number in self.order)
+        self.amount_pruned_nodes = len(genome.nodes) - len(nodes)
+        self.amount_pruned_connections = len(genome.connections) - amount_calculated_connections
+
     def reset(self) -> None:
         """
         Reset the neural network to its initial state. All temporary stored values will be removed.
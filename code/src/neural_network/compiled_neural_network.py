@@ -0,0 +1,292 @@
+from typing import List, Callable, Dict, Union
+
+import numpy as np
+from loguru import logger
+
+from neat_core.models.genome import Genome
+from neat_core.models.node import NodeType
+from neat_core import activation_function as af
+from neural_network.network_pruning import find_required_nodes
+from neural_network.neural_network_interface import NeuralNetworkInterface
+
+
+class CompiledNeuralNetwork(NeuralNetworkInterface):
+
+    def __init__(self):
+        """
+        A neural network, that compiles the genome once into flat arrays and activates the neurons by index.
+        The values of the neurons are stored in one state vector with the layout [current values | last values | 0]. A
+        connection refers either to the current value of a neuron (feed forward) or to the value of the last activation
+        (recurrent connection). Recurrent connections from input neurons refer to the constant zero at the end, which
+        matches the behaviour of the BasicNeuralNetwork.
+        """
+        self.amount_nodes: int = 0
+
+        # Node information, the index of a node is its position in the calculation order
+        self.innovation_numbers: List[Union[int, str]] = []
+        self.input_indices: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.output_indices: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.order: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.biases: np.ndarray = np.zeros(0, dtype=np.float64)
+        self.activation_ids: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.activation_functions: List[Callable[[float], float]] = []
+
+        # Connections in CSR format. The incoming connections of order[i] are edge_pointers[i]:edge_pointers[i + 1]
+        self.edge_pointers: np.ndarray = np.zeros(1, dtype=np.int64)
+        self.edge_sources: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.edge_weights: np.ndarray = np.zeros(0, dtype=np.float64)
+
+        # The amount of nodes and connections of the genome, that don't affect the outputs and are not calculated
+        self.amount_pruned_nodes: int = 0
+        self.amount_pruned_connections: int = 0
+
+        # Plain python values derived from the arrays above, used in the activation loop
+        self._state: List[float] = [0.0]
+        self._input_indices: List[int] = []
+        self._output_indices: List[int] = []
+        self._calculation_steps = []
+
+    def build(self, genome: Genome) -> None:
+        """
+        Compile the given genome into the flat arrays of the neural network and prepare it for the activation.
+        :param genome: that encodes the neural network
+        :return: None
+        """
+        self.compile(genome)
+        self._prepare_calculation()
+
+    def compile(self, genome: Genome) -> None:
+        """
+        Compile the given genome into the flat arrays of the neural network. The network can't be activated before
+        build is called, but the arrays can be used by other networks like the PopulationNetwork.
+        :param genome: that encodes the neural network
+        :return: None
+        """
+        logger.trace("Compiling neural network with genome")
+
+        # Group the enabled connections by their output node
+        incoming_connections = {}
+        for connection in genome.connections:
+            if connection.enabled is not True:
+                continue
+            incoming_connections.setdefault(connection.output_node, []).append(connection)
+
+        # Nodes, that don't affect the outputs, are pruned
+        required_nodes = find_required_nodes(
+            [node.innovation_number for node in genome.nodes if node.node_type == NodeType.INPUT],
+            [node.innovation_number for node in genome.nodes if node.node_type == NodeType.OUTPUT],
+            {node: [connection.input_node for connection in connections]
+             for node, connections in incoming_connections.items()})
+
+        # Same calculation order as in the BasicNeuralNetwork
+        sorted_nodes = sorted([node for node in genome.nodes if node.innovation_number in required_nodes],
+                              key=lambda n: n.x_position)
+        node_index: Dict[Union[int, str], int] = {node.innovation_number: i for i, node in enumerate(sorted_nodes)}
+        amount_nodes = len(sorted_nodes)
+
+        activation_functions = []
+        activation_ids = []
+        for node in sorted_nodes:
+            if node.activation_function not in activation_functions:
+                activation_functions.append(node.activation_function)
+            activation_ids.append(activation_functions.index(node.activation_function))
+
+        order = []
+        edge_pointers = [0]
+        edge_sources = []
+        edge_weights = []
+        for i, node in enumerate(sorted_nodes):
+            if node.node_type == NodeType.INPUT:
+                continue
+
+            order.append(i)
+            for connection in incoming_connections.get(node.innovation_number, []):
+                source_index = node_index[connection.input_node]
+                source_node = sorted_nodes[source_index]
+
+                if node.x_position > source_node.x_position:
+                    # Feed forward connection, the source is calculated before
+                    edge_sources.append(source_index)
+                elif source_node.node_type == NodeType.INPUT:
+                    # Input neurons do not store the value of the last activation
+                    edge_sources.append(2 * amount_nodes)
+                else:
+                    # Recurrent connection, use the value of the last activation
+                    edge_sources.append(amount_nodes + source_index)
+                edge_weights.append(connection.weight)
+            edge_pointers.append(len(edge_sources))
+
+        self.amount_nodes = amount_nodes
+        self.innovation_numbers = [node.innovation_number for node in sorted_nodes]
+        self.input_indices = np.array([i for i, n in enumerate(sorted_nodes) if n.node_type == NodeType.INPUT],
+                                      dtype=np.int64)
+        self.output_indices = np.array([i for i, n in enumerate(sorted_nodes) if n.node_type == NodeType.OUTPUT],
+                                       dtype=np.int64)
+        self.order = np.array(order, dtype=np.int64)
+        self.biases = np.array([node.bias for node in sorted_nodes], dtype=np.float64)
+        self.activation_ids = np.array(activation_ids, dtype=np.int64)
+        self.activation_functions = activation_functions
+        self.edge_pointers = np.array(edge_pointers, dtype=np.int64)
+        self.edge_sources = np.array(edge_sources, dtype=np.int64)
+        self.edge_weights = np.array(edge_weights, dtype=np.float64)
+        self.amount_pruned_nodes = len(genome.nodes) - amount_nodes
+        self.amount_pruned_connections = len(genome.connections) - len(edge_sources)
+
+    def build_from_arrays(self, nodes: np.ndarray, connections: np.ndarray) -> None:
+        """
+        Build the neural network directly from the structured arrays of an encoded genome, without creating the node
+        and connection objects. The result is the same as building the network from the decoded genome.
+        :param nodes: the node array of the genome (encoding_service.NODE_DTYPE)
+        :param connections: the connection array of the genome (encoding_service.CONNECTION_DTYPE)
+        :return: None
+        """
+        self.compile_from_arrays(nodes, connections)
+        self._prepare_calculation()
+
+    def compile_from_arrays(self, nodes: np.ndarray, connections: np.ndarray) -> None:
+        """
+        Compile the structured arrays of an encoded genome into the flat arrays of the neural network, like compile
+        :param nodes: the node array of the genome (encoding_service.NODE_DTYPE)
+        :param connections: the connection array of the genome (encoding_service.CONNECTION_DTYPE)
+        :return: None
+        """
+        logger.trace("Compiling neural network with genome arrays")
+
+        # Nodes, that don't affect the outputs, are pruned
+        enabled_connections = connections[connections["enabled"] != 0]
+        incoming_nodes = {}
+        for input_node, output_node in zip(enabled_connections["input_node"].tolist(),
+                                           enabled_connections["output_node"].tolist()):
+            incoming_nodes.setdefault(output_node, []).append(input_node)
+        required_nodes = find_required_nodes(
+            nodes["innovation_number"][nodes["node_type"] == NodeType.INPUT.value].tolist(),
+            nodes["innovation_number"][nodes["node_type"] == NodeType.OUTPUT.value].tolist(), incoming_nodes)
+        required_nodes = np.array(sorted(required_nodes), dtype=nodes["innovation_number"].dtype)
+        pruned_nodes = nodes[np.isin(nodes["innovation_number"], required_nodes)]
+
+        # Connections of the pruned nodes are removed as well, they only lead to other pruned nodes or input nodes
+        enabled_connections = enabled_connections[np.isin(enabled_connections["input_node"], required_nodes) &
+                                                  np.isin(enabled_connections["output_node"], required_nodes)]
+
+        # Same calculation order as in the BasicNeuralNetwork, the sort must be stable
+        sorted_nodes = pruned_nodes[np.argsort(pruned_nodes["x_position"], kind="stable")]
+        amount_nodes = len(sorted_nodes)
+        innovation_numbers = sorted_nodes["innovation_number"]
+        x_positions = sorted_nodes["x_position"]
+        is_input = sorted_nodes["node_type"] == NodeType.INPUT.value
+
+        # Activation functions in the order of their first usage
+        function_ids = sorted_nodes["activation_function"].astype(np.int64)
+        unique_ids, first_usage = np.unique(function_ids, return_index=True)
+        unique_ids = unique_ids[np.argsort(first_usage)]
+        function_index = np.zeros(max(af.get_amount_activation_functions(), 1), dtype=np.int64)
+        function_index[unique_ids] = np.arange(len(unique_ids))
+
+        # Map the innovation numbers of the connections to the node indices
+        innovation_order = np.argsort(innovation_numbers, kind="stable")
+        sources = innovation_order[np.searchsorted(innovation_numbers, enabled_connections["input_node"],
+                                                   sorter=innovation_order)]
+        targets = innovation_order[np.searchsorted(innovation_numbers, enabled_connections["output_node"],
+                                                   sorter=innovation_order)]
+        weights = enabled_connections["weight"]
+
+        # Input nodes are not calculated, so their incoming connections are ignored
+        calculated = ~is_input[targets]
+        sources, targets, weights = sources[calculated], targets[calculated], weights[calculated]
+
+        # Group the connections by their output node, the connection order of a node is kept
+        grouped = np.argsort(targets, kind="stable")
+        sources, targets, weights = sources[grouped], targets[grouped], weights[grouped]
+
+        order = np.flatnonzero(~is_input)
+        edge_pointers = np.concatenate([[0], np.cumsum(np.bincount(targets, minlength=amount_nodes)[order])])
+        edge_sources = np.where(x_positions[targets] > x_positions[sources], sources,
+                                np.where(is_input[sources], 2 * amount_nodes, amount_nodes + sources))
+
+        self.amount_nodes = amount_nodes
+        self.innovation_numbers = innovation_numbers.tolist()
+        self.input_indices = np.flatnonzero(is_input).astype(np.int64)
+        self.output_indices = np.flatnonzero(sorted_nodes["node_type"] == NodeType.OUTPUT.value).astype(np.int64)
+        self.order = order.astype(np.int64)
+        self.biases = sorted_nodes["bias"].astype(np.float64)
+        self.activation_ids = function_index[function_ids]
+        self.activation_functions = [af.get_activation_function(i) for i in unique_ids]
+        self.edge_pointers = edge_pointers.astype(np.int64)
+        self.edge_sources = edge_sources.astype(np.int64)
+        self.edge_weights = weights.astype(np.float64)
+        self.amount_pruned_nodes = len(nodes) - amount_nodes
+        self.amount_pruned_connections = len(connections) - len(edge_sources)
+
+    def _prepare_calculation(self) -> None:
+        """
+        Derive the values for the activation loop from the compiled arrays. Small networks are faster to calculate with
+        python lists than with many numpy calls on tiny arrays.
+        :return: None
+        """
+        sources = self.edge_sources.tolist()
+        weights = self.edge_weights.tolist()
+        pointers = self.edge_pointers.tolist()
+        biases = self.biases.tolist()
+
+        self._calculation_steps = []
+        for i, node_index in enumerate(self.order.tolist()):
+            start, end = pointers[i], pointers[i + 1]
+            activation_function = self.activation_functions[self.activation_ids[node_index]]
+            self._calculation_steps.append((node_index, tuple(zip(sources[start:end], weights[start:end])),
+                                            biases[node_index], activation_function))
+
+        self._input_indices = self.input_indices.tolist()
+        self._output_indices = self.output_indices.tolist()
+        self._state = [0.0] * (2 * self.amount_nodes + 1)
+
+    def reset(self) -> None:
+        """
+        Reset the neural network to its initial state. All temporary stored values will be removed.
+        :return: None
+        """
+        self._state = [0.0] * (2 * self.amount_nodes + 1)
+
+    def activate(self, inputs: List[float]) -> List[float]:
+        """
+        Activate the neural network with the given inputs
+        :param inputs: a list of float input values. The size must match the size of input neurons
+        :return: the result of the neural network. The size if the list matches the amount of output neurons
+        """
+        assert len(inputs) == len(self._input_indices)
+
+        result = self._calculate(inputs)
+        logger.trace("Net activated: Output: {} | Input: {}", result, inputs)
+        return result
+
+    def _activate_observation(self, observation: np.ndarray) -> List[float]:
+        """
+        Activate the neural network in a rollout. The observation is converted to python floats, which are calculated
+        faster in the activation loop than numpy values.
+        :param observation: the observation as float64 array
+        :return: the outputs of the neural network
+        """
+        assert len(observation) == len(self._input_indices)
+        return self._calculate(observation.tolist())
+
+    def _calculate(self, inputs: List[float]) -> List[float]:
+        """
+        Calculate the outputs for the inputs, without checking the inputs
+        :param inputs: a list of float input values
+        :return: the outputs of the neural network
+        """
+        state = self._state
+        amount_nodes = self.amount_nodes
+
+        # Store the values of the last activation
+        state[amount_nodes:2 * amount_nodes] = state[:amount_nodes]
+
+        for input_index, input_value in zip(self._input_indices, inputs):
+            state[input_index] = input_value
+
+        for node_index, edges, bias, activation_function in self._calculation_steps:
+            calculated_val = 0
+            for source_index, weight in edges:
+                calculated_val += weight * state[source_index]
+            state[node_index] = activation_function(calculated_val + bias)
+
+        return [state[output_index] for output_index in self._output_indices]
@@ -0,0 +1,208 @@
+from typing import List, Union
+
+import numpy as np
+from loguru import logger
+
+from neat_core import activation_function as af
+from neat_core.models.genome import Genome
+from neural_network.compiled_neural_network import CompiledNeuralNetwork
+from neural_network.neural_network_interface import NeuralNetworkInterface
+
+
+def calculate_levels(compiled_network: CompiledNeuralNetwork) -> (np.ndarray, np.ndarray):
+    """
+    Calculate the level of every node. The input nodes have the level 0, every other node is one level above its
+    highest source of a feed forward connection (current value, index < amount_nodes). The nodes are calculated in the
+    order of their x position, so the sources already have their level.
+    :param compiled_network: the compiled network
+    :return: the levels of the nodes and the levels of the calculation steps (in the order of the compiled network)
+    """
+    amount_nodes = compiled_network.amount_nodes
+    pointers = compiled_network.edge_pointers.tolist()
+    sources = compiled_network.edge_sources.tolist()
+
+    node_levels = [0] * amount_nodes
+    step_levels = []
+    for i, node_index in enumerate(compiled_network.order.tolist()):
+        level = 1 + max([node_levels[source] for source in sources[pointers[i]:pointers[i + 1]]
+                         if source < amount_nodes], default=0)
+        node_levels[node_index] = level
+        step_levels.append(level)
+
+    return np.array(node_levels, dtype=np.int64), np.array(step_levels, dtype=np.int64)
+
+
+def get_level_activations(compiled_network: CompiledNeuralNetwork, node_indices: np.ndarray) -> List:
+    """
+    Get the vectorized activation functions of a level
+    :param compiled_network: the compiled network
+    :param node_indices: the nodes of the level
+    :return: the vectorized functions with the mask of the nodes, None if the function is used by all nodes
+    """
+    activation_ids = compiled_network.activation_ids[node_indices]
+    used_ids = np.unique(activation_ids).tolist()
+    functions = [af.get_vectorized_activation_function(compiled_network.activation_functions[i]) for i in used_ids]
+    if len(used_ids) == 1:
+        return [(functions[0], None)]
+    return [(function, activation_ids == i) for function, i in zip(functions, used_ids)]
+
+
+def get_input_positions(input_indices: np.ndarray) -> Union[slice, np.ndarray]:
+    """
+    Get the positions, where the inputs are stored in the values of the nodes. The input nodes are usually the first
+    nodes, a slice is faster than the indices.
+    :param input_indices: the indices of the input nodes
+    :return: a slice if the input nodes are the first nodes, otherwise the indices
+    """
+    amount_inputs = len(input_indices)
+    if np.array_equal(input_indices, np.arange(amount_inputs)):
+        return slice(0, amount_inputs)
+    return input_indices
+
+
+class LayeredNeuralNetwork(NeuralNetworkInterface):
+
+    def __init__(self):
+        """
+        A neural network, that calculates the neurons level by level. The network is compiled like the
+        CompiledNeuralNetwork and uses the same state vector [current values | last values | 0]. A neuron depends on the
+        current values of the neurons with a smaller x position (feed forward) and on the last values of the other
+        neurons (recurrent), which are known before the activation. So the neurons are grouped into levels, that only
+        depend on the inputs and the lower levels, and every level is calculated with one matrix vector product. The
+        results are the same as the ones of the CompiledNeuralNetwork, apart from the rounding of the sums and of the
+        vectorized activation functions (see activation_function.VECTORIZED_TOLERANCE). Networks
+        with many connections per level (e.g. many inputs) are calculated faster, small networks are calculated faster
+        by the CompiledNeuralNetwork.
+        """
+        self.amount_nodes: int = 0
+        self.input_indices: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.output_indices: np.ndarray = np.zeros(0, dtype=np.int64)
+
+        # Level of every node, 0 for the input nodes
+        self.node_levels: np.ndarray = np.zeros(0, dtype=np.int64)
+
+        # The amount of nodes and connections of the genome, that don't affect the outputs and are not calculated
+        self.amount_pruned_nodes: int = 0
+        self.amount_pruned_connections: int = 0
+
+        # Calculation of every level: node indices, source indices, weight matrix (nodes, sources), biases and the
+        # activation functions with the mask of the nodes they are applied to (None for all nodes)
+        self._levels = []
+        self._input_positions = self.input_indices
+        self._state: np.ndarray = np.zeros(1, dtype=np.float64)
+
+    def build(self, genome: Genome) -> None:
+        """
+        Build the levels of the neural network from the genome
+        :param genome: that encodes the neural network
+        :return: None
+        """
+        compiled_network = CompiledNeuralNetwork()
+        compiled_network.compile(genome)
+        self.build_from_compiled(compiled_network)
+
+    def build_from_arrays(self, nodes: np.ndarray, connections: np.ndarray) -> None:
+        """
+        Build the levels directly from the structured arrays of an encoded genome, like the CompiledNeuralNetwork
+        :param nodes: the node array of the genome (encoding_service.NODE_DTYPE)
+        :param connections: the connection array of the genome (encoding_service.CONNECTION_DTYPE)
+        :return: None
+        """
+        compiled_network = CompiledNeuralNetwork()
+        compiled_network.compile_from_arrays(nodes, connections)
+        self.build_from_compiled(compiled_network)
+
+    def build_from_compiled(self, compiled_network: CompiledNeuralNetwork) -> None:
+        """
+        Build the levels from the arrays of a compiled network. The compiled network must not be prepared for the
+        activation.
+        :param compiled_network: the compiled network
+        :return: None
+        """
+        logger.trace("Building levels of neural network")
+
+        node_levels, step_levels = calculate_levels(compiled_network)
+
+        # Steps and connections of every level, the nodes keep the calculation order within the level
+        edge_steps = np.repeat(np.arange(len(step_levels)), np.diff(compiled_network.edge_pointers))
+        edge_levels = step_levels[edge_steps]
+
+        self._levels = []
+        for level in range(1, int(np.max(step_levels, initial=0)) + 1):
+            steps = np.flatnonzero(step_levels == level)
+            level_edges = np.flatnonzero(edge_levels == level)
+
+            # Dense weights of the used sources, multiple connections between two nodes are added
+            source_indices, edge_columns = np.unique(compiled_network.edge_sources[level_edges], return_inverse=True)
+            edge_rows = np.searchsorted(steps, edge_steps[level_edges])
+            weights = np.zeros((len(steps), len(source_indices)), dtype=np.float64)
+            np.add.at(weights, (edge_rows, edge_columns.reshape(-1)), compiled_network.edge_weights[level_edges])
+
+            node_indices = compiled_network.order[steps]
+            self._levels.append((node_indices, source_indices.astype(np.int64), weights,
+                                 compiled_network.biases[node_indices],
+                                 get_level_activations(compiled_network, node_indices)))
+
+        self.amount_nodes = compiled_network.amount_nodes
+        self.input_indices = compiled_network.input_indices
+        self.output_indices = compiled_network.output_indices
+        self.node_levels = node_levels
+        self.amount_pruned_nodes = compiled_network.amount_pruned_nodes
+        self.amount_pruned_connections = compiled_network.amount_pruned_connections
+        self._input_positions = get_input_positions(self.input_indices)
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Reset the neural network to its initial state. All temporary stored values will be removed.
+        :return: None
+        """
+        self._state = np.zeros(2 * self.amount_nodes + 1, dtype=np.float64)
+
+    def activate(self, inputs: List[float]) -> List[float]:
+        """
+        Activate the neural network with the given inputs
+        :param inputs: a list of float input values. The size must match the size of input neurons
+        :return: the result of the neural network. The size if the list matches the amount of output neurons
+        """
+        assert len(inputs) == len(self.input_indices)
+
+        result = self._calculate(inputs).tolist()
+        logger.trace("Net activated: Output: {} | Input: {}", result, inputs)
+        return result
+
+    def _activate_observation(self, observation: np.ndarray) -> np.ndarray:
+        """
+        Activate the neural network in a rollout, the observation is used without converting it
+        :param observation: the observation as float64 array
+        :return: the outputs of the neural network
+        """
+        assert len(observation) == len(self.input_indices)
+        return self._calculate(observation)
+
+    def _calculate(self, inputs: Union[List[float], np.ndarray]) -> np.ndarray:
+        """
+        Calculate the outputs for the inputs, without checking the inputs
+        :param inputs: the input values
+        :return: the outputs of the neural network
+        """
+        state = self._state
+        amount_nodes = self.amount_nodes
+
+        # Store the values of the last activation
+        state[amount_nodes:2 * amount_nodes] = state[:amount_nodes]
+        state[self._input_positions] = inputs
+
+        for node_indices, source_indices, weights, biases, activations in self._levels:
+            calculated_val = weights.dot(state[source_indices])
+            calculated_val += biases
+
+            if activations[0][1] is None:
+                calculated_val = activations[0][0](calculated_val)
+            else:
+                for vectorized_function, mask in activations:
+                    calculated_val[mask] = vectorized_function(calculated_val[mask])
+
+            state[node_indices] = calculated_val
+
+        return state[self.output_indices]
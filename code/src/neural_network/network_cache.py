@@ -0,0 +1,83 @@
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from neat_core.models.genome import Genome
+from neural_network.neural_network_interface import NeuralNetworkInterface
+from utils.cache.fingerprint import Fingerprint
+from utils.cache.lru_cache import LRUCache
+
+
+class NetworkCache(object):
+
+    def __init__(self, max_size: int, cache_results: bool = False) -> None:
+        """
+        Cache for built neural networks, so genomes that did not change (e.g. the copied best genomes of the species)
+        are not built again in every generation. The networks are stored by a fingerprint of everything, that is used to
+        build them, e.g. create_network_fingerprint or the encoded genome. Optionally the results of the evaluations are
+        cached too, which is only valid for deterministic challenges, where the same network always receives the same
+        fitness.
+        :param max_size: the maximum amount of cached networks and results, 0 disables the cache
+        :param cache_results: true, if the fitness and additional info should be reused for the same network
+        """
+        self.networks: LRUCache = LRUCache(max_size)
+        self.results: LRUCache = LRUCache(max_size if cache_results else 0)
+
+    def is_enabled(self) -> bool:
+        """
+        :return: true, if networks are cached
+        """
+        return self.networks.max_size > 0
+
+    def get_neural_network(self, fingerprint: Optional[Hashable],
+                           build_neural_network: Callable[[], NeuralNetworkInterface]) -> NeuralNetworkInterface:
+        """
+        Get the cached network with the fingerprint, or build and store a new one. A cached network is reset, so it is
+        in the same state as a newly built network.
+        :param fingerprint: the fingerprint of the network, None if the network should not be cached
+        :param build_neural_network: creates and builds the network, if it is not cached
+        :return: the built neural network
+        """
+        if fingerprint is None or not self.is_enabled():
+            return build_neural_network()
+
+        neural_network = self.networks.get(fingerprint)
+        if neural_network is None:
+            neural_network = build_neural_network()
+            self.networks.put(fingerprint, neural_network)
+        else:
+            neural_network.reset()
+        return neural_network
+
+    def get_result(self, fingerprint: Optional[Hashable]) -> Optional[Tuple[float, Any]]:
+        """
+        Get the cached result of the network with the fingerprint
+        :param fingerprint: the fingerprint of the network
+        :return: the fitness and additional info, or None if the result is not cached
+        """
+        if fingerprint is None or self.results.max_size == 0:
+            return None
+        return self.results.get(fingerprint)
+
+    def put_result(self, fingerprint: Optional[Hashable], fitness: float, additional_info: Any) -> None:
+        """
+        Store the result of the evaluation, if the results are cached
+        :param fingerprint: the fingerprint of the network
+        :param fitness: the fitness of the network
+        :param additional_info: the additional info of the challenge
+        :return: None
+        """
+        if fingerprint is not None and self.results.max_size > 0:
+            self.results.put(fingerprint, (fitness, additional_info))
+
+
+def create_network_fingerprint(genome: Genome) -> Fingerprint:
+    """
+    Create a fingerprint of the nodes and connections of the genome. The genes are never changed in place, a modified
+    gene is always replaced by a copy (see reproduction_service.copy_genome). So the genes are identified by the
+    objects, which is much cheaper than comparing their values and only unchanged genomes and children, that inherited
+    all genes unchanged, share the fingerprint. The fingerprint references the genes, so they are not garbage collected
+    while the fingerprint is cached. The genes are used in the order of the genome, because it determines the order of
+    the calculations.
+    :param genome: the genome
+    :return: the fingerprint
+    """
+    return Fingerprint((tuple(genome.nodes), tuple(genome.connections)))
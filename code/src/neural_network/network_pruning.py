@@ -0,0 +1,28 @@
+from typing import Dict, Hashable, Iterable, List, Set
+
+
+def find_required_nodes(input_nodes: Iterable[Hashable], output_nodes: Iterable[Hashable],
+                        incoming_nodes: Dict[Hashable, List[Hashable]]) -> Set[Hashable]:
+    """
+    Find the nodes, that can influence the outputs of a network. The search follows the enabled connections backwards
+    from the output nodes, feed forward and recurrent connections alike, so a node is required if the outputs depend on
+    its current or last value. The incoming connections of the input nodes are not calculated, so the search stops at
+    them. Nodes, that are not reachable from the inputs, are required as well, if the outputs depend on them, because
+    their bias and last values change the results. All other nodes never affect the results and can be pruned.
+    :param input_nodes: the input nodes of the network
+    :param output_nodes: the output nodes of the network
+    :param incoming_nodes: for every node the input nodes of its enabled incoming connections
+    :return: the required nodes, including the input and output nodes
+    """
+    input_nodes = set(input_nodes)
+    required_nodes = input_nodes | set(output_nodes)
+
+    open_nodes = [node for node in required_nodes if node not in input_nodes]
+    while open_nodes:
+        node = open_nodes.pop()
+        for source_node in incoming_nodes.get(node, ()):
+            if source_node not in required_nodes:
+                required_nodes.add(source_node)
+                if source_node not in input_nodes:
+                    open_nodes.append(source_node)
+    return required_nodes
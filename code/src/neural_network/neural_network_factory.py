@@ -0,0 +1,23 @@
+from neural_network.basic_neural_network import BasicNeuralNetwork
+from neural_network.compiled_neural_network import CompiledNeuralNetwork
+from neural_network.layered_neural_network import LayeredNeuralNetwork
+from neural_network.neural_network_interface import NeuralNetworkInterface
+from neural_network.recurrent_neural_network import RecurrentNeuralNetwork
+
+
+def create_neural_network(neural_network_type: str) -> NeuralNetworkInterface:
+    """
+    Create an empty neural network of the given type. The network must be built before it can be activated
+    :param neural_network_type: the type of the neural network ("basic", "compiled", "layered" or "recurrent")
+    :return: the created neural network
+    """
+    if neural_network_type == "basic":
+        return BasicNeuralNetwork()
+    elif neural_network_type == "compiled":
+        return CompiledNeuralNetwork()
+    elif neural_network_type == "layered":
+        return LayeredNeuralNetwork()
+    elif neural_network_type == "recurrent":
+        return RecurrentNeuralNetwork()
+    else:
+        raise AssertionError("Unknown type of neural network. Must be 'basic', 'compiled', 'layered' or 'recurrent'")
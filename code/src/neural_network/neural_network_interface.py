@@ -1,6 +1,9 @@
-from typing import List
+from typing import Callable, List, Tuple, Union
+
+import numpy as np
 
 from neat_core.models.genome import Genome
+from neural_network.rollout import RolloutResult, run_rollout
 
 
 class NeuralNetworkInterface(object):
@@ -26,3 +29,26 @@ class NeuralNetworkInterface(object):
         :return: the calculates result of the neural network
         """
         pass
+
+    def rollout(self, env_step_fn: Callable[[object], Tuple[object, float, bool, object]], initial_obs,
+                max_steps: int, action_mode: str = "argmax") -> RolloutResult:
+        """
+        Activate the neural network step by step with the observations of an environment, until the environment is
+        done or the max steps are reached. The network is not reset before the rollout.
+        :param env_step_fn: takes an action and returns observation, reward, done and info like the step of a gym
+        environment
+        :param initial_obs: the observation before the first step, a numpy array or a list
+        :param max_steps: the maximal amount of steps
+        :param action_mode: 'argmax' passes the index of the highest output to the environment, 'raw' passes the outputs
+        :return: the trajectory of the rollout
+        """
+        return run_rollout(self._activate_observation, env_step_fn, initial_obs, max_steps, action_mode)
+
+    def _activate_observation(self, observation: np.ndarray) -> Union[List[float], np.ndarray]:
+        """
+        Activate the neural network in a rollout. Networks can override this method to skip the checks and conversions
+        of activate.
+        :param observation: the observation as float64 array
+        :return: the outputs of the neural network
+        """
+        return self.activate(observation.tolist())
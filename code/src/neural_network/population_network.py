@@ -0,0 +1,186 @@
+from typing import List, Callable
+
+import numpy as np
+from loguru import logger
+
+from neat_core import activation_function as af
+from neat_core.models.genome import Genome
+from neural_network.compiled_neural_network import CompiledNeuralNetwork
+
+
+class PopulationNetwork(object):
+
+    def __init__(self):
+        """
+        The neural networks of a whole population packed into padded arrays. All networks are activated at the same time
+        with a batch of inputs. The networks are compiled like the CompiledNeuralNetwork and calculate their nodes in
+        the same order. Each genome has its own state with the layout [current values | last values | 0 | padding].
+        Every row in the input batch is an independent evaluation with its own recurrent state. The activation functions
+        are applied to whole arrays, so the results are only equal to the ones of the CompiledNeuralNetwork up to
+        activation_function.VECTORIZED_TOLERANCE per activation. Challenges, that amplify small differences (e.g. long
+        episodes of a control task), can therefore calculate a different fitness than the evaluation one by one.
+        """
+        self.amount_genomes: int = 0
+        self.amount_inputs: int = 0
+        self.amount_outputs: int = 0
+        self.max_nodes: int = 0
+
+        # Indices into the state of each genome, shape (genomes, inputs) and (genomes, outputs)
+        self.input_indices: np.ndarray = None
+        self.output_indices: np.ndarray = None
+
+        # Calculation steps, shape (genomes, steps) and (genomes, steps, max incoming connections)
+        self.node_indices: np.ndarray = None
+        self.biases: np.ndarray = None
+        self.activation_ids: np.ndarray = None
+        self.edge_sources: np.ndarray = None
+        self.edge_weights: np.ndarray = None
+        self.activation_functions: List[Callable[[float], float]] = []
+
+        # State of the networks, shape (genomes, state size, batch size)
+        self.state: np.ndarray = None
+
+        self._genome_index: np.ndarray = None
+        self._step_activations = []
+
+    def build(self, genomes: List[Genome]) -> None:
+        """
+        Compile the given genomes and pack them into the arrays of the population network.
+        All genomes must have the same amount of input and output nodes.
+        :param genomes: the genomes, that encode the neural networks
+        :return: None
+        """
+        logger.trace("Building population network with {} genomes", len(genomes))
+        assert len(genomes) != 0
+
+        compiled_networks = []
+        for genome in genomes:
+            compiled_network = CompiledNeuralNetwork()
+            compiled_network.compile(genome)
+            compiled_networks.append(compiled_network)
+
+        amount_inputs = len(compiled_networks[0].input_indices)
+        amount_outputs = len(compiled_networks[0].output_indices)
+        assert all(len(n.input_indices) == amount_inputs for n in compiled_networks)
+        assert all(len(n.output_indices) == amount_outputs for n in compiled_networks)
+
+        amount_genomes = len(compiled_networks)
+        max_nodes = max(n.amount_nodes for n in compiled_networks)
+        max_steps = max(len(n.order) for n in compiled_networks)
+        max_edges = max([int(np.max(np.diff(n.edge_pointers), initial=0)) for n in compiled_networks])
+        zero_index = 2 * max_nodes
+        padding_index = 2 * max_nodes + 1
+
+        self.activation_functions = []
+        self.input_indices = np.zeros((amount_genomes, amount_inputs), dtype=np.int64)
+        self.output_indices = np.zeros((amount_genomes, amount_outputs), dtype=np.int64)
+        self.node_indices = np.full((amount_genomes, max_steps), padding_index, dtype=np.int64)
+        self.biases = np.zeros((amount_genomes, max_steps), dtype=np.float64)
+        self.activation_ids = np.full((amount_genomes, max_steps), -1, dtype=np.int64)
+        self.edge_sources = np.full((amount_genomes, max_steps, max_edges), zero_index, dtype=np.int64)
+        self.edge_weights = np.zeros((amount_genomes, max_steps, max_edges), dtype=np.float64)
+
+        for g, network in enumerate(compiled_networks):
+            amount_nodes = network.amount_nodes
+
+            # Map the state indices of the compiled network to the padded state
+            sources = network.edge_sources
+            sources = np.where(sources < amount_nodes, sources,
+                               np.where(sources < 2 * amount_nodes, sources - amount_nodes + max_nodes, zero_index))
+
+            self.input_indices[g] = network.input_indices
+            self.output_indices[g] = network.output_indices
+
+            # Map the activation functions of the compiled network to the ones of the population network
+            function_ids = []
+            for activation_function in network.activation_functions:
+                if activation_function not in self.activation_functions:
+                    self.activation_functions.append(activation_function)
+                function_ids.append(self.activation_functions.index(activation_function))
+
+            amount_steps = len(network.order)
+            self.node_indices[g, :amount_steps] = network.order
+            self.biases[g, :amount_steps] = network.biases[network.order]
+            self.activation_ids[g, :amount_steps] = np.array(function_ids, dtype=np.int64)[
+                network.activation_ids[network.order]]
+
+            # Scatter the CSR connections into the padded (step, edge) layout
+            amount_edges = np.diff(network.edge_pointers)
+            edge_steps = np.repeat(np.arange(amount_steps), amount_edges)
+            edge_positions = np.arange(len(sources)) - np.repeat(network.edge_pointers[:-1], amount_edges)
+            self.edge_sources[g, edge_steps, edge_positions] = sources
+            self.edge_weights[g, edge_steps, edge_positions] = network.edge_weights
+
+        self.amount_genomes = amount_genomes
+        self.amount_inputs = amount_inputs
+        self.amount_outputs = amount_outputs
+        self.max_nodes = max_nodes
+        self._genome_index = np.arange(amount_genomes)[:, np.newaxis]
+        self._prepare_activation_functions()
+        self.state = None
+
+    def _prepare_activation_functions(self) -> None:
+        """
+        Determine for each calculation step, which activation functions are applied to which genomes. Padded steps
+        keep the identity.
+        :return: None
+        """
+        vectorized_functions = [af.get_vectorized_activation_function(f) for f in self.activation_functions]
+
+        self._step_activations = []
+        for step in range(self.activation_ids.shape[1]):
+            step_ids = self.activation_ids[:, step]
+            used_ids = [i for i in np.unique(step_ids) if i >= 0]
+            if len(used_ids) == 1 and np.all(step_ids == used_ids[0]):
+                # All genomes use the same function, no mask required
+                self._step_activations.append([(vectorized_functions[used_ids[0]], None)])
+            else:
+                self._step_activations.append([(vectorized_functions[i], step_ids == i) for i in used_ids])
+
+    def reset(self) -> None:
+        """
+        Reset all networks to their initial state. All temporary stored values will be removed.
+        :return: None
+        """
+        self.state = None
+
+    def activate(self, inputs: np.ndarray) -> np.ndarray:
+        """
+        Activate all networks with a batch of inputs.
+        :param inputs: the inputs with the shape (batch, inputs), which are used for all genomes or the shape
+        (genomes, batch, inputs) with separate inputs for every genome
+        :return: the results of all networks with the shape (genomes, batch, outputs)
+        """
+        inputs = np.asarray(inputs, dtype=np.float64)
+        if inputs.ndim == 2:
+            inputs = np.broadcast_to(inputs, (self.amount_genomes,) + inputs.shape)
+        assert inputs.shape[0] == self.amount_genomes
+        assert inputs.shape[2] == self.amount_inputs
+
+        batch_size = inputs.shape[1]
+        if self.state is None or self.state.shape[2] != batch_size:
+            self.state = np.zeros((self.amount_genomes, 2 * self.max_nodes + 2, batch_size), dtype=np.float64)
+
+        state = self.state
+        genome_index = self._genome_index
+        max_nodes = self.max_nodes
+
+        # Store the values of the last activation and set the inputs
+        state[:, max_nodes:2 * max_nodes] = state[:, :max_nodes]
+        state[genome_index, self.input_indices] = inputs.transpose((0, 2, 1))
+
+        for step, step_activations in enumerate(self._step_activations):
+            # Weighted sum of the incoming values, shape (genomes, batch)
+            input_values = state[genome_index, self.edge_sources[:, step]]
+            calculated_val = np.einsum("geb,ge->gb", input_values, self.edge_weights[:, step])
+            calculated_val += self.biases[:, step, np.newaxis]
+
+            if len(step_activations) == 1 and step_activations[0][1] is None:
+                calculated_val = step_activations[0][0](calculated_val)
+            else:
+                for vectorized_function, mask in step_activations:
+                    calculated_val[mask] = vectorized_function(calculated_val[mask])
+
+            state[genome_index[:, 0], self.node_indices[:, step]] = calculated_val
+
+        return state[genome_index, self.output_indices].transpose((0, 2, 1))
@@ -0,0 +1,207 @@
+from typing import List, Union
+
+import numpy as np
+from loguru import logger
+
+from neat_core.models.genome import Genome
+from neural_network.compiled_neural_network import CompiledNeuralNetwork
+from neural_network.layered_neural_network import calculate_levels, get_level_activations, get_input_positions
+from neural_network.neural_network_interface import NeuralNetworkInterface
+
+
+class RecurrentNeuralNetwork(NeuralNetworkInterface):
+
+    def __init__(self):
+        """
+        A neural network for recurrent genomes, that keeps the current and the last values of the neurons in two numpy
+        arrays. The arrays are swapped by reference with every activation, so the values of the last activation are not
+        copied. The sums of the recurrent connections only depend on the last values, so they are calculated for all
+        neurons with one matrix vector product at the beginning of an activation. The feed forward connections are
+        calculated level by level like in the LayeredNeuralNetwork. The state of the network (the values of the last
+        activation) can be exported and restored, so many episodes can use the same network without rebuilding it.
+        """
+        self.amount_nodes: int = 0
+        self.input_indices: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.output_indices: np.ndarray = np.zeros(0, dtype=np.int64)
+
+        # Connections of the compiled network, True if the connection uses the last value of its input node
+        self.uses_previous_value: np.ndarray = np.zeros(0, dtype=bool)
+
+        # The amount of nodes and connections of the genome, that don't affect the outputs and are not calculated
+        self.amount_pruned_nodes: int = 0
+        self.amount_pruned_connections: int = 0
+
+        # The calculated nodes are sorted by their level. The recurrent weights (calculated nodes, sources) and the
+        # biases are in this order. Every level contains the node indices, its position in the calculated nodes, the
+        # source indices, the feed forward weights (nodes, sources) and the activation functions with their mask
+        self._levels = []
+        self._recurrent_sources: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._recurrent_weights: np.ndarray = np.zeros((0, 0), dtype=np.float64)
+        self._biases: np.ndarray = np.zeros(0, dtype=np.float64)
+        self._input_positions = self.input_indices
+        self._current_values: np.ndarray = np.zeros(0, dtype=np.float64)
+        self._previous_values: np.ndarray = np.zeros(0, dtype=np.float64)
+
+    def build(self, genome: Genome) -> None:
+        """
+        Build the neural network from the genome
+        :param genome: that encodes the neural network
+        :return: None
+        """
+        compiled_network = CompiledNeuralNetwork()
+        compiled_network.compile(genome)
+        self.build_from_compiled(compiled_network)
+
+    def build_from_arrays(self, nodes: np.ndarray, connections: np.ndarray) -> None:
+        """
+        Build the neural network directly from the structured arrays of an encoded genome, like the
+        CompiledNeuralNetwork
+        :param nodes: the node array of the genome (encoding_service.NODE_DTYPE)
+        :param connections: the connection array of the genome (encoding_service.CONNECTION_DTYPE)
+        :return: None
+        """
+        compiled_network = CompiledNeuralNetwork()
+        compiled_network.compile_from_arrays(nodes, connections)
+        self.build_from_compiled(compiled_network)
+
+    def build_from_compiled(self, compiled_network: CompiledNeuralNetwork) -> None:
+        """
+        Build the neural network from the arrays of a compiled network. The compiled network must not be prepared for
+        the activation.
+        :param compiled_network: the compiled network
+        :return: None
+        """
+        logger.trace("Building recurrent neural network")
+
+        amount_nodes = compiled_network.amount_nodes
+        order = compiled_network.order
+        edge_sources = compiled_network.edge_sources
+        edge_weights = compiled_network.edge_weights
+        edge_steps = np.repeat(np.arange(len(order)), np.diff(compiled_network.edge_pointers))
+
+        # The recurrent connections from input nodes use the constant zero, so they are not calculated
+        uses_previous_value = edge_sources >= amount_nodes
+        recurrent_edges = uses_previous_value & (edge_sources < 2 * amount_nodes)
+        feed_forward_edges = ~uses_previous_value
+
+        # Levels of the calculated nodes, only the feed forward connections depend on the current values
+        _, step_levels = calculate_levels(compiled_network)
+
+        # Sort the calculated nodes by their level, the calculation order is kept within a level
+        sorted_steps = np.argsort(step_levels, kind="stable")
+        step_positions = np.empty(len(order), dtype=np.int64)
+        step_positions[sorted_steps] = np.arange(len(order))
+        calculated_nodes = order[sorted_steps]
+        sorted_levels = step_levels[sorted_steps]
+        edge_positions = step_positions[edge_steps]
+
+        # Dense weights of the used last values for all calculated nodes, multiple connections are added
+        recurrent_sources, recurrent_columns = np.unique(edge_sources[recurrent_edges] - amount_nodes,
+                                                         return_inverse=True)
+        recurrent_weights = np.zeros((len(order), len(recurrent_sources)), dtype=np.float64)
+        np.add.at(recurrent_weights, (edge_positions[recurrent_edges], recurrent_columns.reshape(-1)),
+                  edge_weights[recurrent_edges])
+
+        self._levels = []
+        for level in range(1, int(np.max(step_levels, initial=0)) + 1):
+            start = int(np.searchsorted(sorted_levels, level, side="left"))
+            end = int(np.searchsorted(sorted_levels, level, side="right"))
+            level_edges = feed_forward_edges & (step_levels[edge_steps] == level)
+
+            source_indices, source_columns = np.unique(edge_sources[level_edges], return_inverse=True)
+            weights = np.zeros((end - start, len(source_indices)), dtype=np.float64)
+            np.add.at(weights, (edge_positions[level_edges] - start, source_columns.reshape(-1)),
+                      edge_weights[level_edges])
+
+            node_indices = calculated_nodes[start:end]
+            self._levels.append((node_indices, start, end, source_indices.astype(np.int64), weights,
+                                 get_level_activations(compiled_network, node_indices)))
+
+        self.amount_nodes = amount_nodes
+        self.input_indices = compiled_network.input_indices
+        self.output_indices = compiled_network.output_indices
+        self.uses_previous_value = uses_previous_value
+        self.amount_pruned_nodes = compiled_network.amount_pruned_nodes
+        self.amount_pruned_connections = compiled_network.amount_pruned_connections
+        self._recurrent_sources = recurrent_sources.astype(np.int64)
+        self._recurrent_weights = recurrent_weights
+        self._biases = compiled_network.biases[calculated_nodes]
+        self._input_positions = get_input_positions(self.input_indices)
+        self._current_values = np.zeros(amount_nodes, dtype=np.float64)
+        self._previous_values = np.zeros(amount_nodes, dtype=np.float64)
+
+    def reset(self) -> None:
+        """
+        Reset the neural network to its initial state. All temporary stored values will be removed.
+        :return: None
+        """
+        self._current_values.fill(0)
+        self._previous_values.fill(0)
+
+    def export_state(self) -> np.ndarray:
+        """
+        Export the state of the neural network, which are the values of the neurons after the last activation
+        :return: a copy of the values, indexed like the nodes of the compiled network
+        """
+        return self._current_values.copy()
+
+    def restore_state(self, state: np.ndarray) -> None:
+        """
+        Restore an exported state. The next activation uses the values of the state as the last values
+        :param state: the exported state of a network, that was built with the same genome
+        :return: None
+        """
+        assert len(state) == self.amount_nodes
+        self._current_values[:] = state
+
+    def activate(self, inputs: List[float]) -> List[float]:
+        """
+        Activate the neural network with the given inputs
+        :param inputs: a list of float input values. The size must match the size of input neurons
+        :return: the result of the neural network. The size if the list matches the amount of output neurons
+        """
+        assert len(inputs) == len(self.input_indices)
+
+        result = self._calculate(inputs).tolist()
+        logger.trace("Net activated: Output: {} | Input: {}", result, inputs)
+        return result
+
+    def _activate_observation(self, observation: np.ndarray) -> np.ndarray:
+        """
+        Activate the neural network in a rollout, the observation is used without converting it
+        :param observation: the observation as float64 array
+        :return: the outputs of the neural network
+        """
+        assert len(observation) == len(self.input_indices)
+        return self._calculate(observation)
+
+    def _calculate(self, inputs: Union[List[float], np.ndarray]) -> np.ndarray:
+        """
+        Calculate the outputs for the inputs, without checking the inputs
+        :param inputs: the input values
+        :return: the outputs of the neural network
+        """
+        # The values of the last activation become the previous values, the old previous values are overwritten
+        previous_values, current_values = self._current_values, self._previous_values
+        self._previous_values, self._current_values = previous_values, current_values
+
+        current_values[self._input_positions] = inputs
+        if len(self._recurrent_sources) > 0:
+            sums = self._recurrent_weights.dot(previous_values[self._recurrent_sources])
+            sums += self._biases
+        else:
+            sums = self._biases
+
+        for node_indices, start, end, source_indices, weights, activations in self._levels:
+            calculated_val = weights.dot(current_values[source_indices])
+            calculated_val += sums[start:end]
+
+            if activations[0][1] is None:
+                calculated_val = activations[0][0](calculated_val)
+            else:
+                for vectorized_function, mask in activations:
+                    calculated_val[mask] = vectorized_function(calculated_val[mask])
+
+            current_values[node_indices] = calculated_val
+
+        return current_values[self.output_indices]
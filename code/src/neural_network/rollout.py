@@ -0,0 +1,89 @@
+from typing import Callable, List, Tuple, Union
+
+import numpy as np
+
+ACTION_MODES = ("argmax", "raw")
+
+
+class RolloutResult(object):
+
+    def __init__(self, observations: np.ndarray, actions: np.ndarray, rewards: np.ndarray, total_reward: float,
+                 done: bool, final_observation: np.ndarray, final_info: object) -> None:
+        """
+        The trajectory of a rollout
+        :param observations: the observations, that were activated in every step (steps, inputs)
+        :param actions: the actions of every step. The output index for 'argmax' (steps), the outputs for 'raw'
+        (steps, outputs)
+        :param rewards: the rewards of every step
+        :param total_reward: the sum of the rewards, added up step by step
+        :param done: True if the environment finished, False if the rollout was stopped after the max steps
+        :param final_observation: the observation returned by the last step
+        :param final_info: the info returned by the last step, None if no step was done
+        """
+        self.observations: np.ndarray = observations
+        self.actions: np.ndarray = actions
+        self.rewards: np.ndarray = rewards
+        self.total_reward: float = total_reward
+        self.done: bool = done
+        self.final_observation: np.ndarray = final_observation
+        self.final_info: object = final_info
+
+    @property
+    def steps(self) -> int:
+        return len(self.rewards)
+
+
+def run_rollout(activate: Callable[[np.ndarray], Union[List[float], np.ndarray]],
+                env_step_fn: Callable[[object], Tuple[object, float, bool, object]], initial_observation,
+                max_steps: int, action_mode: str) -> RolloutResult:
+    """
+    Run the loop of observation and action, until the environment is done or the max steps are reached. The
+    observations are copied into a preallocated buffer and the network is activated with the row of the buffer, so the
+    observations of the environment can be numpy arrays or lists.
+    :param activate: activates the network with an observation (float64 array) and returns the outputs
+    :param env_step_fn: takes an action and returns observation, reward, done and info like the step of a gym
+    environment
+    :param initial_observation: the observation before the first step
+    :param max_steps: the maximal amount of steps
+    :param action_mode: 'argmax' passes the index of the highest output to the environment, 'raw' passes the outputs
+    :return: the trajectory of the rollout
+    """
+    if action_mode not in ACTION_MODES:
+        raise AssertionError("Unknown type of action mode. Must be 'argmax' or 'raw'")
+    use_argmax = action_mode == "argmax"
+
+    observation = np.asarray(initial_observation, dtype=np.float64)
+    observations = np.empty((max_steps, observation.size), dtype=np.float64)
+    rewards = np.empty(max_steps, dtype=np.float64)
+    # The amount of outputs is only known after the first activation
+    actions = np.empty(max_steps, dtype=np.int64) if use_argmax else None
+
+    total_reward = 0.0
+    done = False
+    info = None
+    steps = 0
+    while steps < max_steps and not done:
+        current_observation = observations[steps]
+        current_observation[:] = observation
+        outputs = activate(current_observation)
+
+        if not use_argmax:
+            if actions is None:
+                actions = np.empty((max_steps, len(outputs)), dtype=np.float64)
+            action = outputs
+        elif isinstance(outputs, np.ndarray):
+            action = int(outputs.argmax())
+        else:
+            # The first index of the highest output like np.argmax, but without converting the list
+            action = outputs.index(max(outputs))
+        actions[steps] = action
+
+        observation, reward, done, info = env_step_fn(action)
+        rewards[steps] = reward
+        total_reward += reward
+        steps += 1
+
+    if actions is None:
+        actions = np.empty((0, 0), dtype=np.float64)
+    return RolloutResult(observations[:steps], actions[:steps], rewards[:steps], float(total_reward), bool(done),
+                         np.asarray(observation), info)
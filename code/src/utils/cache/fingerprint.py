@@ -0,0 +1,22 @@
+from typing import Tuple
+
+
+class Fingerprint(object):
+    __slots__ = ("values", "_hash")
+
+    def __init__(self, values: Tuple) -> None:
+        """
+        Hashable key of a cache, e.g. for a network or a genome. The hash is calculated once, because the caches look
+        up the key multiple times.
+        :param values: the hashable values, that identify the cached object
+        """
+        self.values: Tuple = values
+        self._hash: int = hash(values)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Fingerprint):
+            return NotImplemented
+        return self._hash == other._hash and self.values == other.values
@@ -0,0 +1,53 @@
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class LRUCache(object):
+
+    def __init__(self, max_size: int) -> None:
+        """
+        A cache with a limited size. If the cache is full, the least recently used entry is removed. The cache counts
+        the hits and misses of the lookups, to check if the cache is useful.
+        :param max_size: the maximum amount of entries, 0 disables the cache
+        """
+        assert max_size >= 0
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get the value for the key and mark the entry as recently used
+        :param key: the key of the entry
+        :param default: the value, that is returned if the key is not in the cache
+        :return: the cached value or the default value
+        """
+        if key not in self._entries:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store the value for the key. The least recently used entry is removed, if the cache is full.
+        :param key: the key of the entry
+        :param value: the value of the entry
+        :return: None
+        """
+        if self.max_size == 0:
+            return
+
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,58 @@
+import math
+from typing import Tuple
+
+import numpy as np
+
+from utils.environment.vectorized_environment import VectorizedEnvironment
+
+
+class VectorizedCartPole(VectorizedEnvironment):
+    # Physics of the gym environment CartPole-v1 (gym 0.17), https://github.com/openai/gym/wiki/CartPole-v0
+    gravity = 9.8
+    mass_cart = 1.0
+    mass_pole = 0.1
+    total_mass = mass_pole + mass_cart
+    length = 0.5
+    pole_mass_length = mass_pole * length
+    force_mag = 10.0
+    tau = 0.02
+    theta_threshold_radians = 12 * 2 * math.pi / 360
+    x_threshold = 2.4
+
+    def __init__(self, amount_environments: int, max_episode_steps: int = 500):
+        """
+        Vectorized version of the gym environment CartPole-v1. The state of an environment is
+        [cart position, cart velocity, pole angle, pole angular velocity]. Action 0 pushes the cart to the left,
+        action 1 to the right. Every step gives a reward of 1, including the step in which the pole falls.
+        :param amount_environments: the amount of independent environments
+        :param max_episode_steps: after this amount of steps an environment is done
+        """
+        super().__init__(amount_environments, 4, max_episode_steps)
+
+    def _initial_state(self, random_generator: np.random.RandomState) -> np.ndarray:
+        return random_generator.uniform(low=-0.05, high=0.05, size=(4,))
+
+    def _step(self, states: np.ndarray, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        x, x_dot, theta, theta_dot = states[:, 0], states[:, 1], states[:, 2], states[:, 3]
+
+        force = np.where(actions == 1, self.force_mag, -self.force_mag)
+        cos_theta = np.cos(theta)
+        sin_theta = np.sin(theta)
+
+        # Same order of operations as in gym, so that the results are equal
+        temp = (force + self.pole_mass_length * theta_dot ** 2 * sin_theta) / self.total_mass
+        theta_acc = (self.gravity * sin_theta - cos_theta * temp) / (
+                self.length * (4.0 / 3.0 - self.mass_pole * cos_theta ** 2 / self.total_mass))
+        x_acc = temp - self.pole_mass_length * theta_acc * cos_theta / self.total_mass
+
+        # Euler integration
+        new_states = np.stack([x + self.tau * x_dot,
+                               x_dot + self.tau * x_acc,
+                               theta + self.tau * theta_dot,
+                               theta_dot + self.tau * theta_acc], axis=1)
+
+        new_x, new_theta = new_states[:, 0], new_states[:, 2]
+        terminal = (new_x < -self.x_threshold) | (new_x > self.x_threshold) | \
+                   (new_theta < -self.theta_threshold_radians) | (new_theta > self.theta_threshold_radians)
+
+        return new_states, terminal, np.ones(len(states), dtype=np.float64)
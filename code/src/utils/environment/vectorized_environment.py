@@ -0,0 +1,99 @@
+from abc import ABC, abstractmethod
+from typing import List, Tuple, Union
+
+import numpy as np
+from gym.utils import seeding
+
+
+class VectorizedEnvironment(ABC):
+
+    def __init__(self, amount_environments: int, state_size: int, max_episode_steps: int):
+        """
+        Many independent environments, that are stepped together with numpy operations. The state of all environments
+        is stored in one array with the shape (environments, state size). Every environment has its own random
+        generator, that is seeded like a gym environment. Environments that are done are not stepped anymore.
+        :param amount_environments: the amount of independent environments
+        :param state_size: the size of the state of one environment
+        :param max_episode_steps: after this amount of steps an environment is done (like the gym TimeLimit)
+        """
+        self.amount_environments: int = amount_environments
+        self.max_episode_steps: int = max_episode_steps
+
+        self.states: np.ndarray = np.zeros((amount_environments, state_size), dtype=np.float64)
+        self.dones: np.ndarray = np.ones(amount_environments, dtype=bool)
+        self.elapsed_steps: np.ndarray = np.zeros(amount_environments, dtype=np.int64)
+
+        self._random_generators: List[np.random.RandomState] = []
+        self.seed()
+
+    def seed(self, seed: Union[int, List[int]] = None) -> List[int]:
+        """
+        Seed the random generators of the environments
+        :param seed: one seed for all environments, a list with a seed for every environment or None for random seeds
+        :return: the used seeds
+        """
+        if isinstance(seed, (list, tuple, np.ndarray)):
+            seeds = list(seed)
+        else:
+            seeds = [seed] * self.amount_environments
+        assert len(seeds) == self.amount_environments
+
+        self._random_generators = []
+        used_seeds = []
+        for environment_seed in seeds:
+            random_generator, used_seed = seeding.np_random(environment_seed)
+            self._random_generators.append(random_generator)
+            used_seeds.append(used_seed)
+        return used_seeds
+
+    def reset(self) -> np.ndarray:
+        """
+        Reset all environments
+        :return: the initial observations with the shape (environments, state size)
+        """
+        for i, random_generator in enumerate(self._random_generators):
+            self.states[i] = self._initial_state(random_generator)
+        self.dones[:] = False
+        self.elapsed_steps[:] = 0
+        return self.states.copy()
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Execute the actions in all environments, that are not done yet
+        :param actions: the action for every environment, the actions of done environments are ignored
+        :return: the observations, the rewards of this step and the mask of done environments
+        """
+        actions = np.asarray(actions)
+        assert actions.shape[0] == self.amount_environments
+
+        active = ~self.dones
+        rewards = np.zeros(self.amount_environments, dtype=np.float64)
+        if not np.any(active):
+            return self.states.copy(), rewards, self.dones.copy()
+
+        new_states, terminal, active_rewards = self._step(self.states[active], actions[active])
+        self.states[active] = new_states
+        self.elapsed_steps[active] += 1
+        self.dones[active] = terminal | (self.elapsed_steps[active] >= self.max_episode_steps)
+        rewards[active] = active_rewards
+
+        return self.states.copy(), rewards, self.dones.copy()
+
+    @abstractmethod
+    def _initial_state(self, random_generator: np.random.RandomState) -> np.ndarray:
+        """
+        Create the initial state of one environment
+        :param random_generator: the random generator of the environment
+        :return: the initial state
+        """
+        pass
+
+    @abstractmethod
+    def _step(self, states: np.ndarray, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate the next states of the given environments
+        :param states: the states of the environments, that are not done
+        :param actions: the actions of these environments
+        :return: the new states, the mask of terminal states and the rewards
+        """
+        pass
@@ -0,0 +1,42 @@
+from typing import Tuple
+
+import numpy as np
+
+from utils.environment.vectorized_environment import VectorizedEnvironment
+
+
+class VectorizedMountainCar(VectorizedEnvironment):
+    # Physics of the gym environment MountainCar-v0 (gym 0.17)
+    min_position = -1.2
+    max_position = 0.6
+    max_speed = 0.07
+    goal_position = 0.5
+    goal_velocity = 0
+    force = 0.001
+    gravity = 0.0025
+
+    def __init__(self, amount_environments: int, max_episode_steps: int = 200):
+        """
+        Vectorized version of the gym environment MountainCar-v0. The state of an environment is [position, velocity].
+        Action 0 accelerates to the left, action 1 does nothing and action 2 accelerates to the right. Every step gives
+        a reward of -1.
+        :param amount_environments: the amount of independent environments
+        :param max_episode_steps: after this amount of steps an environment is done
+        """
+        super().__init__(amount_environments, 2, max_episode_steps)
+
+    def _initial_state(self, random_generator: np.random.RandomState) -> np.ndarray:
+        return np.array([random_generator.uniform(low=-0.6, high=-0.4), 0])
+
+    def _step(self, states: np.ndarray, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        position, velocity = states[:, 0], states[:, 1]
+
+        # Same order of operations as in gym, so that the results are equal
+        velocity = velocity + ((actions - 1) * self.force + np.cos(3 * position) * (-self.gravity))
+        velocity = np.clip(velocity, -self.max_speed, self.max_speed)
+        position = position + velocity
+        position = np.clip(position, self.min_position, self.max_position)
+        velocity = np.where((position == self.min_position) & (velocity < 0), 0.0, velocity)
+
+        terminal = (position >= self.goal_position) & (velocity >= self.goal_velocity)
+        return np.stack([position, velocity], axis=1), terminal, np.full(len(states), -1.0)
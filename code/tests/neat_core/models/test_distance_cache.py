@@ -0,0 +1,68 @@
+from unittest import TestCase
+
+import neat_core.service.reproduction_service as rs
+from neat_core.activation_function import step_activation
+from neat_core.models.connection import Connection
+from neat_core.models.distance_cache import DistanceCache
+from neat_core.models.genome import Genome
+from neat_core.models.node import Node, NodeType
+from neat_core.optimizer.neat_config import NeatConfig
+
+
+class DistanceCacheTest(TestCase):
+
+    def setUp(self) -> None:
+        self.config = NeatConfig()
+        self.genome1 = Genome(1, [Node(1, NodeType.INPUT, 0, step_activation, 0),
+                                  Node(2, NodeType.OUTPUT, 0.5, step_activation, 1)],
+                              [Connection(3, 1, 2, 0.8, True)])
+        self.genome2 = Genome(2, [Node(1, NodeType.INPUT, 0, step_activation, 0),
+                                  Node(2, NodeType.OUTPUT, -0.5, step_activation, 1)],
+                              [Connection(3, 1, 2, 0.1, True)])
+
+    def test_is_enabled(self):
+        self.assertFalse(DistanceCache(0).is_enabled())
+        self.assertTrue(DistanceCache(1).is_enabled())
+
+    def test_create_fingerprint(self):
+        fingerprint = DistanceCache.create_fingerprint(self.genome1)
+
+        # Genomes with the same genes have the same fingerprint, even if the gene objects are different
+        self.assertEqual(fingerprint, DistanceCache.create_fingerprint(rs.deep_copy_genome(self.genome1)))
+        self.assertEqual(hash(fingerprint), hash(DistanceCache.create_fingerprint(rs.copy_genome(self.genome1))))
+        self.assertNotEqual(fingerprint, DistanceCache.create_fingerprint(self.genome2))
+
+        # Connections and nodes with the same innovation numbers and values have other fingerprints
+        genome_node = Genome(3, [Node(1, NodeType.HIDDEN, 0.5, step_activation, 0)], [])
+        genome_connection = Genome(4, [], [Connection(1, 1, 2, 0.5, True)])
+        self.assertNotEqual(DistanceCache.create_fingerprint(genome_node),
+                            DistanceCache.create_fingerprint(genome_connection))
+
+        # The enabled flag doesn't change the genetic distance
+        genome_disabled = rs.copy_genome(self.genome1)
+        genome_disabled.connections[0] = Connection(3, 1, 2, 0.8, False)
+        self.assertEqual(fingerprint, DistanceCache.create_fingerprint(genome_disabled))
+
+    def test_get_put_distances(self):
+        distance_cache = DistanceCache(3)
+        fingerprint1 = DistanceCache.create_fingerprint(self.genome1)
+        fingerprint2 = DistanceCache.create_fingerprint(self.genome2)
+        self.assertIsNone(distance_cache.get_distances(fingerprint1, [fingerprint1, fingerprint2], self.config))
+
+        distance_cache.put_distances(fingerprint1, [fingerprint1, fingerprint2], self.config, [0.0, 1.5])
+        self.assertEqual([0.0, 1.5], distance_cache.get_distances(fingerprint1, [fingerprint1, fingerprint2],
+                                                                  self.config))
+        self.assertEqual([], distance_cache.get_distances(fingerprint1, [], self.config))
+        self.assertIsNone(distance_cache.get_distances(fingerprint2, [fingerprint1], self.config))
+
+        # Other compatibility factors don't use the cached distances
+        factor = self.config.compatibility_factor_matching_genes
+        self.config.compatibility_factor_matching_genes = factor + 1
+        self.assertIsNone(distance_cache.get_distances(fingerprint1, [fingerprint2], self.config))
+
+        # The least recently used distance is removed, it can't be combined with the cached ones
+        distance_cache.put_distances(fingerprint1, [fingerprint2], self.config, [2.5])
+        distance_cache.put_distances(fingerprint2, [fingerprint2], self.config, [0.0])
+        self.config.compatibility_factor_matching_genes = factor
+        self.assertIsNone(distance_cache.get_distances(fingerprint1, [fingerprint1, fingerprint2], self.config))
+        self.assertEqual([1.5], distance_cache.get_distances(fingerprint1, [fingerprint2], self.config))
@@ -11,6 +11,11 @@ class GenomeTest(TestCase):
         genome_empty = Genome(20)
         self.assertEqual(20, genome_empty.seed)
         self.assertEqual([], genome_empty.nodes)
+        self.assertEqual([], genome_empty.connections)
+
+        # Every genome gets its own lists
+        genome_empty.nodes.append(Node(1, NodeType.INPUT, bias=0.5, activation_function=lambda x: x, x_position=0))
+        self.assertEqual([], Genome(21).nodes)
 
         node_list = [
             Node(2, NodeType.INPUT, bias=0.5, activation_function=lambda x: x + 1, x_position=0),
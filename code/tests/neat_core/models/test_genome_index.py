@@ -0,0 +1,108 @@
+from unittest import TestCase
+
+from neat_core.activation_function import step_activation
+from neat_core.models.connection import Connection
+from neat_core.models.genome import Genome
+from neat_core.models.genome_index import GenomeIndex, get_genome_index
+from neat_core.models.node import Node, NodeType
+
+
+class GenomeIndexTest(TestCase):
+
+    def setUp(self) -> None:
+        self.input_node = Node(0, NodeType.INPUT, 0, step_activation, 0)
+        self.output_node = Node(1, NodeType.OUTPUT, 0, step_activation, 1)
+        self.hidden_node1 = Node(2, NodeType.HIDDEN, 0, step_activation, 0.5)
+        self.hidden_node2 = Node(3, NodeType.HIDDEN, 0, step_activation, 0.5)
+        self.genome = Genome(1, [self.input_node, self.output_node, self.hidden_node1, self.hidden_node2],
+                             [Connection(0, 0, 1, 1.0, True), Connection(1, 0, 2, 1.0, False)])
+        self.index = GenomeIndex(self.genome)
+
+    def test_get_node(self):
+        self.assertIs(self.hidden_node1, self.index.get_node(2))
+        with self.assertRaises(KeyError):
+            self.index.get_node(10)
+
+    def test_has_connection(self):
+        self.assertTrue(self.index.has_connection(0, 1))
+        self.assertTrue(self.index.has_connection(0, 2))
+        self.assertFalse(self.index.has_connection(1, 0))
+
+    def test_sorted_nodes(self):
+        self.assertEqual([self.input_node, self.hidden_node1, self.hidden_node2, self.output_node],
+                         self.index.get_sorted_nodes())
+        self.assertEqual([self.hidden_node1, self.hidden_node2, self.output_node],
+                         self.index.get_sorted_hidden_output_nodes())
+        self.assertEqual(0, self.index.get_first_hidden_output_node_after(0))
+        self.assertEqual(2, self.index.get_first_hidden_output_node_after(0.5))
+        self.assertEqual(3, self.index.get_first_hidden_output_node_after(1))
+
+    def test_add_genes(self):
+        # Genes added before the first access are found by building the index
+        new_node1 = Node(4, NodeType.HIDDEN, 0, step_activation, 0.75)
+        self.genome.nodes.append(new_node1)
+        self.assertIs(new_node1, self.index.get_node(4))
+
+        # After the first access, the new genes must be registered
+        new_node2 = Node(5, NodeType.HIDDEN, 0, step_activation, 0.5)
+        new_connection = Connection(2, 5, 1, 1.0, True)
+        self.genome.nodes.append(new_node2)
+        self.genome.connections.append(new_connection)
+        self.index.add_node(new_node2)
+        self.index.add_connection(new_connection)
+
+        self.assertIs(new_node2, self.index.get_node(5))
+        self.assertTrue(self.index.has_connection(5, 1))
+        self.assertEqual(sorted(self.genome.nodes, key=lambda node: node.x_position), self.index.get_sorted_nodes())
+        self.assertEqual([self.hidden_node1, self.hidden_node2, new_node2, new_node1, self.output_node],
+                         self.index.get_sorted_hidden_output_nodes())
+
+    def test_template(self):
+        # The child has the structure of the template, but some nodes come from another genome
+        other_hidden_node1 = Node(2, NodeType.HIDDEN, 0.7, step_activation, 0.5)
+        child = Genome(2, [self.input_node, self.output_node, other_hidden_node1, self.hidden_node2],
+                       [Connection(0, 0, 1, 0.3, True), Connection(1, 0, 2, 1.0, True)])
+        self.index.get_sorted_nodes()
+        child_index = GenomeIndex(child, self.index)
+
+        self.assertIs(other_hidden_node1, child_index.get_node(2))
+        self.assertEqual([self.input_node, other_hidden_node1, self.hidden_node2, self.output_node],
+                         child_index.get_sorted_nodes())
+        self.assertEqual([other_hidden_node1, self.hidden_node2, self.output_node],
+                         child_index.get_sorted_hidden_output_nodes())
+        self.assertEqual(2, child_index.get_first_hidden_output_node_after(0.5))
+        self.assertTrue(child_index.has_connection(0, 2))
+
+        # The genes of the child don't change the template
+        new_node = Node(4, NodeType.HIDDEN, 0, step_activation, 0.25)
+        child.nodes.append(new_node)
+        child.connections.append(Connection(2, 4, 1, 1.0, True))
+        child_index.add_node(new_node)
+        child_index.add_connection(child.connections[-1])
+        self.assertEqual(4, len(self.index.get_sorted_nodes()))
+        self.assertFalse(self.index.has_connection(4, 1))
+        self.assertEqual([new_node, other_hidden_node1, self.hidden_node2, self.output_node],
+                         child_index.get_sorted_hidden_output_nodes())
+
+        # A grandchild without structural mutation passes the built template on
+        grandchild = Genome(3, list(child.nodes), list(child.connections))
+        grandchild_index = GenomeIndex(grandchild, GenomeIndex(Genome(4, list(child.nodes), list(child.connections)),
+                                                               child_index))
+        self.assertEqual(child_index.get_sorted_nodes(), grandchild_index.get_sorted_nodes())
+
+    def test_template_different_positions(self):
+        # A template with different positions is not used
+        moved_hidden_node2 = Node(3, NodeType.HIDDEN, 0, step_activation, 0.2)
+        child = Genome(2, [self.input_node, self.output_node, self.hidden_node1, moved_hidden_node2],
+                       list(self.genome.connections))
+        self.index.get_sorted_nodes()
+        child_index = GenomeIndex(child, self.index)
+        self.assertEqual([self.input_node, moved_hidden_node2, self.hidden_node1, self.output_node],
+                         child_index.get_sorted_nodes())
+        self.assertEqual([0.2, 0.5, 1], child_index._sorted_hidden_output_x_positions)
+
+    def test_get_genome_index(self):
+        index = get_genome_index(self.genome)
+        self.assertIs(index, self.genome.index)
+        self.assertIs(index, get_genome_index(self.genome))
+        self.assertIs(self.hidden_node2, index.get_node(3))
@@ -1,6 +1,8 @@
+import math
+import pickle
 from unittest import TestCase
 
-from neat_core.activation_function import modified_sigmoid_activation
+from neat_core.activation_function import get_activation_function_id, modified_sigmoid_activation, tanh_activation
 from neat_core.models.node import NodeType, Node
 
 
@@ -26,3 +28,25 @@ class NodeTest(TestCase):
         self.assertEqual(NodeType.HIDDEN, hidden_node.node_type)
         self.assertEqual(0.6, hidden_node.bias)
         self.assertEqual(0.5, hidden_node.x_position)
+
+    def test_pickle_activation_function_id(self):
+        node = Node(3, NodeType.HIDDEN, 0.6, tanh_activation, 0.5)
+        self.assertEqual((3, NodeType.HIDDEN, 0.6, get_activation_function_id(tanh_activation), 0.5),
+                         node.__getstate__())
+
+        loaded_node = pickle.loads(pickle.dumps(node))
+        self.assertIs(tanh_activation, loaded_node.activation_function)
+        self.assertEqual((3, NodeType.HIDDEN, 0.6, 0.5),
+                         (loaded_node.innovation_number, loaded_node.node_type, loaded_node.bias,
+                          loaded_node.x_position))
+
+        # Functions, that are not registered, are pickled by their reference
+        node = Node(4, NodeType.HIDDEN, 0.6, math.sin, 0.5)
+        self.assertIs(math.sin, node.__getstate__()[3])
+        self.assertIs(math.sin, pickle.loads(pickle.dumps(node)).activation_function)
+
+    def test_set_state_with_function(self):
+        # Nodes, that were pickled before the registry of the activation functions, store the function itself
+        node = Node.__new__(Node)
+        node.__setstate__((3, NodeType.HIDDEN, 0.6, tanh_activation, 0.5))
+        self.assertIs(tanh_activation, node.activation_function)
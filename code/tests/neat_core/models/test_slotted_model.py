@@ -0,0 +1,79 @@
+import pickle
+from unittest import TestCase
+
+from neat_core.activation_function import modified_sigmoid_activation
+from neat_core.models.agent import Agent
+from neat_core.models.connection import Connection
+from neat_core.models.genome import Genome
+from neat_core.models.node import Node, NodeType
+from neat_core.models.slotted_model import SlottedModel
+
+
+class SingleSlotModel(SlottedModel):
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class SlottedModelTest(TestCase):
+
+    def setUp(self) -> None:
+        self.genome = Genome(20, [Node(1, NodeType.INPUT, 0.3, modified_sigmoid_activation, 0),
+                                  Node("output", NodeType.OUTPUT, 0.4, modified_sigmoid_activation, 1)],
+                             [Connection(2, 1, "output", 0.5, False)])
+
+    def test_no_dict(self):
+        with self.assertRaises(AttributeError):
+            self.genome.unknown_attribute = 1
+        with self.assertRaises(AttributeError):
+            self.genome.nodes[0].unknown_attribute = 1
+
+    def test_pickle(self):
+        agent = Agent(3, self.genome)
+        agent.fitness = 1.5
+        agent.additional_info = {"steps": 10}
+
+        for protocol in [0, pickle.HIGHEST_PROTOCOL]:
+            loaded_agent = pickle.loads(pickle.dumps(agent, protocol=protocol))
+            self.assertEqual(3, loaded_agent.id)
+            self.assertEqual(1.5, loaded_agent.fitness)
+            self.assertEqual({"steps": 10}, loaded_agent.additional_info)
+            self.assertIsNone(loaded_agent.neural_network)
+
+            loaded_genome = loaded_agent.genome
+            self.assertEqual(20, loaded_genome.seed)
+            self.assertEqual([(1, NodeType.INPUT, 0.3, modified_sigmoid_activation, 0),
+                              ("output", NodeType.OUTPUT, 0.4, modified_sigmoid_activation, 1)],
+                             [(n.innovation_number, n.node_type, n.bias, n.activation_function, n.x_position)
+                              for n in loaded_genome.nodes])
+            connection = loaded_genome.connections[0]
+            self.assertEqual((2, 1, "output", 0.5, False), (connection.innovation_number, connection.input_node,
+                                                            connection.output_node, connection.weight,
+                                                            connection.enabled))
+
+    def test_pickle_genome_without_index(self):
+        self.genome.index = object()
+        self.assertEqual(3, len(self.genome.__getstate__()))
+        self.assertIsNone(pickle.loads(pickle.dumps(self.genome)).index)
+
+    def test_pickle_single_slot(self):
+        self.assertEqual((4,), SingleSlotModel(4).__getstate__())
+        self.assertEqual((2, 3), pickle.loads(pickle.dumps(SingleSlotModel((2, 3)))).value)
+
+    def test_set_dict_state(self):
+        # Objects, that were pickled before the slots were introduced, have a dict as state
+        node = Node.__new__(Node)
+        node.__setstate__({"innovation_number": 4, "node_type": NodeType.HIDDEN, "bias": 0.1,
+                           "activation_function": modified_sigmoid_activation, "x_position": 0.5,
+                           "removed_attribute": 2})
+        self.assertEqual(4, node.innovation_number)
+        self.assertEqual(NodeType.HIDDEN, node.node_type)
+        self.assertEqual(0.1, node.bias)
+        self.assertEqual(0.5, node.x_position)
+
+        genome = Genome.__new__(Genome)
+        genome.__setstate__({"seed": 5, "nodes": [node], "connections": []})
+        self.assertEqual(5, genome.seed)
+        self.assertEqual([node], genome.nodes)
+        self.assertEqual([], genome.connections)
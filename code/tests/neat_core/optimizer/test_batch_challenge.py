@@ -0,0 +1,47 @@
+from typing import Dict, List, Tuple
+from unittest import TestCase
+
+from loguru import logger
+
+from neat_core.optimizer.batch_challenge import BatchChallenge, use_batch_evaluation, warn_ignored_settings
+from neat_core.optimizer.challenge import Challenge
+from neat_core.optimizer.neat_config import NeatConfig
+from neural_network.neural_network_interface import NeuralNetworkInterface
+from neural_network.population_network import PopulationNetwork
+
+
+class SimpleChallenge(Challenge):
+
+    def evaluate(self, neural_network: NeuralNetworkInterface, **kwargs) -> (float, Dict[str, object]):
+        return 0.0, {}
+
+
+class SimpleBatchChallenge(SimpleChallenge, BatchChallenge):
+
+    def evaluate_population(self, population_network: PopulationNetwork, **kwargs) \
+            -> List[Tuple[float, Dict[str, object]]]:
+        return [(0.0, {}) for _ in range(population_network.amount_genomes)]
+
+
+class BatchChallengeTest(TestCase):
+
+    def setUp(self) -> None:
+        self.messages = []
+        handler_id = logger.add(self.messages.append, level="WARNING", format="{message}")
+        self.addCleanup(logger.remove, handler_id)
+
+    def test_use_batch_evaluation(self):
+        self.assertTrue(use_batch_evaluation(SimpleBatchChallenge(), NeatConfig(batch_evaluation=True)))
+        self.assertFalse(use_batch_evaluation(SimpleBatchChallenge(), NeatConfig()))
+        self.assertFalse(use_batch_evaluation(SimpleChallenge(), NeatConfig(batch_evaluation=True)))
+
+    def test_warn_ignored_settings(self):
+        warn_ignored_settings(SimpleBatchChallenge(), NeatConfig(batch_evaluation=True))
+        warn_ignored_settings(SimpleChallenge(), NeatConfig(neural_network_type="compiled", batch_evaluation=True))
+        warn_ignored_settings(SimpleBatchChallenge(), NeatConfig(neural_network_type="compiled"))
+        self.assertEqual([], self.messages)
+
+        config = NeatConfig(neural_network_type="compiled", network_cache_size=10, batch_evaluation=True)
+        warn_ignored_settings(SimpleBatchChallenge(), config)
+        self.assertEqual(1, len(self.messages))
+        self.assertIn("neural_network_type, network_cache_size", self.messages[0])
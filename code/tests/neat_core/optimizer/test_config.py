@@ -15,3 +15,7 @@ class ConfigTest(TestCase):
         self.assertEqual(200, config.population_size)
         self.assertEqual(-10, config.connection_min_weight)
         self.assertEqual(10, config.connection_max_weight)
+
+    def test_config_neural_network_type(self):
+        self.assertEqual("basic", NeatConfig().neural_network_type)
+        self.assertEqual("compiled", NeatConfig(neural_network_type="compiled").neural_network_type)
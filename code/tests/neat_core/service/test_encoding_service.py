@@ -0,0 +1,99 @@
+import pickle
+from unittest import TestCase
+
+import numpy as np
+
+import neat_core.service.encoding_service as es
+import neat_core.service.reproduction_service as rp
+from neat_core.activation_function import modified_sigmoid_activation, step_activation, tanh_activation
+from neat_core.models.agent import Agent
+from neat_core.models.connection import Connection
+from neat_core.models.genome import Genome
+from neat_core.models.node import Node, NodeType
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.service.generation_service import create_genome_structure
+from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
+
+
+class EncodingServiceTest(TestCase):
+
+    def setUp(self) -> None:
+        self.genome = Genome(15, [
+            Node(1, NodeType.INPUT, 0, step_activation, x_position=0),
+            Node(2, NodeType.INPUT, 0, step_activation, x_position=0),
+            Node(4, NodeType.OUTPUT, -0.6, tanh_activation, x_position=1),
+            Node(15, NodeType.HIDDEN, -0.5, modified_sigmoid_activation, x_position=0.5),
+        ], [
+            Connection(innovation_number=5, input_node=1, output_node=4, weight=0.5, enabled=True),
+            Connection(innovation_number=16, input_node=1, output_node=15, weight=-0.4, enabled=False),
+            Connection(innovation_number=17, input_node=15, output_node=4, weight=2.0, enabled=True),
+        ])
+
+    def _assert_genome_equal(self, genome1: Genome, genome2: Genome):
+        self.assertEqual(genome1.seed, genome2.seed)
+        self.assertEqual(len(genome1.nodes), len(genome2.nodes))
+        self.assertEqual(len(genome1.connections), len(genome2.connections))
+
+        for node1, node2 in zip(genome1.nodes, genome2.nodes):
+            self.assertEqual(node1.innovation_number, node2.innovation_number)
+            self.assertEqual(node1.node_type, node2.node_type)
+            self.assertEqual(node1.bias, node2.bias)
+            self.assertEqual(node1.activation_function, node2.activation_function)
+            self.assertEqual(node1.x_position, node2.x_position)
+
+        for connection1, connection2 in zip(genome1.connections, genome2.connections):
+            self.assertEqual(connection1.innovation_number, connection2.innovation_number)
+            self.assertEqual(connection1.input_node, connection2.input_node)
+            self.assertEqual(connection1.output_node, connection2.output_node)
+            self.assertEqual(connection1.weight, connection2.weight)
+            self.assertEqual(connection1.enabled, connection2.enabled)
+
+    def test_encode_decode_genome(self):
+        data = es.encode_genome(self.genome)
+        self.assertEqual(es.HEADER_DTYPE.itemsize + 4 * es.NODE_DTYPE.itemsize + 3 * es.CONNECTION_DTYPE.itemsize,
+                         len(data))
+
+        decoded_genome = es.decode_genome(data)
+        self._assert_genome_equal(self.genome, decoded_genome)
+        self.assertIsInstance(decoded_genome.connections[1].enabled, bool)
+
+        # Empty genome
+        self._assert_genome_equal(Genome(3, [], []), es.decode_genome(es.encode_genome(Genome(3, [], []))))
+
+        with self.assertRaises(AssertionError):
+            es.decode_genome(data[:-1])
+
+    def test_decode_genome_arrays(self):
+        seed, nodes, connections = es.decode_genome_arrays(es.encode_genome(self.genome))
+
+        self.assertEqual(15, seed)
+        self.assertEqual([1, 2, 4, 15], nodes["innovation_number"].tolist())
+        self.assertEqual([1, 1, 3, 2], nodes["node_type"].tolist())
+        self.assertEqual([1, 1, 3, 0], nodes["activation_function"].tolist())
+        self.assertEqual([0, 0, -0.6, -0.5], nodes["bias"].tolist())
+        self.assertEqual([5, 16, 17], connections["innovation_number"].tolist())
+        self.assertEqual([1, 1, 15], connections["input_node"].tolist())
+        self.assertEqual([4, 15, 4], connections["output_node"].tolist())
+        self.assertEqual([0.5, -0.4, 2.0], connections["weight"].tolist())
+        self.assertEqual([1, 0, 1], connections["enabled"].tolist())
+
+    def test_unknown_activation_function(self):
+        genome = Genome(1, [Node(1, NodeType.INPUT, 0, lambda x: x, x_position=0)], [])
+        with self.assertRaises(AssertionError):
+            es.encode_genome(genome)
+
+    def test_encoding_smaller_than_pickled_agent(self):
+        config = NeatConfig(probability_mutate_add_node=0.5, probability_mutate_add_connection=1.0)
+        rnd = np.random.RandomState(1)
+        generator = InnovationNumberGeneratorSingleCore()
+        genome = create_genome_structure(4, 2, modified_sigmoid_activation, config, generator)
+        genome = rp.set_new_genome_weights(genome, rnd, config)
+        for generation in range(10):
+            generator.next_generation(generation)
+            genome, _, _, _ = rp.mutate_add_node(genome, rnd, generator, config)
+            genome, _ = rp.mutate_add_connection(genome, rnd, generator, config)
+
+        data = es.encode_genome(genome)
+        self._assert_genome_equal(genome, es.decode_genome(data))
+        # The pickled models store only the values of their slots, but the encoded genome is still smaller
+        self.assertLess(len(pickle.dumps(data)) * 1.4, len(pickle.dumps(Agent(1, genome))))
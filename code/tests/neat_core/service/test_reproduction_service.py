@@ -5,11 +5,13 @@ import numpy as np
 from neat_core.activation_function import step_activation, modified_sigmoid_activation
 from neat_core.models.connection import Connection
 from neat_core.models.genome import Genome
+from neat_core.models.agent import Agent
+from neat_core.models.genome_index import GenomeIndex
 from neat_core.models.node import NodeType, Node
 from neat_core.optimizer.neat_config import NeatConfig
 from neat_core.service.reproduction_service import deep_copy_node, deep_copy_connection, deep_copy_genome, \
     set_new_genome_weights, mutate_weights, mutate_add_connection, mutate_add_node, cross_over, mutate_bias, \
-    set_new_genome_bias
+    set_new_genome_bias, copy_genome, mutate_weights_vectorized, mutate_bias_vectorized, compose_offspring_genome
 from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
 
 
@@ -66,6 +68,31 @@ class ReproductionServiceTest(TestCase):
         for original_connection, copied_connection in zip(original_genome.connections, copied_genome.connections):
             self.compare_connections(original_connection, copied_connection)
 
+    def test_copy_genome(self):
+        copied_genome = copy_genome(self.genome)
+        self.assertIsNot(self.genome, copied_genome)
+        self.assertEqual(self.genome.seed, copied_genome.seed)
+        self.assertEqual(self.genome.nodes, copied_genome.nodes)
+        self.assertEqual(self.genome.connections, copied_genome.connections)
+
+        # The genes are replaced by copies, if they are changed, so the original genome is not modified
+        config = NeatConfig(probability_weight_mutation=1.0, probability_bias_mutation=1.0,
+                            probability_mutate_add_node=1.0)
+        copied_genome = mutate_weights(copied_genome, self.rnd, config)
+        copied_genome = mutate_bias(copied_genome, self.rnd, config)
+        copied_genome, _, _, _ = mutate_add_node(copied_genome, self.rnd, self.inn_generator, config)
+
+        self.assertEqual(self.nodes, self.genome.nodes)
+        self.assertEqual(self.connections, self.genome.connections)
+        self.assertEqual([-2.1, -1.2, 0.6, 0], [connection.weight for connection in self.genome.connections])
+        self.assertEqual([0, 0, 1.2, 1.3], [node.bias for node in self.genome.nodes])
+        self.assertEqual([True, True, True, False], [connection.enabled for connection in self.genome.connections])
+
+        # Input nodes have no bias and are still shared
+        self.assertIs(self.node_input1, copied_genome.nodes[0])
+        self.assertIsNot(self.node_output1, copied_genome.nodes[2])
+        self.assertEqual(5, len(copied_genome.nodes))
+
     def test_deep_copy_node(self):
         original_node = Node(1, NodeType.INPUT, 1.1, step_activation, 0)
         original_node_str = Node("asfaf", NodeType.OUTPUT, 1.2, step_activation, 1)
@@ -171,12 +198,14 @@ class ReproductionServiceTest(TestCase):
 
         new_genome = mutate_weights(self.genome, self.rnd, config)
 
-        # Same object
+        # Same object, the mutated connections are replaced by copies
         self.assertEqual(self.genome, new_genome)
-        self.assertAlmostEqual(con1_expected_weight, self.connection1.weight, delta=0.000000000001)
-        self.assertAlmostEqual(-2.445968431387213, self.connection2.weight, delta=0.000000000001)
-        self.assertAlmostEqual(-0.6193951546159804, self.connection3.weight, delta=0.000000000001)
-        self.assertAlmostEqual(1.1113170023805568, self.connection4.weight, delta=0.000000000001)
+        self.assertAlmostEqual(con1_expected_weight, new_genome.connections[0].weight, delta=0.000000000001)
+        self.assertAlmostEqual(-2.445968431387213, new_genome.connections[1].weight, delta=0.000000000001)
+        self.assertAlmostEqual(-0.6193951546159804, new_genome.connections[2].weight, delta=0.000000000001)
+        self.assertAlmostEqual(1.1113170023805568, new_genome.connections[3].weight, delta=0.000000000001)
+        self.assertEqual(-2.1, self.connection1.weight)
+        self.assertEqual(self.connection4.enabled, new_genome.connections[3].enabled)
 
     def test_mutate_weights_normal(self):
         config = NeatConfig(probability_weight_mutation=0.6,
@@ -211,12 +240,12 @@ class ReproductionServiceTest(TestCase):
 
         new_genome = mutate_weights(self.genome, self.rnd, config)
 
-        # Same object
+        # Same object, the mutated connections are replaced by copies
         self.assertEqual(self.genome, new_genome)
-        self.assertAlmostEqual(connection1_new_weight, self.connection1.weight, delta=0.000000000001)
-        self.assertAlmostEqual(connection2_new_weight, self.connection2.weight, delta=0.000000000001)
-        self.assertAlmostEqual(connection3_new_weight, self.connection3.weight, delta=0.000000000001)
-        self.assertAlmostEqual(connection4_new_weight, self.connection4.weight, delta=0.000000000001)
+        self.assertAlmostEqual(connection1_new_weight, new_genome.connections[0].weight, delta=0.000000000001)
+        self.assertAlmostEqual(connection2_new_weight, new_genome.connections[1].weight, delta=0.000000000001)
+        self.assertAlmostEqual(connection3_new_weight, new_genome.connections[2].weight, delta=0.000000000001)
+        self.assertAlmostEqual(connection4_new_weight, new_genome.connections[3].weight, delta=0.000000000001)
 
     def test_mutate_bias_uniform(self):
         config = NeatConfig(probability_bias_mutation=0.6,
@@ -264,6 +293,70 @@ class ReproductionServiceTest(TestCase):
         self.assertAlmostEqual(old_output_bias - 0.5281717522634557, new_genome.nodes[2].bias, delta=0.000000001)
         self.assertAlmostEqual(-0.3232219423868208, new_genome.nodes[3].bias, delta=0.0000000001)
 
+    def test_mutate_weights_vectorized(self):
+        config = NeatConfig(probability_weight_mutation=0.6,
+                            probability_random_weight_mutation=0.5,
+                            connection_initial_min_weight=-3,
+                            connection_initial_max_weight=3,
+                            connection_min_weight=-2,
+                            connection_max_weight=2,
+                            weight_mutation_type="normal",
+                            weight_mutation_normal_sigma=0.5)
+
+        # The random values are drawn for all connections at once
+        rnd = np.random.RandomState(1)
+        mutate = rnd.uniform(0, 1, 4)
+        random_weight = rnd.uniform(0, 1, 4)
+        new_weights = rnd.uniform(-3, 3, 4)
+        perturbations = rnd.normal(0, 0.5, 4)
+
+        old_connections = list(self.genome.connections)
+        old_weights = [connection.weight for connection in old_connections]
+        new_genome = mutate_weights_vectorized(self.genome, self.rnd, config)
+
+        self.assertEqual(self.genome, new_genome)
+        for i, connection in enumerate(new_genome.connections):
+            if mutate[i] > 0.6:
+                self.assertIs(old_connections[i], connection)
+            elif random_weight[i] <= 0.5:
+                self.assertAlmostEqual(new_weights[i], connection.weight, delta=0.000000000001)
+            else:
+                expected_weight = np.clip(old_weights[i] + perturbations[i], -2, 2)
+                self.assertAlmostEqual(expected_weight, connection.weight, delta=0.000000000001)
+            self.assertEqual(old_connections[i].enabled, connection.enabled)
+
+        # The original connections are not changed
+        self.assertEqual(old_weights, [connection.weight for connection in old_connections])
+
+        with self.assertRaises(AssertionError):
+            mutate_weights_vectorized(self.genome, self.rnd, NeatConfig(weight_mutation_type="unknown"))
+
+    def test_mutate_bias_vectorized(self):
+        config = NeatConfig(probability_bias_mutation=1.0,
+                            bias_max=3,
+                            bias_min=-3,
+                            bias_initial_min=-2,
+                            bias_initial_max=2,
+                            probability_random_bias_mutation=0.5,
+                            bias_mutation_uniform_max_change=1,
+                            bias_mutation_type="uniform")
+
+        # Only the output and hidden node have a bias
+        rnd = np.random.RandomState(1)
+        rnd.uniform(0, 1, 2)
+        random_bias = rnd.uniform(0, 1, 2)
+        new_biases = rnd.uniform(-2, 2, 2)
+        perturbations = rnd.uniform(-1, 1, 2)
+
+        old_nodes = list(self.genome.nodes)
+        new_genome = mutate_bias_vectorized(self.genome, self.rnd, config)
+        self.assertIs(self.node_input1, new_genome.nodes[0])
+        self.assertIs(self.node_input2, new_genome.nodes[1])
+        for i, (old_node, new_node) in enumerate(zip(old_nodes[2:], new_genome.nodes[2:])):
+            expected_bias = new_biases[i] if random_bias[i] <= 0.5 else old_node.bias + perturbations[i]
+            self.assertAlmostEqual(expected_bias, new_node.bias, delta=0.000000000001)
+            self.assertEqual(old_node.innovation_number, new_node.innovation_number)
+
     def test_mutate_add_connection(self):
         config = NeatConfig(connection_initial_min_weight=-3,
                             connection_initial_max_weight=3,
@@ -350,8 +443,10 @@ class ReproductionServiceTest(TestCase):
         self.assertEqual(node_size_before + 1, len(genome.nodes))
         self.assertEqual(connections_size_before + 2, len(genome.connections))
 
-        # Check if old connection was disabled
-        self.assertFalse(self.connection1.enabled)
+        # Check if old connection was disabled, the connection is replaced by a disabled copy
+        self.assertFalse(genome.connections[0].enabled)
+        self.assertEqual(self.connection1.weight, genome.connections[0].weight)
+        self.assertTrue(self.connection1.enabled)
 
         # Check the generated node
         self.assertEqual(NodeType.HIDDEN, node.node_type)
@@ -374,6 +469,58 @@ class ReproductionServiceTest(TestCase):
         self.assertEqual(self.connection1.weight, con2.weight)
         self.assertTrue(con2.enabled)
 
+    def test_structural_mutation_with_index(self):
+        # The mutations with a kept index create the same genome as the mutations, that build their own index
+        for allow_recurrent in [True, False]:
+            config = NeatConfig(allow_recurrent_connections=allow_recurrent, probability_mutate_add_node=0.7,
+                                probability_mutate_add_connection=0.9)
+            genomes = []
+            for use_index in [True, False]:
+                genome, rnd = deep_copy_genome(self.genome), np.random.RandomState(5)
+                generator = InnovationNumberGeneratorSingleCore()
+                generator.node_counter, generator.connection_counter = 4, 4
+                index = GenomeIndex(genome) if use_index else None
+                for _ in range(40):
+                    mutate_add_node(genome, rnd, generator, config, index)
+                    mutate_add_connection(genome, rnd, generator, config, index)
+                genomes.append(genome)
+
+            self.assertGreater(len(genomes[0].nodes), 20)
+            self.assertEqual([(c.innovation_number, c.input_node, c.output_node, c.weight, c.enabled)
+                              for c in genomes[0].connections],
+                             [(c.innovation_number, c.input_node, c.output_node, c.weight, c.enabled)
+                              for c in genomes[1].connections])
+
+    def test_compose_offspring_genome_with_index(self):
+        # The children derive their index from the more fit parent and create the same genomes as without the index
+        config = NeatConfig(probability_mutate_add_node=0.5, probability_mutate_add_connection=0.9)
+        results = []
+        for keep_index in [True, False]:
+            generator = InnovationNumberGeneratorSingleCore()
+            generator.node_counter, generator.connection_counter = 4, 4
+            agents = [Agent(i, deep_copy_genome(self.genome)) for i in range(4)]
+            for generation in range(15):
+                for i, agent in enumerate(agents):
+                    agent.fitness = (i * 7 + generation) % 4
+                    if not keep_index:
+                        agent.genome.index = None
+                agents = [Agent(i, compose_offspring_genome(agents[i], agents[(i + 1 + generation) % 4], generator,
+                                                            config)) for i in range(4)]
+                for agent in agents:
+                    agent.genome.seed = (agent.genome.seed + generation + agent.id) % 2 ** 24
+                generator.next_generation(generation)
+            results.append([[(c.innovation_number, c.input_node, c.output_node, c.weight, c.enabled)
+                             for c in agent.genome.connections] for agent in agents])
+
+            if keep_index:
+                self.assertTrue(all(agent.genome.index is not None for agent in agents))
+                for agent in agents:
+                    self.assertEqual(sorted(agent.genome.nodes, key=lambda node: node.x_position),
+                                     agent.genome.index.get_sorted_nodes())
+
+        self.assertGreater(max(len(connections) for connections in results[0]), 10)
+        self.assertEqual(results[0], results[1])
+
     def test_cross_over(self):
         node1_1 = Node(1, NodeType.INPUT, 1.1, step_activation, 0)
         node1_2 = Node(2, NodeType.INPUT, 1.2, step_activation, 0)
@@ -417,17 +564,12 @@ class ReproductionServiceTest(TestCase):
         # 1 rnd.uniform(0, 1) = 0.34556072704304774 -> Re-enable connection False (connection1_7)
 
         child_nodes, child_connections = cross_over(more_fit_parent, less_fit_parent, self.rnd, config)
-        # Check nodes
-        self.assertEqual(4, len(child_nodes))
-        self.compare_nodes(node1_1, child_nodes[0])
-        self.compare_nodes(node2_2, child_nodes[1])
-        self.compare_nodes(node1_5, child_nodes[2])
-        self.compare_nodes(node1_7, child_nodes[3])
-
-        # Check connections
+        # Check nodes, they are shared with the parents
+        self.assertEqual([node1_1, node2_2, node1_5, node1_7], child_nodes)
+
+        # Check connections, only the re-enabled connection is copied
         self.assertEqual(4, len(child_connections))
-        connection1_1.enabled = True
-        self.compare_connections(connection1_1, child_connections[0])
-        self.compare_connections(connection1_2, child_connections[1])
-        self.compare_connections(connection1_4, child_connections[2])
-        self.compare_connections(connection1_7, child_connections[3])
+        self.assertFalse(connection1_1.enabled)
+        connection1_1_enabled = Connection(innovation_number=1, input_node=1, output_node=2, weight=1.2, enabled=True)
+        self.compare_connections(connection1_1_enabled, child_connections[0])
+        self.assertEqual([connection1_2, connection1_4, connection1_7], child_connections[1:])
@@ -1,4 +1,6 @@
+import warnings
 from unittest import TestCase
+from unittest.mock import patch
 
 import numpy as np
 
@@ -8,6 +10,7 @@ import neat_core.service.species_service as ss
 from neat_core.activation_function import step_activation
 from neat_core.models.agent import Agent
 from neat_core.models.connection import Connection
+from neat_core.models.distance_cache import DistanceCache
 from neat_core.models.generation import Generation
 from neat_core.models.genome import Genome
 from neat_core.models.node import Node, NodeType
@@ -120,6 +123,50 @@ class SpeciesServiceTest(TestCase):
             disjoint_gene_value_connection + matching_genes_value_connection + disjoint_gene_value_node +
             matching_genes_value_node, genetic_distance)
 
+    def test_calculate_genetic_distance_cached(self):
+        expected = ss.calculate_genetic_distance(self.g1, self.g2, self.config)
+        distance_cache = DistanceCache(10)
+
+        self.assertEqual(expected, ss.calculate_genetic_distance(self.g1, self.g2, self.config, distance_cache))
+        self.assertEqual(expected, ss.calculate_genetic_distance(rs.copy_genome(self.g1), self.g2, self.config,
+                                                                 distance_cache))
+        self.assertEqual(1, distance_cache.distances.hits)
+        self.assertEqual(1, distance_cache.distances.misses)
+
+        # Replaced genes and other compatibility factors are not taken from the cache
+        self.config.compatibility_factor_matching_genes = 2
+        ss.calculate_genetic_distance(self.g1, self.g2, self.config, distance_cache)
+        genome_changed = rs.copy_genome(self.g1)
+        genome_changed.connections[0] = Connection(1, 1, 3, 0.3, True)
+        self.assertEqual(ss._calculate_genetic_distance(genome_changed, self.g2, self.config),
+                         ss.calculate_genetic_distance(genome_changed, self.g2, self.config, distance_cache))
+        self.assertEqual(3, distance_cache.distances.misses)
+
+    def test_genetic_distances_cached(self):
+        representatives = [self.g2, self.genome3, self.g1]
+        genomes = [self.g1, rs.copy_genome(self.genome3), self.genome4, self.g2]
+        distance_cache = DistanceCache(100)
+
+        with warnings.catch_warnings():
+            # genome4 has no matching genes with the representatives
+            warnings.simplefilter("ignore", RuntimeWarning)
+            expected = ss.calculate_genetic_distances(self.g1, representatives, self.config)
+            self.assertTrue(np.array_equal(expected, ss.calculate_genetic_distances(self.g1, representatives,
+                                                                                    self.config, distance_cache)))
+            self.assertTrue(np.array_equal(expected, ss.calculate_genetic_distances(self.g1, representatives,
+                                                                                    self.config, distance_cache)))
+            self.assertEqual(3, distance_cache.distances.hits)
+
+            # The vectorized comparison of the remaining representatives uses the cache too
+            distance_cache = DistanceCache(100)
+            candidates = ss.find_compatible_species(genomes, representatives, self.config, distance_cache)
+            misses, hits = distance_cache.distances.misses, distance_cache.distances.hits
+            self.assertEqual([2, 1, -1, 0], candidates.tolist())
+            self.assertEqual(candidates.tolist(), ss.find_compatible_species(genomes, representatives, self.config,
+                                                                             distance_cache).tolist())
+        self.assertEqual(misses, distance_cache.distances.misses)
+        self.assertLess(hits, distance_cache.distances.hits)
+
     def test_calculate_genetic_distance_nodes_normalized(self):
         disjoint_gene_value = (3 / 6) * self.config.compatibility_factor_disjoint_genes
         matching_genes_value = 0.325 * self.config.compatibility_factor_matching_genes
@@ -163,6 +210,56 @@ class SpeciesServiceTest(TestCase):
         self.assertEqual({"c", "d"}, matching_genes_str)
         self.assertEqual({"a", "b", "e", "f"}, disjoint_genes_str)
 
+    def test_create_gene_arrays(self):
+        gene_arrays = ss.create_gene_arrays(self.g1)
+        self.assertEqual([2, 4, 6, 8, 12, 14, 3, 5, 7, 9, 11, 13], gene_arrays.keys.tolist())
+        self.assertEqual([0, 0, 1.2, 1.5, 0.5, 0.2, 1.2, 0.5, -1.2, 0.2, 2.0, -1.1], gene_arrays.values.tolist())
+        self.assertEqual([6, 6], gene_arrays.amount_genes.tolist())
+        self.assertEqual([2, 3, 4, 5, 6, 7, 8, 9, 11, 12, 13, 14], gene_arrays.sorted_keys.tolist())
+
+        # Only unique integer innovation numbers are supported
+        genome_str = Genome(3, [Node("a", NodeType.INPUT, 0, step_activation, 0)], [])
+        self.assertIsNone(ss.create_gene_arrays(genome_str))
+        genome_duplicated = Genome(4, self.g1_nodes, self.g1_connections + [Connection(6, 2, 3, 0.1, True)])
+        self.assertIsNone(ss.create_gene_arrays(genome_duplicated))
+
+    def test_calculate_genetic_distances(self):
+        # Genome without matching connections and a genome with string innovation numbers
+        genome_disjoint = Genome(3, self.g1_nodes, [Connection(20, 1, 3, 0.4, True)])
+        genome_str = Genome(4, [Node("a", NodeType.INPUT, 0, step_activation, 0)], [])
+        representatives = [self.g2, self.g1, genome_disjoint, self.genome3, self.genome4]
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            for genome in [self.g1, self.g2, genome_disjoint, self.genome5, genome_str]:
+                for threshold in [0, 7]:
+                    self.config.compatibility_genome_size_threshold = threshold
+                    expected = [ss.calculate_genetic_distance(genome, r, self.config) for r in representatives]
+                    distances = ss.calculate_genetic_distances(genome, representatives, self.config)
+                    self.assertTrue(np.array_equal(expected, distances, equal_nan=True))
+
+        self.assertEqual([], ss.calculate_genetic_distances(self.g1, [], self.config).tolist())
+
+    def test_segment_means(self):
+        rnd = np.random.RandomState(1)
+        counts = np.array(list(range(300)) + [0, 9, 0])
+        values = rnd.uniform(-3, 3, size=counts.sum())
+
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.assertTrue(ss._BLOCKED_SUMS_MATCH_NUMPY)
+        for blocked_sums in [True, False]:
+            with patch.object(ss, "_BLOCKED_SUMS_MATCH_NUMPY", blocked_sums):
+                means = ss._segment_means(values, counts)
+
+            for i, count in enumerate(counts):
+                if count == 0:
+                    self.assertTrue(np.isnan(means[i]))
+                else:
+                    # Identical to the mean of numpy, not only almost equal
+                    self.assertEqual(np.mean(values[offsets[i]:offsets[i + 1]]), means[i])
+
+        self.assertTrue(np.all(np.isnan(ss._segment_means(np.zeros(0), np.zeros(3, dtype=np.int64)))))
+
     def test_sort_agents_into_species(self):
         species_id_generator = SpeciesIDGeneratorSingleCore()
         species_list_new = ss.sort_agents_into_species([], [self.agent1, self.agent2], species_id_generator,
@@ -200,6 +297,96 @@ class SpeciesServiceTest(TestCase):
         self.assertEqual(self.agent2, species_list_new[1].members[0])
         self.assertEqual(1, species_list_new[1].id_)
 
+    def test_sort_agents_into_species_first_compatible(self):
+        species_id_generator = SpeciesIDGeneratorSingleCore()
+        species_list = [Species(species_id_generator.get_species_id(), genome, [])
+                        for genome in [self.g2, self.genome3, self.g1, rs.deep_copy_genome(self.g1)]]
+        agent_new = Agent(10, rs.deep_copy_genome(self.g1))
+        agent_str = Agent(11, Genome(5, [Node("a", NodeType.INPUT, 0, step_activation, 0)], []))
+
+        with warnings.catch_warnings():
+            # The string genome has no matching genes with the other genomes
+            warnings.simplefilter("ignore", RuntimeWarning)
+            species_list = ss.sort_agents_into_species(species_list, [agent_new, agent_str], species_id_generator,
+                                                       self.config)
+        self.assertEqual(5, len(species_list))
+        self.assertEqual([[], [], [agent_new], [], [agent_str]], [species.members for species in species_list])
+
+    def test_find_compatible_species(self):
+        representatives = [self.g2, self.genome3, self.g1]
+        genomes = [self.g1, rs.deep_copy_genome(self.genome3), self.genome4, self.g2]
+
+        with warnings.catch_warnings():
+            # genome4 has no matching genes with the representatives
+            warnings.simplefilter("ignore", RuntimeWarning)
+            candidates = ss.find_compatible_species(genomes, representatives, self.config)
+        self.assertEqual(np.int64, candidates.dtype)
+        self.assertEqual([2, 1, -1, 0], candidates.tolist())
+        self.assertEqual([-1], ss.find_compatible_species([self.g1], [], self.config).tolist())
+        self.assertEqual([], ss.find_compatible_species([], representatives, self.config).tolist())
+
+    def test_sort_agents_into_species_with_candidates(self):
+        config = NeatConfig(probability_mutate_add_node=0.5, probability_mutate_add_connection=0.5,
+                            compatibility_threshold=0.8)
+        rnd = np.random.RandomState(1)
+        generator = InnovationNumberGeneratorSingleCore()
+        genomes = [gs.create_genome_structure(2, 2, step_activation, config, generator)]
+        for generation in range(60):
+            generator.next_generation(generation)
+            genome = rs.deep_copy_genome(genomes[rnd.randint(len(genomes))])
+            genome = rs.mutate_weights(genome, rnd, config)
+            genome, _, _, _ = rs.mutate_add_node(genome, rnd, generator, config)
+            genome, _ = rs.mutate_add_connection(genome, rnd, generator, config)
+            genomes.append(genome)
+        agents = [Agent(i, genome) for i, genome in enumerate(genomes)]
+
+        expected_generator = SpeciesIDGeneratorSingleCore()
+        expected_species = [Species(expected_generator.get_species_id(), genomes[i], []) for i in [5, 40]]
+        expected_species = ss.sort_agents_into_species(expected_species, agents, expected_generator, config)
+
+        # The candidates can be calculated in parts, e.g. on different workers
+        species_id_generator = SpeciesIDGeneratorSingleCore()
+        species_list = [Species(species_id_generator.get_species_id(), genomes[i], []) for i in [5, 40]]
+        representatives = [species.representative for species in species_list]
+        candidates = np.concatenate([ss.find_compatible_species(genomes[:25], representatives, config),
+                                     ss.find_compatible_species(genomes[25:], representatives, config)])
+        species_list = ss.sort_agents_into_species_with_candidates(species_list, agents, candidates,
+                                                                   species_id_generator, config)
+
+        self.assertGreater(len(expected_species), 3)
+        self.assertEqual([(s.id_, s.representative, s.members) for s in expected_species],
+                         [(s.id_, s.representative, s.members) for s in species_list])
+
+        with self.assertRaises(AssertionError):
+            ss.sort_agents_into_species_with_candidates([], agents, candidates[:-1], species_id_generator, config)
+
+    def test_calculate_species_statistics(self):
+        self.agent5.fitness = 1
+        statistics = ss.calculate_species_statistics(self.species2)
+
+        self.assertEqual(self.agent6, statistics.best_agent)
+        self.assertEqual(11 / 3, statistics.mean_fitness)
+        self.assertEqual([self.agent5, self.agent4, self.agent6], statistics.sorted_members)
+        # The order of the members is not changed
+        self.assertEqual([self.agent4, self.agent5, self.agent6], self.species2.members)
+
+    def test_precalculated_species_statistics(self):
+        # The statistics are used instead of the members, only missing statistics are calculated
+        statistics = {self.species1.id_: ss.calculate_species_statistics(self.species1)}
+        self.agent2.fitness = 100
+        self.agent8.fitness = 100
+
+        generation = ss.update_fitness_species(self.generation, statistics)
+        self.assertEqual(3, generation.species_list[0].max_species_fitness)
+        self.assertEqual(100, generation.species_list[2].max_species_fitness)
+
+        species_list = ss.calculate_adjusted_fitness(self.generation.species_list, 1, 8, statistics)
+        self.assertEqual(1 / 7, species_list[0].adjusted_fitness)
+
+        species_list = ss.remove_low_genomes(self.generation.species_list, 0.5, statistics)
+        self.assertEqual([self.agent2, self.agent3], species_list[0].members)
+        self.assertEqual([self.agent8], species_list[2].members)
+
     def test_update_fitness_species(self):
         generation = ss.update_fitness_species(self.generation)
 
@@ -0,0 +1,138 @@
+from unittest import TestCase
+
+import numpy as np
+
+import neat_core.service.generation_service as gs
+import neat_core.service.steady_state_service as sss
+from neat_core.activation_function import modified_sigmoid_activation
+from neat_core.models.agent import Agent
+from neat_core.models.species import Species
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_single_core.agent_id_generator_single_core import AgentIDGeneratorSingleCore
+from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
+from neat_single_core.species_id_generator_single_core import SpeciesIDGeneratorSingleCore
+
+
+class SteadyStateServiceTest(TestCase):
+
+    def setUp(self) -> None:
+        self.config = NeatConfig(population_size=20, compatibility_threshold=1.0)
+        self.inno_num_generator = InnovationNumberGeneratorSingleCore()
+        self.species_id_generator = SpeciesIDGeneratorSingleCore()
+        self.agent_id_generator = AgentIDGeneratorSingleCore()
+
+        self.generation = gs.create_initial_generation(2, 1, modified_sigmoid_activation, self.inno_num_generator,
+                                                       self.species_id_generator, self.agent_id_generator,
+                                                       self.config, 1)
+        for i, agent in enumerate(self.generation.agents):
+            agent.fitness = float(i % 7)
+
+    def test_create_next_generation(self):
+        next_generation, rnd = sss.create_next_generation(self.generation)
+        expected_seed = np.random.RandomState(self.generation.seed).randint(2 ** 24)
+
+        self.assertEqual(self.generation.number + 1, next_generation.number)
+        self.assertEqual(expected_seed, next_generation.seed)
+        self.assertIsInstance(rnd, np.random.RandomState)
+        self.assertEqual([a.id for a in self.generation.agents], [a.id for a in next_generation.agents])
+        self.assertEqual([s.id_ for s in self.generation.species_list], [s.id_ for s in next_generation.species_list])
+
+        # The old generation is not changed by the new one
+        next_generation.agents.pop()
+        next_generation.species_list[0].members.pop()
+        self.assertEqual(self.config.population_size, len(self.generation.agents))
+        self.assertEqual(self.config.population_size, sum(len(s.members) for s in self.generation.species_list))
+
+    def test_select_species(self):
+        species1 = Species(1, None, [], adjust_fitness=0.0)
+        species2 = Species(2, None, [], adjust_fitness=1.0)
+        rnd = np.random.RandomState(1)
+        self.assertTrue(all(sss.select_species([species1, species2], rnd) is species2 for _ in range(20)))
+
+        # Without adjusted fitness, all species can be selected
+        species2.adjusted_fitness = 0.0
+        selected_ids = {sss.select_species([species1, species2], rnd).id_ for _ in range(50)}
+        self.assertEqual({1, 2}, selected_ids)
+
+        with self.assertRaises(AssertionError):
+            sss.select_species([], rnd)
+
+    def test_create_selection(self):
+        members_before = [list(s.members) for s in self.generation.species_list]
+        selection = sss.create_selection(self.generation, self.config)
+
+        # The low genomes are only removed from the copies of the species
+        self.assertEqual(members_before, [s.members for s in self.generation.species_list])
+        self.assertEqual([s.id_ for s in self.generation.species_list], [s.id_ for s in selection])
+        for species, selected_species in zip(self.generation.species_list, selection):
+            self.assertIsNot(species, selected_species)
+            self.assertLess(len(selected_species.members), len(species.members))
+            self.assertGreaterEqual(min(a.fitness for a in selected_species.members),
+                                    max(a.fitness for a in species.members if a not in selected_species.members))
+            self.assertIsNotNone(selected_species.adjusted_fitness)
+            self.assertEqual(6, species.max_species_fitness)
+
+    def test_create_offspring_agent(self):
+        members_before = [list(s.members) for s in self.generation.species_list]
+        self.inno_num_generator.next_generation(0)
+        selection = sss.create_selection(self.generation, self.config)
+        selection_members_before = [list(s.members) for s in selection]
+
+        rnd = np.random.RandomState(2)
+        agent = sss.create_offspring_agent(self.generation, selection, rnd, self.inno_num_generator,
+                                           self.agent_id_generator, self.config)
+        self.assertEqual(self.config.population_size, agent.id)
+        self.assertIsNotNone(agent.genome)
+        self.assertEqual(3, len([n for n in agent.genome.nodes if n.innovation_number in [0, 1, 2]]))
+
+        # The species and the selection are not changed by the offspring
+        self.assertEqual(members_before, [s.members for s in self.generation.species_list])
+        self.assertEqual(selection_members_before, [s.members for s in selection])
+
+    def test_replace_worst_agent(self):
+        # In the initial generation, the members of the species are the list of agents
+        self.generation, _ = sss.create_next_generation(self.generation)
+        selection = [Species(1, None, list(self.generation.agents), adjust_fitness=1.0)]
+        new_agent = Agent(100, self.generation.agents[3].genome)
+        new_agent.fitness = 10.0
+
+        removed_agent = sss.replace_worst_agent(self.generation, new_agent, selection, self.species_id_generator,
+                                                self.config)
+
+        # The oldest agent with the lowest fitness is removed
+        self.assertEqual(0, removed_agent.id)
+        self.assertEqual(self.config.population_size, len(self.generation.agents))
+        self.assertIn(new_agent, self.generation.agents)
+        self.assertNotIn(removed_agent, self.generation.agents)
+        members = [a for s in self.generation.species_list for a in s.members]
+        self.assertEqual(self.config.population_size, len(members))
+        self.assertIn(new_agent, members)
+        self.assertTrue(all(len(s.members) > 0 for s in self.generation.species_list))
+
+        # The removed agent can't be selected as parent, the new agent is selected in the next generation
+        self.assertEqual(self.config.population_size - 1, len(selection[0].members))
+        self.assertNotIn(removed_agent, selection[0].members)
+        self.assertNotIn(new_agent, selection[0].members)
+
+        # A new agent with the lowest fitness is removed again
+        worst_agent = Agent(101, self.generation.agents[3].genome)
+        worst_agent.fitness = -1.0
+        self.assertIs(worst_agent, sss.replace_worst_agent(self.generation, worst_agent, selection,
+                                                           self.species_id_generator, self.config))
+        self.assertNotIn(worst_agent, self.generation.agents)
+        self.assertEqual(self.config.population_size - 1, len(selection[0].members))
+
+    def test_replace_worst_agent_empty_selection(self):
+        self.generation, _ = sss.create_next_generation(self.generation)
+        worst_agent = min(self.generation.agents, key=lambda a: a.fitness)
+        selection = [Species(1, None, [worst_agent], adjust_fitness=1.0)]
+        new_agent = Agent(100, self.generation.agents[3].genome)
+        new_agent.fitness = 10.0
+
+        # The selection is calculated again from the population, when its last member is removed
+        self.assertIs(worst_agent, sss.replace_worst_agent(self.generation, new_agent, selection,
+                                                           self.species_id_generator, self.config))
+        self.assertNotEqual(0, len(selection))
+        selected_members = [a for s in selection for a in s.members]
+        self.assertNotIn(worst_agent, selected_members)
+        self.assertIn(new_agent, selected_members)
@@ -1,5 +1,8 @@
+import math
 from unittest import TestCase
 
+import numpy as np
+
 from neat_core import activation_function as func
 
 
@@ -32,3 +35,60 @@ class ActivationFunctionTest(TestCase):
         self.assertAlmostEqual(1, func.relu_activation(1))
         self.assertAlmostEqual(0, func.relu_activation(0))
         self.assertAlmostEqual(0, func.relu_activation(-1))
+
+    def test_vectorized_activation_functions(self):
+        x = np.array([-200.0, -100.0, -2.5, -0.5, -0.0, 0.0, 0.25, 1.0, 99.0, 100.0, 200.0])
+        for activation_function in [func.modified_sigmoid_activation, func.step_activation, func.sigmoid_activation,
+                                    func.tanh_activation, func.relu_activation]:
+            result = func.get_vectorized_activation_function(activation_function)(x)
+            self.assertEqual(x.shape, result.shape)
+            np.testing.assert_allclose([activation_function(value) for value in x.tolist()], result, rtol=0,
+                                       atol=func.VECTORIZED_TOLERANCE)
+
+        # Functions without np.exp and np.tanh are exact
+        for activation_function in [func.step_activation, func.relu_activation]:
+            result = func.get_vectorized_activation_function(activation_function)(x)
+            self.assertEqual([activation_function(value) for value in x.tolist()], result.tolist())
+
+        # Unknown functions are vectorized element wise
+        self.assertEqual([0.0, 1.0], func.get_vectorized_activation_function(math.cos)(np.array([0.5 * math.pi, 0])
+                                                                                       ).round(12).tolist())
+
+    def test_vectorized_tolerance(self):
+        # np.exp and np.tanh are rounded differently than math.exp and math.tanh
+        x = np.random.RandomState(1).uniform(-20, 20, size=100000)
+        for activation_function in [func.modified_sigmoid_activation, func.sigmoid_activation, func.tanh_activation]:
+            expected = np.array([activation_function(value) for value in x.tolist()])
+            result = func.get_vectorized_activation_function(activation_function)(x)
+            self.assertLessEqual(np.max(np.abs(expected - result)), func.VECTORIZED_TOLERANCE)
+
+    def test_registry(self):
+        # The ids of the built-in functions are used in encoded genomes and pickled nodes, they must never change
+        builtin_functions = [func.modified_sigmoid_activation, func.step_activation, func.sigmoid_activation,
+                             func.tanh_activation, func.relu_activation]
+        for function_id, activation_function in enumerate(builtin_functions):
+            self.assertTrue(func.is_registered(activation_function))
+            self.assertEqual(function_id, func.get_activation_function_id(activation_function))
+            self.assertEqual(function_id, func.find_activation_function_id(activation_function))
+            self.assertIs(activation_function, func.get_activation_function(function_id))
+
+        self.assertFalse(func.is_registered(_custom_activation))
+        self.assertIsNone(func.find_activation_function_id(_custom_activation))
+        with self.assertRaises(AssertionError):
+            func.get_activation_function_id(_custom_activation)
+
+        amount_functions = func.get_amount_activation_functions()
+        function_id = func.register_activation_function(_custom_activation)
+        self.assertEqual(amount_functions, function_id)
+        self.assertEqual(amount_functions + 1, func.get_amount_activation_functions())
+        self.assertIs(_custom_activation, func.get_activation_function(function_id))
+        self.assertEqual([0.0, 4.0], func.get_vectorized_activation_function(_custom_activation)(
+            np.array([0.0, 2.0])).tolist())
+
+        # Registering a function again keeps the id
+        self.assertEqual(function_id, func.register_activation_function(_custom_activation))
+        self.assertEqual(1, func.register_activation_function(func.step_activation))
+
+
+def _custom_activation(x: float) -> float:
+    return x * x
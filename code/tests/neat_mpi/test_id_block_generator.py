@@ -0,0 +1,35 @@
+from unittest import TestCase
+
+from neat_mpi.agent_id_generator_mpi import AgentIDGeneratorMPI
+from neat_mpi.id_block_generator import IDBlockGenerator
+from neat_mpi.species_id_generator_mpi import SpeciesIDGeneratorMPI
+
+
+class IDBlockGeneratorTest(TestCase):
+
+    def test_get_id(self):
+        generator0 = IDBlockGenerator(0, 2, block_size=3)
+        generator1 = IDBlockGenerator(1, 2, block_size=3)
+
+        self.assertEqual([0, 1, 2, 6, 7, 8, 12], [generator0.get_id() for _ in range(7)])
+        self.assertEqual([3, 4, 5, 9], [generator1.get_id() for _ in range(4)])
+
+        generator = IDBlockGenerator(2, 3, block_size=2, first_id=100)
+        self.assertEqual([104, 105, 110, 111, 116], [generator.get_id() for _ in range(5)])
+
+    def test_unique_ids(self):
+        generators = [IDBlockGenerator(rank, 4, block_size=5) for rank in range(4)]
+        ids = [generator.get_id() for generator in generators for _ in range(17)]
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(AssertionError):
+            IDBlockGenerator(2, 2)
+        with self.assertRaises(AssertionError):
+            IDBlockGenerator(0, 1, block_size=0)
+
+    def test_agent_and_species_id_generator(self):
+        agent_generator = AgentIDGeneratorMPI(1, 2, block_size=2)
+        self.assertEqual([2, 3, 6], [agent_generator.get_agent_id() for _ in range(3)])
+        species_generator = SpeciesIDGeneratorMPI(0, 3, block_size=1, first_id=5)
+        self.assertEqual([5, 8], [species_generator.get_species_id() for _ in range(2)])
@@ -0,0 +1,151 @@
+from unittest import TestCase
+
+from neat_core.activation_function import modified_sigmoid_activation, step_activation
+from neat_core.models.agent import Agent
+from neat_core.models.connection import Connection
+from neat_core.models.genome import Genome
+from neat_core.models.node import Node, NodeType
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.service import generation_service as gs
+from neat_core.service import reproduction_service as rp
+from neat_mpi import partitioning
+from neat_mpi.inno_number_generator_mpi import InnovationNumberGeneratorMPI, merge_innovations, remap_genome
+from neat_single_core.agent_id_generator_single_core import AgentIDGeneratorSingleCore
+from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
+from neat_single_core.species_id_generator_single_core import SpeciesIDGeneratorSingleCore
+
+
+class InnovationNumberGeneratorMPITest(TestCase):
+
+    def setUp(self) -> None:
+        self.node1 = Node(0, NodeType.INPUT, 0, step_activation, 0)
+        self.node2 = Node(1, NodeType.OUTPUT, 0, step_activation, 1)
+
+    def test_provisional_numbers(self):
+        generator = InnovationNumberGeneratorMPI(rank=2, block_size=100)
+        generator.node_counter = 5
+        generator.connection_counter = 10
+        generator.next_generation(1)
+
+        self.assertEqual(205, generator.get_node_innovation_number(self.node1, self.node2))
+        self.assertEqual(205, generator.get_node_innovation_number(self.node1, self.node2))
+        self.assertEqual(206, generator.get_node_innovation_number(self.node2, self.node1))
+        self.assertEqual(210, generator.get_connection_innovation_number(self.node1, self.node2))
+        self.assertEqual(210, generator.get_connection_innovation_number(self.node1, self.node2))
+
+        # Initial nodes and connections receive final numbers
+        self.assertEqual(5, generator.get_node_innovation_number())
+        self.assertEqual(10, generator.get_connection_innovation_number())
+
+        self.assertEqual(([((0, 1), 205), ((1, 0), 206)], [((0, 1), 210)], []), generator.get_new_innovations())
+
+        generator = InnovationNumberGeneratorMPI(rank=0, block_size=1)
+        generator.get_node_innovation_number(self.node1, self.node2)
+        with self.assertRaises(AssertionError):
+            generator.get_node_innovation_number(self.node2, self.node1)
+
+    def test_merge_innovations(self):
+        # Rank 1 creates the same node as rank 0 and a connection to it
+        rank0 = ([((0, 1), 5)], [((0, 5), 10)], [])
+        rank1 = ([((3, 4), 105), ((0, 1), 106)], [((106, 1), 110), ((0, 106), 111)], [(2, 3)])
+
+        node_mappings, connection_mappings, new_connections, node_counter, connection_counter = \
+            merge_innovations([rank0, rank1], 5, 10)
+
+        self.assertEqual([{5: 5}, {105: 6, 106: 5}], node_mappings)
+        self.assertEqual([{10: 10}, {110: 11, 111: 10}], connection_mappings)
+        self.assertEqual([((0, 5), 10), ((5, 1), 11)], new_connections)
+        self.assertEqual(7, node_counter)
+        self.assertEqual(12, connection_counter)
+
+    def test_apply_innovations(self):
+        generators = [InnovationNumberGeneratorMPI(rank, block_size=100) for rank in range(2)]
+        for generator in generators:
+            generator.connection_innovations[(0, 1)] = (0, 0)
+            generator.connection_innovations[(1, 0)] = (1, 0)
+            generator.node_counter = generator.connection_counter = 2
+            generator.next_generation(3)
+
+        generators[0].get_connection_innovation_number(self.node2, self.node1)
+        generators[1].get_connection_innovation_number(self.node2, self.node2)
+        innovations = [generator.get_new_innovations() for generator in generators]
+
+        # Rank 0 uses a stored innovation, rank 1 creates a new one
+        self.assertEqual(([], [], [(1, 0)]), innovations[0])
+        self.assertEqual(({}, {}), generators[0].apply_innovations(innovations))
+        self.assertEqual(({}, {102: 2}), generators[1].apply_innovations(innovations))
+        for generator in generators:
+            self.assertEqual(3, generator.connection_counter)
+            self.assertEqual([(0, 1), (1, 0), (1, 1)], list(generator.connection_innovations))
+            self.assertEqual((1, 3), generator.connection_innovations[(1, 0)])
+            self.assertEqual(([], [], []), generator.get_new_innovations())
+
+    def test_remap_genome(self):
+        hidden_node = Node(105, NodeType.HIDDEN, 0.5, step_activation, 0.5)
+        connection1 = Connection(0, 0, 1, 1.0, True)
+        connection2 = Connection(110, 0, 105, 0.3, False)
+        genome = Genome(1, [self.node1, self.node2, hidden_node], [connection1, connection2])
+
+        genome = remap_genome(genome, {105: 6}, {110: 11})
+
+        self.assertIs(self.node1, genome.nodes[0])
+        self.assertIs(connection1, genome.connections[0])
+        self.assertEqual((6, 0.5), (genome.nodes[2].innovation_number, genome.nodes[2].bias))
+        self.assertEqual((11, 0, 6, 0.3, False), (genome.connections[1].innovation_number,
+                                                  genome.connections[1].input_node, genome.connections[1].output_node,
+                                                  genome.connections[1].weight, genome.connections[1].enabled))
+        self.assertEqual(105, hidden_node.innovation_number)
+
+    def test_same_numbers_as_single_core(self):
+        config = NeatConfig(population_size=30, probability_mutate_add_node=0.5, probability_mutate_add_connection=0.5)
+        single_core_generator = InnovationNumberGeneratorSingleCore()
+        generation = gs.create_initial_generation(2, 1, modified_sigmoid_activation, single_core_generator,
+                                                  SpeciesIDGeneratorSingleCore(), AgentIDGeneratorSingleCore(),
+                                                  config, 1)
+        generators = [InnovationNumberGeneratorMPI(rank) for rank in range(3)]
+        for generator in generators:
+            generator.node_counter = single_core_generator.node_counter
+            generator.connection_counter = single_core_generator.connection_counter
+
+        agents = generation.agents
+        for generation_number in range(1, 4):
+            for i, agent in enumerate(agents):
+                agent.fitness = float(i % 5)
+            pairs = [(agent, agents[(i + 1) % len(agents)]) for i, agent in enumerate(agents)]
+
+            single_core_generator.next_generation(generation_number)
+            expected_genomes = [rp.compose_offspring_genome(parent1, parent2, single_core_generator, config)
+                                for parent1, parent2 in pairs]
+
+            # Every rank composes a contiguous part of the children
+            displacements = partitioning.get_displacements(partitioning.static_partition(len(pairs), 3)).tolist()
+            parts = [pairs[start:end] for start, end in zip(displacements, displacements[1:] + [len(pairs)])]
+            genomes_per_rank = []
+            for generator, part in zip(generators, parts):
+                generator.next_generation(generation_number)
+                genomes_per_rank.append([rp.compose_offspring_genome(parent1, parent2, generator, config)
+                                         for parent1, parent2 in part])
+
+            innovations = [generator.get_new_innovations() for generator in generators]
+            genomes = []
+            for generator, rank_genomes in zip(generators, genomes_per_rank):
+                node_mapping, connection_mapping = generator.apply_innovations(innovations)
+                genomes += [remap_genome(genome, node_mapping, connection_mapping) for genome in rank_genomes]
+
+            for expected_genome, genome in zip(expected_genomes, genomes):
+                self.assertEqual([n.innovation_number for n in expected_genome.nodes],
+                                 [n.innovation_number for n in genome.nodes])
+                self.assertEqual([(c.innovation_number, c.input_node, c.output_node, c.weight)
+                                  for c in expected_genome.connections],
+                                 [(c.innovation_number, c.input_node, c.output_node, c.weight)
+                                  for c in genome.connections])
+
+            for generator in generators:
+                self.assertEqual(single_core_generator.node_counter, generator.node_counter)
+                self.assertEqual(single_core_generator.connection_counter, generator.connection_counter)
+                self.assertEqual(single_core_generator.connection_innovations, generator.connection_innovations)
+
+            agents = [Agent(i, genome) for i, genome in enumerate(expected_genomes)]
+
+        # The test requires new structures in the run
+        self.assertGreater(single_core_generator.node_counter, 3)
@@ -0,0 +1,72 @@
+from unittest import TestCase
+
+import numpy as np
+
+from neat_mpi import partitioning
+
+
+class PartitioningTest(TestCase):
+
+    def test_static_partition(self):
+        self.assertEqual([4, 3, 3], partitioning.static_partition(10, 3).tolist())
+        self.assertEqual([5, 5], partitioning.static_partition(10, 2).tolist())
+        self.assertEqual([1, 1, 0, 0], partitioning.static_partition(2, 4).tolist())
+        self.assertEqual([0], partitioning.static_partition(0, 1).tolist())
+
+        with self.assertRaises(AssertionError):
+            partitioning.static_partition(10, 0)
+
+    def test_cost_partition(self):
+        self.assertEqual([2, 2], partitioning.cost_partition([1, 1, 1, 1], 2).tolist())
+        self.assertEqual([1, 3], partitioning.cost_partition([10, 1, 1, 1], 2).tolist())
+        self.assertEqual([3, 1], partitioning.cost_partition([1, 1, 1, 10], 2).tolist())
+        self.assertEqual([1, 1, 2], partitioning.cost_partition([5, 5, 2, 3], 3).tolist())
+
+        # More parts than items, the remaining parts are empty
+        self.assertEqual([1, 0, 1, 0], partitioning.cost_partition([1, 100], 4).tolist())
+        self.assertEqual([0, 0], partitioning.cost_partition([], 2).tolist())
+
+        # All items are assigned
+        costs = np.random.RandomState(1).exponential(size=150)
+        counts = partitioning.cost_partition(costs, 7)
+        self.assertEqual(150, np.sum(counts))
+        self.assertTrue(np.all(counts >= 0))
+
+    def test_get_displacements(self):
+        self.assertEqual([0, 4, 7], partitioning.get_displacements(np.array([4, 3, 3])).tolist())
+        self.assertEqual([0, 0, 2], partitioning.get_displacements(np.array([0, 2, 1])).tolist())
+
+    def test_get_part_sums(self):
+        values = np.array([3, 1, 4, 1, 5], dtype=np.int64)
+        self.assertEqual([4, 0, 10], partitioning.get_part_sums(values, np.array([2, 0, 3])).tolist())
+        self.assertEqual(np.int64, partitioning.get_part_sums(values, np.array([5])).dtype)
+
+    def test_pack_unpack_buffers(self):
+        buffers = [b"abc", b"", b"defgh"]
+        packed, sizes = partitioning.pack_buffers(buffers)
+
+        self.assertEqual(np.uint8, packed.dtype)
+        self.assertEqual(8, len(packed))
+        self.assertEqual([3, 0, 5], sizes.tolist())
+        self.assertEqual(buffers, partitioning.unpack_buffers(packed, sizes))
+        self.assertEqual([b"defgh"], partitioning.unpack_buffers(packed[3:], sizes[2:]))
+
+    def test_guided_chunks(self):
+        # Same costs, the chunks shrink with the remaining items
+        chunks = partitioning.guided_chunks(np.ones(20), 4)
+        self.assertEqual([5, 4, 3, 2, 2, 1, 1, 1, 1], [len(chunk) for chunk in chunks])
+        self.assertEqual(list(range(20)), np.concatenate(chunks).tolist())
+
+        # Expensive items are scheduled first
+        costs = np.array([1, 1, 8, 1, 1, 4, 1, 1])
+        chunks = partitioning.guided_chunks(costs, 2)
+        self.assertEqual([[2], [5, 0], [1, 3, 4], [6], [7]], [chunk.tolist() for chunk in chunks])
+
+        # Minimum chunk size
+        chunks = partitioning.guided_chunks(np.ones(10), 4, min_chunk_size=2)
+        self.assertTrue(all(len(chunk) >= 2 for chunk in chunks))
+        self.assertEqual(10, sum(len(chunk) for chunk in chunks))
+
+        self.assertEqual([], partitioning.guided_chunks(np.array([]), 4))
+        with self.assertRaises(AssertionError):
+            partitioning.guided_chunks(np.ones(2), 0)
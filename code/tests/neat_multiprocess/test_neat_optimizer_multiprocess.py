@@ -0,0 +1,201 @@
+import os
+import tempfile
+from typing import Dict, List, Tuple
+from unittest import TestCase
+
+from neat_core.activation_function import modified_sigmoid_activation
+from neat_core.models.generation import Generation
+from neat_core.optimizer.batch_challenge import BatchChallenge
+from neat_core.optimizer.challenge import Challenge
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.optimizer.neat_optimizer_callback import NeatOptimizerCallback
+from neat_multiprocess.neat_optimizer_multiprocess import NeatOptimizerMultiprocess
+from neat_single_core.neat_optimizer_single_core import NeatOptimizerSingleCore
+from neural_network.neural_network_interface import NeuralNetworkInterface
+from neural_network.population_network import PopulationNetwork
+
+
+class OutputChallenge(Challenge):
+    """
+    Deterministic challenge, the fitness is the output of the network for a fixed input
+    """
+
+    def evaluate(self, neural_network: NeuralNetworkInterface, **kwargs) -> (float, Dict[str, object]):
+        fitness = neural_network.activate([0.5, -0.5])[0]
+        return fitness, {"fitness": fitness}
+
+
+class OutputBatchChallenge(BatchChallenge, OutputChallenge):
+
+    def evaluate_population(self, population_network: PopulationNetwork, **kwargs) \
+            -> List[Tuple[float, Dict[str, object]]]:
+        results = population_network.activate([[0.5, -0.5]])[:, 0, 0]
+        return [(float(fitness), {"fitness": float(fitness)}) for fitness in results]
+
+
+class RecordingChallenge(OutputChallenge):
+
+    def __init__(self, directory: str):
+        """
+        Challenge, that records the process ids of its initializations and clean ups in a directory
+        :param directory: the directory for the records
+        """
+        self.directory = directory
+
+    def _record(self, event: str) -> None:
+        with open(os.path.join(self.directory, "{}_{}".format(event, os.getpid())), "w"):
+            pass
+
+    def initialization(self, **kwargs) -> None:
+        self._record("initialization")
+
+    def clean_up(self, **kwargs) -> None:
+        self._record("clean_up")
+
+    def recorded_processes(self, event: str) -> List[str]:
+        return sorted(name[len(event) + 1:] for name in os.listdir(self.directory) if name.startswith(event + "_"))
+
+
+class GenerationCallback(NeatOptimizerCallback):
+
+    def __init__(self, amount_generations: int) -> None:
+        self.amount_generations = amount_generations
+        self.generations: List[Generation] = []
+        self.on_agent_evaluation_end_count = 0
+        self.events: List[str] = []
+        self.start_indices: Dict[int, int] = {}
+        self.end_indices: Dict[int, int] = {}
+
+    def on_agent_evaluation_start(self, i, agent) -> None:
+        self.start_indices[agent.id] = i
+
+    def on_agent_evaluation_end(self, i, agent) -> None:
+        self.on_agent_evaluation_end_count += 1
+        self.end_indices[agent.id] = i
+
+    def on_generation_evaluation_start(self, generation: Generation) -> None:
+        self.events.append("evaluation_start")
+
+    def on_generation_evaluation_end(self, generation: Generation, reporters) -> None:
+        self.events.append("evaluation_end")
+
+    def on_reproduction_start(self, generation: Generation) -> None:
+        self.events.append("reproduction_start")
+
+    def on_reproduction_end(self, generation: Generation) -> None:
+        self.events.append("reproduction_end")
+
+    def on_finish(self, generation: Generation, reporters) -> None:
+        pass
+
+    def finish_evaluation(self, generation: Generation) -> bool:
+        self.generations.append(generation)
+        return len(self.generations) >= self.amount_generations
+
+
+class NeatOptimizerMultiprocessTest(TestCase):
+
+    def setUp(self) -> None:
+        self.config = NeatConfig(population_size=50, neural_network_type="compiled")
+
+    def test_evaluate_same_as_single_core(self):
+        single_callback = GenerationCallback(4)
+        optimizer_single = NeatOptimizerSingleCore()
+        optimizer_single.register_callback(single_callback)
+        optimizer_single.evaluate(2, 1, modified_sigmoid_activation, OutputChallenge(), self.config, 1)
+
+        multiprocess_callback = GenerationCallback(4)
+        optimizer_multiprocess = NeatOptimizerMultiprocess(amount_processes=2)
+        optimizer_multiprocess.register_callback(multiprocess_callback)
+        optimizer_multiprocess.evaluate(2, 1, modified_sigmoid_activation, OutputChallenge(), self.config, 1)
+
+        self.assertEqual(4 * self.config.population_size, multiprocess_callback.on_agent_evaluation_end_count)
+        self.assertIsNotNone(optimizer_multiprocess.agent_evaluation_time)
+        for generation_single, generation_multiprocess in zip(single_callback.generations,
+                                                              multiprocess_callback.generations):
+            self.assertEqual([a.id for a in generation_single.agents], [a.id for a in generation_multiprocess.agents])
+            self.assertEqual([a.fitness for a in generation_single.agents],
+                             [a.fitness for a in generation_multiprocess.agents])
+            for agent in generation_multiprocess.agents:
+                self.assertEqual({"fitness": agent.fitness}, agent.additional_info)
+
+    def test_evaluate_batch_challenge(self):
+        callback = GenerationCallback(1)
+        optimizer_multiprocess = NeatOptimizerMultiprocess(amount_processes=2)
+        optimizer_multiprocess.register_callback(callback)
+        optimizer_multiprocess.evaluate(2, 1, modified_sigmoid_activation, OutputChallenge(), self.config, 1)
+
+        batch_callback = GenerationCallback(1)
+        self.config.batch_evaluation = True
+        optimizer_multiprocess = NeatOptimizerMultiprocess(amount_processes=2)
+        optimizer_multiprocess.register_callback(batch_callback)
+        optimizer_multiprocess.evaluate(2, 1, modified_sigmoid_activation, OutputBatchChallenge(), self.config, 1)
+
+        # The chunks are evaluated with population networks
+        self.assertEqual(self.config.population_size, batch_callback.on_agent_evaluation_end_count)
+        for agent, batch_agent in zip(callback.generations[0].agents, batch_callback.generations[0].agents):
+            self.assertEqual(agent.id, batch_agent.id)
+            self.assertAlmostEqual(agent.fitness, batch_agent.fitness)
+
+    def test_evaluate_steady_state(self):
+        callback = GenerationCallback(4)
+        optimizer = NeatOptimizerMultiprocess(amount_processes=2, mode="steady_state")
+        optimizer.register_callback(callback)
+        optimizer.evaluate(2, 1, modified_sigmoid_activation, OutputChallenge(), self.config, 1)
+
+        # Every generation contains as many new evaluated agents as the population size
+        self.assertEqual(4 * self.config.population_size, callback.on_agent_evaluation_end_count)
+        self.assertEqual([0, 1, 2, 3], [generation.number for generation in callback.generations])
+        self.assertEqual(["evaluation_start", "evaluation_end", "reproduction_start", "reproduction_end"] * 3 +
+                         ["evaluation_start", "evaluation_end"], callback.events)
+
+        for generation in callback.generations:
+            self.assertEqual(self.config.population_size, len(generation.agents))
+            members = [agent for species in generation.species_list for agent in species.members]
+            self.assertEqual(sorted(a.id for a in generation.agents), sorted(a.id for a in members))
+
+        # The start and the end of the evaluation of an agent are reported with the same index
+        self.assertLess(0, len(callback.start_indices))
+        for agent_id, i in callback.start_indices.items():
+            if agent_id in callback.end_indices:
+                self.assertEqual(i, callback.end_indices[agent_id])
+
+        # The population only gets better
+        for last_generation, generation in zip(callback.generations, callback.generations[1:]):
+            self.assertGreaterEqual(min(a.fitness for a in generation.agents),
+                                    min(a.fitness for a in last_generation.agents))
+            self.assertGreaterEqual(max(a.fitness for a in generation.agents),
+                                    max(a.fitness for a in last_generation.agents))
+
+        with self.assertRaises(AssertionError):
+            NeatOptimizerMultiprocess(mode="unknown")
+
+    def test_clean_up_workers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            challenge = RecordingChallenge(directory)
+            optimizer = NeatOptimizerMultiprocess(amount_processes=2)
+            optimizer.register_callback(GenerationCallback(2))
+            optimizer.evaluate(2, 1, modified_sigmoid_activation, challenge, self.config, 1)
+
+            # Every started worker and the main process clean up their challenge
+            initialized_processes = challenge.recorded_processes("initialization")
+            self.assertIn(str(os.getpid()), initialized_processes)
+            self.assertLess(1, len(initialized_processes))
+            self.assertEqual(initialized_processes, challenge.recorded_processes("clean_up"))
+
+    def test_calculate_chunk_size(self):
+        optimizer = NeatOptimizerMultiprocess(amount_processes=4, target_chunk_time=0.2, min_chunks_per_process=4)
+
+        # Without measurement, every process gets 4 chunks
+        self.assertEqual(10, optimizer._calculate_chunk_size(150))
+        self.assertEqual(1, optimizer._calculate_chunk_size(3))
+
+        # Fast agents are limited by the load balancing
+        optimizer.agent_evaluation_time = 0.0001
+        self.assertEqual(10, optimizer._calculate_chunk_size(150))
+
+        # Slow agents are sent in small chunks
+        optimizer.agent_evaluation_time = 0.05
+        self.assertEqual(4, optimizer._calculate_chunk_size(150))
+        optimizer.agent_evaluation_time = 1.0
+        self.assertEqual(1, optimizer._calculate_chunk_size(150))
@@ -72,3 +72,45 @@ class InnovationNumberGeneratorSingleCoreTest(TestCase):
         self.assertEqual(5, generator.get_connection_innovation_number(node3, node1))
 
         self.assertEqual(0, generator.get_node_innovation_number())
+
+    def test_connection_innovation_expiry(self):
+        node1 = Node(1, NodeType.INPUT, 1.0, step_activation, 0)
+        node2 = Node(2, NodeType.HIDDEN, 1.1, step_activation, 0.5)
+        node3 = Node(3, NodeType.OUTPUT, 1.2, step_activation, 1)
+
+        generator = InnovationNumberGeneratorSingleCore(connection_innovation_expiry=2)
+        generator.next_generation(0)
+        self.assertEqual(0, generator.get_connection_innovation_number(node1, node3))
+        self.assertEqual(1, generator.get_connection_innovation_number(node2, node3))
+
+        # The usage in generation 1 keeps the first innovation
+        generator.next_generation(1)
+        self.assertEqual(0, generator.get_connection_innovation_number(node1, node3))
+
+        generator.next_generation(2)
+        self.assertEqual(1, generator.get_connection_innovation_number(node2, node3))
+        generator.next_generation(3)
+        self.assertEqual(2, len(generator.connection_innovations))
+
+        # The first innovation was not used in the generations 2 and 3
+        generator.next_generation(4)
+        self.assertEqual(1, len(generator.connection_innovations))
+        self.assertEqual(1, generator.get_connection_innovation_number(node2, node3))
+        self.assertEqual(2, generator.get_connection_innovation_number(node1, node3))
+
+        with self.assertRaises(AssertionError):
+            InnovationNumberGeneratorSingleCore(connection_innovation_expiry=0)
+
+    def test_get_memory_usage(self):
+        node1 = Node(1, NodeType.INPUT, 1.0, step_activation, 0)
+        node2 = Node(2, NodeType.OUTPUT, 1.1, step_activation, 1)
+
+        generator = InnovationNumberGeneratorSingleCore()
+        empty_memory = generator.get_memory_usage()
+        generator.get_connection_innovation_number(node1, node2)
+        generator.get_node_innovation_number(node1, node2)
+        self.assertGreater(generator.get_memory_usage(), empty_memory)
+
+        generator.next_generation(1)
+        generator.connection_innovations.clear()
+        self.assertEqual(empty_memory, generator.get_memory_usage())
@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from unittest import TestCase
 
 from neat_core.activation_function import step_activation, modified_sigmoid_activation
@@ -7,16 +7,20 @@ from neat_core.models.connection import Connection
 from neat_core.models.generation import Generation
 from neat_core.models.genome import Genome
 from neat_core.models.node import Node, NodeType
+from neat_core.models.species import Species
+from neat_core.optimizer.batch_challenge import BatchChallenge
 from neat_core.optimizer.challenge import Challenge
 from neat_core.optimizer.neat_config import NeatConfig
 from neat_core.optimizer.neat_optimizer_callback import NeatOptimizerCallback
 from neat_core.optimizer.neat_reporter import NeatReporter
 from neat_core.service import generation_service as gs
+from neat_core.service import steady_state_service as sss
 from neat_single_core.agent_id_generator_single_core import AgentIDGeneratorSingleCore
 from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
 from neat_single_core.neat_optimizer_single_core import NeatOptimizerSingleCore
 from neat_single_core.species_id_generator_single_core import SpeciesIDGeneratorSingleCore
 from neural_network.neural_network_interface import NeuralNetworkInterface
+from neural_network.population_network import PopulationNetwork
 from utils.reporter.species_reporter import SpeciesReporter
 from utils.reporter.time_reporter import TimeReporter
 
@@ -106,6 +110,17 @@ class MockChallenge(Challenge):
         self.clean_up_count += 1
 
 
+class MockBatchChallenge(MockChallenge, BatchChallenge):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.evaluate_population_count = 0
+
+    def evaluate_population(self, population_network: PopulationNetwork, **kwargs) -> List[Tuple[float, Dict]]:
+        self.evaluate_population_count += 1
+        return [(i, {"genomes": population_network.amount_genomes}) for i in range(population_network.amount_genomes)]
+
+
 class MockReporter(NeatReporter):
 
     def __init__(self) -> None:
@@ -278,7 +293,7 @@ class NeatOptimizerSingleCoreTest(TestCase):
                                                   SpeciesIDGeneratorSingleCore(), AgentIDGeneratorSingleCore(),
                                                   self.config, 1)
 
-        self.optimizer_single._evaluate_generation(generation, self.challenge)
+        self.optimizer_single._evaluate_generation(generation, self.challenge, self.config)
 
         # Check challenge
         self.assertEqual(self.config.population_size, self.challenge.before_evaluation_count)
@@ -298,3 +313,69 @@ class NeatOptimizerSingleCoreTest(TestCase):
         self.optimizer_single._cleanup(self.challenge)
         self.assertEqual(1, self.challenge.clean_up_count)
         self.assertEqual(1, self.callback.on_cleanup_count)
+
+    def test_evaluate_generation_batch(self):
+        challenge = MockBatchChallenge()
+        self.config.batch_evaluation = True
+        generation = gs.create_initial_generation(2, 1, step_activation, InnovationNumberGeneratorSingleCore(),
+                                                  SpeciesIDGeneratorSingleCore(), AgentIDGeneratorSingleCore(),
+                                                  self.config, 1)
+
+        self.optimizer_single._evaluate_generation(generation, challenge, self.config)
+
+        # The whole population is evaluated at once
+        self.assertEqual(1, challenge.before_evaluation_count)
+        self.assertEqual(1, challenge.evaluate_population_count)
+        self.assertEqual(0, challenge.evaluate_count)
+        self.assertEqual(1, challenge.after_evaluation_count)
+
+        # Check callback
+        self.assertEqual(1, self.callback.on_generation_evaluation_start_count)
+        self.assertEqual(self.config.population_size, self.callback.on_agent_evaluation_start_count)
+        self.assertEqual(self.config.population_size, self.callback.on_agent_evaluation_end_count)
+        self.assertEqual(1, self.callback.on_generation_evaluation_end_count)
+
+        for expected_fitness, agent in zip(range(self.config.population_size), generation.agents):
+            self.assertEqual(expected_fitness, agent.fitness)
+            self.assertEqual({"genomes": self.config.population_size}, agent.additional_info)
+
+    def test_evaluate_generation_batch_disabled(self):
+        challenge = MockBatchChallenge()
+        generation = gs.create_initial_generation(2, 1, step_activation, InnovationNumberGeneratorSingleCore(),
+                                                  SpeciesIDGeneratorSingleCore(), AgentIDGeneratorSingleCore(),
+                                                  self.config, 1)
+
+        self.optimizer_single._evaluate_generation(generation, challenge, self.config)
+
+        # The agents are evaluated one by one
+        self.assertEqual(0, challenge.evaluate_population_count)
+        self.assertEqual(self.config.population_size, challenge.evaluate_count)
+        self.assertEqual(list(range(self.config.population_size)), [agent.fitness for agent in generation.agents])
+
+    def test_update_species_statistics(self):
+        generation = gs.create_initial_generation(2, 1, step_activation, InnovationNumberGeneratorSingleCore(),
+                                                  SpeciesIDGeneratorSingleCore(), AgentIDGeneratorSingleCore(),
+                                                  NeatConfig(population_size=4), 1)
+        generation, _ = sss.create_next_generation(generation)
+        species1 = generation.species_list[0]
+        species1.members = generation.agents[:3]
+        species2 = Species(species1.id_ + 1, generation.agents[3].genome, generation.agents[3:])
+        generation.species_list.append(species2)
+        for i, agent in enumerate(generation.agents):
+            agent.fitness = i
+
+        self.optimizer_single._prepare_species_statistics(generation)
+        self.assertEqual({}, self.optimizer_single.species_statistics)
+
+        # The statistics are calculated, when all members of a species are evaluated
+        self.optimizer_single._update_species_statistics(generation.agents[3])
+        self.assertEqual([species2.id_], list(self.optimizer_single.species_statistics.keys()))
+        for agent in generation.agents[:2]:
+            self.optimizer_single._update_species_statistics(agent)
+        self.assertNotIn(species1.id_, self.optimizer_single.species_statistics)
+        self.optimizer_single._update_species_statistics(generation.agents[2])
+
+        statistics = self.optimizer_single.species_statistics[species1.id_]
+        self.assertEqual(generation.agents[2], statistics.best_agent)
+        self.assertEqual(1.0, statistics.mean_fitness)
+        self.assertEqual(generation.agents[:3], statistics.sorted_members)
@@ -139,6 +139,39 @@ class TestBasicNeuralNetwork(TestCase):
         # Check calculation order
         self.assertEqual([15, 4], neural_network.order)
 
+    def test_build_pruned(self):
+        # Inputs 1, 2, output 3. 4 is a dead end, 7 only feeds the dead end and the path of 5 is disabled. 6 has no
+        # inputs, but its bias changes the output
+        genome = Genome(30, [
+            Node(1, NodeType.INPUT, 0, modified_sigmoid_activation, x_position=0),
+            Node(2, NodeType.INPUT, 0, modified_sigmoid_activation, x_position=0),
+            Node(3, NodeType.OUTPUT, -0.2, modified_sigmoid_activation, x_position=1),
+            Node(4, NodeType.HIDDEN, 0.1, modified_sigmoid_activation, x_position=0.5),
+            Node(5, NodeType.HIDDEN, 0.2, modified_sigmoid_activation, x_position=0.5),
+            Node(6, NodeType.HIDDEN, 0.4, modified_sigmoid_activation, x_position=0.5),
+            Node(7, NodeType.HIDDEN, 0.3, modified_sigmoid_activation, x_position=0.3),
+        ], [
+            Connection(innovation_number=10, input_node=1, output_node=3, weight=0.5, enabled=True),
+            Connection(innovation_number=11, input_node=1, output_node=4, weight=1.0, enabled=True),
+            Connection(innovation_number=12, input_node=7, output_node=4, weight=0.3, enabled=True),
+            Connection(innovation_number=13, input_node=2, output_node=5, weight=-1.0, enabled=True),
+            Connection(innovation_number=14, input_node=5, output_node=3, weight=2.0, enabled=False),
+            Connection(innovation_number=15, input_node=6, output_node=3, weight=1.5, enabled=True),
+        ])
+
+        neural_network = BasicNeuralNetwork()
+        neural_network.build(genome)
+
+        self.assertEqual({1, 2, 3, 6}, set(neural_network.all_neurons.keys()))
+        self.assertEqual([6, 3], neural_network.order)
+        self.assertEqual(3, neural_network.amount_pruned_nodes)
+        self.assertEqual(4, neural_network.amount_pruned_connections)
+
+        for inputs in [[0, 0], [1, -2], [-0.5, 3]]:
+            expected = modified_sigmoid_activation(
+                0.5 * inputs[0] + 1.5 * modified_sigmoid_activation(0.4) - 0.2)
+            self.assertAlmostEqual(expected, neural_network.activate(inputs)[0], delta=1e-12)
+
     def test_reset(self):
         self.net_recurrent.build(self.genome_recurrent)
 
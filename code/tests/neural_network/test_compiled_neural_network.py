@@ -0,0 +1,217 @@
+from unittest import TestCase
+
+import numpy as np
+
+import neat_core.service.encoding_service as es
+import neat_core.service.reproduction_service as rp
+from neat_core.activation_function import step_activation, modified_sigmoid_activation, tanh_activation
+from neat_core.models.connection import Connection
+from neat_core.models.genome import Genome
+from neat_core.models.node import Node, NodeType
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.service.generation_service import create_genome_structure
+from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
+from neural_network.basic_neural_network import BasicNeuralNetwork
+from neural_network.compiled_neural_network import CompiledNeuralNetwork
+
+
+class TestCompiledNeuralNetwork(TestCase):
+
+    def setUp(self) -> None:
+        self.genome_feed_forward = Genome(10, [
+            Node(1, NodeType.INPUT, 0, step_activation, x_position=0),
+            Node(2, NodeType.INPUT, 0, step_activation, x_position=0),
+            Node(3, NodeType.INPUT, 0, step_activation, x_position=0),
+            Node(4, NodeType.OUTPUT, -0.6, step_activation, x_position=1),
+            Node(15, NodeType.HIDDEN, -0.5, step_activation, x_position=0.5),
+        ], [
+            Connection(innovation_number=5, input_node=1, output_node=4, weight=0.5, enabled=True),
+            Connection(innovation_number=16, input_node=1, output_node=15, weight=-0.4, enabled=True),
+            Connection(innovation_number=17, input_node=15, output_node=4, weight=2.0, enabled=True),
+            Connection(innovation_number=18, input_node=2, output_node=15, weight=-1.0, enabled=True),
+            Connection(innovation_number=6, input_node=2, output_node=4, weight=-15.0, enabled=False),
+            Connection(innovation_number=19, input_node=3, output_node=15, weight=2.0, enabled=True),
+            Connection(innovation_number=19, input_node=3, output_node=4, weight=15.0, enabled=False)
+        ])
+
+        self.genome_recurrent = Genome(20, [
+            Node(1, NodeType.INPUT, 0, modified_sigmoid_activation, x_position=0),
+            Node(2, NodeType.INPUT, 0, modified_sigmoid_activation, x_position=0),
+            Node(3, NodeType.INPUT, 0, modified_sigmoid_activation, x_position=0),
+            Node(4, NodeType.OUTPUT, -1.0, modified_sigmoid_activation, x_position=1),
+            Node(10, NodeType.HIDDEN, -0.6, modified_sigmoid_activation, x_position=0.5),
+            Node(15, NodeType.HIDDEN, -1.2, modified_sigmoid_activation, x_position=0.5),
+        ], [
+            Connection(innovation_number=11, input_node=1, output_node=10, weight=0.5, enabled=True),
+            Connection(innovation_number=12, input_node=2, output_node=10, weight=-0.3, enabled=True),
+            Connection(innovation_number=22, input_node=10, output_node=10, weight=1.5, enabled=True),
+            Connection(innovation_number=21, input_node=15, output_node=10, weight=-0.1, enabled=True),
+            Connection(innovation_number=16, input_node=2, output_node=15, weight=2.0, enabled=True),
+            Connection(innovation_number=17, input_node=3, output_node=15, weight=-1.6, enabled=True),
+            Connection(innovation_number=20, input_node=10, output_node=15, weight=-0.3, enabled=True),
+            Connection(innovation_number=18, input_node=4, output_node=15, weight=0.6, enabled=True),
+            Connection(innovation_number=13, input_node=10, output_node=4, weight=1.6, enabled=True),
+            Connection(innovation_number=19, input_node=15, output_node=4, weight=-0.6, enabled=True),
+            Connection(innovation_number=14, input_node=3, output_node=4, weight=-0.3, enabled=True),
+        ])
+
+    def test_build(self):
+        neural_network = CompiledNeuralNetwork()
+        neural_network.build(self.genome_feed_forward)
+
+        self.assertEqual(5, neural_network.amount_nodes)
+        self.assertEqual([1, 2, 3, 15, 4], neural_network.innovation_numbers)
+        self.assertEqual([0, 1, 2], neural_network.input_indices.tolist())
+        self.assertEqual([4], neural_network.output_indices.tolist())
+        self.assertEqual([3, 4], neural_network.order.tolist())
+        self.assertEqual([0, 0, 0, -0.5, -0.6], neural_network.biases.tolist())
+        self.assertEqual([step_activation], neural_network.activation_functions)
+        self.assertEqual([0, 0, 0, 0, 0], neural_network.activation_ids.tolist())
+
+        # Only enabled connections are compiled
+        self.assertEqual([0, 3, 5], neural_network.edge_pointers.tolist())
+        self.assertEqual([0, 1, 2, 0, 3], neural_network.edge_sources.tolist())
+        self.assertEqual([-0.4, -1.0, 2.0, 0.5, 2.0], neural_network.edge_weights.tolist())
+
+    def test_build_recurrent(self):
+        neural_network = CompiledNeuralNetwork()
+        neural_network.build(self.genome_recurrent)
+
+        # Order: 1, 2, 3, 10, 15, 4
+        self.assertEqual([3, 4, 5], neural_network.order.tolist())
+        # Recurrent connections point to the last values, connections from input nodes to the constant zero
+        self.assertEqual([0, 1, 6 + 3, 6 + 4, 1, 2, 6 + 3, 6 + 5, 3, 4, 2], neural_network.edge_sources.tolist())
+
+    def test_build_pruned(self):
+        # Inputs 1, 2, output 3. 4 is a dead end, 7 only feeds the dead end and the path of 5 is disabled. 6 has no
+        # inputs, but its bias changes the output
+        genome = Genome(30, [
+            Node(1, NodeType.INPUT, 0, modified_sigmoid_activation, x_position=0),
+            Node(2, NodeType.INPUT, 0, modified_sigmoid_activation, x_position=0),
+            Node(3, NodeType.OUTPUT, -0.2, modified_sigmoid_activation, x_position=1),
+            Node(4, NodeType.HIDDEN, 0.1, modified_sigmoid_activation, x_position=0.5),
+            Node(5, NodeType.HIDDEN, 0.2, modified_sigmoid_activation, x_position=0.5),
+            Node(6, NodeType.HIDDEN, 0.4, modified_sigmoid_activation, x_position=0.5),
+            Node(7, NodeType.HIDDEN, 0.3, modified_sigmoid_activation, x_position=0.3),
+        ], [
+            Connection(innovation_number=10, input_node=1, output_node=3, weight=0.5, enabled=True),
+            Connection(innovation_number=11, input_node=1, output_node=4, weight=1.0, enabled=True),
+            Connection(innovation_number=12, input_node=7, output_node=4, weight=0.3, enabled=True),
+            Connection(innovation_number=13, input_node=2, output_node=5, weight=-1.0, enabled=True),
+            Connection(innovation_number=14, input_node=5, output_node=3, weight=2.0, enabled=False),
+            Connection(innovation_number=15, input_node=6, output_node=3, weight=1.5, enabled=True),
+        ])
+
+        neural_network = CompiledNeuralNetwork()
+        neural_network.build(genome)
+
+        self.assertEqual(4, neural_network.amount_nodes)
+        self.assertEqual([1, 2, 6, 3], neural_network.innovation_numbers)
+        self.assertEqual([0, 2], neural_network.edge_sources.tolist())
+        self.assertEqual(3, neural_network.amount_pruned_nodes)
+        self.assertEqual(4, neural_network.amount_pruned_connections)
+
+        for inputs in [[0, 0], [1, -2], [-0.5, 3]]:
+            expected = modified_sigmoid_activation(
+                0.5 * inputs[0] + 1.5 * modified_sigmoid_activation(0.4) - 0.2)
+            self.assertAlmostEqual(expected, neural_network.activate(inputs)[0], delta=1e-12)
+
+        # The encoded genome is pruned in the same way
+        _, nodes, connections = es.decode_genome_arrays(es.encode_genome(genome))
+        array_network = CompiledNeuralNetwork()
+        array_network.build_from_arrays(nodes, connections)
+        self.assertEqual([1, 2, 6, 3], array_network.innovation_numbers)
+        self.assertEqual(neural_network.edge_sources.tolist(), array_network.edge_sources.tolist())
+        self.assertEqual(3, array_network.amount_pruned_nodes)
+        self.assertEqual(4, array_network.amount_pruned_connections)
+
+    def test_activate(self):
+        neural_network = CompiledNeuralNetwork()
+        neural_network.build(self.genome_feed_forward)
+
+        with self.assertRaises(AssertionError):
+            neural_network.activate([1, 2, 3, 4])
+
+        self.assertEqual([0], neural_network.activate([0, 0, 0]))
+        self.assertEqual([1], neural_network.activate([0, 0, 1]))
+        self.assertEqual([0], neural_network.activate([0, 1, 0]))
+        self.assertEqual([1], neural_network.activate([0, 1, 1]))
+        self.assertEqual([0], neural_network.activate([1, 0, 0]))
+        self.assertEqual([1], neural_network.activate([1, 0, 1]))
+        self.assertEqual([0], neural_network.activate([1, 1, 0]))
+        self.assertEqual([1], neural_network.activate([1, 1, 1]))
+
+    def test_activate_recurrent_and_reset(self):
+        neural_network = CompiledNeuralNetwork()
+        neural_network.build(self.genome_recurrent)
+
+        result_first = neural_network.activate([0.5, -2, 3])
+        self.assertAlmostEqual(0.03732211974054669, result_first[0], delta=0.00000001)
+        result_second = neural_network.activate([0.5, -2, 3])
+        self.assertAlmostEqual(0.1857531506810662, result_second[0], delta=0.00000001)
+
+        neural_network.reset()
+        result_reset = neural_network.activate([0.5, -2, 3])
+        self.assertAlmostEqual(0.03732211974054669, result_reset[0], delta=0.00000001)
+
+    def test_same_result_as_basic_neural_network(self):
+        config = NeatConfig(allow_recurrent_connections=True, probability_mutate_add_node=0.5,
+                            probability_mutate_add_connection=1.0, mutate_connection_tries=20)
+        rnd = np.random.RandomState(1)
+
+        for _ in range(10):
+            generator = InnovationNumberGeneratorSingleCore()
+            genome = create_genome_structure(3, 2, tanh_activation, config, generator)
+            genome = rp.set_new_genome_weights(genome, rnd, config)
+            genome = rp.set_new_genome_bias(genome, rnd, config)
+            for generation in range(15):
+                # Every mutation is done in a new generation, so the innovation numbers of nodes are unique
+                generator.next_generation(generation)
+                genome, _, _, _ = rp.mutate_add_node(genome, rnd, generator, config)
+                genome, _ = rp.mutate_add_connection(genome, rnd, generator, config)
+
+            basic_network = BasicNeuralNetwork()
+            basic_network.build(genome)
+            compiled_network = CompiledNeuralNetwork()
+            compiled_network.build(genome)
+
+            for _ in range(5):
+                inputs = rnd.uniform(-2, 2, size=3).tolist()
+                self.assertEqual(basic_network.activate(inputs), compiled_network.activate(inputs))
+
+    def test_build_from_arrays(self):
+        config = NeatConfig(allow_recurrent_connections=True, probability_mutate_add_node=0.5,
+                            probability_mutate_add_connection=1.0, mutate_connection_tries=20)
+        rnd = np.random.RandomState(2)
+
+        genomes = [self.genome_feed_forward, self.genome_recurrent]
+        for _ in range(10):
+            generator = InnovationNumberGeneratorSingleCore()
+            genome = create_genome_structure(3, 2, tanh_activation, config, generator)
+            genome = rp.set_new_genome_weights(genome, rnd, config)
+            genome = rp.set_new_genome_bias(genome, rnd, config)
+            for generation in range(15):
+                generator.next_generation(generation)
+                genome, _, _, _ = rp.mutate_add_node(genome, rnd, generator, config)
+                genome, _ = rp.mutate_add_connection(genome, rnd, generator, config)
+            genomes.append(genome)
+
+        for genome in genomes:
+            compiled_network = CompiledNeuralNetwork()
+            compiled_network.build(genome)
+
+            _, nodes, connections = es.decode_genome_arrays(es.encode_genome(genome))
+            array_network = CompiledNeuralNetwork()
+            array_network.build_from_arrays(nodes, connections)
+
+            self.assertEqual(compiled_network.innovation_numbers, array_network.innovation_numbers)
+            self.assertEqual(compiled_network.order.tolist(), array_network.order.tolist())
+            self.assertEqual(compiled_network.activation_functions, array_network.activation_functions)
+            self.assertEqual(compiled_network.activation_ids.tolist(), array_network.activation_ids.tolist())
+            self.assertEqual(compiled_network.edge_pointers.tolist(), array_network.edge_pointers.tolist())
+            self.assertEqual(compiled_network.edge_sources.tolist(), array_network.edge_sources.tolist())
+            self.assertEqual(compiled_network.edge_weights.tolist(), array_network.edge_weights.tolist())
+
+            for _ in range(3):
+                inputs = rnd.uniform(-2, 2, size=3).tolist()
+                self.assertEqual(compiled_network.activate(inputs), array_network.activate(inputs))
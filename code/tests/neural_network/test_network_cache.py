@@ -0,0 +1,88 @@
+from unittest import TestCase
+
+from neat_core.activation_function import step_activation
+from neat_core.models.connection import Connection
+from neat_core.models.genome import Genome
+from neat_core.models.node import Node, NodeType
+from neat_core.service import reproduction_service as rp
+from neural_network.basic_neural_network import BasicNeuralNetwork
+from neural_network.network_cache import NetworkCache, create_network_fingerprint
+
+
+class NetworkCacheTest(TestCase):
+
+    def setUp(self) -> None:
+        self.genome = Genome(1, [Node(1, NodeType.INPUT, 0, step_activation, 0),
+                                 Node(2, NodeType.OUTPUT, 0.5, step_activation, 1)],
+                             [Connection(1, 1, 2, 0.3, True)])
+        self.amount_builds = 0
+
+    def _build(self) -> BasicNeuralNetwork:
+        self.amount_builds += 1
+        neural_network = BasicNeuralNetwork()
+        neural_network.build(self.genome)
+        return neural_network
+
+    def test_network_fingerprint(self):
+        fingerprint = create_network_fingerprint(self.genome)
+
+        # Copies share the unchanged genes
+        copied_genome = rp.copy_genome(self.genome)
+        copied_genome.seed = 2
+        self.assertEqual(fingerprint, create_network_fingerprint(copied_genome))
+        self.assertEqual(hash(fingerprint), hash(create_network_fingerprint(copied_genome)))
+
+        # A changed gene is replaced by a copy
+        copied_genome.connections[0] = Connection(1, 1, 2, 0.4, True)
+        self.assertNotEqual(fingerprint, create_network_fingerprint(copied_genome))
+
+        copied_genome = rp.copy_genome(self.genome)
+        copied_genome.nodes.append(Node(3, NodeType.HIDDEN, 0, step_activation, 0.5))
+        self.assertNotEqual(fingerprint, create_network_fingerprint(copied_genome))
+
+        # The order of the genes determines the order of the calculations
+        copied_genome = rp.copy_genome(self.genome)
+        copied_genome.nodes.reverse()
+        self.assertNotEqual(fingerprint, create_network_fingerprint(copied_genome))
+
+    def test_get_neural_network(self):
+        cache = NetworkCache(2)
+        self.assertTrue(cache.is_enabled())
+        fingerprint = create_network_fingerprint(self.genome)
+
+        neural_network = cache.get_neural_network(fingerprint, self._build)
+        self.assertEqual(1, self.amount_builds)
+        self.assertEqual([1], neural_network.activate([1.0]))
+
+        # The cached network is reset and used again
+        self.assertIs(neural_network, cache.get_neural_network(fingerprint, self._build))
+        self.assertEqual(1, self.amount_builds)
+        self.assertTrue(all(neuron.val == 0 for neuron in neural_network.all_neurons.values()))
+
+        # Without fingerprint the network is always built
+        self.assertIsNot(neural_network, cache.get_neural_network(None, self._build))
+        self.assertEqual(2, self.amount_builds)
+
+    def test_disabled_cache(self):
+        cache = NetworkCache(0, cache_results=True)
+        self.assertFalse(cache.is_enabled())
+
+        fingerprint = create_network_fingerprint(self.genome)
+        self.assertIsNot(cache.get_neural_network(fingerprint, self._build),
+                         cache.get_neural_network(fingerprint, self._build))
+        cache.put_result(fingerprint, 1.0, None)
+        self.assertIsNone(cache.get_result(fingerprint))
+
+    def test_results(self):
+        fingerprint = create_network_fingerprint(self.genome)
+
+        # The results are only cached, if it is enabled
+        cache = NetworkCache(2)
+        cache.put_result(fingerprint, 1.0, {"a": 1})
+        self.assertIsNone(cache.get_result(fingerprint))
+
+        cache = NetworkCache(2, cache_results=True)
+        self.assertIsNone(cache.get_result(fingerprint))
+        cache.put_result(fingerprint, 1.0, {"a": 1})
+        self.assertEqual((1.0, {"a": 1}), cache.get_result(fingerprint))
+        self.assertIsNone(cache.get_result(None))
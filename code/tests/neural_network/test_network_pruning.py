@@ -0,0 +1,25 @@
+from unittest import TestCase
+
+from neural_network.network_pruning import find_required_nodes
+
+
+class NetworkPruningTest(TestCase):
+
+    def test_find_required_nodes(self):
+        # Inputs 1, 2, output 3. 4 is a dead end, 5 only feeds the dead end, 6 has no inputs but feeds the output
+        incoming_nodes = {3: [1, 6], 4: [1, 5], 5: [2]}
+        self.assertEqual({1, 2, 3, 6}, find_required_nodes([1, 2], [3], incoming_nodes))
+
+    def test_find_required_nodes_recurrent(self):
+        # 4 and 5 form a recurrent cycle feeding the output, 6 is only connected from the output
+        incoming_nodes = {3: [4], 4: [1, 5], 5: [4, 3], 6: [3]}
+        self.assertEqual({1, 2, 3, 4, 5}, find_required_nodes([1, 2], [3], incoming_nodes))
+
+    def test_find_required_nodes_stops_at_inputs(self):
+        # The incoming connections of input nodes are not calculated
+        incoming_nodes = {3: [1], 1: [4], 4: [2]}
+        self.assertEqual({1, 2, 3}, find_required_nodes([1, 2], [3], incoming_nodes))
+
+    def test_find_required_nodes_without_connections(self):
+        self.assertEqual({1, 2, 3, 4}, find_required_nodes([1, 2], [3, 4], {}))
+        self.assertEqual(set(), find_required_nodes([], [], {5: [6]}))
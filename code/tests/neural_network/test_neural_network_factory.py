@@ -0,0 +1,19 @@
+from unittest import TestCase
+
+from neural_network.basic_neural_network import BasicNeuralNetwork
+from neural_network.compiled_neural_network import CompiledNeuralNetwork
+from neural_network.layered_neural_network import LayeredNeuralNetwork
+from neural_network.neural_network_factory import create_neural_network
+from neural_network.recurrent_neural_network import RecurrentNeuralNetwork
+
+
+class TestNeuralNetworkFactory(TestCase):
+
+    def test_create_neural_network(self):
+        self.assertIsInstance(create_neural_network("basic"), BasicNeuralNetwork)
+        self.assertIsInstance(create_neural_network("compiled"), CompiledNeuralNetwork)
+        self.assertIsInstance(create_neural_network("layered"), LayeredNeuralNetwork)
+        self.assertIsInstance(create_neural_network("recurrent"), RecurrentNeuralNetwork)
+
+        with self.assertRaises(AssertionError):
+            create_neural_network("unknown")
@@ -0,0 +1,110 @@
+from unittest import TestCase
+
+import numpy as np
+
+import neat_core.service.reproduction_service as rp
+from neat_core.activation_function import modified_sigmoid_activation, tanh_activation, relu_activation
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.service.generation_service import create_genome_structure
+from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
+from neural_network.compiled_neural_network import CompiledNeuralNetwork
+from neural_network.population_network import PopulationNetwork
+
+
+def _custom_activation(x: float) -> float:
+    return x / 2
+
+
+class TestPopulationNetwork(TestCase):
+
+    def setUp(self) -> None:
+        self.config = NeatConfig(allow_recurrent_connections=True, probability_mutate_add_node=0.5,
+                                 probability_mutate_add_connection=1.0, mutate_connection_tries=20)
+        self.rnd = np.random.RandomState(5)
+        self.activation_functions = [modified_sigmoid_activation, tanh_activation, relu_activation,
+                                     _custom_activation]
+
+        self.genomes = []
+        for i in range(12):
+            generator = InnovationNumberGeneratorSingleCore()
+            genome = create_genome_structure(3, 2, self.activation_functions[i % 4], self.config, generator)
+            genome = rp.set_new_genome_weights(genome, self.rnd, self.config)
+            genome = rp.set_new_genome_bias(genome, self.rnd, self.config)
+            # Genomes with a different amount of nodes and connections
+            for generation in range(i):
+                generator.next_generation(generation)
+                genome, _, _, _ = rp.mutate_add_node(genome, self.rnd, generator, self.config)
+                genome, _ = rp.mutate_add_connection(genome, self.rnd, generator, self.config)
+            self.genomes.append(genome)
+
+    def test_build(self):
+        population_network = PopulationNetwork()
+        population_network.build(self.genomes)
+
+        self.assertEqual(12, population_network.amount_genomes)
+        self.assertEqual(3, population_network.amount_inputs)
+        self.assertEqual(2, population_network.amount_outputs)
+        self.assertEqual(max(len(g.nodes) for g in self.genomes), population_network.max_nodes)
+        self.assertEqual((12, 3), population_network.input_indices.shape)
+        self.assertEqual((12, 2), population_network.output_indices.shape)
+        self.assertEqual(4, len(population_network.activation_functions))
+
+        with self.assertRaises(AssertionError):
+            population_network.build([])
+
+        with self.assertRaises(AssertionError):
+            other_genome = create_genome_structure(2, 2, tanh_activation, self.config,
+                                                   InnovationNumberGeneratorSingleCore())
+            population_network.build([self.genomes[0], other_genome])
+
+    def test_activate_shared_inputs(self):
+        population_network = PopulationNetwork()
+        population_network.build(self.genomes)
+
+        inputs = self.rnd.uniform(-2, 2, size=(4, 3))
+        result = population_network.activate(inputs)
+        self.assertEqual((12, 4, 2), result.shape)
+
+        # Every row of the batch is an independent evaluation
+        for g, genome in enumerate(self.genomes):
+            for b in range(4):
+                compiled_network = CompiledNeuralNetwork()
+                compiled_network.build(genome)
+                expected = compiled_network.activate(inputs[b].tolist())
+                np.testing.assert_allclose(expected, result[g, b], rtol=0, atol=1e-12)
+
+    def test_activate_recurrent_and_reset(self):
+        population_network = PopulationNetwork()
+        population_network.build(self.genomes)
+        compiled_networks = []
+        for genome in self.genomes:
+            compiled_network = CompiledNeuralNetwork()
+            compiled_network.build(genome)
+            compiled_networks.append(compiled_network)
+
+        inputs = self.rnd.uniform(-2, 2, size=(5, 12, 1, 3))
+        for step in range(5):
+            result = population_network.activate(inputs[step])
+            for g, compiled_network in enumerate(compiled_networks):
+                expected = compiled_network.activate(inputs[step, g, 0].tolist())
+                np.testing.assert_allclose(expected, result[g, 0], rtol=0, atol=1e-12)
+
+        population_network.reset()
+        result = population_network.activate(inputs[0])
+        for g, genome in enumerate(self.genomes):
+            compiled_network = CompiledNeuralNetwork()
+            compiled_network.build(genome)
+            np.testing.assert_allclose(compiled_network.activate(inputs[0, g, 0].tolist()), result[g, 0], rtol=0,
+                                       atol=1e-12)
+
+    def test_activate_without_hidden_nodes(self):
+        genome = create_genome_structure(2, 1, tanh_activation, self.config, InnovationNumberGeneratorSingleCore())
+        genome = rp.set_new_genome_weights(genome, self.rnd, self.config)
+
+        population_network = PopulationNetwork()
+        population_network.build([genome])
+        compiled_network = CompiledNeuralNetwork()
+        compiled_network.build(genome)
+
+        result = population_network.activate([[1, -1]])
+        np.testing.assert_allclose(compiled_network.activate([1, -1]), result[0, 0], rtol=0, atol=1e-12)
@@ -0,0 +1,174 @@
+from unittest import TestCase
+
+import numpy as np
+
+import neat_core.service.encoding_service as es
+import neat_core.service.reproduction_service as rp
+from neat_core.activation_function import step_activation, modified_sigmoid_activation, tanh_activation, \
+    relu_activation
+from neat_core.models.connection import Connection
+from neat_core.models.genome import Genome
+from neat_core.models.node import Node, NodeType
+from neat_core.optimizer.neat_config import NeatConfig
+from neat_core.service.generation_service import create_genome_structure
+from neat_single_core.inno_number_generator_single_core import InnovationNumberGeneratorSingleCore
+from neural_network.compiled_neural_network import CompiledNeuralNetwork
+from neural_network.recurrent_neural_network import RecurrentNeuralNetwork
+
+
+class TestRecurrentNeuralNetwork(TestCase):
+
+    def setUp(self) -> None:
+        self.genome_feed_forward = Genome(10, [
+            Node(1, NodeType.INPUT, 0, step_activation, x_position=0),
+            Node(2, NodeType.INPUT, 0, step_activation, x_position=0),
+            Node(3, NodeType.INPUT, 0, step_activation, x_position=0),
+            Node(4, NodeType.OUTPUT, -0.6, step_activation, x_position=1),
+            Node(15, NodeType.HIDDEN, -0.5, step_activation, x_position=0.5),
+        ], [
+            Connection(innovation_number=5, input_node=1, output_node=4, weight=0.5, enabled=True),
+            Connection(innovation_number=16, input_node=1, output_node=15, weight=-0.4, enabled=True),
+            Connection(innovation_number=17, input_node=15, output_node=4, weight=2.0, enabled=True),
+            Connection(innovation_number=18, input_node=2, output_node=15, weight=-1.0, enabled=True),
+            Connection(innovation_number=6, input_node=2, output_node=4, weight=-15.0, enabled=False),
+            Connection(innovation_number=19, input_node=3, output_node=15, weight=2.0, enabled=True),
+            Connection(innovation_number=19, input_node=3, output_node=4, weight=15.0, enabled=False)
+        ])
+
+        self.genome_recurrent = Genome(20, [
+            Node(1, NodeType.INPUT, 0, modified_sigmoid_activation, x_position=0),
+            Node(2, NodeType.INPUT, 0, modified_sigmoid_activation, x_position=0),
+            Node(3, NodeType.INPUT, 0, modified_sigmoid_activation, x_position=0),
+            Node(4, NodeType.OUTPUT, -1.0, modified_sigmoid_activation, x_position=1),
+            Node(10, NodeType.HIDDEN, -0.6, modified_sigmoid_activation, x_position=0.5),
+            Node(15, NodeType.HIDDEN, -1.2, relu_activation, x_position=0.5),
+        ], [
+            Connection(innovation_number=11, input_node=1, output_node=10, weight=0.5, enabled=True),
+            Connection(innovation_number=12, input_node=2, output_node=10, weight=-0.3, enabled=True),
+            Connection(innovation_number=22, input_node=10, output_node=10, weight=1.5, enabled=True),
+            Connection(innovation_number=21, input_node=15, output_node=10, weight=-0.1, enabled=True),
+            Connection(innovation_number=16, input_node=2, output_node=15, weight=2.0, enabled=True),
+            Connection(innovation_number=17, input_node=3, output_node=15, weight=-1.6, enabled=True),
+            Connection(innovation_number=20, input_node=10, output_node=15, weight=-0.3, enabled=True),
+            Connection(innovation_number=18, input_node=4, output_node=15, weight=0.6, enabled=True),
+            Connection(innovation_number=13, input_node=10, output_node=4, weight=1.6, enabled=True),
+            Connection(innovation_number=19, input_node=15, output_node=4, weight=-0.6, enabled=True),
+            Connection(innovation_number=14, input_node=3, output_node=4, weight=-0.3, enabled=True),
+            Connection(innovation_number=23, input_node=2, output_node=2, weight=0.7, enabled=True),
+        ])
+
+    def _create_genomes(self, allow_recurrent_connections: bool, seed: int):
+        config = NeatConfig(allow_recurrent_connections=allow_recurrent_connections, probability_mutate_add_node=0.5,
+                            probability_mutate_add_connection=1.0, mutate_connection_tries=20)
+        rnd = np.random.RandomState(seed)
+
+        genomes = []
+        for _ in range(10):
+            generator = InnovationNumberGeneratorSingleCore()
+            genome = create_genome_structure(3, 2, tanh_activation, config, generator)
+            genome = rp.set_new_genome_weights(genome, rnd, config)
+            genome = rp.set_new_genome_bias(genome, rnd, config)
+            for generation in range(15):
+                generator.next_generation(generation)
+                genome, _, _, _ = rp.mutate_add_node(genome, rnd, generator, config)
+                genome, _ = rp.mutate_add_connection(genome, rnd, generator, config)
+            genomes.append(genome)
+        return genomes
+
+    def test_build(self):
+        neural_network = RecurrentNeuralNetwork()
+        neural_network.build(self.genome_recurrent)
+
+        # Order: 1, 2, 3, 10, 15, 4. The incoming connection of the input node 2 is not calculated
+        self.assertEqual(6, neural_network.amount_nodes)
+        self.assertEqual([0, 1, 2], neural_network.input_indices.tolist())
+        self.assertEqual([5], neural_network.output_indices.tolist())
+        self.assertEqual([False, False, True, True, False, False, True, True, False, False, False],
+                         neural_network.uses_previous_value.tolist())
+        self.assertEqual(0, neural_network.amount_pruned_nodes)
+        self.assertEqual(1, neural_network.amount_pruned_connections)
+
+    def test_activate(self):
+        neural_network = RecurrentNeuralNetwork()
+        neural_network.build(self.genome_feed_forward)
+
+        with self.assertRaises(AssertionError):
+            neural_network.activate([1, 2, 3, 4])
+
+        self.assertEqual([0], neural_network.activate([0, 0, 0]))
+        self.assertEqual([1], neural_network.activate([0, 0, 1]))
+        self.assertEqual([0], neural_network.activate([0, 1, 0]))
+        self.assertEqual([1], neural_network.activate([0, 1, 1]))
+        self.assertEqual([0], neural_network.activate([1, 0, 0]))
+        self.assertEqual([1], neural_network.activate([1, 0, 1]))
+        self.assertEqual([0], neural_network.activate([1, 1, 0]))
+        self.assertEqual([1], neural_network.activate([1, 1, 1]))
+
+    def test_activate_recurrent_and_reset(self):
+        compiled_network = CompiledNeuralNetwork()
+        compiled_network.build(self.genome_recurrent)
+        neural_network = RecurrentNeuralNetwork()
+        neural_network.build(self.genome_recurrent)
+
+        results = [neural_network.activate([0.5, -2, 3]) for _ in range(3)]
+        for result in results:
+            self.assertAlmostEqual(compiled_network.activate([0.5, -2, 3])[0], result[0], delta=1e-12)
+        self.assertNotEqual(results[0], results[1])
+
+        neural_network.reset()
+        self.assertEqual(results[0], neural_network.activate([0.5, -2, 3]))
+
+    def test_export_and_restore_state(self):
+        neural_network = RecurrentNeuralNetwork()
+        neural_network.build(self.genome_recurrent)
+
+        self.assertEqual([0] * 6, neural_network.export_state().tolist())
+        neural_network.activate([0.5, -2, 3])
+        state = neural_network.export_state()
+        results = [neural_network.activate([1, 0.3, -1]) for _ in range(3)]
+
+        # The exported state is a copy, it doesn't change with the activations
+        self.assertNotEqual(state.tolist(), neural_network.export_state().tolist())
+        neural_network.restore_state(state)
+        self.assertEqual(results, [neural_network.activate([1, 0.3, -1]) for _ in range(3)])
+
+        # The state can be restored in another network of the same genome
+        other_network = RecurrentNeuralNetwork()
+        other_network.build(self.genome_recurrent)
+        other_network.restore_state(state)
+        self.assertEqual(results[0], other_network.activate([1, 0.3, -1]))
+
+        with self.assertRaises(AssertionError):
+            neural_network.restore_state(np.zeros(5))
+
+    def test_same_result_as_compiled_neural_network(self):
+        rnd = np.random.RandomState(3)
+
+        for allow_recurrent_connections, seed in [(False, 1), (True, 2)]:
+            genomes = self._create_genomes(allow_recurrent_connections, seed)
+            for genome in genomes + [self.genome_feed_forward, self.genome_recurrent]:
+                compiled_network = CompiledNeuralNetwork()
+                compiled_network.build(genome)
+                recurrent_network = RecurrentNeuralNetwork()
+                recurrent_network.build(genome)
+
+                # The sums are calculated in a different order, so the results can differ in the rounding
+                for _ in range(5):
+                    inputs = rnd.uniform(-2, 2, size=3).tolist()
+                    np.testing.assert_allclose(compiled_network.activate(inputs), recurrent_network.activate(inputs),
+                                               rtol=0, atol=1e-12)
+
+    def test_build_from_arrays(self):
+        rnd = np.random.RandomState(4)
+
+        for genome in self._create_genomes(True, 5):
+            recurrent_network = RecurrentNeuralNetwork()
+            recurrent_network.build(genome)
+
+            _, nodes, connections = es.decode_genome_arrays(es.encode_genome(genome))
+            array_network = RecurrentNeuralNetwork()
+            array_network.build_from_arrays(nodes, connections)
+
+            for _ in range(3):
+                inputs = rnd.uniform(-2, 2, size=3).tolist()
+                self.assertEqual(recurrent_network.activate(inputs), array_network.activate(inputs))
@@ -0,0 +1,136 @@
+from unittest import TestCase
+
+import numpy as np
+
+from neat_core.activation_function import modified_sigmoid_activation
+from neat_core.models.connection import Connection
+from neat_core.models.genome import Genome
+from neat_core.models.node import Node, NodeType
+from neural_network.neural_network_factory import create_neural_network
+from neural_network.rollout import run_rollout
+
+
+class CounterEnvironment(object):
+
+    def __init__(self, max_steps: int):
+        """
+        Environment for the tests, the observations depend on the amount of steps and the last action
+        :param max_steps: the amount of steps, after which the environment is done
+        """
+        self.max_steps = max_steps
+        self.steps = 0
+        self.actions = []
+
+    def step(self, action):
+        self.steps += 1
+        self.actions.append(action)
+        value = float(np.sum(action))
+        observation = np.array([self.steps / 10, -value, 0.5])
+        return observation, value + 1, self.steps >= self.max_steps, {"steps": self.steps}
+
+
+class TestRollout(TestCase):
+
+    def setUp(self) -> None:
+        self.genome = Genome(20, [
+            Node(1, NodeType.INPUT, 0, modified_sigmoid_activation, x_position=0),
+            Node(2, NodeType.INPUT, 0, modified_sigmoid_activation, x_position=0),
+            Node(3, NodeType.INPUT, 0, modified_sigmoid_activation, x_position=0),
+            Node(4, NodeType.OUTPUT, -0.1, modified_sigmoid_activation, x_position=1),
+            Node(5, NodeType.OUTPUT, 0.2, modified_sigmoid_activation, x_position=1),
+            Node(10, NodeType.HIDDEN, -0.6, modified_sigmoid_activation, x_position=0.5),
+        ], [
+            Connection(innovation_number=11, input_node=1, output_node=10, weight=1.5, enabled=True),
+            Connection(innovation_number=12, input_node=2, output_node=10, weight=-0.3, enabled=True),
+            Connection(innovation_number=13, input_node=10, output_node=10, weight=0.8, enabled=True),
+            Connection(innovation_number=14, input_node=10, output_node=4, weight=2.0, enabled=True),
+            Connection(innovation_number=15, input_node=3, output_node=5, weight=0.4, enabled=True),
+            Connection(innovation_number=16, input_node=4, output_node=5, weight=-1.0, enabled=True),
+        ])
+
+    def _expected_rollout(self, neural_network_type: str, max_steps: int, environment_steps: int):
+        neural_network = create_neural_network(neural_network_type)
+        neural_network.build(self.genome)
+        environment = CounterEnvironment(environment_steps)
+
+        observation = [0.1, 0.2, 0.3]
+        observations, actions, rewards = [], [], []
+        for _ in range(max_steps):
+            observations.append(observation)
+            action = int(np.argmax(neural_network.activate(observation)))
+            actions.append(action)
+            observation, reward, done, _ = environment.step(action)
+            observation = observation.tolist()
+            rewards.append(reward)
+            if done:
+                break
+        return observations, actions, rewards
+
+    def test_rollout_argmax(self):
+        for neural_network_type in ["basic", "compiled", "layered", "recurrent"]:
+            neural_network = create_neural_network(neural_network_type)
+            neural_network.build(self.genome)
+            environment = CounterEnvironment(12)
+
+            result = neural_network.rollout(environment.step, np.array([0.1, 0.2, 0.3]), 20)
+            observations, actions, rewards = self._expected_rollout(neural_network_type, 20, 12)
+
+            self.assertEqual(12, result.steps)
+            self.assertTrue(result.done)
+            self.assertEqual(observations, result.observations.tolist())
+            self.assertEqual(actions, result.actions.tolist())
+            self.assertEqual(actions, environment.actions)
+            self.assertIsInstance(environment.actions[0], int)
+            self.assertEqual(rewards, result.rewards.tolist())
+            self.assertEqual(sum(rewards), result.total_reward)
+            self.assertEqual([1.2, -actions[-1], 0.5], result.final_observation.tolist())
+            self.assertEqual({"steps": 12}, result.final_info)
+
+    def test_rollout_max_steps(self):
+        neural_network = create_neural_network("compiled")
+        neural_network.build(self.genome)
+
+        # The observation can be a list
+        result = neural_network.rollout(CounterEnvironment(12).step, [0.1, 0.2, 0.3], 5)
+        observations, actions, rewards = self._expected_rollout("compiled", 5, 12)
+        self.assertEqual(5, result.steps)
+        self.assertFalse(result.done)
+        self.assertEqual(observations, result.observations.tolist())
+        self.assertEqual(actions, result.actions.tolist())
+
+        result = neural_network.rollout(CounterEnvironment(12).step, [0.1, 0.2, 0.3], 0)
+        self.assertEqual(0, result.steps)
+        self.assertIsNone(result.final_info)
+
+    def test_rollout_raw(self):
+        neural_network = create_neural_network("layered")
+        neural_network.build(self.genome)
+        expected_network = create_neural_network("basic")
+        expected_network.build(self.genome)
+
+        environment = CounterEnvironment(3)
+        result = neural_network.rollout(environment.step, np.array([0.1, 0.2, 0.3]), 10, action_mode="raw")
+
+        self.assertEqual(3, result.steps)
+        self.assertEqual((3, 2), result.actions.shape)
+        for observation, action in zip(result.observations.tolist(), result.actions):
+            np.testing.assert_allclose(expected_network.activate(observation), action, rtol=0, atol=1e-12)
+        self.assertEqual([float(np.sum(action)) + 1 for action in result.actions], result.rewards.tolist())
+
+    def test_rollout_errors(self):
+        neural_network = create_neural_network("recurrent")
+        neural_network.build(self.genome)
+
+        with self.assertRaises(AssertionError):
+            neural_network.rollout(CounterEnvironment(3).step, [0.1, 0.2, 0.3], 10, action_mode="unknown")
+
+        with self.assertRaises(AssertionError):
+            neural_network.rollout(CounterEnvironment(3).step, [0.1, 0.2], 10)
+
+    def test_run_rollout(self):
+        # The index of the first highest output is used like in np.argmax
+        environment = CounterEnvironment(2)
+        result = run_rollout(lambda observation: [0.5, 0.9, 0.9], environment.step, [1, 2, 3], 5, "argmax")
+        self.assertEqual([1, 1], result.actions.tolist())
+        self.assertEqual([[1, 2, 3], [0.1, -1, 0.5]], result.observations.tolist())
+        self.assertEqual(4.0, result.total_reward)
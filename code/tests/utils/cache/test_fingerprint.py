@@ -0,0 +1,16 @@
+from unittest import TestCase
+
+from utils.cache.fingerprint import Fingerprint
+
+
+class FingerprintTest(TestCase):
+
+    def test_equal_values(self):
+        fingerprint = Fingerprint(((1, 2), (0.5, -0.5)))
+        self.assertEqual(Fingerprint(((1, 2), (0.5, -0.5))), fingerprint)
+        self.assertEqual(hash(((1, 2), (0.5, -0.5))), hash(fingerprint))
+        self.assertNotEqual(Fingerprint(((1, 2), (0.5, 0.5))), fingerprint)
+        self.assertNotEqual(((1, 2), (0.5, -0.5)), fingerprint)
+
+        cache = {fingerprint: 1}
+        self.assertEqual(1, cache[Fingerprint(((1, 2), (0.5, -0.5)))])
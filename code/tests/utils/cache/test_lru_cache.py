@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+from utils.cache.lru_cache import LRUCache
+
+
+class LRUCacheTest(TestCase):
+
+    def test_get_put(self):
+        cache = LRUCache(2)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(-1, cache.get("a", -1))
+
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(1, cache.get("a"))
+        self.assertEqual(2, cache.get("b"))
+        self.assertEqual(2, len(cache))
+        self.assertEqual(2, cache.hits)
+        self.assertEqual(2, cache.misses)
+
+        # The value of an existing key is replaced
+        cache.put("a", 3)
+        self.assertEqual(3, cache.get("a"))
+        self.assertEqual(2, len(cache))
+
+    def test_least_recently_used_removed(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+
+    def test_disabled(self):
+        cache = LRUCache(0)
+        cache.put("a", 1)
+        self.assertEqual(0, len(cache))
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(1, cache.misses)
+
+        with self.assertRaises(AssertionError):
+            LRUCache(-1)
+
@@ -0,0 +1,107 @@
+import math
+from unittest import TestCase
+
+import numpy as np
+from gym.utils import seeding
+
+from utils.environment.vectorized_cart_pole import VectorizedCartPole
+
+
+class ReferenceCartPole(object):
+    """
+    Step function of the gym environment CartPole-v1 (gym 0.17) with the TimeLimit of 500 steps
+    """
+
+    def __init__(self, seed: int):
+        self.np_random, _ = seeding.np_random(seed)
+        self.state = None
+        self.elapsed_steps = 0
+
+    def reset(self):
+        self.state = self.np_random.uniform(low=-0.05, high=0.05, size=(4,))
+        self.elapsed_steps = 0
+        return np.array(self.state)
+
+    def step(self, action):
+        x, x_dot, theta, theta_dot = self.state
+        force = 10.0 if action == 1 else -10.0
+        costheta = math.cos(theta)
+        sintheta = math.sin(theta)
+        temp = (force + 0.05 * theta_dot ** 2 * sintheta) / 1.1
+        thetaacc = (9.8 * sintheta - costheta * temp) / (0.5 * (4.0 / 3.0 - 0.1 * costheta ** 2 / 1.1))
+        xacc = temp - 0.05 * thetaacc * costheta / 1.1
+        x = x + 0.02 * x_dot
+        x_dot = x_dot + 0.02 * xacc
+        theta = theta + 0.02 * theta_dot
+        theta_dot = theta_dot + 0.02 * thetaacc
+        self.state = (x, x_dot, theta, theta_dot)
+
+        theta_threshold = 12 * 2 * math.pi / 360
+        done = x < -2.4 or x > 2.4 or theta < -theta_threshold or theta > theta_threshold
+        self.elapsed_steps += 1
+        return np.array(self.state), 1.0, bool(done) or self.elapsed_steps >= 500
+
+
+class VectorizedCartPoleTest(TestCase):
+
+    def test_reset(self):
+        environment = VectorizedCartPole(3)
+        self.assertEqual([5, 6, 7], environment.seed([5, 6, 7]))
+        observations = environment.reset()
+
+        self.assertEqual((3, 4), observations.shape)
+        for seed, observation in zip([5, 6, 7], observations):
+            self.assertEqual(ReferenceCartPole(seed).reset().tolist(), observation.tolist())
+        self.assertFalse(np.any(environment.dones))
+
+        # Same seed for all environments
+        environment.seed(5)
+        observations = environment.reset()
+        self.assertEqual(observations[0].tolist(), observations[2].tolist())
+
+        with self.assertRaises(AssertionError):
+            environment.seed([1, 2])
+
+    def test_step_same_as_gym(self):
+        seeds = list(range(20))
+        environment = VectorizedCartPole(len(seeds))
+        environment.seed(seeds)
+        observations = environment.reset()
+
+        references = [ReferenceCartPole(seed) for seed in seeds]
+        reference_observations = [reference.reset() for reference in references]
+        reference_done = [False] * len(seeds)
+        reference_fitness = [0.0] * len(seeds)
+        fitness = np.zeros(len(seeds))
+
+        # A simple controller, so that the episodes have different lengths
+        weights = np.random.RandomState(1).uniform(-1, 1, size=(len(seeds), 4))
+        while not np.all(environment.dones):
+            actions = (np.sum(weights * observations, axis=1) > 0).astype(np.int64)
+            observations, rewards, dones = environment.step(actions)
+            fitness += rewards
+
+            for i, reference in enumerate(references):
+                if reference_done[i]:
+                    continue
+                reference_observations[i], reward, reference_done[i] = reference.step(actions[i])
+                reference_fitness[i] += reward
+                self.assertEqual(reference_observations[i].tolist(), observations[i].tolist())
+                self.assertEqual(reference_done[i], dones[i])
+
+        self.assertEqual(reference_fitness, fitness.tolist())
+
+    def test_time_limit(self):
+        environment = VectorizedCartPole(2, max_episode_steps=3)
+        environment.seed(1)
+        environment.reset()
+
+        for _ in range(3):
+            # Balance the pole by pushing the cart alternating in both directions
+            _, rewards, dones = environment.step(np.array([0, 1]))
+            self.assertEqual([1.0, 1.0], rewards.tolist())
+
+        self.assertEqual([True, True], dones.tolist())
+        _, rewards, dones = environment.step(np.array([0, 1]))
+        self.assertEqual([0.0, 0.0], rewards.tolist())
+        self.assertEqual([3, 3], environment.elapsed_steps.tolist())
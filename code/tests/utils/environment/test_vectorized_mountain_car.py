@@ -0,0 +1,79 @@
+import math
+from unittest import TestCase
+
+import numpy as np
+from gym.utils import seeding
+
+from utils.environment.vectorized_mountain_car import VectorizedMountainCar
+
+
+class ReferenceMountainCar(object):
+    """
+    Step function of the gym environment MountainCar-v0 (gym 0.17) with the TimeLimit of 200 steps
+    """
+
+    def __init__(self, seed: int):
+        self.np_random, _ = seeding.np_random(seed)
+        self.state = None
+        self.elapsed_steps = 0
+
+    def reset(self):
+        self.state = np.array([self.np_random.uniform(low=-0.6, high=-0.4), 0])
+        self.elapsed_steps = 0
+        return np.array(self.state)
+
+    def step(self, action):
+        position, velocity = self.state
+        velocity += (action - 1) * 0.001 + math.cos(3 * position) * (-0.0025)
+        velocity = np.clip(velocity, -0.07, 0.07)
+        position += velocity
+        position = np.clip(position, -1.2, 0.6)
+        if position == -1.2 and velocity < 0:
+            velocity = 0
+
+        done = bool(position >= 0.5 and velocity >= 0)
+        self.state = (position, velocity)
+        self.elapsed_steps += 1
+        return np.array(self.state), -1.0, done or self.elapsed_steps >= 200
+
+
+class VectorizedMountainCarTest(TestCase):
+
+    def test_reset(self):
+        environment = VectorizedMountainCar(2)
+        environment.seed(1111)
+        observations = environment.reset()
+
+        expected = ReferenceMountainCar(1111).reset().tolist()
+        self.assertEqual([expected, expected], observations.tolist())
+
+    def test_step_same_as_gym(self):
+        seeds = list(range(30))
+        environment = VectorizedMountainCar(len(seeds))
+        environment.seed(seeds)
+        observations = environment.reset()
+
+        references = [ReferenceMountainCar(seed) for seed in seeds]
+        for reference in references:
+            reference.reset()
+        reference_done = [False] * len(seeds)
+
+        # Accelerate in the direction of the velocity, some environments reach the goal
+        rnd = np.random.RandomState(2)
+        while not np.all(environment.dones):
+            actions = np.where(observations[:, 1] < 0, 0, 2)
+            actions = np.where(rnd.uniform(size=len(seeds)) < 0.3, rnd.randint(3, size=len(seeds)), actions)
+            observations, rewards, dones = environment.step(actions)
+
+            for i, reference in enumerate(references):
+                if reference_done[i]:
+                    self.assertEqual(0.0, rewards[i])
+                    continue
+                reference_observation, reward, reference_done[i] = reference.step(actions[i])
+                self.assertEqual(reference_observation.tolist(), observations[i].tolist())
+                self.assertEqual(reward, rewards[i])
+                self.assertEqual(reference_done[i], dones[i])
+
+        # Some environments reached the goal, the others stopped after 200 steps
+        self.assertTrue(np.any(environment.elapsed_steps < 200))
+        self.assertTrue(np.all(environment.elapsed_steps <= 200))